@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark mapování kategorií
+==================================
+
+Porovnává vyhodnocení předkompilovaného plánu pravidel CategoryMapper
+(klíčová slova názvu přes Aho-Corasick masku) s původním procházením
+vnořených slovníků. Obě cesty musí vrátit stejné
+kategorie pro každý produkt; vypisuje µs na produkt a zrychlení.
+
+Použití:
+    python benchmarks/benchmark_category_mapper.py
+    python benchmarks/benchmark_category_mapper.py --products 50000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper, collect_name_keywords
+
+PARAM_VALUES = {
+    'pohlavi': ['pánské', 'dámské', 'dětské', 'unisex'],
+    'sport': ['fotbal', 'běh', 'tenis', 'basketbal', 'outdoor'],
+    'typ': ['kopačky', 'tričko', 'mikina', 'batoh', 'míč'],
+    'povrch': ['FG', 'AG', 'TF', 'IC', 'SG'],
+    'znacka': ['Nike', 'Adidas', 'Puma', 'New Balance'],
+}
+
+
+def generate_products(mapper: CategoryMapper, count: int, seed: int = 42) -> list:
+    """Vygeneruje (název, parametry) s klíčovými slovy a parametry z pravidel."""
+    rng = random.Random(seed)
+    keywords = collect_name_keywords(mapper.category_structure)
+    filler = ['Nike', 'Mercurial', 'Pro', 'Elite', 'Jr', '2024', 'Air', 'Classic']
+    products = []
+    for _ in range(count):
+        words = rng.sample(filler, 2) + rng.sample(keywords, rng.randint(0, 2))
+        rng.shuffle(words)
+        params = {key: rng.choice(values) for key, values in PARAM_VALUES.items()
+                  if rng.random() < 0.5}
+        products.append((' '.join(words), params))
+    return products
+
+
+def legacy_check_conditions(product_name: str, params: dict, conditions: list) -> bool:
+    """Původní vyhodnocení podmínek nad slovníkovou definicí."""
+    for condition in conditions:
+        if 'name_contains' in condition:
+            if any(word in product_name for word in condition['name_contains']):
+                return True
+        if 'name_regex' in condition:
+            if re.search(condition['name_regex'], product_name):
+                return True
+        if 'params' in condition:
+            params_match = True
+            for param_name, param_values in condition['params'].items():
+                if param_name.lower() not in params:
+                    params_match = False
+                    break
+                param_value = params[param_name.lower()]
+                values = param_values if isinstance(param_values, list) else [param_values]
+                if not any(v.lower() in param_value for v in values):
+                    params_match = False
+                    break
+            if params_match:
+                return True
+        if 'params_any' in condition:
+            for param_name, param_values in condition['params_any'].items():
+                if param_name.lower() in params:
+                    values = param_values if isinstance(param_values, list) else [param_values]
+                    if params[param_name.lower()] in [v.lower() for v in values]:
+                        return True
+        if 'brand_contains' in condition:
+            brand = params.get('znacka', '') or params.get('vyrobce', '')
+            if any(word.lower() in brand.lower() for word in condition['brand_contains']):
+                return True
+    return False
+
+
+def legacy_find_all_matches(product_name: str, params: dict, category_tree: dict,
+                            parent_path: str = "") -> list:
+    """Původní rekurzivní průchod slovníkem se skládáním cest za běhu."""
+    matches = []
+    for category_name, category_data in category_tree.items():
+        current_path = f"{parent_path} > {category_name}" if parent_path else category_name
+        current_depth = current_path.count(' > ') + 1
+        if legacy_check_conditions(product_name, params, category_data.get('conditions', [])):
+            priority = category_data.get('priority', 0)
+            if 'subcategories' in category_data:
+                sub_matches = legacy_find_all_matches(
+                    product_name, params, category_data['subcategories'], current_path
+                )
+                matches.extend(sub_matches)
+                if not sub_matches:
+                    matches.append((current_path, priority, current_depth))
+            else:
+                matches.append((current_path, priority, current_depth))
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark mapování kategorií')
+    parser.add_argument('--products', type=int, default=20_000, help='Počet produktů')
+    args = parser.parse_args()
+
+    mapper = CategoryMapper()
+    products = generate_products(mapper, args.products)
+    # Obě cesty začínají stejnou normalizací názvu a parametrů
+    start = time.perf_counter()
+    legacy_results = []
+    for name, params in products:
+        context = mapper._create_product_context(name, params)
+        legacy_results.append(
+            legacy_find_all_matches(context.name, context.params, mapper.category_structure)
+        )
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_results = [
+        mapper._find_all_category_matches(mapper._create_product_context(name, params),
+                                          mapper.category_plan)
+        for name, params in products
+    ]
+    compiled_elapsed = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy_results, compiled_results) if a != b)
+    matched = sum(1 for result in compiled_results if result)
+
+    print(f"Produktů: {len(products)} (se shodou: {matched})")
+    print(f"Slovníková pravidla:  {legacy_elapsed / len(products) * 1e6:8.2f} µs/produkt")
+    print(f"Zkompilovaný plán:    {compiled_elapsed / len(products) * 1e6:8.2f} µs/produkt")
+    print(f"Zrychlení:            {legacy_elapsed / compiled_elapsed:8.2f}x")
+
+    if mismatches:
+        print(f"\n❌ Rozdílné výsledky u {mismatches} produktů")
+        sys.exit(1)
+    print("\n✓ Výsledky obou cest jsou shodné")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark načítání sešitu FastCentrik exportu
+=============================================
+
+Porovnává původní načítání (pd.read_excel zvlášť pro každý list, tedy
+trojí otevření sešitu) s DataLoaderem, který sešit otevře jednou a listy
+parsuje postupně nebo souběžně, s líným načtením jen potřebných listů
+a s načtením z cache rozparsovaných listů.
+Načtené DataFrame musí být shodné; list Zbozi se porovnává po aplikaci
+schématu (input_schema). Vypíše i velikost listů v paměti před a po
+omezení sloupců a převodu typů.
+
+Bez zadaného souboru se vygeneruje syntetický .xlsx sešit.
+
+Použití:
+    python benchmarks/benchmark_data_loader.py
+    python benchmarks/benchmark_data_loader.py --input Export_Excel_Lite.xls
+    python benchmarks/benchmark_data_loader.py --products 50000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.benchmark_product_records import generate_products
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader, SHEETS_TO_LOAD
+from src.fastcentrik_woocommerce.loaders.input_schema import SHEET_SCHEMAS, apply_schema, memory_usage, text_dtypes
+
+
+def write_workbook(path: Path, products: int) -> None:
+    """Zapíše syntetický sešit s listy Zbozi, Kategorie a Parametry."""
+    products_df = generate_products(products)
+    # Sloupce exportu, které transformace nepoužívá (schéma je nenačte)
+    products_df['EAN'] = [f"859{index:010d}" for index in range(len(products_df))]
+    products_df['Vyrobce'] = 'Nike'
+    products_df['PoznamkaInterni'] = 'Interní poznámka ke skladové položce'
+    categories_df = pd.DataFrame({
+        'InterniKod': [f"CAT{i}" for i in range(1, 51)],
+        'JmenoKategorie': [f"Kategorie {i}" for i in range(1, 51)],
+        'KodNadrizeneKategorie': ['ROOT_1'] * 50,
+    })
+    parameters_df = pd.DataFrame({
+        'Nazev': ['velikost', 'barva'] * 50,
+        'Hodnota': [str(i) for i in range(100)],
+    })
+    with pd.ExcelWriter(path) as writer:
+        products_df.to_excel(writer, sheet_name='Zbozi', index=False)
+        categories_df.to_excel(writer, sheet_name='Kategorie', index=False)
+        parameters_df.to_excel(writer, sheet_name='Parametry', index=False)
+
+
+def legacy_load(path: Path) -> dict:
+    """Původní načítání - každý list samostatným pd.read_excel (textové sloupce jako str jako v DataLoaderu)."""
+    return {key: pd.read_excel(path, sheet_name=sheet, dtype=text_dtypes(sheet))
+            for key, sheet in SHEETS_TO_LOAD.items()}
+
+
+def expected_frames(legacy: dict) -> dict:
+    """Výsledek původního načtení po omezení sloupců a převodu typů podle schématu."""
+    expected = {}
+    for key, sheet_name in SHEETS_TO_LOAD.items():
+        df = legacy[key]
+        columns = SHEET_SCHEMAS.get(sheet_name)
+        if columns is not None:
+            names = {spec.name for spec in columns}
+            df = apply_schema(df[[column for column in df.columns if column in names]], sheet_name)
+        expected[key] = df
+    return expected
+
+
+def timed(func, *args):
+    """Vrátí (výsledek, čas [s])."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark načítání sešitu')
+    parser.add_argument('--input', help='Existující export (.xls/.xlsx); jinak se vygeneruje')
+    parser.add_argument('--products', type=int, default=20_000, help='Počet produktů syntetického sešitu')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.input) if args.input else Path(tmp) / 'catalog.xlsx'
+        if not args.input:
+            write_workbook(path, args.products)
+
+        legacy, legacy_elapsed = timed(legacy_load, path)
+        expected = expected_frames(legacy)
+        print(f"{'varianta':>22} {'čas [s]':>9}")
+        print(f"{'3x pd.read_excel':>22} {legacy_elapsed:>9.2f}")
+
+        for workers in (1, len(SHEETS_TO_LOAD)):
+            loader = DataLoader(str(path), max_workers=workers, use_cache=False, lazy=False)
+            data, elapsed = timed(loader.load_data)
+            same = all(data[key].equals(expected[key]) for key in SHEETS_TO_LOAD)
+            label = f"DataLoader ({workers} vl.)"
+            print(f"{label:>22} {elapsed:>9.2f}" + ('' if same else ' ✗'))
+            timings = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in loader.sheet_timings.items())
+            print(f"{'':>22} {timings}")
+            if not same:
+                print("✗ Načtená data se liší od pd.read_excel")
+                sys.exit(1)
+
+        # Líné načtení - jen listy, které transformace používá
+        loader = DataLoader(str(path), use_cache=False, lazy=True)
+        start = time.perf_counter()
+        data = loader.load_data()
+        same = all(data[key].equals(expected[key]) for key in ('products', 'categories'))
+        elapsed = time.perf_counter() - start
+        loader.close()
+        print(f"{'líně (Zbozi+Kategorie)':>22} {elapsed:>9.2f}" + ('' if same else ' ✗'))
+        if not same:
+            print("✗ Líně načtená data se liší od pd.read_excel")
+            sys.exit(1)
+
+        # Cache rozparsovaných listů: první běh plní, druhý čte
+        cache_dir = Path(tmp) / 'cache'
+        for label in ('cache (plnění)', 'cache (zásah)'):
+            loader = DataLoader(str(path), use_cache=True, cache_dir=str(cache_dir), lazy=False)
+            data, elapsed = timed(loader.load_data)
+            same = all(data[key].equals(expected[key]) for key in SHEETS_TO_LOAD)
+            print(f"{label:>22} {elapsed:>9.2f}" + ('' if same else ' ✗') + f"  [{loader.cache.cache_format}]")
+            if not same:
+                print("✗ Data z cache se liší od pd.read_excel")
+                sys.exit(1)
+
+        print(f"\n{'list':>12} {'vše [MB]':>9} {'schéma [MB]':>12} {'sloupce':>9}")
+        for key, sheet_name in SHEETS_TO_LOAD.items():
+            before = memory_usage(legacy[key]) / 1024 / 1024
+            after = memory_usage(expected[key]) / 1024 / 1024
+            columns = f"{len(legacy[key].columns)}→{len(expected[key].columns)}"
+            print(f"{sheet_name:>12} {before:>9.1f} {after:>12.1f} {columns:>9}")
+
+    print("\n✓ DataLoader načítá stejná data jako pd.read_excel (po aplikaci schématu)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark sestavení WooCommerce produktů: slovníky vs. sloupce
+==============================================================
+
+Na syntetickém katalogu (scripts/generate_synthetic_catalog.py) změří
+sestavení produktů až po text CSV dvěma cestami:
+
+    slovníky  _iter_product_units (slovník na produkt)
+              + pd.DataFrame ze seznamu slovníků
+    sloupce   build_product_frame (celé sloupce)
+
+pro DataTransformer (woocommerce_products.csv), nebo s --webtoffee pro
+WebToffeeTransformer (webtoffee_products_all.csv).
+
+Obě cesty začínají se stejně připraveným transformátorem (tabulka
+parametrů, záznamy, mapování kategorií - mimo měření) a musí vytvořit
+stejné CSV. Fáze společné oběma cestám (dávkové mapování kategorií,
+rodiny variant, souhrny rodin) se měří zvlášť a odečtou se, zbývá
+samotné sestavení produktů včetně převodu na CSV.
+
+Použití:
+    python benchmarks/benchmark_product_frame.py
+    python benchmarks/benchmark_product_frame.py --sizes 10k 100k --no-intelligent-mapping
+    python benchmarks/benchmark_product_frame.py --webtoffee
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import CATEGORY_MAPPING_SETTINGS
+from scripts.generate_synthetic_catalog import generate_catalog, parse_size, size_label
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.variant_grouping import build_sku_index
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+from src.fastcentrik_woocommerce.exporters.webtoffee_csv_exporter import WebToffeeCSVExporter
+
+DEFAULT_SIZES = ['10k', '100k']
+
+
+def prepare(sheets: dict) -> DataTransformer:
+    """Transformátor s tabulkou parametrů, záznamy a mapováním kategorií."""
+    transformer = DataTransformer(sheets['Zbozi'], sheets['Kategorie'])
+    transformer._create_category_mapping()
+    return transformer
+
+
+def build_with_dicts(transformer: DataTransformer) -> str:
+    """Slovník na produkt, DataFrame ze seznamu slovníků a CSV."""
+    products = [product for unit in transformer._iter_product_units() for product in unit]
+    frame = pd.DataFrame(products).reindex(columns=CsvExporter.WOO_COLUMNS, fill_value='')
+    return frame.to_csv(index=False)
+
+
+def build_with_columns(transformer: DataTransformer) -> str:
+    """Sestavení po sloupcích a CSV."""
+    frame = transformer.build_product_frame().reindex(columns=CsvExporter.WOO_COLUMNS, fill_value='')
+    return frame.to_csv(index=False)
+
+
+def shared_stages(transformer: DataTransformer) -> None:
+    """Fáze, které obě cesty volají stejně: mapování kategorií, rodiny variant a jejich souhrny."""
+    transformer._precompute_category_assignments()
+    families = transformer._group_family_positions()
+    transformer._aggregate_families({
+        parent_sku: positions for parent_sku, positions, _ in families['families'] if len(positions) > 1
+    })
+
+
+def prepare_webtoffee(sheets: dict) -> WebToffeeTransformer:
+    """WebToffee transformátor s tabulkou parametrů, záznamy a mapováním kategorií."""
+    transformer = WebToffeeTransformer(sheets['Zbozi'], sheets['Kategorie'])
+    transformer._create_category_mapping()
+    return transformer
+
+
+def build_webtoffee_with_dicts(transformer: WebToffeeTransformer) -> bytes:
+    """Slovník na produkt a export webtoffee_products_*.csv (obsah všech souborů)."""
+    products = [product for unit in transformer._iter_product_units() for product in unit]
+    with tempfile.TemporaryDirectory() as tmp:
+        return b''.join(Path(file).read_bytes() for file in WebToffeeCSVExporter(tmp).export_products(products))
+
+
+def build_webtoffee_with_columns(transformer: WebToffeeTransformer) -> bytes:
+    """Sestavení po sloupcích a export webtoffee_products_*.csv (obsah všech souborů)."""
+    frame = transformer.build_product_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        return b''.join(Path(file).read_bytes() for file in WebToffeeCSVExporter(tmp).export_product_frame(frame))
+
+
+def shared_webtoffee_stages(transformer: WebToffeeTransformer) -> None:
+    """Fáze společné oběma WebToffee cestám: index SKU, mapování kategorií, skupiny variant a souhrny."""
+    transformer.sku_index = build_sku_index(transformer.products_data['KodZbozi'])
+    transformer._precompute_category_assignments()
+    transformer._aggregate_families(transformer._detect_variant_groups())
+
+
+def time_call(func, *args) -> tuple:
+    """Vrátí výsledek a čas volání."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sestavení produktů: slovníky vs. sloupce')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help='Počty produktů (např. 10k 100k 1M)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed generátoru katalogu')
+    parser.add_argument('--no-intelligent-mapping', action='store_true',
+                        help='Kategorie podle kódu místo inteligentního mapování')
+    parser.add_argument('--webtoffee', action='store_true',
+                        help='Měřit WebToffeeTransformer místo DataTransformer')
+    args = parser.parse_args()
+    
+    if args.webtoffee:
+        setup, shared, with_dicts, with_columns = (prepare_webtoffee, shared_webtoffee_stages,
+                                                   build_webtoffee_with_dicts, build_webtoffee_with_columns)
+    else:
+        setup, shared, with_dicts, with_columns = prepare, shared_stages, build_with_dicts, build_with_columns
+
+    if args.no_intelligent_mapping:
+        CATEGORY_MAPPING_SETTINGS['use_intelligent_mapping'] = False
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'produkty':>10} {'společné [s]':>13} {'slovníky [s]':>13} {'sloupce [s]':>12} {'zrychlení':>10}")
+    for size in [parse_size(value) for value in args.sizes]:
+        sheets = generate_catalog(size, seed=args.seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, shared_elapsed = time_call(shared, setup(sheets))
+            dict_csv, dict_elapsed = time_call(with_dicts, setup(sheets))
+            frame_csv, frame_elapsed = time_call(with_columns, setup(sheets))
+        if dict_csv != frame_csv:
+            print(f"✗ CSV pro {size_label(size)} produktů se liší")
+            sys.exit(1)
+
+        dict_elapsed = max(dict_elapsed - shared_elapsed, 1e-9)
+        frame_elapsed = max(frame_elapsed - shared_elapsed, 1e-9)
+        print(f"{size_label(size):>10} {shared_elapsed:>13.2f} {dict_elapsed:>13.2f} {frame_elapsed:>12.2f} "
+              f"{dict_elapsed / frame_elapsed:>9.1f}x")
+
+    print("\n✓ Obě cesty vytvoří stejné CSV")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark průchodu produkty: iterrows vs. ProductRecord
+=======================================================
+
+Měří čtení polí, která transformátory potřebují pro každý produkt, jednou
+přes DataFrame.iterrows (pd.Series na řádek) a jednou přes seznam
+ProductRecord (převod DataFrame + přístup přes atributy). Obě cesty musí
+přečíst stejné hodnoty. Volitelně změří i celou transformaci DataTransformer.
+
+Použití:
+    python benchmarks/benchmark_product_records.py
+    python benchmarks/benchmark_product_records.py --sizes 10000 --transform
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.product_record import build_product_records
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def generate_products(count: int, seed: int = 42) -> pd.DataFrame:
+    """Vygeneruje list Zbozi s rodinami variant a typickými sloupci exportu."""
+    rng = random.Random(seed)
+    rows = []
+    family = 0
+    while len(rows) < count:
+        family += 1
+        base = f"{family:06d}"
+        sizes = rng.sample(['38', '39', '40', '41', '42', '43', '44'], rng.randint(1, 4))
+        for index, size in enumerate(sizes):
+            rows.append({
+                'KodZbozi': base if index == 0 else f"{base}_{index + 1}",
+                'JmenoZbozi': f"Kopačky Nike Mercurial {family} {size}",
+                'KodMasterVyrobku': base if len(sizes) > 1 else None,
+                'HodnotyParametru': f"velikost||{size}##barva||{rng.choice(['modrá', 'černá'])}",
+                'InetrniKodyKategorii': f"CAT{rng.randint(1, 50)}",
+                'CenaBezna': f"{rng.randint(500, 5000)},00",
+                'ZakladniCena': f"{rng.randint(400, 4500)},00",
+                'Popis': '<p>Popis produktu</p>',
+                'KratkyPopis': 'Krátký popis',
+                'HlavniObrazek': f"/images/{base}.jpg" if index == 0 else None,
+                'DalsiObrazky': None,
+                'NaSklade': rng.randint(0, 20),
+                'Vypnuto': 0,
+                'Hmotnost': '0,5',
+            })
+    return pd.DataFrame(rows[:count])
+
+
+def read_with_iterrows(products_df: pd.DataFrame) -> list:
+    """Původní přístup - Series pro každý řádek a row.get()."""
+    values = []
+    for _, row in products_df.iterrows():
+        values.append((
+            row.name, str(row['KodZbozi']), str(row['JmenoZbozi']),
+            row.get('CenaBezna', ''), row.get('NaSklade', 0), row.get('HlavniObrazek')
+        ))
+    return values
+
+
+def read_with_records(products_df: pd.DataFrame) -> list:
+    """Převod na ProductRecord a přístup přes atributy."""
+    values = []
+    for row in build_product_records(products_df):
+        values.append((
+            row.label, str(row.KodZbozi), str(row.JmenoZbozi),
+            row.CenaBezna, row.NaSklade, row.HlavniObrazek
+        ))
+    return values
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """Vrátí nejlepší čas z několika opakování."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_transform(products_df: pd.DataFrame) -> float:
+    """Změří celou transformaci produktů DataTransformer."""
+    from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+
+    categories_df = pd.DataFrame({
+        'InterniKod': [f"CAT{i}" for i in range(1, 51)],
+        'JmenoKategorie': [f"Kategorie {i}" for i in range(1, 51)],
+        'KodNadrizeneKategorie': ['ROOT_1'] * 50,
+    })
+    start = time.perf_counter()
+    transformer = DataTransformer(products_df, categories_df)
+    transformer._create_category_mapping()
+    transformer._transform_products()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark iterrows vs. ProductRecord')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Počty produktů pro měření')
+    parser.add_argument('--transform', action='store_true',
+                        help='Změřit i celou transformaci DataTransformer')
+    args = parser.parse_args()
+
+    print(f"{'produkty':>10} {'iterrows [s]':>13} {'records [s]':>12} {'zrychlení':>10} {'transformace [s]':>17}")
+    for size in args.sizes:
+        products_df = generate_products(size)
+        if read_with_iterrows(products_df) != read_with_records(products_df):
+            print(f"✗ Hodnoty se pro {size} produktů liší")
+            sys.exit(1)
+
+        iterrows_elapsed = time_call(read_with_iterrows, products_df, repeat=1)
+        records_elapsed = time_call(read_with_records, products_df)
+        transform = f"{time_transform(products_df):.2f}" if args.transform else ''
+
+        print(f"{size:>10} {iterrows_elapsed:>13.3f} {records_elapsed:>12.3f} "
+              f"{iterrows_elapsed / records_elapsed:>9.1f}x {transform:>17}")
+
+    print("\n✓ Obě cesty čtou stejné hodnoty")
+
+
+if __name__ == "__main__":
+    main()
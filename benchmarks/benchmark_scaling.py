@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark škálování pipeline na syntetických katalozích
+=======================================================
+
+Pro každou velikost katalogu (scripts/generate_synthetic_catalog.py)
+změří čas, CPU čas a paměť jednotlivých fází:
+
+    načtení      DataLoader bez cache (celý sešit)
+    záznamy      DataTransformer - ParameterTable a záznamy produktů
+    transformace DataTransformer.run_transformation
+    export       CsvExporter.export_products
+    webtoffee    WebToffeeTransformer.run_transformation (volitelně --webtoffee)
+
+Každá velikost běží v samostatném procesu, aby se paměť větších katalogů
+neměřila v haldě po menších. Paměť fáze je nárůst špičky RSS oproti RSS
+na jejím začátku (Linux), nebo špička alokací tracemalloc (--memory
+tracemalloc, pomalejší). Mezi sousedními velikostmi se spočítá exponent
+růstu log(t2/t1) / log(n2/n1) - lineární fáze má exponent kolem 1.
+Fáze s exponentem nad prahem (a hodnotou nad prahem šumu) se označí
+jako superlineární.
+
+Použití:
+    python benchmarks/benchmark_scaling.py
+    python benchmarks/benchmark_scaling.py --sizes 1k 10k 100k 1M --format csv.gz
+    python benchmarks/benchmark_scaling.py --sizes 1k 10k --format xlsx --webtoffee --json scaling.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.generate_synthetic_catalog import DEFAULT_SIZES, generate_catalog, parse_size, size_label, write_catalog
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+from src.fastcentrik_woocommerce.utils.memory import current_rss, peak_rss, release_memory, reset_peak_rss
+
+STAGES = ['načtení', 'záznamy', 'transformace', 'export', 'webtoffee']
+GROWTH_THRESHOLD = 1.2
+TIME_NOISE_FLOOR = 0.25          # s - kratší fáze se neposuzují
+MEMORY_NOISE_FLOOR = 16 * 1024 * 1024
+
+
+def measure(func, memory_mode: str) -> tuple:
+    """
+    Vrátí (výsledek, čas [s], CPU čas [s], paměť [B]) volání func.
+
+    Paměť je nárůst špičky RSS během volání (memory_mode 'rss'), nebo
+    špička alokací Pythonu (memory_mode 'tracemalloc'). None, pokud ji nelze změřit.
+    """
+    release_memory()
+    if memory_mode == 'tracemalloc':
+        tracemalloc.start()
+    else:
+        per_call = reset_peak_rss()
+        baseline = current_rss()
+    start, cpu_start = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+    if memory_mode == 'tracemalloc':
+        _, memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        peak = peak_rss()
+        memory = max(peak - baseline, 0) if per_call and peak is not None and baseline is not None else None
+    return result, elapsed, cpu, memory
+
+
+def run_size(size: int, file_format: str, memory_mode: str, webtoffee: bool, seed: int) -> List[Dict]:
+    """Vygeneruje katalog dané velikosti a změří fáze pipeline; vrátí řádky výsledků."""
+    results = []
+
+    def record(stage: str, func):
+        result, elapsed, cpu, memory = measure(func, memory_mode)
+        results.append({'size': size, 'stage': stage, 'seconds': elapsed, 'cpu_seconds': cpu,
+                        'rows_per_second': size / elapsed if elapsed > 0 else None, 'memory_bytes': memory})
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"catalog_{size_label(size)}.{file_format}"
+        write_catalog(generate_catalog(size, seed), path)
+        release_memory()
+
+        data = record('načtení', lambda: DataLoader(str(path), use_cache=False, lazy=False).load_data())
+        transformer = record('záznamy', lambda: DataTransformer(data['products'], data['categories']))
+        products, _ = record('transformace', transformer.run_transformation)
+        record('export', lambda: CsvExporter().export_products(products, tmp))
+        del transformer, products
+
+        if webtoffee:
+            record('webtoffee', lambda: WebToffeeTransformer(data['products'], data['categories']).run_transformation())
+    return results
+
+
+def run_isolated(size: int, args) -> List[Dict]:
+    """Spustí měření jedné velikosti v novém procesu a vrátí jeho výsledky."""
+    command = [sys.executable, __file__, '--worker', str(size), '--format', args.format,
+               '--memory', args.memory, '--seed', str(args.seed)]
+    if args.webtoffee:
+        command.append('--webtoffee')
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    if completed.returncode != 0:
+        raise RuntimeError(f"Měření {size_label(size)} selhalo:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def growth_exponent(n1: int, v1: Optional[float], n2: int, v2: Optional[float]) -> Optional[float]:
+    """Exponent růstu mezi dvěma velikostmi (1 = lineární), None pro nezměřené hodnoty."""
+    if not v1 or not v2 or v1 <= 0 or v2 <= 0 or n1 == n2:
+        return None
+    return math.log(v2 / v1) / math.log(n2 / n1)
+
+
+def find_superlinear(results: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Najde fáze, jejichž čas nebo paměť mezi sousedními velikostmi roste rychleji
+    než n^threshold. Hodnoty pod prahem šumu se neposuzují.
+    """
+    findings = []
+    for stage in STAGES:
+        rows = sorted((row for row in results if row['stage'] == stage), key=lambda row: row['size'])
+        for previous, row in zip(rows, rows[1:]):
+            for metric, floor in (('seconds', TIME_NOISE_FLOOR), ('memory_bytes', MEMORY_NOISE_FLOOR)):
+                exponent = growth_exponent(previous['size'], previous[metric], row['size'], row[metric])
+                if exponent is not None and exponent > threshold and row[metric] >= floor:
+                    findings.append({'stage': stage, 'metric': metric, 'exponent': exponent,
+                                     'from_size': previous['size'], 'to_size': row['size']})
+    return findings
+
+
+def print_results(results: List[Dict]) -> None:
+    """Vypíše tabulku fází s exponenty růstu oproti předchozí velikosti."""
+    previous = {}
+    print(f"{'velikost':>9} {'fáze':>13} {'čas [s]':>9} {'CPU [s]':>9} {'řádků/s':>10} "
+          f"{'paměť [MB]':>11} {'exp. času':>10} {'exp. paměti':>12}")
+    for row in sorted(results, key=lambda row: (row['size'], STAGES.index(row['stage']))):
+        before = previous.get(row['stage'])
+        time_exp = mem_exp = None
+        if before:
+            time_exp = growth_exponent(before['size'], before['seconds'], row['size'], row['seconds'])
+            mem_exp = growth_exponent(before['size'], before['memory_bytes'], row['size'], row['memory_bytes'])
+        memory = f"{row['memory_bytes'] / 1024 / 1024:.1f}" if row['memory_bytes'] is not None else 'n/a'
+        rate = f"{row['rows_per_second']:.0f}" if row['rows_per_second'] else 'n/a'
+        print(f"{size_label(row['size']):>9} {row['stage']:>13} {row['seconds']:>9.2f} {row['cpu_seconds']:>9.2f} "
+              f"{rate:>10} {memory:>11} "
+              f"{'' if time_exp is None else f'{time_exp:.2f}':>10} {'' if mem_exp is None else f'{mem_exp:.2f}':>12}")
+        previous[row['stage']] = row
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark škálování pipeline')
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help='Velikosti katalogu (např. 1k 10k 100k 1M)')
+    parser.add_argument('--format', default='csv.gz',
+                        help='Vstupní formát katalogu: xlsx, csv, csv.gz, tsv, jsonl... (výchozí csv.gz)')
+    parser.add_argument('--memory', choices=['rss', 'tracemalloc'], default='rss',
+                        help='Měření paměti fází: nárůst špičky RSS, nebo špička alokací tracemalloc')
+    parser.add_argument('--webtoffee', action='store_true', help='Změřit i WebToffee transformaci')
+    parser.add_argument('--threshold', type=float, default=GROWTH_THRESHOLD,
+                        help='Exponent růstu, nad kterým je fáze superlineární')
+    parser.add_argument('--seed', type=int, default=42, help='Seed generátoru katalogu')
+    parser.add_argument('--json', help='Uložit výsledky do JSON souboru')
+    parser.add_argument('--fail-on-superlinear', action='store_true',
+                        help='Skončit s chybou, pokud některá fáze roste superlineárně')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.format = args.format.lstrip('.')
+
+    logging.disable(logging.CRITICAL)
+    if args.worker:
+        results = run_size(args.worker, args.format, args.memory, args.webtoffee, args.seed)
+        print(json.dumps(results))
+        return
+
+    results = []
+    for size in sorted(set(args.sizes)):
+        print(f"⏱️  Měřím katalog {size_label(size)} ({args.format})...", flush=True)
+        results.extend(run_isolated(size, args))
+
+    print()
+    print_results(results)
+    findings = find_superlinear(results, args.threshold)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump({'format': args.format, 'memory': args.memory, 'threshold': args.threshold,
+                       'results': results, 'superlinear': findings}, handle, ensure_ascii=False, indent=2)
+        print(f"\n📄 Výsledky uloženy do {args.json}")
+
+    if findings:
+        print(f"\n⚠️  Superlineární růst (exponent > {args.threshold}):")
+        for finding in findings:
+            metric = 'čas' if finding['metric'] == 'seconds' else 'paměť'
+            print(f"   {finding['stage']} - {metric}: {finding['exponent']:.2f} "
+                  f"mezi {size_label(finding['from_size'])} a {size_label(finding['to_size'])}")
+        if args.fail_on_superlinear:
+            sys.exit(1)
+    else:
+        print("\n✓ Všechny fáze rostou nejvýše lineárně")
+
+
+if __name__ == "__main__":
+    main()
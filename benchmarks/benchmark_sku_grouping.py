@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark škálování seskupování variant podle SKU vzoru
+=======================================================
+
+Měří dobu běhu group_skus_by_pattern pro 1k až 1M SKU a počítá empirický
+exponent růstu mezi sousedními velikostmi (1.0 = lineární chování).
+
+Použití:
+    python benchmarks/benchmark_sku_grouping.py
+    python benchmarks/benchmark_sku_grouping.py --sizes 1000 10000 --legacy
+"""
+
+import argparse
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fastcentrik_woocommerce.core.variant_grouping import group_skus_by_pattern
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SUPERLINEAR_THRESHOLD = 1.2
+
+
+def generate_skus(count: int, seed: int = 42) -> pd.Series:
+    """Vygeneruje SKU ve tvaru FastCentrik exportu - jednoduché produkty i rodiny variant."""
+    rng = random.Random(seed)
+    skus = []
+    family = 0
+    while len(skus) < count:
+        family += 1
+        base = f"{rng.choice(['', 'GZ', 'TOPS.'])}{family:06d}"
+        if rng.random() < 0.3:
+            skus.append(base)
+            continue
+        if rng.random() < 0.8:
+            skus.append(base)
+        skus.extend(f"{base}_{i}" for i in range(2, 2 + rng.randint(2, 8)))
+    return pd.Series(skus[:count], dtype=object)
+
+
+def legacy_group_skus(skus: pd.Series) -> dict:
+    """Původní O(skupiny × produkty) implementace - pouze pro srovnání na malých datech."""
+    base_skus_with_variants = set()
+    all_skus = set()
+    for sku in skus.map(str):
+        all_skus.add(sku)
+        match = re.match(r'^(.+?)_\d+$', sku)
+        if match:
+            base_skus_with_variants.add(match.group(1))
+
+    parent_groups = {}
+    all_variant_skus = set()
+    for base_sku in base_skus_with_variants:
+        parent_groups[base_sku] = []
+        for sku in all_skus:
+            if re.match(f'^{re.escape(base_sku)}_\\d+$', sku):
+                parent_groups[base_sku].append(sku)
+                all_variant_skus.add(sku)
+        if base_sku in all_skus:
+            all_variant_skus.add(base_sku)
+    return {'parent_groups': parent_groups, 'all_variant_skus': all_variant_skus}
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """Vrátí nejlepší čas z několika opakování."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark seskupování variant podle SKU')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Počty SKU pro měření')
+    parser.add_argument('--legacy', action='store_true',
+                        help='Změřit i původní kvadratickou implementaci (jen do 10k SKU)')
+    args = parser.parse_args()
+
+    print(f"{'SKU':>10} {'čas [s]':>10} {'µs/SKU':>8} {'exponent':>9} {'legacy [s]':>11}")
+    previous = None
+    superlinear = False
+    for size in args.sizes:
+        skus = generate_skus(size)
+        elapsed = time_call(group_skus_by_pattern, skus)
+
+        exponent = ''
+        if previous:
+            prev_size, prev_elapsed = previous
+            value = math.log(elapsed / prev_elapsed) / math.log(size / prev_size)
+            exponent = f"{value:.2f}"
+            if value > SUPERLINEAR_THRESHOLD:
+                exponent += ' !'
+                superlinear = True
+
+        legacy = ''
+        if args.legacy and size <= 10_000:
+            legacy_elapsed = time_call(legacy_group_skus, skus, repeat=1)
+            expected, actual = legacy_group_skus(skus), group_skus_by_pattern(skus)
+            same = (
+                expected['all_variant_skus'] == actual['all_variant_skus'] and
+                {k: sorted(v) for k, v in expected['parent_groups'].items()} ==
+                {k: sorted(v) for k, v in actual['parent_groups'].items()}
+            )
+            legacy = f"{legacy_elapsed:.3f}" + ('' if same else ' ✗')
+
+        print(f"{size:>10} {elapsed:>10.4f} {elapsed / size * 1e6:>8.2f} {exponent:>9} {legacy:>11}")
+        previous = (size, elapsed)
+
+    if superlinear:
+        print(f"\n⚠️  Exponent růstu překročil {SUPERLINEAR_THRESHOLD} - chování není lineární")
+        sys.exit(1)
+    print("\n✓ Škálování je přibližně lineární")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark paměti: jednorázový export vs. streamování po dávkách
+===============================================================
+
+Pro syntetický katalog změří špičku alokací (tracemalloc) během
+transformace a zápisu produktů do CSV - jednou přes run_transformation +
+export_products, jednou přes run_streaming_transformation + CsvStreamWriter.
+Oba výstupní soubory musí být shodné.
+
+Použití:
+    python benchmarks/benchmark_streaming.py
+    python benchmarks/benchmark_streaming.py --products 50000 --chunk-sizes 500 5000
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.benchmark_product_records import generate_products
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+
+
+def make_categories() -> pd.DataFrame:
+    """Kategorie odpovídající kódům z generate_products."""
+    return pd.DataFrame({
+        'InterniKod': [f"CAT{i}" for i in range(1, 51)],
+        'JmenoKategorie': [f"Kategorie {i}" for i in range(1, 51)],
+        'KodNadrizeneKategorie': ['ROOT_1'] * 50,
+    })
+
+
+def measure(func) -> tuple:
+    """Vrátí (čas [s], špička alokací [MB]) volání func."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark paměti streamovaného exportu')
+    parser.add_argument('--products', type=int, default=20_000, help='Počet produktů v katalogu')
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='Velikosti dávek pro streamování')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    products_df = generate_products(args.products)
+    categories_df = make_categories()
+    exporter = CsvExporter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_dir = Path(tmp) / 'batch'
+        batch_dir.mkdir()
+
+        def run_batch():
+            products, _ = DataTransformer(products_df, categories_df).run_transformation()
+            exporter.export_products(products, str(batch_dir))
+
+        elapsed, peak = measure(run_batch)
+        print(f"{'režim':>14} {'čas [s]':>9} {'špička [MB]':>12}")
+        print(f"{'jednorázově':>14} {elapsed:>9.2f} {peak:>12.1f}")
+
+        for chunk_size in args.chunk_sizes:
+            stream_dir = Path(tmp) / f"stream_{chunk_size}"
+            stream_dir.mkdir()
+
+            def run_stream():
+                with exporter.open_product_stream(str(stream_dir)) as writer:
+                    DataTransformer(products_df, categories_df).run_streaming_transformation(
+                        writer.write, chunk_size
+                    )
+
+            elapsed, peak = measure(run_stream)
+            same = filecmp.cmp(batch_dir / 'woocommerce_products.csv',
+                               stream_dir / 'woocommerce_products.csv', shallow=False)
+            print(f"{f'dávka {chunk_size}':>14} {elapsed:>9.2f} {peak:>12.1f}" + ('' if same else ' ✗'))
+            if not same:
+                print("✗ Streamovaný výstup se liší od jednorázového exportu")
+                sys.exit(1)
+
+    print("\n✓ Streamovaný výstup je shodný s jednorázovým exportem")
+
+
+if __name__ == "__main__":
+    main()
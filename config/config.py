@@ -39,7 +39,8 @@ CATEGORY_MAPPING_SETTINGS = {
     "multi_category_separator": " | ", # Oddělovač pro více kategorií v CSV (WooCommerce standard)
     "validate_categories": True,      # Validovat existenci kategorií před přiřazením
     "multi_category_strategy": "complementary",  # Strategie: "complementary" nebo "all_matches"
-    "use_leaf_category_only": False  # Použít celou cestu kategorie pro lepší rozlišení
+    "use_leaf_category_only": False,  # Použít celou cestu kategorie pro lepší rozlišení
+    "mapping_cache_size": 4096        # LRU cache mapování po řádcích, např. parenty s novým názvem (0 = vypnuto)
 }
 
 # Mapování atributů - DŮLEŽITÉ pro správné zobrazení variant
@@ -88,6 +89,12 @@ VARIANT_SETTINGS = {
     "parent_name_remove_attrs": ["velikost", "barva"],  # Atributy k odstranění z názvu parent produktu
     "inherit_parent_data": True,  # Varianty zdědí data z parent produktu
     "sync_stock_status": True,  # Synchronizovat stock status mezi parent a variantami
+    # Vzory velikosti v názvu varianty bez parametrů (skupina 1 = velikost, vyhrává první shoda)
+    "size_name_patterns": [
+        r"\b(\d{2}(?:\s+\d/\d)?)\b$",  # Číselné velikosti na konci názvu: "40", "41 1/3"
+        # r"\b(XXS|XS|S|M|L|XL|XXL|XXXL)$",  # Textové velikosti oblečení
+        # r"\b((?:UK|EU)\s?\d{1,2}(?:[.,]5)?)$",  # Obuv s označením systému: "UK 8.5", "EU 42"
+    ],
 }
 
 # NOVÉ: Nastavení skladových zásob
@@ -143,8 +150,31 @@ ADVANCED_SETTINGS = {
     "generate_seo_automatically": True,
     "create_product_variations": True,
     "log_level": "INFO",  # DEBUG, INFO, WARNING, ERROR
-    "batch_size": 1000,  # Počet produktů zpracovaných najednou
-    "memory_optimization": True,  # Optimalizace paměti pro velké soubory
+    "batch_size": 1000,  # Počet produktů zpracovaných najednou (--stream, --batch)
+    "memory_optimization": True,  # Při --batch internovat texty, zmenšit celá čísla a po dávce uvolnit paměť
+    "sheet_loader_workers": 3,  # Počet vláken pro souběžné parsování listů Excelu (1 = postupně)
+    "lazy_sheet_loading": True,  # Listy Excelu načítat až při prvním použití (nepotřebné se nečtou)
+}
+
+# Měření fází transformace (čas, CPU, řádky/s, špička alokací) a JSON report běhu
+INSTRUMENTATION_SETTINGS = {
+    "enabled": True,
+    "trace_memory": False,  # Špičky alokací přes tracemalloc (transformace je několikrát pomalejší, viz --trace-memory)
+    "report_file": "run_report.json",  # Ukládá se do výstupní složky
+}
+
+# Cache rozparsovaných listů vstupního sešitu (Arrow IPC s pyarrow, jinak pickle)
+SHEET_CACHE_SETTINGS = {
+    "enabled": True,
+    "cache_dir": ".sheet_cache",  # Adresář cache (relativně k pracovnímu adresáři)
+    "max_size_mb": 1024,  # Při překročení se mažou nejdéle nepoužité záznamy
+    "format": "auto",  # auto, arrow, pickle
+}
+
+# Engine pro čtení Excelu (xlrd, openpyxl, calamine)
+LOADER_ENGINE_SETTINGS = {
+    "engine": "auto",  # auto = vítěz měření benchmark-loaders, jinak výchozí engine pandas
+    "choices_file": ".loader_engines.json",  # Uložení vítězů měření podle přípony souboru
 }
 
 # Nastavení pro import do WooCommerce
@@ -6,20 +6,35 @@ Spouštěcí skript pro FastCentrik to WooCommerce transformaci
 Použití:
     python run_transformation.py
     python run_transformation.py --input "jiný_soubor.xls" --output "./custom_output/"
+    python run_transformation.py --stream --chunk-size 500
+    python run_transformation.py --batch --chunk-size 5000
+    python run_transformation.py --columnar
+    python run_transformation.py --no-cache
+    python run_transformation.py --engine calamine
+    python run_transformation.py --benchmark-loaders --input "Export_Excel_Lite.xls"
+    python run_transformation.py --input catalog.csv.gz
+    python run_transformation.py --trace-memory
 """
 
 import argparse
+import contextlib
 import sys
 from pathlib import Path
 import logging
 
+import pandas as pd
+
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config.config import INPUT_EXCEL_FILE, OUTPUT_DIRECTORY, ADVANCED_SETTINGS
-from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+from config.config import (INPUT_EXCEL_FILE, OUTPUT_DIRECTORY, ADVANCED_SETTINGS, INSTRUMENTATION_SETTINGS,
+                           LOADER_ENGINE_SETTINGS)
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader, SHEETS_TO_LOAD
+from src.fastcentrik_woocommerce.loaders.excel_engines import EXCEL_ENGINES, benchmark_engines
+from src.fastcentrik_woocommerce.loaders.text_formats import detect_format
 from src.fastcentrik_woocommerce.core.transformer import DataTransformer
 from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+from src.fastcentrik_woocommerce.utils.instrumentation import RunReport, instrument_iter, span
 
 def setup_logging(level: str = "INFO"):
     """Nastavení logování"""
@@ -40,17 +55,38 @@ def validate_input_file(file_path: str) -> bool:
         print(f"❌ Soubor {file_path} neexistuje!")
         return False
     
-    if not path.suffix.lower() in ['.xls', '.xlsx']:
-        print(f"❌ Soubor {file_path} není Excel soubor!")
+    try:
+        detect_format(path)
+    except ValueError as e:
+        print(f"❌ {e}")
         return False
     
     return True
 
+def run_loader_benchmark(file_path: str) -> None:
+    """Změří dostupné enginy na vstupním souboru a uloží nejrychlejší pro jeho příponu."""
+    choices_file = LOADER_ENGINE_SETTINGS['choices_file']
+    print(f"⏱️  Měřím enginy pro čtení {file_path}...")
+    results = benchmark_engines(Path(file_path), SHEETS_TO_LOAD.values(), repeat=2,
+                                choices_file=choices_file)
+    print(f"{'engine':>10} {'čas [s]':>9} {'shodná data':>12}")
+    for result in results:
+        seconds = f"{result['seconds']:.2f}" if result['seconds'] is not None else 'chyba'
+        mark = ' ← vítěz' if result['winner'] else ''
+        print(f"{result['name']:>10} {seconds:>9} {'ano' if result['identical'] else 'ne':>12}{mark}")
+        if result['error']:
+            print(f"           {result['error']}")
+    winner = next((result['name'] for result in results if result['winner']), None)
+    if winner:
+        print(f"✅ Engine {winner} uložen pro {Path(file_path).suffix.lower()} do {choices_file}")
+    else:
+        print("❌ Žádný engine nevrátil shodná data, volba nebyla uložena")
+
 def main():
     """Hlavní funkce"""
     parser = argparse.ArgumentParser(description='FastCentrik to WooCommerce transformace')
     parser.add_argument('--input', '-i', default=INPUT_EXCEL_FILE, 
-                       help='Cesta k vstupnímu Excel souboru')
+                       help='Cesta k vstupnímu souboru (Excel, CSV/TSV, JSONL; volitelně .gz/.zst)')
     parser.add_argument('--output', '-o', default=OUTPUT_DIRECTORY,
                        help='Výstupní složka')
     parser.add_argument('--log-level', default=ADVANCED_SETTINGS['log_level'],
@@ -58,6 +94,25 @@ def main():
                        help='Úroveň logování')
     parser.add_argument('--validate-only', action='store_true',
                        help='Pouze validace bez transformace')
+    parser.add_argument('--stream', action='store_true',
+                       help='Zapisovat produkty do CSV postupně po dávkách (nižší spotřeba paměti)')
+    parser.add_argument('--batch', action='store_true',
+                       help='Načítat, transformovat i zapisovat produkty po dávkách - celý katalog '
+                            'není v paměti (optimalizace podle ADVANCED_SETTINGS[\'memory_optimization\'])')
+    parser.add_argument('--columnar', action='store_true',
+                       help='Sestavit produkty po celých sloupcích místo slovníku na produkt (stejné CSV)')
+    parser.add_argument('--chunk-size', type=int, default=ADVANCED_SETTINGS['batch_size'],
+                       help='Počet produktů v dávce při --stream a --batch')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Nepoužívat cache rozparsovaných listů (vždy parsovat Excel)')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Před načtením smazat záznamy cache pro vstupní soubor')
+    parser.add_argument('--engine', default=None, choices=['auto'] + list(EXCEL_ENGINES),
+                       help='Engine pro čtení Excelu (výchozí z LOADER_ENGINE_SETTINGS)')
+    parser.add_argument('--trace-memory', action='store_true',
+                       help='Měřit ve fázích i špičky alokací (tracemalloc) - výrazně pomalejší běh')
+    parser.add_argument('--benchmark-loaders', action='store_true',
+                       help='Změřit enginy na vstupním souboru, uložit nejrychlejší a skončit')
     
     args = parser.parse_args()
     
@@ -79,25 +134,84 @@ def main():
         print("✅ Validace dokončena - soubor je v pořádku")
         return
     
+    if args.benchmark_loaders:
+        if detect_format(args.input).kind != 'excel':
+            print("❌ Měření enginů je jen pro Excel soubory")
+            sys.exit(1)
+        run_loader_benchmark(args.input)
+        return
+    
+    # Měření fází (čas, CPU, řádky/s, špička alokací) pro JSON report běhu
+    report = RunReport('run_transformation',
+                       trace_memory=args.trace_memory or INSTRUMENTATION_SETTINGS['trace_memory'],
+                       metadata={
+                           'input': args.input,
+                           'mode': 'batch' if args.batch else 'stream' if args.stream
+                                   else 'columnar' if args.columnar else 'full',
+                           'chunk_size': args.chunk_size,
+                       })
+    
     try:
-        # 1. Načtení dat
-        loader = DataLoader(args.input)
-        data = loader.load_data()
-        
-        # 2. Transformace dat
-        transformer = DataTransformer(
-            products_df=data['products'],
-            categories_df=data['categories']
-        )
-        products, categories = transformer.run_transformation()
-        
-        # 3. Export do CSV
-        exporter = CsvExporter()
-        output_path = Path(args.output)
-        output_path.mkdir(parents=True, exist_ok=True)
+        with report if INSTRUMENTATION_SETTINGS['enabled'] else contextlib.nullcontext():
+            # 1. Načtení dat
+            # Při --batch se list Zbozi celý nenačte - čte se po dávkách až při transformaci
+            loader = DataLoader(args.input, use_cache=not args.no_cache, engine=args.engine,
+                                lazy=True if args.batch else None)
+            if args.clear_cache:
+                loader.invalidate_cache()
+            with span('load') as measured:
+                data = loader.load_data()
+                products_df = pd.DataFrame() if args.batch else data['products']
+                categories_df = data['categories']
+                measured.rows = len(products_df)
+            
+            # 2. Transformace dat
+            transformer = DataTransformer(products_df=products_df, categories_df=categories_df)
+            # Parametry nikdo nepotřebuje - list se nenačte, sešit se zavře
+            loader.close()
+            exporter = CsvExporter()
+            output_path = Path(args.output)
+            output_path.mkdir(parents=True, exist_ok=True)
+            
+            if args.batch or args.stream:
+                with exporter.open_product_stream(str(output_path)) as writer:
+                    def write_products(products):
+                        with span('export', rows=len(products)):
+                            writer.write(products)
+                    
+                    with span('transformation'):
+                        if args.batch:
+                            # 1-3. Načtení, transformace a export po dávkách (rodiny variant se nedělí)
+                            _, categories = transformer.run_batched_transformation(
+                                instrument_iter('load', loader.iter_product_chunks(args.chunk_size)),
+                                write_products
+                            )
+                        else:
+                            # 2+3. Transformace a export po dávkách
+                            _, categories = transformer.run_streaming_transformation(write_products,
+                                                                                     args.chunk_size)
+            elif args.columnar:
+                with span('transformation'):
+                    product_frame, categories = transformer.run_frame_transformation()
+                
+                # 3. Export do CSV
+                with span('export', rows=len(product_frame)):
+                    exporter.export_product_frame(product_frame, str(output_path))
+            else:
+                with span('transformation'):
+                    products, categories = transformer.run_transformation()
+                
+                # 3. Export do CSV
+                with span('export', rows=len(products)):
+                    exporter.export_products(products, str(output_path))
+            with span('category_export', rows=len(categories)):
+                exporter.export_categories(categories, str(output_path))
         
-        exporter.export_products(products, str(output_path))
-        exporter.export_categories(categories, str(output_path))
+        if INSTRUMENTATION_SETTINGS['enabled']:
+            report_file = report.write(output_path / INSTRUMENTATION_SETTINGS['report_file'])
+            print("\n⏱️  MĚŘENÍ FÁZÍ")
+            print("\n".join(report.summary_lines()))
+            print(f"📄 Report běhu: {report_file}")
         
         print("\n🎉 TRANSFORMACE ÚSPĚŠNĚ DOKONČENA!")
         print(f"📄 Soubory jsou uloženy v: {args.output}")
@@ -8,24 +8,40 @@ Skript pro spuštění transformace FastCentrik dat do WebToffee CSV formátu.
 
 Použití:
     python run_webtoffee_transformation.py
+    python run_webtoffee_transformation.py --stream --chunk-size 500
+    python run_webtoffee_transformation.py --batch --chunk-size 5000
+    python run_webtoffee_transformation.py --columnar
+    python run_webtoffee_transformation.py --no-cache
+    python run_webtoffee_transformation.py --input catalog.csv.gz
+    python run_webtoffee_transformation.py --trace-memory
 
-Vstupní soubor: Export_Excel_Lite.xls (musí být v aktuální složce)
+Vstupní soubor: Export_Excel_Lite.xls (výchozí, musí být v aktuální složce),
+nebo CSV/TSV/JSONL export zadaný přes --input
 Výstup: webtoffee_output/
 
 Autor: FastCentrik Migration Tool
 """
 
+import argparse
+import contextlib
 import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
+import pandas as pd
+
 # Přidání projektu do Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+from src.fastcentrik_woocommerce.loaders.excel_engines import EXCEL_ENGINES
+from src.fastcentrik_woocommerce.core.variant_grouping import has_master_code_groups
 from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
 from src.fastcentrik_woocommerce.exporters.webtoffee_csv_exporter import WebToffeeCSVExporter
+from src.fastcentrik_woocommerce.utils.instrumentation import RunReport, instrument_iter, span
 from src.fastcentrik_woocommerce.utils.logging_config import get_transformation_logger
+from config.config import ADVANCED_SETTINGS, INSTRUMENTATION_SETTINGS
 
 # Nastavení logování s novou konfigurací
 logger = get_transformation_logger(__name__, "webtoffee")
@@ -37,10 +53,33 @@ OUTPUT_DIR = "webtoffee_output"
 
 def main():
     """Hlavní funkce pro spuštění transformace."""
+    parser = argparse.ArgumentParser(description='FastCentrik to WebToffee transformace')
+    parser.add_argument('--input', '-i', default=INPUT_FILE,
+                        help='Vstupní soubor (Excel, CSV/TSV, JSONL; volitelně .gz/.zst)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Zapisovat produkty do CSV postupně po dávkách (pouze soubor _all)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Načítat, transformovat i zapisovat produkty po dávkách - celý katalog '
+                             'není v paměti (pouze soubor _all, atributové sloupce pro všechny '
+                             'klíče parametrů)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Sestavit produkty po celých sloupcích místo slovníku na produkt (stejné CSV)')
+    parser.add_argument('--chunk-size', type=int, default=ADVANCED_SETTINGS['batch_size'],
+                        help='Počet produktů v dávce při --stream a --batch')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Nepoužívat cache rozparsovaných listů (vždy parsovat Excel)')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='Před načtením smazat záznamy cache pro vstupní soubor')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Měřit ve fázích i špičky alokací (tracemalloc) - výrazně pomalejší běh')
+    parser.add_argument('--engine', default=None, choices=['auto'] + list(EXCEL_ENGINES),
+                        help='Engine pro čtení Excelu (výchozí z LOADER_ENGINE_SETTINGS)')
+    args = parser.parse_args()
+    
     # Kontrola vstupního souboru
-    input_path = Path(INPUT_FILE)
+    input_path = Path(args.input)
     if not input_path.exists():
-        logger.error(f"Vstupní soubor neexistuje: {INPUT_FILE}")
+        logger.error(f"Vstupní soubor neexistuje: {args.input}")
         logger.error("Umístěte soubor Export_Excel_Lite.xls do aktuální složky a spusťte znovu.")
         sys.exit(1)
     
@@ -50,45 +89,133 @@ def main():
     logger.info(f"Vstupní soubor: {input_path}")
     logger.info(f"Výstupní adresář: {OUTPUT_DIR}")
     
+    # Měření fází (čas, CPU, řádky/s, špička alokací) pro JSON report běhu
+    report = RunReport('run_webtoffee_transformation',
+                       trace_memory=args.trace_memory or INSTRUMENTATION_SETTINGS['trace_memory'],
+                       metadata={
+                           'input': str(input_path),
+                           'mode': 'batch' if args.batch else 'stream' if args.stream
+                                   else 'columnar' if args.columnar else 'full',
+                           'chunk_size': args.chunk_size,
+                       })
+    
     try:
-        # 1. Načtení dat
-        logger.info("\n1. NAČÍTÁNÍ DAT")
-        logger.info("-" * 40)
-        loader = DataLoader(str(input_path))
-        data = loader.load_data()
-        
-        products_df = data['products']
-        categories_df = data['categories']
-        # parameters_df = data['parameters']  # Není potřeba pro WebToffee transformaci
-        
-        logger.info(f"Načteno {len(products_df)} produktů")
-        logger.info(f"Načteno {len(categories_df)} kategorií")
-        
-        # 2. Transformace dat
-        logger.info("\n2. TRANSFORMACE DAT")
-        logger.info("-" * 40)
-        transformer = WebToffeeTransformer(products_df, categories_df)
-        woo_products, validation_errors = transformer.run_transformation()
-        
-        # 3. Export dat
-        logger.info("\n3. EXPORT DAT")
-        logger.info("-" * 40)
-        exporter = WebToffeeCSVExporter(OUTPUT_DIR)
-        
-        # Export produktů
-        exported_files = exporter.export_products(woo_products)
-        
-        logger.info("\nVytvořené soubory:")
-        for file in exported_files:
-            logger.info(f"  - {file}")
-        
-        # Vždy vytvoříme ukázkový soubor
-        sample_file = exporter.export_sample(woo_products, sample_size=20)
-        logger.info(f"\nUkázkový soubor (prvních 20 produktů): {sample_file}")
+        with report if INSTRUMENTATION_SETTINGS['enabled'] else contextlib.nullcontext():
+            # 1. Načtení dat
+            logger.info("\n1. NAČÍTÁNÍ DAT")
+            logger.info("-" * 40)
+            # Při --batch se list Zbozi celý nenačte - čte se po dávkách až při transformaci
+            loader = DataLoader(str(input_path), use_cache=not args.no_cache, engine=args.engine,
+                                lazy=True if args.batch else None)
+            if args.clear_cache:
+                loader.invalidate_cache()
+            with span('load') as measured:
+                data = loader.load_data()
+                
+                products_df = pd.DataFrame() if args.batch else data['products']
+                categories_df = data['categories']
+                measured.rows = len(products_df)
+            # parameters_df = data['parameters']  # Není potřeba pro WebToffee transformaci
+            # Parametry nikdo nepotřebuje - list se nenačte, sešit se zavře
+            loader.close()
+            
+            if not args.batch:
+                logger.info(f"Načteno {len(products_df)} produktů")
+            logger.info(f"Načteno {len(categories_df)} kategorií")
+            
+            exporter = WebToffeeCSVExporter(OUTPUT_DIR)
+            transformer = WebToffeeTransformer(products_df, categories_df)
+            
+            if args.batch or args.stream:
+                sample_products = []
+                
+                if args.batch:
+                    # 1-3. Načtení, transformace a export po dávkách (rodiny variant se nedělí)
+                    logger.info(f"\n2. NAČTENÍ, TRANSFORMACE A EXPORT PO DÁVKÁCH ({args.chunk_size} řádků)")
+                    logger.info("-" * 40)
+                    
+                    # Předběžné průchody: rodiny variant, způsob seskupení a sloupce pro hlavičku
+                    with span('load'):
+                        family_index = loader.load_family_index()
+                        group_by_master_code = has_master_code_groups(family_index.get('KodMasterVyrobku'))
+                        product_columns = transformer.product_columns(loader.load_parameter_keys())
+                else:
+                    # 2+3. Transformace a export po dávkách
+                    logger.info(f"\n2. TRANSFORMACE A EXPORT PO DÁVKÁCH ({args.chunk_size} produktů)")
+                    logger.info("-" * 40)
+                    product_columns = transformer.product_columns()
+                
+                with exporter.open_product_stream(product_columns) as writer:
+                    def write_products(products):
+                        # Prvních 20 produktů si ponecháme pro ukázkový soubor
+                        if len(sample_products) < 20:
+                            sample_products.extend(products[:20 - len(sample_products)])
+                        with span('export', rows=len(products)):
+                            writer.write(products)
+                    
+                    with span('transformation'):
+                        if args.batch:
+                            type_counts, validation_errors = transformer.run_batched_transformation(
+                                instrument_iter('load', loader.iter_product_chunks(
+                                    args.chunk_size, family_index=family_index)),
+                                write_products,
+                                group_by_master_code=group_by_master_code
+                            )
+                        else:
+                            type_counts, validation_errors = transformer.run_streaming_transformation(
+                                write_products, args.chunk_size
+                            )
+                exported_files = [str(writer.output_file)]
+            elif args.columnar:
+                # 2. Transformace dat po sloupcích
+                logger.info("\n2. SLOUPCOVÁ TRANSFORMACE DAT")
+                logger.info("-" * 40)
+                with span('transformation'):
+                    product_frame, validation_errors = transformer.run_frame_transformation()
+                type_counts = Counter(product_frame['tax:product_type'].tolist())
+                sample_products = product_frame
+                
+                # 3. Export dat
+                logger.info("\n3. EXPORT DAT")
+                logger.info("-" * 40)
+                
+                with span('export', rows=len(product_frame)):
+                    exported_files = exporter.export_product_frame(product_frame)
+            else:
+                # 2. Transformace dat
+                logger.info("\n2. TRANSFORMACE DAT")
+                logger.info("-" * 40)
+                with span('transformation'):
+                    woo_products, validation_errors = transformer.run_transformation()
+                type_counts = Counter(p['tax:product_type'] for p in woo_products)
+                sample_products = woo_products
+                
+                # 3. Export dat
+                logger.info("\n3. EXPORT DAT")
+                logger.info("-" * 40)
+                
+                # Export produktů
+                with span('export', rows=len(woo_products)):
+                    exported_files = exporter.export_products(woo_products)
+            
+            logger.info("\nVytvořené soubory:")
+            for file in exported_files:
+                logger.info(f"  - {file}")
+            
+            # Vždy vytvoříme ukázkový soubor
+            sample_file = exporter.export_sample(sample_products, sample_size=20)
+            logger.info(f"\nUkázkový soubor (prvních 20 produktů): {sample_file}")
+            
+            # Vytvoření šablony
+            template_file = exporter.create_import_template()
+            logger.info(f"\nImport šablona: {template_file}")
         
-        # Vytvoření šablony
-        template_file = exporter.create_import_template()
-        logger.info(f"\nImport šablona: {template_file}")
+        if INSTRUMENTATION_SETTINGS['enabled']:
+            report_file = report.write(Path(OUTPUT_DIR) / INSTRUMENTATION_SETTINGS['report_file'])
+            logger.info("\nMĚŘENÍ FÁZÍ")
+            for line in report.summary_lines():
+                logger.info(line)
+            logger.info(f"Report běhu: {report_file}")
         
         # 4. Souhrn
         logger.info("\n" + "="*60)
@@ -96,11 +223,11 @@ def main():
         logger.info("="*60)
         
         # Statistiky produktů
-        simple_count = len([p for p in woo_products if p['tax:product_type'] == 'simple'])
-        variable_count = len([p for p in woo_products if p['tax:product_type'] == 'variable'])
-        variation_count = len([p for p in woo_products if p['tax:product_type'] == 'variation'])
+        simple_count = type_counts['simple']
+        variable_count = type_counts['variable']
+        variation_count = type_counts['variation']
         
-        logger.info(f"Celkem produktů: {len(woo_products)}")
+        logger.info(f"Celkem produktů: {sum(type_counts.values())}")
         logger.info(f"  - Jednoduché: {simple_count}")
         logger.info(f"  - Variable: {variable_count}")
         logger.info(f"  - Varianty: {variation_count}")
@@ -51,6 +51,8 @@ def batch_transform(input_dir: str, output_base_dir: str):
                 products_df=data['products'],
                 categories_df=data['categories']
             )
+            # Parametry nikdo nepotřebuje - list se nenačte, sešit se zavře
+            loader.close()
             products, categories = transformer.run_transformation()
             
             exporter = CsvExporter()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generátor syntetického FastCentrik katalogu
+===========================================
+
+Vytvoří export ve tvaru FastCentrik (listy Zbozi, Kategorie, Parametry)
+libovolné velikosti bez zákaznických dat - pro měření škálování
+(benchmarks/benchmark_scaling.py) a reprodukci problémů s velkými katalogy.
+
+Katalog obsahuje:
+    - strom kategorií sport -> sekce -> typ produktu (kódy CAT###, kořen ROOT_1)
+    - jednoduché produkty a rodiny variant ve třech podobách:
+      SKU se suffixem _N s KodMasterVyrobku, SKU se suffixem _N bez master
+      kódu a varianty s vlastními SKU spojené jen přes KodMasterVyrobku
+    - HTML popisy (varianty sdílí popis master produktu, obrázky má master),
+      parametry ve formátu klic||hodnota##klic||hodnota, ceny s desetinnou
+      čárkou a sloupce exportu, které transformace nepoužívá (EAN, Vyrobce...)
+
+Výstup .xlsx (jeden sešit), .csv/.tsv (sousední soubory <název>.<List>.csv)
+nebo .jsonl (záznamy Kategorie a Parametry s polem _sheet), volitelně .gz/.zst.
+Stejné seed a velikost vždy vytvoří stejný katalog.
+
+Použití:
+    python scripts/generate_synthetic_catalog.py --sizes 1k 10k 100k
+    python scripts/generate_synthetic_catalog.py --sizes 1M --formats csv.gz --output-dir synthetic
+    python scripts/generate_synthetic_catalog.py --sizes 10k --formats xlsx csv jsonl.gz
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.text_formats import SHEET_FIELD, detect_format, sheet_path
+
+DEFAULT_SIZES = ['1k', '10k', '100k']
+DEFAULT_FORMATS = ['xlsx', 'csv.gz']
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+EXCEL_MAX_ROWS = 1_048_575  # Bez řádku hlavičky
+
+# Podíl rodin podle druhu (zbytek jsou jednoduché produkty)
+FAMILY_MIX = {
+    'suffix_master': 0.25,   # 033201, 033201_2... + KodMasterVyrobku
+    'suffix_only': 0.10,     # 033201, 033201_2... bez KodMasterVyrobku
+    'master_only': 0.15,     # vlastní SKU variant, spojené jen KodMasterVyrobku
+}
+
+SPORTS = ['Běh', 'Fotbal', 'Tenis', 'Outdoor', 'Fitness', 'Lyžování', 'Cyklistika', 'Hokej']
+SECTIONS = [('Pánské', 'pánské'), ('Dámské', 'dámské'), ('Dětské', 'dětské'), ('Unisex', 'unisex')]
+PRODUCT_TYPES = [
+    # (typ, název v jednotném čísle, velikosti)
+    ('bota', 'obuv', ['38', '39', '40', '41', '42', '43', '44', '45']),
+    ('tričko', 'tričko', ['XS', 'S', 'M', 'L', 'XL', 'XXL']),
+    ('mikina', 'mikina', ['S', 'M', 'L', 'XL']),
+    ('bunda', 'bunda', ['S', 'M', 'L', 'XL', 'XXL']),
+    ('kalhoty', 'kalhoty', ['S', 'M', 'L', 'XL']),
+    ('batoh', 'batoh', ['20 l', '30 l', '45 l']),
+]
+BRANDS = ['Nike', 'Adidas', 'Puma', 'Salomon', 'Asics', 'Under Armour', 'Bauer', 'Head', 'Craft', 'Husky']
+COLORS = ['černá', 'bílá', 'modrá', 'červená', 'zelená', 'šedá', 'oranžová']
+MATERIALS = ['bavlna', 'polyester', 'merino', 'Gore-Tex', 'nylon']
+SEASONS = ['celoroční', 'léto', 'zima']
+MODEL_WORDS = ['Pro', 'Air', 'Trail', 'Elite', 'Speed', 'Classic', 'Light', 'Storm', 'Flex', 'Max']
+
+PRODUCT_COLUMNS = [
+    'KodZbozi', 'JmenoZbozi', 'KodMasterVyrobku', 'HodnotyParametru', 'InetrniKodyKategorii',
+    'CenaBezna', 'ZakladniCena', 'Popis', 'KratkyPopis', 'HlavniObrazek', 'DalsiObrazky',
+    'NaSklade', 'Hmotnost', 'Vypnuto', 'EAN', 'Vyrobce', 'Zaruka', 'PoznamkaInterni',
+]
+
+
+def parse_size(text: str) -> int:
+    """Převede velikost jako 1000, 10k nebo 1M na počet produktů."""
+    value = text.strip().lower().replace('_', '')
+    multiplier = SIZE_SUFFIXES.get(value[-1:], 1)
+    if value[-1:] in SIZE_SUFFIXES:
+        value = value[:-1]
+    try:
+        size = int(float(value) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Neplatná velikost katalogu: {text}")
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"Velikost katalogu musí být kladná: {text}")
+    return size
+
+
+def size_label(size: int) -> str:
+    """Popisek velikosti pro názvy souborů (1000 -> 1k, 1000000 -> 1M)."""
+    if size % 1_000_000 == 0:
+        return f"{size // 1_000_000}M"
+    if size % 1_000 == 0:
+        return f"{size // 1_000}k"
+    return str(size)
+
+
+def generate_categories() -> Tuple[pd.DataFrame, Dict[Tuple[int, int, int], str]]:
+    """
+    Vytvoří strom kategorií sport -> sekce -> typ produktu.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict]: List Kategorie a kód koncové kategorie
+            pro (sport, sekce, typ).
+    """
+    rows = []
+    leaves = {}
+
+    def add(name: str, parent: str, description: str) -> str:
+        code = f"CAT{len(rows) + 1:03d}"
+        rows.append({'InterniKod': code, 'JmenoKategorie': name,
+                     'KodNadrizeneKategorie': parent, 'PopisKategorie': description})
+        return code
+
+    for sport_index, sport in enumerate(SPORTS):
+        sport_code = add(sport, 'ROOT_1', f"<p>Vybavení pro {sport.lower()}</p>")
+        for section_index, (section, _) in enumerate(SECTIONS):
+            section_code = add(f"{section} {sport.lower()}", sport_code, '')
+            for type_index, (_, type_name, _) in enumerate(PRODUCT_TYPES):
+                leaves[(sport_index, section_index, type_index)] = add(
+                    f"{section} {type_name} - {sport.lower()}", section_code, ''
+                )
+    return pd.DataFrame(rows), leaves
+
+
+def _description(rng: random.Random, name: str, brand: str, material: str) -> str:
+    """HTML popis produktu podobný popisům z FastCentrik administrace."""
+    features = rng.sample([
+        'prodyšný materiál', 'odolné švy', 'reflexní prvky', 'nízká hmotnost',
+        'ergonomický střih', 'voděodolná úprava', 'antibakteriální úprava', 'zesílená pata',
+    ], rng.randint(2, 5))
+    items = ''.join(f"<li>{feature}</li>" for feature in features)
+    paragraphs = ''.join(
+        f"<p>{name} od značky <strong>{brand}</strong> je vyrobený z materiálu {material}.&nbsp;"
+        f"Vhodný pro trénink i závody, testovaný v náročných podmínkách.</p>"
+        for _ in range(rng.randint(1, 3))
+    )
+    return f'<div class="popis">{paragraphs}<ul>{items}</ul><p style="color:#666">Záruka 24 měsíců.</p></div>'
+
+
+def _price(value: float) -> str:
+    """Cena ve formátu exportu: mezera jako oddělovač tisíců, desetinná čárka."""
+    return f"{value:,.2f}".replace(',', ' ').replace('.', ',')
+
+
+def generate_products(count: int, leaves: Dict[Tuple[int, int, int], str], seed: int = 42) -> pd.DataFrame:
+    """
+    Vygeneruje list Zbozi s přesně count řádky.
+
+    Rodina variant se nikdy nerozdělí - poslední rodina se zkrátí jen
+    odebráním variant, master řádek zůstane.
+    """
+    rng = random.Random(seed)
+    columns: Dict[str, List] = {name: [] for name in PRODUCT_COLUMNS}
+    kinds = list(FAMILY_MIX.items())
+    family = 0
+
+    def add_row(**values) -> None:
+        for name in PRODUCT_COLUMNS:
+            columns[name].append(values.get(name))
+
+    while len(columns['KodZbozi']) < count:
+        family += 1
+        base = f"{100000 + family:06d}"
+        sport_index = rng.randrange(len(SPORTS))
+        section_index = rng.randrange(len(SECTIONS))
+        type_index = rng.randrange(len(PRODUCT_TYPES))
+        product_type, type_name, sizes = PRODUCT_TYPES[type_index]
+        section, gender = SECTIONS[section_index]
+        brand = rng.choice(BRANDS)
+        material = rng.choice(MATERIALS)
+        color = rng.choice(COLORS)
+        name = f"{section} {type_name} {brand} {rng.choice(MODEL_WORDS)} {family % 997}"
+        category = leaves[(sport_index, section_index, type_index)]
+        price = rng.randint(199, 7999) + rng.choice([0, 0.5, 0.9])
+        base_params = (f"pohlavi||{gender}##typ||{product_type}##sport||{SPORTS[sport_index].lower()}"
+                       f"##znacka||{brand}##material||{material}##sezona||{rng.choice(SEASONS)}")
+        common = {
+            'InetrniKodyKategorii': category,
+            'CenaBezna': _price(price),
+            'ZakladniCena': _price(price * rng.choice([1, 1, 0.9, 0.75])),
+            'Popis': _description(rng, name, brand, material),
+            'KratkyPopis': f"{type_name.capitalize()} {brand} pro {SPORTS[sport_index].lower()}",
+            'Hmotnost': f"{rng.randint(1, 30) / 10:.1f}".replace('.', ','),
+            'Vyrobce': brand,
+            'Zaruka': '24 měsíců',
+        }
+        images = f"/images/products/{base}.jpg"
+        gallery = ';'.join(f"/images/products/{base}_{i}.jpg" for i in range(2, rng.randint(2, 5)))
+
+        roll = rng.random()
+        kind = None
+        for candidate, share in kinds:
+            if roll < share:
+                kind = candidate
+                break
+            roll -= share
+
+        remaining = count - len(columns['KodZbozi'])
+        if kind is None or remaining == 1:
+            add_row(KodZbozi=base, JmenoZbozi=f"{name} {color}", KodMasterVyrobku=None,
+                    HodnotyParametru=f"{base_params}##barva||{color}", HlavniObrazek=images,
+                    DalsiObrazky=gallery or None, NaSklade=rng.randint(0, 50), Vypnuto=int(rng.random() < 0.03),
+                    EAN=f"859{family:010d}", PoznamkaInterni=None, **common)
+            continue
+
+        variant_sizes = rng.sample(sizes, min(len(sizes), rng.randint(2, 5)))[:remaining - 1]
+        master_code = None if kind == 'suffix_only' else base
+        # U rodin spojených jen master kódem chybí master řádek v exportu občas úplně
+        with_master_row = kind != 'master_only' or rng.random() < 0.7
+        if with_master_row:
+            add_row(KodZbozi=base, JmenoZbozi=name, KodMasterVyrobku=None, HodnotyParametru=base_params,
+                    HlavniObrazek=images, DalsiObrazky=gallery or None, NaSklade=0, Vypnuto=0,
+                    EAN=f"859{family:010d}", PoznamkaInterni='Master produkt', **common)
+        for index, size in enumerate(variant_sizes, start=2):
+            if kind == 'master_only':
+                sku = f"{base}-{size.replace(' ', '')}"
+            else:
+                sku = f"{base}_{index}"
+            add_row(KodZbozi=sku, JmenoZbozi=f"{name} {size}", KodMasterVyrobku=master_code,
+                    HodnotyParametru=f"{base_params}##barva||{color}##velikost||{size}",
+                    HlavniObrazek=None, DalsiObrazky=None, NaSklade=rng.randint(0, 20), Vypnuto=0,
+                    EAN=f"859{family:07d}{index:03d}", PoznamkaInterni=None, **common)
+
+    return pd.DataFrame(columns)
+
+
+def generate_parameters() -> pd.DataFrame:
+    """List Parametry - číselník parametrů a jejich hodnot."""
+    rows = [('pohlavi', gender) for _, gender in SECTIONS]
+    rows += [('typ', product_type) for product_type, _, _ in PRODUCT_TYPES]
+    rows += [('sport', sport.lower()) for sport in SPORTS]
+    rows += [('znacka', brand) for brand in BRANDS]
+    rows += [('barva', color) for color in COLORS]
+    rows += [('material', material) for material in MATERIALS]
+    rows += [('sezona', season) for season in SEASONS]
+    rows += sorted({('velikost', size) for _, _, sizes in PRODUCT_TYPES for size in sizes})
+    return pd.DataFrame(rows, columns=['Nazev', 'Hodnota'])
+
+
+def generate_catalog(products: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Vygeneruje celý katalog.
+
+    Args:
+        products (int): Počet řádků listu Zbozi.
+        seed (int): Seed generátoru náhodných čísel.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Název listu (Zbozi, Kategorie, Parametry) -> DataFrame.
+    """
+    categories_df, leaves = generate_categories()
+    return {
+        'Zbozi': generate_products(products, leaves, seed),
+        'Kategorie': categories_df,
+        'Parametry': generate_parameters(),
+    }
+
+
+def write_catalog(sheets: Dict[str, pd.DataFrame], path: Path) -> List[Path]:
+    """
+    Zapíše katalog ve formátu podle přípony (viz text_formats).
+
+    Returns:
+        List[Path]: Zapsané soubory.
+
+    Raises:
+        ValueError: Nepodporovaný formát, .xls nebo katalog větší než list Excelu.
+    """
+    path = Path(path)
+    input_format = detect_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if input_format.kind == 'excel':
+        if input_format.suffix == '.xls':
+            raise ValueError("Formát .xls nelze zapisovat (xlwt není podporován), použijte .xlsx")
+        largest = max(len(df) for df in sheets.values())
+        if largest > EXCEL_MAX_ROWS:
+            raise ValueError(f"{largest} řádků se nevejde do listu Excelu (max {EXCEL_MAX_ROWS})")
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return [path]
+
+    if input_format.kind == 'jsonl':
+        frames = [df if sheet_name == 'Zbozi' else df.assign(**{SHEET_FIELD: sheet_name})
+                  for sheet_name, df in sheets.items()]
+        pd.concat(frames, ignore_index=True).to_json(path, orient='records', lines=True, force_ascii=False)
+        return [path]
+
+    separator = '\t' if input_format.suffix == '.tsv' else ';'
+    written = []
+    for sheet_name, df in sheets.items():
+        target = sheet_path(path, sheet_name)
+        df.to_csv(target, sep=separator, index=False, encoding='utf-8')
+        written.append(target)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generátor syntetického FastCentrik katalogu')
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help='Počty produktů (např. 1k 10k 100k 1M)')
+    parser.add_argument('--formats', nargs='+', default=DEFAULT_FORMATS,
+                        help='Formáty výstupu: xlsx, csv, tsv, jsonl, volitelně s .gz/.zst (např. csv.gz)')
+    parser.add_argument('--output-dir', default='synthetic_catalogs', help='Výstupní složka')
+    parser.add_argument('--seed', type=int, default=42, help='Seed generátoru')
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    for size in args.sizes:
+        start = time.perf_counter()
+        sheets = generate_catalog(size, args.seed)
+        products_df = sheets['Zbozi']
+        families = products_df['KodZbozi'].str.extract(r'^(\d+)', expand=False).nunique()
+        print(f"📦 {size_label(size)}: {len(products_df)} produktů v {families} rodinách, "
+              f"{len(sheets['Kategorie'])} kategorií ({time.perf_counter() - start:.1f} s)")
+        for file_format in args.formats:
+            path = output_dir / f"catalog_{size_label(size)}.{file_format.lstrip('.')}"
+            start = time.perf_counter()
+            try:
+                written = write_catalog(sheets, path)
+            except ValueError as e:
+                print(f"   ❌ {path.name}: {e}")
+                continue
+            print(f"   ✅ {', '.join(str(file) for file in written)} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Předpočítané cesty kategorií
+============================
+
+Jedním průchodem přes mapování kategorií (InterniKod -> záznam) doplní ke
+každé kategorii celou cestu, hloubku a název koncové kategorie. Každý uzel
+se zpracuje právě jednou; cesta rodiče se znovu použije pro všechny potomky.
+
+Průchod zároveň odhalí rozbitý export:
+    - sirotky: kategorie s rodičem, který v exportu neexistuje
+      (cesta pak začíná u sirotka, stejně jako při původním procházení)
+    - cykly: kategorie, jejichž rodiče se zacyklí (cyklus se přeruší
+      u hrany, která ho uzavírá, takže výpočet vždy skončí)
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+from typing import Dict, List, Hashable
+
+import pandas as pd
+
+ROOT_CATEGORY_ID = 'ROOT_1'
+PATH_SEPARATOR = ' > '
+
+
+def resolve_category_paths(category_mapping: Dict[Hashable, Dict],
+                           root_id: str = ROOT_CATEGORY_ID) -> Dict[str, List]:
+    """
+    Doplní do záznamů kategorií klíče 'path', 'depth' a 'leaf'.
+
+    Args:
+        category_mapping (Dict): Mapování InterniKod -> {'name', 'parent', ...}; upravuje se na místě.
+        root_id (str): Kód kořenové kategorie, která se do cesty nezapočítává.
+
+    Returns:
+        Dict obsahující:
+            - orphans: List - kódy kategorií, jejichž rodič neexistuje
+            - cycles: List[List] - kódy kategorií tvořících jednotlivé cykly
+    """
+    orphans = []
+    cycles = []
+    resolved = set()
+
+    for category_id in category_mapping:
+        if category_id in resolved:
+            continue
+
+        # Cesta nahoru až k vyřešenému předkovi, kořeni, sirotkovi nebo cyklu
+        chain = []
+        chain_positions = {}
+        base = None
+        current = category_id
+        while True:
+            chain_positions[current] = len(chain)
+            chain.append(current)
+
+            parent_id = category_mapping[current]['parent']
+            if not parent_id or parent_id == root_id or pd.isna(parent_id):
+                break
+            if parent_id not in category_mapping:
+                orphans.append(current)
+                break
+            if parent_id in resolved:
+                base = category_mapping[parent_id]
+                break
+            if parent_id in chain_positions:
+                cycles.append(chain[chain_positions[parent_id]:])
+                break
+            current = parent_id
+
+        # Cesty od nejvyššího předka dolů
+        for chain_id in reversed(chain):
+            entry = category_mapping[chain_id]
+            if base is None:
+                entry['path'] = entry['name']
+                entry['depth'] = 1
+            else:
+                entry['path'] = f"{base['path']}{PATH_SEPARATOR}{entry['name']}"
+                entry['depth'] = base['depth'] + 1
+            entry['leaf'] = entry['name']
+            resolved.add(chain_id)
+            base = entry
+
+    return {
+        'orphans': orphans,
+        'cycles': cycles
+    }
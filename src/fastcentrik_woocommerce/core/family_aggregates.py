@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Souhrnné údaje rodin variant
+============================
+
+Pro všechny rodiny variant najednou spočítá z tabulky parametrů
+(ParameterTable.long_table) hodnoty variantních atributů, výchozí hodnotu
+atributu a příznak, zda je skladem aspoň jedna varianta. Transformátory pak
+při sestavení parent produktu jen vyhledají výsledek své rodiny místo
+procházení parametrů všech variant v Pythonu.
+
+Sémantika odpovídá původnímu výpočtu po rodinách: řádek bez jakýchkoli
+parametrů dostane velikost odvozenou z názvu (ParameterTable.inferred_velikost),
+hodnoty atributu jsou unikátní
+a seřazené, atributy jsou v pořadí prvního výskytu (varianty v pořadí
+rodiny, v rámci varianty podle VARIANT_SETTINGS['variant_attributes']).
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+from itertools import chain
+from typing import Dict, Hashable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+
+class FamilyAggregate(NamedTuple):
+    """Souhrn jedné rodiny variant."""
+    attributes: Dict[str, List[str]]  # Atribut -> seřazené unikátní hodnoty (pořadí prvního výskytu)
+    any_in_stock: Optional[bool] = None  # None, pokud se sklad nepočítal
+
+    @property
+    def defaults(self) -> Dict[str, str]:
+        """Výchozí hodnota každého atributu (první seřazená hodnota)."""
+        return {name: values[0] for name, values in self.attributes.items() if values}
+
+
+EMPTY_AGGREGATE = FamilyAggregate({})
+
+
+def aggregate_families(families: Dict[Hashable, Sequence[int]], params_table: ParameterTable,
+                       attributes: Sequence[str],
+                       stock: Optional[Sequence] = None) -> Dict[Hashable, FamilyAggregate]:
+    """
+    Spočítá souhrny všech rodin variant jedním průchodem.
+
+    Args:
+        families (Dict[Hashable, Sequence[int]]): Klíč rodiny -> pozice řádků rodiny v jejím pořadí.
+        params_table (ParameterTable): Parametry produktů (pozice odpovídají řádkům)
+            včetně velikosti odvozené z názvu pro řádky bez parametrů.
+        attributes (Sequence[str]): Variantní atributy v pořadí priority.
+        stock (Sequence, optional): Skladové množství (NaSklade) podle pozice; bez něj se
+            příznak skladem nepočítá.
+
+    Returns:
+        Dict[Hashable, FamilyAggregate]: Souhrn pro každý klíč z families.
+    """
+    keys = list(families)
+    if not keys:
+        return {}
+    lengths = np.fromiter((len(families[key]) for key in keys), dtype=np.int64, count=len(keys))
+    total = int(lengths.sum())
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    members = pd.DataFrame({
+        'family': np.repeat(np.arange(len(keys)), lengths),
+        'row': np.fromiter(chain.from_iterable(families[key] for key in keys), dtype=np.int64, count=total),
+    })
+    members['order'] = np.arange(total) - offsets
+
+    # Hodnoty variantních atributů všech řádků rodin
+    long_table = params_table.long_table
+    attribute_rank = {name: rank for rank, name in enumerate(attributes)}
+    row_values = long_table.loc[long_table['key'].isin(attribute_rank), ['row', 'key', 'value']]
+    if 'velikost' in attribute_rank:
+        # Řádek bez jakýchkoli parametrů: velikost odvozená z názvu
+        sizes = params_table.inferred_velikost.dropna()
+        row_values = pd.concat([row_values, pd.DataFrame({
+            'row': sizes.index.to_numpy(dtype=np.int64), 'key': 'velikost', 'value': sizes.to_numpy(dtype=object),
+        })], ignore_index=True)
+
+    values = members.merge(row_values, on='row')
+    values['rank'] = values['order'] * len(attribute_rank) + values['key'].map(attribute_rank)
+    first_rank = values.groupby(['family', 'key'], sort=False)['rank'].min()
+    unique_values = (values.drop_duplicates(['family', 'key', 'value'])
+                     .sort_values('value', kind='stable')
+                     .groupby(['family', 'key'], sort=False)['value'].agg(list))
+    summary = pd.DataFrame({'rank': first_rank, 'values': unique_values}).reset_index()
+    summary = summary.sort_values(['family', 'rank'], kind='stable')
+
+    family_attributes: Dict[int, Dict[str, List[str]]] = {}
+    for family, key, family_values in zip(summary['family'].tolist(), summary['key'].tolist(),
+                                          summary['values'].tolist()):
+        family_attributes.setdefault(family, {})[key] = family_values
+
+    in_stock: Optional[List[bool]] = None
+    if stock is not None:
+        stock_values = pd.to_numeric(pd.Series(list(stock), dtype=object), errors='coerce')
+        positive = (stock_values > 0).to_numpy()[members['row'].to_numpy()]
+        in_stock = pd.Series(positive).groupby(members['family']).any().reindex(
+            range(len(keys)), fill_value=False).tolist()
+
+    return {
+        key: FamilyAggregate(family_attributes.get(family, {}), in_stock[family] if in_stock is not None else None)
+        for family, key in enumerate(keys)
+    }
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sloupcové sestavení výstupních produktů
+=======================================
+
+Pomocné funkce pro sestavení exportního DataFrame po celých sloupcích
+místo jednoho slovníku na produkt. Hodnoty odpovídají výpočtu po řádcích
+v transformátorech (str() na hodnotu, záměna desetinné čárky, URL
+obrázků, SEO šablony), takže zapsané CSV je stejné.
+
+Všechny funkce vrací Series s indexem 0..n-1 (pozice řádku).
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+from string import Formatter
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+from src.fastcentrik_woocommerce.loaders.product_record import column_values
+
+
+def text_column(df: pd.DataFrame, column: str, default: Any = '') -> pd.Series:
+    """str() na každou hodnotu sloupce (NaN -> 'nan', stejně jako str(row.sloupec))."""
+    return pd.Series([str(value) for value in column_values(df, column, default)], dtype=object)
+
+
+def decimal_column(df: pd.DataFrame, column: str, default: Any = '') -> pd.Series:
+    """Textová hodnota sloupce s desetinnou tečkou místo čárky (ceny, hmotnost)."""
+    return text_column(df, column, default).str.replace(',', '.', regex=False)
+
+
+def optional_text_column(df: pd.DataFrame, column: str, default: Any = '') -> pd.Series:
+    """str() na hodnoty sloupce, chybějící hodnota (NaN) -> ''."""
+    return text_column(df, column, default).mask(object_column(df, column, default).isna(), '')
+
+
+def price_column(df: pd.DataFrame, column: str, default: Any = '') -> pd.Series:
+    """Cena s desetinnou tečkou, chybějící nebo prázdná hodnota -> '' (jako _format_price)."""
+    values = object_column(df, column, default)
+    return decimal_column(df, column, default).mask(values.isna() | (values == ''), '')
+
+
+def object_column(df: pd.DataFrame, column: str, default: Any = None) -> pd.Series:
+    """Hodnoty sloupce jako object Series (NA -> NaN) pro porovnání se stejnou sémantikou jako v Pythonu."""
+    return pd.Series(column_values(df, column, default), dtype=object)
+
+
+def format_template(template: str, **fields: pd.Series) -> pd.Series:
+    """
+    Vyplní šablonu str.format po sloupcích.
+
+    Šablona se rozloží na literály a pole a výsledek se složí sčítáním
+    sloupců. Pole s formátem, konverzí nebo mimo fields se vyplní po
+    řádcích přes str.format.
+
+    Args:
+        template (str): Šablona, např. "Kvalitní {product_name} v kategorii {category}".
+        **fields (pd.Series): Hodnoty polí (textové Series stejné délky).
+    """
+    length = len(next(iter(fields.values())))
+    parts = list(Formatter().parse(template))
+    if any(field is not None and (spec or conversion or field not in fields)
+           for _, field, spec, conversion in parts):
+        names = list(fields)
+        return pd.Series([
+            template.format(**dict(zip(names, values)))
+            for values in zip(*(fields[name].tolist() for name in names))
+        ], dtype=object)
+
+    result = pd.Series([''] * length, dtype=object)
+    for literal, field, _, _ in parts:
+        if literal:
+            result = result + literal
+        if field is not None:
+            result = result + fields[field].reset_index(drop=True)
+    return result
+
+
+def first_words(texts: pd.Series, count: int) -> pd.Series:
+    """Prvních count slov každého textu malými písmeny (focus keyword)."""
+    return pd.Series([' '.join(text.split()[:count]).lower() for text in texts.tolist()], dtype=object)
+
+
+def last_segment(paths: pd.Series, separator: str = ' > ') -> pd.Series:
+    """Poslední část cesty (za posledním oddělovačem), spočítaná jednou pro každou různou cestu."""
+    unique_paths = pd.unique(paths.to_numpy(dtype=object))
+    segments = {path: path.split(separator)[-1] for path in unique_paths.tolist()}
+    return pd.Series(paths.map(segments).to_numpy(dtype=object), dtype=object)
+
+
+def image_urls(main_images: pd.Series, additional_images: pd.Series, base_url: str) -> pd.Series:
+    """
+    URL obrázků produktů spojené '|' (hlavní obrázek, pak další v pořadí).
+
+    Args:
+        main_images (pd.Series): HlavniObrazek (cesta, nebo NaN).
+        additional_images (pd.Series): DalsiObrazky (cesty oddělené ';', nebo NaN).
+        base_url (str): Základní URL; cesty se připojí bez počátečního lomítka.
+    """
+    base_url = base_url.strip('/')
+    main_images = main_images.reset_index(drop=True)
+    additional_images = additional_images.reset_index(drop=True)
+
+    main = main_images[main_images.notna()].astype(object).str.strip()
+    main = main[main.notna() & (main != '')]
+
+    extra = additional_images[additional_images.notna()].astype(object)
+    extra = extra.str.split(';').explode().str.strip()
+    extra = extra[extra.notna() & (extra != '')]
+
+    # Hlavní obrázek řádku před dalšími (stabilní řazení podle řádku)
+    paths = pd.concat([main, extra]).sort_index(kind='stable')
+    urls = base_url + '/' + paths.str.lstrip('/')
+    return pd.Series(join_groups(paths.index.to_numpy(), urls.tolist(), '|', len(main_images)), dtype=object)
+
+
+def output_parameters(table: ParameterTable, positions: np.ndarray, infer_sizes: np.ndarray) -> pd.DataFrame:
+    """
+    Parametry výstupních řádků v long formátu (out_row, key, value, seq).
+
+    Args:
+        table (ParameterTable): Parametry zdrojových řádků.
+        positions (np.ndarray): Pozice zdrojového řádku každého výstupního řádku.
+        infer_sizes (np.ndarray): Maska výstupních řádků (varianty), které bez
+            parametrů dostanou velikost odvozenou z názvu.
+
+    Returns:
+        pd.DataFrame: Parametry seřazené podle výstupního řádku a pořadí v řádku.
+    """
+    long_table = table.long_table
+    row_params = long_table.assign(seq=long_table.groupby('row').cumcount())
+
+    inferred = table.inferred_velikost.dropna()
+    inferred_rows = np.flatnonzero(infer_sizes)
+    inferred_rows = inferred_rows[np.isin(positions[inferred_rows], inferred.index.to_numpy())]
+    sizes = pd.DataFrame({
+        'out_row': inferred_rows,
+        'key': 'velikost',
+        'value': inferred.reindex(positions[inferred_rows]).to_numpy(dtype=object),
+        'seq': 0,
+    })
+
+    rows = pd.DataFrame({'out_row': np.arange(len(positions)), 'row': positions})
+    params = rows.merge(row_params, on='row').drop(columns='row')
+    params = pd.concat([params, sizes], ignore_index=True)
+    return params.sort_values(['out_row', 'seq'], kind='stable').reset_index(drop=True)
+
+
+def tag_column(params: pd.DataFrame, tag_attributes: Sequence[str], max_tags: int,
+               separator: str, length: int) -> List[str]:
+    """
+    Tagy výstupních řádků: hodnoty parametrů v pořadí tag_attributes, nejvýše max_tags.
+
+    Args:
+        params (pd.DataFrame): Parametry z output_parameters.
+        tag_attributes (Sequence[str]): Parametry, ze kterých vznikají tagy.
+        max_tags (int): Nejvyšší počet tagů produktu.
+        separator (str): Oddělovač tagů.
+        length (int): Počet výstupních řádků.
+    """
+    tag_rank = {attr: rank for rank, attr in enumerate(tag_attributes)}
+    tags = params[params['key'].isin(tag_rank)]
+    tags = tags.assign(rank=tags['key'].map(tag_rank)).sort_values(['out_row', 'rank'], kind='stable')
+    tags = tags[tags.groupby('out_row').cumcount() < max_tags]
+    return join_groups(tags['out_row'].to_numpy(dtype=np.int64), tags['value'].tolist(), separator, length)
+
+
+def spread_columns(cells: pd.DataFrame, length: int) -> pd.DataFrame:
+    """
+    Rozloží buňky v long formátu (out_row, column, value) do sloupců.
+
+    Buňky jsou v pořadí zápisu do slovníku produktu; při opakování stejného
+    sloupce v řádku platí poslední hodnota, stejně jako u slovníku.
+
+    Returns:
+        pd.DataFrame: Sloupce pro řádky 0..length-1, řádky bez hodnoty mají NaN.
+    """
+    cells = cells.drop_duplicates(['out_row', 'column'], keep='last')
+    if cells.empty:
+        return pd.DataFrame(index=pd.RangeIndex(length))
+    wide = cells.pivot(index='out_row', columns='column', values='value').reindex(pd.RangeIndex(length))
+    wide.columns.name = None
+    return wide.astype(object)
+
+
+def join_groups(rows: np.ndarray, values: List[str], separator: str, length: int) -> List[str]:
+    """
+    Spojí hodnoty se stejným výstupním řádkem (rows seřazené vzestupně).
+
+    Returns:
+        List[str]: Spojené hodnoty pro řádky 0..length-1, řádky bez hodnot mají ''.
+    """
+    joined = [''] * length
+    if not len(rows):
+        return joined
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    ends = np.r_[starts[1:], len(rows)]
+    for row, start, end in zip(rows[starts].tolist(), starts.tolist(), ends.tolist()):
+        joined[row] = separator.join(values[start:end])
+    return joined
+
+
+def slot_columns(rows: np.ndarray, slots: np.ndarray, values: Dict[str, Sequence],
+                 length: int, max_slots: int) -> Dict[str, List[Any]]:
+    """
+    Rozloží číslované hodnoty (Attribute 1 name, Attribute 2 name...) do sloupců.
+
+    Args:
+        rows (np.ndarray): Výstupní řádek každé hodnoty.
+        slots (np.ndarray): Číslo slotu od 1.
+        values (Dict[str, Sequence]): Šablona názvu sloupce ("Attribute {} name") -> hodnoty.
+        length (int): Počet výstupních řádků.
+        max_slots (int): Nejvyšší číslo slotu ve výstupu.
+
+    Returns:
+        Dict[str, List]: Sloupce; řádky bez hodnoty mají NaN.
+    """
+    columns: Dict[str, List[Any]] = {}
+    for slot in range(1, max_slots + 1):
+        selected = slots == slot
+        slot_rows = rows[selected]
+        for name_template, slot_values in values.items():
+            column = np.full(length, np.nan, dtype=object)
+            column[slot_rows] = np.asarray(slot_values, dtype=object)[selected]
+            columns[name_template.format(slot)] = column.tolist()
+    return columns
@@ -11,10 +11,12 @@ Autor: FastCentrik Migration Tool
 Verze: 2.0
 """
 
+import numpy as np
 import pandas as pd
 import re
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Set, Optional
 import logging
 import sys
 
@@ -23,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from src.fastcentrik_woocommerce.utils.utils import create_slug, parse_parameters
 from config.config import (
+    ADVANCED_SETTINGS,
     SEO_SETTINGS,
     TAG_SETTINGS,
     VARIANT_SETTINGS,
@@ -32,6 +35,17 @@ from config.config import (
     CATEGORY_MAPPING_SETTINGS
 )
 from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper
+from src.fastcentrik_woocommerce.loaders.parameter_table import DEFAULT_SIZE_PATTERNS, ParameterTable, infer_size
+from src.fastcentrik_woocommerce.loaders.product_record import ProductRecord, build_product_records, column_values
+from src.fastcentrik_woocommerce.core.category_paths import resolve_category_paths
+from src.fastcentrik_woocommerce.core.family_aggregates import FamilyAggregate, aggregate_families
+from src.fastcentrik_woocommerce.core.product_frame import (
+    decimal_column, first_words, format_template, image_urls, last_segment, object_column, output_parameters,
+    slot_columns, tag_column, text_column
+)
+from src.fastcentrik_woocommerce.core.variant_grouping import group_family_positions, group_skus_by_pattern
+from src.fastcentrik_woocommerce.utils.memory import BatchMemoryMonitor, format_mb, optimize_frame, release_memory
+from src.fastcentrik_woocommerce.utils.instrumentation import instrument_iter, span, spanned
 
 # Nastavení logování
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -41,42 +55,91 @@ class DataTransformer:
     """
     Zodpovídá za transformaci načtených FastCentrik dat do WooCommerce formátu.
     """
-    def __init__(self, products_df: pd.DataFrame, categories_df: pd.DataFrame):
+    def __init__(self, products_df: pd.DataFrame, categories_df: pd.DataFrame,
+                 params_table: Optional[ParameterTable] = None):
         """
         Inicializace transformátoru.
 
         Args:
             products_df (pd.DataFrame): DataFrame s produkty.
             categories_df (pd.DataFrame): DataFrame s kategoriemi.
+            params_table (ParameterTable, optional): Předem naparsované parametry produktů.
+                Pokud není zadána, vytvoří se z products_df jedním průchodem.
         """
-        self.products_data = products_df
         self.categories_data = categories_df
+        self._bind_products(products_df, params_table)
         self.category_mapping = {}
         self.woo_products = []
         self.woo_categories = []
         self.validation_errors = []
+        self.batch_stats = []  # Paměť po dávkách z run_batched_transformation
         
         # Inicializace inteligentního category mapperu
         if CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
-            self.category_mapper = CategoryMapper()
+            self.category_mapper = CategoryMapper(
+                cache_size=CATEGORY_MAPPING_SETTINGS.get('mapping_cache_size', 4096)
+            )
             logger.info("Inteligentní mapování kategorií aktivováno")
         else:
             self.category_mapper = None
     
+    @spanned('product_records', rows=lambda self, products_df, params_table=None: len(products_df))
+    def _bind_products(self, products_df: pd.DataFrame,
+                       params_table: Optional[ParameterTable] = None) -> None:
+        """Nastaví produkty, se kterými transformátor pracuje (celý katalog nebo jednu dávku)."""
+        self.products_data = products_df
+        self.params_table = params_table if params_table is not None else ParameterTable.from_products(
+            products_df, size_patterns=VARIANT_SETTINGS.get('size_name_patterns', DEFAULT_SIZE_PATTERNS))
+        self.product_records = build_product_records(products_df)
+        self.category_assignments = {}  # Label řádku -> (název, kategorie, mapping_type) z dávkového mapování
+    
+    def _get_params(self, row: ProductRecord) -> Dict[str, str]:
+        """Vrátí parametry řádku z tabulky parametrů (bez opakovaného parsování řetězce)."""
+        if row.position < len(self.params_table):
+            return self.params_table.params_at(row.position)
+        return parse_parameters(row.HodnotyParametru)
+    
+    def _get_variant_params(self, row: ProductRecord) -> Dict[str, str]:
+        """Parametry varianty; bez parametrů velikost odvozená z názvu (inferred_velikost)."""
+        params = self._get_params(row)
+        if not params:
+            if row.position < len(self.params_table):
+                size = self.params_table.inferred_size_at(row.position)
+            else:
+                size = infer_size(row.JmenoZbozi,
+                                  VARIANT_SETTINGS.get('size_name_patterns', DEFAULT_SIZE_PATTERNS))
+            if size is not None:
+                params['velikost'] = size
+        return params
+    
+    @spanned('category_mapping')
     def _create_category_mapping(self) -> None:
         """Vytvoří mapování kategorií s hierarchickou strukturou."""
         logger.info("Vytvářím mapování kategorií")
         
         # Základní mapování ID -> název
-        for _, cat in self.categories_data.iterrows():
-            if pd.notna(cat['InterniKod']) and pd.notna(cat['JmenoKategorie']):
-                self.category_mapping[cat['InterniKod']] = {
-                    'name': cat['JmenoKategorie'],
-                    'parent': cat.get('KodNadrizeneKategorie', ''),
-                    'description': cat.get('PopisKategorie', ''),
-                    'slug': create_slug(cat['JmenoKategorie'])
+        categories = zip(
+            column_values(self.categories_data, 'InterniKod', None),
+            column_values(self.categories_data, 'JmenoKategorie', None),
+            column_values(self.categories_data, 'KodNadrizeneKategorie', ''),
+            column_values(self.categories_data, 'PopisKategorie', '')
+        )
+        for category_id, category_name, parent_id, description in categories:
+            if pd.notna(category_id) and pd.notna(category_name):
+                self.category_mapping[category_id] = {
+                    'name': category_name,
+                    'parent': parent_id,
+                    'description': description,
+                    'slug': create_slug(category_name)
                 }
         
+        # Cesty, hloubky a koncové názvy všech kategorií jedním průchodem
+        hierarchy_issues = resolve_category_paths(self.category_mapping)
+        if hierarchy_issues['orphans']:
+            logger.warning(f"Kategorie s neexistující nadřazenou kategorií: {hierarchy_issues['orphans']}")
+        for cycle in hierarchy_issues['cycles']:
+            logger.warning(f"Cyklus v hierarchii kategorií: {' -> '.join(map(str, cycle))}")
+        
         logger.info(f"Vytvořeno mapování pro {len(self.category_mapping)} kategorií")
     
     def _get_category_path(self, category_id: str) -> str:
@@ -84,17 +147,125 @@ class DataTransformer:
         if not category_id or category_id not in self.category_mapping:
             return ""
         
-        category = self.category_mapping[category_id]
-        path = [category['name']]
+        # Cesta je předpočítaná v _create_category_mapping
+        return self.category_mapping[category_id]['path']
+    
+    @spanned('category_mapping', rows=lambda self: len(self.products_data))
+    def _precompute_category_assignments(self) -> None:
+        """Namapuje kategorie celého katalogu jedním dávkovým voláním mapperu."""
+        self.category_assignments = {}
+        if not self.category_mapper or not self.products_data.index.is_unique:
+            return
+        
+        if 'InetrniKodyKategorii' in self.products_data.columns:
+            original_categories = self.products_data['InetrniKodyKategorii'].astype(object).map(
+                self._get_category_path)
+        else:
+            original_categories = None
+        
+        categories, mapping_types = self.category_mapper.map_dataframe(
+            self.products_data, self.params_table,
+            original_categories=original_categories,
+            multi_category=CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False),
+            max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
+            strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary'),
+            update_stats=False
+        )
+        names = self.products_data['JmenoZbozi'].map(str) if 'JmenoZbozi' in self.products_data.columns \
+            else pd.Series('', index=self.products_data.index)
+        self.category_assignments = dict(zip(
+            self.products_data.index, zip(names.tolist(), categories.tolist(), mapping_types.tolist())
+        ))
+    
+    def _map_product_categories(self, row: ProductRecord, name: str,
+                                params: Optional[Dict[str, str]] = None) -> Tuple[List[str], str]:
+        """
+        Vrátí kategorie produktu z dávkového mapování, případně namapuje řádek samostatně.
         
-        # Projdeme hierarchii nahoru
-        parent_id = category['parent']
-        while parent_id and parent_id != 'ROOT_1' and parent_id in self.category_mapping:
-            parent = self.category_mapping[parent_id]
-            path.insert(0, parent['name'])
-            parent_id = parent['parent']
+        Samostatně se mapují řádky upravené během transformace (např. parent
+        produkt s novým názvem). Statistiky mapperu se započítají v obou případech.
+        """
+        assignment = self.category_assignments.get(row.label)
+        if assignment is not None and assignment[0] == name:
+            _, categories, mapping_type = assignment
+            self.category_mapper.record_mapping(name, categories, mapping_type)
+            return list(categories), mapping_type
+        
+        if params is None:
+            params = self._get_params(row)
+        original_category = self._get_category_path(row.InetrniKodyKategorii)
+        if CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False):
+            return self.category_mapper.map_product_to_multiple_categories(
+                product_name=name,
+                product_params=params,
+                original_category=original_category,
+                max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
+                strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary')
+            )
+        
+        category_path, mapping_type = self.category_mapper.map_product_to_category(
+            product_name=name,
+            product_params=params,
+            original_category=original_category
+        )
+        return ([category_path] if category_path else []), mapping_type
+    
+    def _get_product_category(self, row: ProductRecord, name: str,
+                              params: Optional[Dict[str, str]] = None) -> str:
+        """
+        Vrátí hodnotu sloupce Categories pro produkt.
+        
+        Args:
+            row (ProductRecord): Záznam produktu.
+            name (str): Název produktu (u parent produktu upravený).
+            params (Dict[str, str], optional): Parametry řádku; bez nich se načtou,
+                až když je mapper potřebuje.
+        """
+        sku = str(row.KodZbozi)
+        category_path = ""
+        
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
+            # Kontrola, zda je povoleno multi-category mapování
+            if CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False):
+                # Multi-category mapování
+                categories, mapping_type = self._map_product_categories(row, name, params)
+                
+                # Spojit kategorie pomocí definovaného oddělovače
+                if categories:
+                    separator = CATEGORY_MAPPING_SETTINGS.get('multi_category_separator', ', ')
+                    # Pokud je nastaveno použití pouze koncové kategorie
+                    if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True):
+                        # Extrahovat pouze název koncové kategorie z každé cesty
+                        leaf_categories = []
+                        for cat_path in categories:
+                            # Získat poslední část cesty (za posledním ' > ')
+                            leaf_name = cat_path.split(' > ')[-1].strip()
+                            leaf_categories.append(leaf_name)
+                        category_path = separator.join(leaf_categories)
+                    else:
+                        # Použít celou cestu
+                        category_path = separator.join(categories)
+                
+                # Logování nenamapovaných produktů
+                if mapping_type == "unmapped" and CATEGORY_MAPPING_SETTINGS.get('log_unmapped_products', True):
+                    logger.warning(f"Produkt '{name}' (SKU: {sku}) nebyl namapován do žádné kategorie")
+            else:
+                # Single-category mapování (zpětná kompatibilita)
+                categories, mapping_type = self._map_product_categories(row, name, params)
+                category_path = categories[0] if categories else ""
+                
+                # Logování nenamapovaných produktů
+                if mapping_type == "unmapped" and CATEGORY_MAPPING_SETTINGS.get('log_unmapped_products', True):
+                    logger.warning(f"Produkt '{name}' (SKU: {sku}) nebyl namapován do žádné kategorie")
+        else:
+            # Původní mapování
+            if pd.notna(row.InetrniKodyKategorii):
+                category_path = self._get_category_path(row.InetrniKodyKategorii)
+                # Pokud je nastaveno použití pouze koncové kategorie
+                if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True) and category_path:
+                    category_path = category_path.split(' > ')[-1].strip()
         
-        return ' > '.join(path)
+        return category_path
     
     def _generate_seo_fields(self, product_name: str, category: str) -> Tuple[str, str, str]:
         """Generuje SEO pole pro produkt na základě nastavení v config.py."""
@@ -135,9 +306,9 @@ class DataTransformer:
         
         return '|'.join(images)
     
-    def _get_stock_data(self, row: pd.Series, product_type: str = 'simple') -> Dict:
+    def _get_stock_data(self, row: ProductRecord, product_type: str = 'simple') -> Dict:
         """Vrátí kompletní data o skladových zásobách"""
-        stock_quantity = row.get('NaSklade', 0)
+        stock_quantity = row.NaSklade
         
         # Základní stock data
         stock_data = {
@@ -159,62 +330,41 @@ class DataTransformer:
         
         return stock_data
     
-    def _create_parent_attributes(self, variants_group: pd.DataFrame) -> Dict:
-        """Vytvoří souhrnné atributy pro parent produkt ze všech variant"""
-        all_attributes = {}
-        
-        # Shromáždíme všechny unikátní hodnoty atributů ze všech variant
-        for _, variant in variants_group.iterrows():
-            params = parse_parameters(variant.get('HodnotyParametru', ''))
-            
-            # Pokud jsou parametry prázdné, zkusíme extrahovat velikost z názvu
-            if not params and 'JmenoZbozi' in variant:
-                name = str(variant['JmenoZbozi'])
-                # Zkusíme najít velikost v názvu (např. "39 1/3", "40", "41 1/3")
-                import re
-                size_match = re.search(r'\b(\d{2}(?:\s+\d/\d)?)\b$', name)
-                if size_match:
-                    params['velikost'] = size_match.group(1)
-            
-            for attr_name in VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva']):
-                if attr_name in params:
-                    if attr_name not in all_attributes:
-                        all_attributes[attr_name] = set()
-                    all_attributes[attr_name].add(params[attr_name])
-        
-        # Převod na WooCommerce formát
+    @spanned('family_aggregation')
+    def _aggregate_families(self, families: Dict[str, List[int]]) -> Dict[str, FamilyAggregate]:
+        """Spočítá atributy a sklad všech rodin variant jedním průchodem (viz aggregate_families)."""
+        return aggregate_families(
+            families, self.params_table,
+            attributes=VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva']),
+            stock=column_values(self.products_data, 'NaSklade', 0)
+        )
+    
+    def _create_parent_attributes(self, aggregate: FamilyAggregate) -> Dict:
+        """Vytvoří souhrnné atributy pro parent produkt ze souhrnu rodiny variant"""
         woo_attributes = {}
         attr_counter = 1
         
-        for attr_name, values in all_attributes.items():
+        for attr_name, values in aggregate.attributes.items():
             mapped_name = ATTRIBUTE_MAPPING.get(attr_name, attr_name.title())
             woo_attributes[f'Attribute {attr_counter} name'] = mapped_name
-            woo_attributes[f'Attribute {attr_counter} value(s)'] = ', '.join(sorted(values))
+            woo_attributes[f'Attribute {attr_counter} value(s)'] = ', '.join(values)
             woo_attributes[f'Attribute {attr_counter} visible'] = '1'
             woo_attributes[f'Attribute {attr_counter} global'] = '1'
             attr_counter += 1
         
         return woo_attributes
     
-    def _calculate_parent_stock(self, variants_group: pd.DataFrame) -> Tuple[str, str]:
-        """Vypočítá skladové zásoby pro parent produkt"""
-        any_in_stock = False
-        
-        for _, variant in variants_group.iterrows():
-            variant_stock = variant.get('NaSklade', 0)
-            if variant_stock > 0:
-                any_in_stock = True
-                break
-        
+    def _calculate_parent_stock(self, aggregate: FamilyAggregate) -> Tuple[str, str]:
+        """Vypočítá skladové zásoby pro parent produkt ze souhrnu rodiny variant"""
         # WooCommerce parent produkty nemají vlastní stock
-        in_stock = '1' if any_in_stock else '0'
+        in_stock = '1' if aggregate.any_in_stock else '0'
         stock_quantity = ''  # Vždy prázdné pro variable produkty
         
         return in_stock, stock_quantity
     
-    def _get_stock_data(self, row: pd.Series, product_type: str = 'simple') -> Dict:
+    def _get_stock_data(self, row: ProductRecord, product_type: str = 'simple') -> Dict:
         """Vrátí kompletní data o skladových zásobách"""
-        stock_quantity = row.get('NaSklade', 0)
+        stock_quantity = row.NaSklade
         
         # Základní stock data
         stock_data = {
@@ -237,80 +387,30 @@ class DataTransformer:
         return stock_data
     
     
-    def _create_woo_product(self, row: pd.Series, product_type: str = 'simple', parent_sku: str = '') -> Dict:
+    def _create_woo_product(self, row: ProductRecord, product_type: str = 'simple', parent_sku: str = '') -> Dict:
         """Vytvoří WooCommerce produkt ze záznamu."""
-        params = parse_parameters(row.get('HodnotyParametru', ''))
+        params = self._get_params(row)
         
         # Základní informace
-        sku = str(row['KodZbozi'])
-        name = str(row['JmenoZbozi'])
-        
-        # Kategorie - použití inteligentního mapování
-        category_path = ""
+        sku = str(row.KodZbozi)
+        name = str(row.JmenoZbozi)
         
-        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
-            # Kontrola, zda je povoleno multi-category mapování
-            if CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False):
-                # Multi-category mapování
-                categories, mapping_type = self.category_mapper.map_product_to_multiple_categories(
-                    product_name=name,
-                    product_params=params,
-                    original_category=self._get_category_path(row.get('InetrniKodyKategorii', '')),
-                    max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
-                    strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary')
-                )
-                
-                # Spojit kategorie pomocí definovaného oddělovače
-                if categories:
-                    separator = CATEGORY_MAPPING_SETTINGS.get('multi_category_separator', ', ')
-                    # Pokud je nastaveno použití pouze koncové kategorie
-                    if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True):
-                        # Extrahovat pouze název koncové kategorie z každé cesty
-                        leaf_categories = []
-                        for cat_path in categories:
-                            # Získat poslední část cesty (za posledním ' > ')
-                            leaf_name = cat_path.split(' > ')[-1].strip()
-                            leaf_categories.append(leaf_name)
-                        category_path = separator.join(leaf_categories)
-                    else:
-                        # Použít celou cestu
-                        category_path = separator.join(categories)
-                
-                # Logování nenamapovaných produktů
-                if mapping_type == "unmapped" and CATEGORY_MAPPING_SETTINGS.get('log_unmapped_products', True):
-                    logger.warning(f"Produkt '{name}' (SKU: {sku}) nebyl namapován do žádné kategorie")
-            else:
-                # Single-category mapování (zpětná kompatibilita)
-                category_path, mapping_type = self.category_mapper.map_product_to_category(
-                    product_name=name,
-                    product_params=params,
-                    original_category=self._get_category_path(row.get('InetrniKodyKategorii', ''))
-                )
-                
-                # Logování nenamapovaných produktů
-                if mapping_type == "unmapped" and CATEGORY_MAPPING_SETTINGS.get('log_unmapped_products', True):
-                    logger.warning(f"Produkt '{name}' (SKU: {sku}) nebyl namapován do žádné kategorie")
-        else:
-            # Původní mapování
-            if pd.notna(row.get('InetrniKodyKategorii')):
-                category_path = self._get_category_path(row['InetrniKodyKategorii'])
-                # Pokud je nastaveno použití pouze koncové kategorie
-                if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True) and category_path:
-                    category_path = category_path.split(' > ')[-1].strip()
+        # Kategorie
+        category_path = self._get_product_category(row, name, params)
         
         # Ceny
-        regular_price = str(row.get('CenaBezna', '')).replace(',', '.')
-        sale_price = str(row.get('ZakladniCena', '')).replace(',', '.')
+        regular_price = str(row.CenaBezna).replace(',', '.')
+        sale_price = str(row.ZakladniCena).replace(',', '.')
         
         # Popis
-        description = str(row.get('Popis', ''))
-        short_description = str(row.get('KratkyPopis', ''))
+        description = str(row.Popis)
+        short_description = str(row.KratkyPopis)
         
         # SEO
         seo_title, meta_desc, focus_keyword = self._generate_seo_fields(name, category_path.split(' > ')[-1] if category_path else '')
         
         # Obrázky
-        images = self._get_product_images(row.get('HlavniObrazek'), row.get('DalsiObrazky'))
+        images = self._get_product_images(row.HlavniObrazek, row.DalsiObrazky)
         
         # Skladové zásoby
         stock_data = self._get_stock_data(row, product_type)
@@ -321,14 +421,9 @@ class DataTransformer:
             # Pro varianty přidáme pouze atributy, které jsou variant attributes
             attr_counter = 1
             
-            # Pokud jsou parametry prázdné, zkusíme extrahovat velikost z názvu
-            if not params and 'JmenoZbozi' in row:
-                name = str(row['JmenoZbozi'])
-                # Zkusíme najít velikost v názvu (např. "39 1/3", "40", "41 1/3")
-                import re
-                size_match = re.search(r'\b(\d{2}(?:\s+\d/\d)?)\b$', name)
-                if size_match:
-                    params['velikost'] = size_match.group(1)
+            # Pokud jsou parametry prázdné, použijeme velikost odvozenou z názvu
+            if not params:
+                params = self._get_variant_params(row)
             
             for attr_name in VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva']):
                 if attr_name in params:
@@ -366,7 +461,7 @@ class DataTransformer:
             'Type': product_type,
             'SKU': sku,
             'Name': name,
-            'Published': '1' if row.get('Vypnuto', 0) == 0 else '0',
+            'Published': '1' if row.Vypnuto == 0 else '0',
             'Is featured?': '0',
             'Visibility in catalog': 'visible',
             'Short description': short_description,
@@ -380,7 +475,7 @@ class DataTransformer:
             'Low stock amount': stock_data['Low stock amount'],
             'Backorders allowed?': stock_data['Backorders allowed?'],
             'Sold individually?': '0',
-            'Weight (kg)': str(row.get('Hmotnost', '')).replace(',', '.'),
+            'Weight (kg)': str(row.Hmotnost).replace(',', '.'),
             'Length (cm)': '',
             'Width (cm)': '',
             'Height (cm)': '',
@@ -415,49 +510,54 @@ class DataTransformer:
         
         return woo_product
     
-    def _transform_products(self) -> None:
-        """Hlavní metoda pro transformaci produktů."""
-        logger.info("Zahajuji transformaci produktů")
+    def _iter_product_units(self) -> Iterator[List[Dict]]:
+        """
+        Postupně vytváří WooCommerce produkty.
+        
+        Vrací celé jednotky exportu: jednoduchý produkt jako jednoprvkový
+        seznam, rodinu variant jako [parent, varianty...], takže se rodina
+        nikdy nerozdělí mezi dávky.
+        """
+        # Kategorie celého katalogu se namapují najednou
+        self._precompute_category_assignments()
         
-        # Nejprve detekujeme varianty podle SKU vzoru
-        sku_groups = self._group_products_by_sku_pattern()
+        # Rodiny variant podle SKU vzoru jako pozice řádků (jeden groupby průchod)
+        families = self._group_family_positions()
         
         # Zpracování jednoduchých produktů (ty co nejsou součástí žádné skupiny variant)
-        simple_products = []
-        for _, product in self.products_data.iterrows():
-            sku = str(product['KodZbozi'])
-            if sku not in sku_groups['all_variant_skus']:
-                simple_products.append(product)
-        
-        logger.info(f"Zpracovávám {len(simple_products)} jednoduchých produktů")
-        for product in simple_products:
-            woo_product = self._create_woo_product(product, 'simple')
-            self.woo_products.append(woo_product)
+        simple_positions = families['simple_positions']
+        logger.info(f"Zpracovávám {len(simple_positions)} jednoduchých produktů")
+        for position in simple_positions:
+            yield [self._create_woo_product(self.product_records[position], 'simple')]
         
         # Zpracování variabilních produktů
-        logger.info(f"Zpracovávám {len(sku_groups['parent_groups'])} skupin variabilních produktů")
+        logger.info(f"Zpracovávám {len(families['families'])} skupin variabilních produktů")
         
-        for parent_sku, variant_skus in sku_groups['parent_groups'].items():
-            # Najdeme všechny produkty této skupiny
-            group_products = self.products_data[self.products_data['KodZbozi'].isin([parent_sku] + variant_skus)]
+        # Atributy a sklad všech rodin s více produkty najednou
+        aggregates = self._aggregate_families({
+            parent_sku: group_positions
+            for parent_sku, group_positions, _ in families['families'] if len(group_positions) > 1
+        })
+        
+        for parent_sku, group_positions, parent_position in families['families']:
+            # Všechny produkty této skupiny (v pořadí DataFrame)
+            group_products = [self.product_records[position] for position in group_positions]
             
             if len(group_products) <= 1:
                 # Pokud je jen jeden produkt, zpracujeme ho jako simple
                 if len(group_products) == 1:
-                    woo_product = self._create_woo_product(group_products.iloc[0], 'simple')
-                    self.woo_products.append(woo_product)
+                    yield [self._create_woo_product(group_products[0], 'simple')]
                 continue
             
             # Najdeme parent produkt (ten s base SKU)
-            parent_row = self.products_data[self.products_data['KodZbozi'] == parent_sku]
-            if parent_row.empty:
+            if parent_position is None:
                 # Pokud parent neexistuje, použijeme první variantu jako základ
-                parent_row = group_products.iloc[0].copy()
+                parent_row = group_products[0]
             else:
-                parent_row = parent_row.iloc[0].copy()
+                parent_row = self.product_records[parent_position]
             
             # Upravíme název parent produktu
-            parent_row['JmenoZbozi'] = self._create_parent_name(group_products)
+            parent_row = parent_row._replace(JmenoZbozi=self._create_parent_name(group_products))
             
             # Vytvoření parent produktu
             parent_product = self._create_woo_product(parent_row, 'variable')
@@ -467,32 +567,299 @@ class DataTransformer:
             parent_product['Parent'] = f"{parent_sku}_parent"
             
             # Přidání souhrnných atributů ze všech variant
-            parent_attributes = self._create_parent_attributes(group_products)
+            aggregate = aggregates[parent_sku]
+            parent_attributes = self._create_parent_attributes(aggregate)
             parent_product.update(parent_attributes)
             
             # Výpočet skladových zásob
-            in_stock, stock = self._calculate_parent_stock(group_products)
+            in_stock, stock = self._calculate_parent_stock(aggregate)
             parent_product['In stock?'] = in_stock
             parent_product['Stock'] = stock
             parent_product['Manage stock?'] = ''  # Variable produkty neřídí stock přímo
             
-            self.woo_products.append(parent_product)
+            family = [parent_product]
             
             # Zpracování variant
-            for _, variant in group_products.iterrows():
-                variant_sku = str(variant['KodZbozi'])
+            for variant in group_products:
+                variant_sku = str(variant.KodZbozi)
                 # Přeskočíme parent SKU, pokud existuje v datech
                 if variant_sku == parent_sku and len(group_products) > 1:
                     continue
                     
                 variant_product = self._create_woo_product(variant, 'variation', f"{parent_sku}_parent")
-                self.woo_products.append(variant_product)
+                family.append(variant_product)
+            
+            yield family
+    
+    def _transform_products(self) -> None:
+        """Hlavní metoda pro transformaci produktů."""
+        logger.info("Zahajuji transformaci produktů")
+        
+        with span('product_build') as measured:
+            for unit in self._iter_product_units():
+                self.woo_products.extend(unit)
+            measured.rows = len(self.woo_products)
         
         logger.info(f"Vytvořeno celkem {len(self.woo_products)} WooCommerce produktů")
         
         # Debug výstup pokud je povoleno
         self._debug_product_structure()
+    
+    def _plan_product_rows(self) -> Dict:
+        """
+        Rozvrhne výstupní řádky ve stejném pořadí jako _iter_product_units.
+        
+        Returns:
+            Dict obsahující:
+                - positions: np.ndarray - pozice zdrojového řádku každého produktu
+                - types: List[str] - typ produktu (simple, variable, variation)
+                - parents: List[str] - hodnota sloupce Parent
+                - parent_rows: List[Tuple[int, str, str, FamilyAggregate]] - výstupní řádek,
+                  SKU, název a souhrn rodiny každého parent produktu
+        """
+        families = self._group_family_positions()
+        skus = text_column(self.products_data, 'KodZbozi', '').tolist()
+        
+        simple_positions = families['simple_positions']
+        logger.info(f"Zpracovávám {len(simple_positions)} jednoduchých produktů")
+        positions = list(simple_positions)
+        types = ['simple'] * len(positions)
+        parents = [''] * len(positions)
+        parent_rows = []
+        
+        logger.info(f"Zpracovávám {len(families['families'])} skupin variabilních produktů")
+        aggregates = self._aggregate_families({
+            parent_sku: group_positions
+            for parent_sku, group_positions, _ in families['families'] if len(group_positions) > 1
+        })
+        
+        for parent_sku, group_positions, parent_position in families['families']:
+            if len(group_positions) <= 1:
+                # Jediný produkt skupiny je jednoduchý produkt
+                positions.extend(group_positions)
+                types.extend(['simple'] * len(group_positions))
+                parents.extend([''] * len(group_positions))
+                continue
+            
+            group_products = [self.product_records[position] for position in group_positions]
+            parent_name = self._create_parent_name(group_products)
+            family_parent = f"{parent_sku}_parent"
+            parent_rows.append((len(positions), family_parent, parent_name, aggregates[parent_sku]))
+            positions.append(group_positions[0] if parent_position is None else parent_position)
+            types.append('variable')
+            parents.append(family_parent)
+            
+            for position in group_positions:
+                # Přeskočíme parent SKU, pokud existuje v datech
+                if skus[position] == parent_sku:
+                    continue
+                positions.append(position)
+                types.append('variation')
+                parents.append(family_parent)
+        
+        return {
+            'positions': np.asarray(positions, dtype=np.int64),
+            'types': types,
+            'parents': parents,
+            'parent_rows': parent_rows,
+        }
+    
+    def _frame_categories(self, positions: np.ndarray, names: List[str]) -> pd.Series:
+        """Sloupec Categories pro výstupní řádky (viz _get_product_category)."""
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
+            # Mapper a jeho statistiky po řádcích; hotová přiřazení z _precompute_category_assignments
+            return pd.Series([
+                self._get_product_category(self.product_records[position], name)
+                for position, name in zip(positions.tolist(), names)
+            ], dtype=object)
+        
+        # Původní mapování: cesta podle kódu kategorie, jednou pro každý zdrojový řádek
+        paths = {category_id: data['path'] for category_id, data in self.category_mapping.items() if category_id}
+        categories = object_column(self.products_data, 'InetrniKodyKategorii', '').map(paths).fillna('')
+        if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True):
+            categories = last_segment(categories).str.strip()
+        return pd.Series(categories.to_numpy(dtype=object)[positions], dtype=object)
+    
+    def _frame_params(self, plan: Dict) -> pd.DataFrame:
+        """
+        Parametry výstupních řádků v long formátu (out_row, key, value, seq).
+        
+        Varianty bez parametrů dostanou velikost odvozenou z názvu, stejně
+        jako v _create_woo_product.
+        """
+        types = np.asarray(plan['types'], dtype=object)
+        params = output_parameters(self.params_table, plan['positions'], types == 'variation')
+        return params.assign(type=types[params['out_row'].to_numpy(dtype=np.int64)])
+    
+    def _frame_tags(self, params: pd.DataFrame, length: int) -> pd.Series:
+        """Sloupec Tags z parametrů podle TAG_SETTINGS."""
+        if not TAG_SETTINGS.get('auto_generate_tags', False):
+            return pd.Series([''] * length, dtype=object)
+        return pd.Series(tag_column(params, TAG_SETTINGS.get('tag_attributes', []),
+                                    TAG_SETTINGS.get('max_tags_per_product', 5), ', ', length), dtype=object)
+    
+    def _frame_attributes(self, params: pd.DataFrame, plan: Dict, length: int) -> Dict[str, List]:
+        """Sloupce Attribute N name/value(s)/visible/global pro všechny typy produktů."""
+        # Jednoduché produkty: první tři parametry
+        simple = params[params['type'] == 'simple']
+        simple = simple[simple['seq'] < 3].assign(slot=lambda df: df['seq'] + 1)
+        
+        # Varianty: variantní atributy v pořadí VARIANT_SETTINGS
+        variant_rank = {attr: rank for rank, attr in
+                        enumerate(VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva']))}
+        variation = params[(params['type'] == 'variation') & params['key'].isin(variant_rank)]
+        variation = variation.assign(rank=variation['key'].map(variant_rank))
+        variation = variation.sort_values(['out_row', 'rank'], kind='stable')
+        variation = variation.assign(slot=variation.groupby('out_row').cumcount() + 1)
+        
+        # Parent produkty: souhrnné atributy rodiny
+        parent_attributes = [
+            (out_row, slot, key, ', '.join(values))
+            for out_row, _, _, aggregate in plan['parent_rows']
+            for slot, (key, values) in enumerate(aggregate.attributes.items(), start=1)
+        ]
+        parents = pd.DataFrame(parent_attributes, columns=['out_row', 'slot', 'key', 'value'])
+        
+        attributes = pd.concat([part[['out_row', 'slot', 'key', 'value']] for part in (simple, variation, parents)],
+                               ignore_index=True)
+        mapped_names = {key: ATTRIBUTE_MAPPING.get(key, key.title()) for key in attributes['key'].unique()}
+        flags = ['1'] * len(attributes)
+        return slot_columns(
+            attributes['out_row'].to_numpy(dtype=np.int64), attributes['slot'].to_numpy(dtype=np.int64), {
+                'Attribute {} name': attributes['key'].map(mapped_names).tolist(),
+                'Attribute {} value(s)': attributes['value'].tolist(),
+                'Attribute {} visible': flags,
+                'Attribute {} global': flags,
+            }, length, 3
+        )
+    
+    @spanned('product_frame', rows=lambda self: len(self.products_data))
+    def build_product_frame(self) -> pd.DataFrame:
+        """
+        Sestaví všechny produkty jako DataFrame po celých sloupcích.
+        
+        Alternativa k _iter_product_units se slovníkem na produkt: ceny,
+        sklad, Published, SEO pole a obrázky se počítají vektorově pro celý
+        katalog, konstantní sloupce jsou jediná hodnota. Řádky jsou ve stejném
+        pořadí a se stejnými hodnotami jako slovníky z _create_woo_product,
+        takže CsvExporter.export_product_frame zapíše stejné CSV jako
+        export_products. Sloupec Stock status variant (mimo export) chybí.
+        
+        Returns:
+            pd.DataFrame: Produkty (řádek = produkt, index 0..n-1).
+        """
+        self._precompute_category_assignments()
+        products = self.products_data
+        plan = self._plan_product_rows()
+        positions = plan['positions']
+        length = len(positions)
+        
+        def take(values) -> np.ndarray:
+            return np.asarray(values, dtype=object)[positions]
+        
+        # Hodnoty zdrojových řádků
+        stock = object_column(products, 'NaSklade', 0)
+        regular_price = decimal_column(products, 'CenaBezna', '')
+        sale_price = decimal_column(products, 'ZakladniCena', '')
+        skus = take(text_column(products, 'KodZbozi', ''))
+        names = take(text_column(products, 'JmenoZbozi', ''))
+        in_stock = take(np.where(stock > 0, '1', '0'))
+        stock_text = take(text_column(products, 'NaSklade', 0))
+        
+        # Parent produkty: SKU, název a sklad z rodiny variant
+        for out_row, parent_sku, parent_name, aggregate in plan['parent_rows']:
+            skus[out_row] = parent_sku
+            names[out_row] = parent_name
+            in_stock[out_row], stock_text[out_row] = self._calculate_parent_stock(aggregate)
+        
+        categories = self._frame_categories(positions, names.tolist())
+        name_series = pd.Series(names, dtype=object)
+        leaf_categories = last_segment(categories)
+        params = self._frame_params(plan)
+        
+        columns = {
+            'ID': '',
+            'Type': plan['types'],
+            'SKU': skus,
+            'Name': names,
+            'Published': take(np.where(object_column(products, 'Vypnuto', 0) == 0, '1', '0')),
+            'Is featured?': '0',
+            'Visibility in catalog': 'visible',
+            'Short description': take(text_column(products, 'KratkyPopis', '')),
+            'Description': take(text_column(products, 'Popis', '')),
+            'Date sale price starts': '',
+            'Date sale price ends': '',
+            'Tax status': 'taxable',
+            'Tax class': '',
+            'In stock?': in_stock,
+            'Stock': stock_text,
+            'Low stock amount': str(STOCK_SETTINGS.get('low_stock_threshold', 5)),
+            'Backorders allowed?': '1' if STOCK_SETTINGS.get('enable_backorders', False) else '0',
+            'Sold individually?': '0',
+            'Weight (kg)': take(decimal_column(products, 'Hmotnost', '')),
+            'Length (cm)': '',
+            'Width (cm)': '',
+            'Height (cm)': '',
+            'Allow customer reviews?': '1',
+            'Purchase note': '',
+            'Sale price': take(np.where(sale_price != regular_price, sale_price, '')),
+            'Regular price': take(regular_price),
+            'Categories': categories.to_numpy(dtype=object),
+            'Tags': self._frame_tags(params, length).to_numpy(dtype=object),
+            'Shipping class': '',
+            'Images': take(image_urls(object_column(products, 'HlavniObrazek', None),
+                                      object_column(products, 'DalsiObrazky', None), IMAGE_BASE_URL)),
+            'Download limit': '',
+            'Download expiry days': '',
+            'Parent': plan['parents'],
+            'Grouped products': '',
+            'Upsells': '',
+            'Cross-sells': '',
+            'External URL': '',
+            'Button text': '',
+            'Position': '0',
+            'Meta: _yoast_wpseo_title': format_template(
+                f"{{product_name}}{SEO_SETTINGS.get('title_suffix', '')}", product_name=name_series
+            ).to_numpy(dtype=object),
+            'Meta: _yoast_wpseo_metadesc': format_template(
+                SEO_SETTINGS.get('meta_desc_template', '{product_name}'),
+                product_name=name_series, category=leaf_categories
+            ).to_numpy(dtype=object),
+            'Meta: _yoast_wpseo_focuskw': first_words(
+                name_series, SEO_SETTINGS.get('focus_keyword_words', 3)).to_numpy(dtype=object),
+        }
+        columns.update(self._frame_attributes(params, plan, length))
+        
+        # Konstantní sloupce (skalární hodnoty) pandas rozšíří na všechny řádky
+        frame = pd.DataFrame(columns, index=pd.RangeIndex(length))
+        logger.info(f"Vytvořeno celkem {length} WooCommerce produktů")
+        return frame
+    
+    def iter_product_chunks(self, chunk_size: int) -> Iterator[List[Dict]]:
+        """
+        Vrací produkty po dávkách bez ukládání do self.woo_products.
+        
+        Dávka se uzavře po dosažení chunk_size produktů, ale vždy až za
+        celou rodinou variant, takže může být o jednu rodinu delší.
+        Sestavení každé dávky se měří jako span product_build.
+        
+        Args:
+            chunk_size (int): Požadovaný počet produktů v dávce.
+        """
+        return instrument_iter('product_build', self._product_chunks(chunk_size))
 
+    def _product_chunks(self, chunk_size: int) -> Iterator[List[Dict]]:
+        """Skládá jednotky produktů do dávek (viz iter_product_chunks)."""
+        chunk = []
+        for unit in self._iter_product_units():
+            chunk.extend(unit)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @spanned('variant_grouping', rows=lambda self: len(self.products_data))
     def _group_products_by_sku_pattern(self) -> Dict:
         """
         Seskupí produkty podle SKU vzoru pro detekci variant.
@@ -504,59 +871,37 @@ class DataTransformer:
                 - parent_groups: Dict[str, List[str]] - mapování parent SKU na seznam variant SKU
                 - all_variant_skus: Set[str] - všechny SKU které jsou součástí nějaké skupiny variant
         """
-        import re
-        
-        # Nejprve najdeme všechny base SKU které mají varianty
-        base_skus_with_variants = set()
-        all_skus = set()
-        
-        for _, product in self.products_data.iterrows():
-            sku = str(product['KodZbozi'])
-            all_skus.add(sku)
-            
-            # Pokud má SKU podtržítko následované číslem, je to varianta
-            if '_' in sku:
-                # Regex který zachytí jakýkoliv base SKU (včetně teček, pomlček atd.)
-                # před podtržítkem a číslem
-                match = re.match(r'^(.+?)_\d+$', sku)
-                if match:
-                    base_sku = match.group(1)
-                    base_skus_with_variants.add(base_sku)
-        
-        # Nyní vytvoříme skupiny
-        parent_groups = {}
-        all_variant_skus = set()
-        
-        for base_sku in base_skus_with_variants:
-            parent_groups[base_sku] = []
-            
-            # Najdeme všechny varianty tohoto base SKU
-            for sku in all_skus:
-                if re.match(f'^{re.escape(base_sku)}_\\d+$', sku):
-                    parent_groups[base_sku].append(sku)
-                    all_variant_skus.add(sku)
-            
-            # Přidáme také base SKU do all_variant_skus
-            # (bude zpracováno jako součást skupiny variant)
-            if base_sku in all_skus:
-                all_variant_skus.add(base_sku)
+        sku_groups = group_skus_by_pattern(self.products_data.get('KodZbozi', pd.Series(dtype=object)))
+        parent_groups = sku_groups['parent_groups']
         
         logger.info(f"Detekováno {len(parent_groups)} skupin variant")
         for parent_sku, variants in parent_groups.items():
             logger.debug(f"Skupina {parent_sku}: parent + {len(variants)} variant")
         
-        return {
-            'parent_groups': parent_groups,
-            'all_variant_skus': all_variant_skus
-        }
+        return sku_groups
 
-    def _create_parent_name(self, variants_group: pd.DataFrame) -> str:
+    @spanned('variant_grouping', rows=lambda self: len(self.products_data))
+    def _group_family_positions(self) -> Dict:
+        """
+        Seskupí řádky do rodin variant podle SKU vzoru (viz group_family_positions).
+        
+        Returns:
+            Dict obsahující:
+                - families: List[Tuple[str, List[int], Optional[int]]] - base SKU, pozice řádků
+                  rodiny a pozice parent řádku (None, pokud base SKU v datech chybí)
+                - simple_positions: List[int] - pozice jednoduchých produktů
+        """
+        families = group_family_positions(self.products_data.get('KodZbozi', pd.Series(dtype=object)))
+        logger.info(f"Detekováno {len(families['families'])} skupin variant")
+        return families
+
+    def _create_parent_name(self, variants_group: List[ProductRecord]) -> str:
         """Vytvoří název pro hlavní variabilní produkt na základě configu."""
-        first_product = variants_group.iloc[0]
-        name = str(first_product['JmenoZbozi'])
+        first_product = variants_group[0]
+        name = str(first_product.JmenoZbozi)
         
         # Odstranění specifických variant z názvu
-        params = parse_parameters(first_product.get('HodnotyParametru', ''))
+        params = self._get_params(first_product)
         attrs_to_remove = VARIANT_SETTINGS.get('parent_name_remove_attrs', [])
         
         for attr in attrs_to_remove:
@@ -614,18 +959,26 @@ class DataTransformer:
                 for v in variants[:3]:  # Zobrazit max 3 varianty
                     print(f"    - {v['SKU']}: Stock={v['Stock']}, In stock={v['In stock?']}")
     
-    def validate_products(self) -> List[str]:
-        """Validuje vytvořené produkty před exportem"""
+    def validate_products(self, products: Optional[List[Dict]] = None) -> List[str]:
+        """
+        Validuje vytvořené produkty před exportem.
+        
+        Args:
+            products (List[Dict], optional): Dávka produktů; výchozí jsou všechny self.woo_products.
+                Rodiny variant jsou v dávce vždy celé, takže kontrola dávky je úplná.
+        """
+        if products is None:
+            products = self.woo_products
         errors = []
         parent_skus = set()
         
         # Najít všechny parent produkty
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variable':
                 parent_skus.add(product['SKU'])
         
         # Zkontrolovat varianty
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variation':
                 if product['Parent'] not in parent_skus:
                     errors.append(f"Varianta {product['SKU']} nemá parent produkt {product['Parent']}")
@@ -639,7 +992,7 @@ class DataTransformer:
                     errors.append(f"Varianta {product['SKU']} nemá žádné atributy")
         
         # Kontrola parent produktů
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variable':
                 # Musí mít atributy
                 has_attributes = any(
@@ -684,18 +1037,26 @@ class DataTransformer:
                 for v in variants[:3]:  # Zobrazit max 3 varianty
                     print(f"    - {v['SKU']}: Stock={v['Stock']}, In stock={v['In stock?']}")
     
-    def validate_products(self) -> List[str]:
-        """Validuje vytvořené produkty před exportem"""
+    def validate_products(self, products: Optional[List[Dict]] = None) -> List[str]:
+        """
+        Validuje vytvořené produkty před exportem.
+        
+        Args:
+            products (List[Dict], optional): Dávka produktů; výchozí jsou všechny self.woo_products.
+                Rodiny variant jsou v dávce vždy celé, takže kontrola dávky je úplná.
+        """
+        if products is None:
+            products = self.woo_products
         errors = []
         parent_skus = set()
         
         # Najít všechny parent produkty
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variable':
                 parent_skus.add(product['SKU'])
         
         # Zkontrolovat varianty
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variation':
                 if product['Parent'] not in parent_skus:
                     errors.append(f"Varianta {product['SKU']} nemá parent produkt {product['Parent']}")
@@ -709,7 +1070,7 @@ class DataTransformer:
                     errors.append(f"Varianta {product['SKU']} nemá žádné atributy")
         
         # Kontrola parent produktů
-        for product in self.woo_products:
+        for product in products:
             if product['Type'] == 'variable':
                 # Musí mít atributy
                 has_attributes = any(
@@ -725,6 +1086,54 @@ class DataTransformer:
         
         return errors
     
+    def validate_product_frame(self, frame: pd.DataFrame) -> List[str]:
+        """
+        Validuje produkty z build_product_frame stejnými pravidly jako validate_products.
+        
+        Args:
+            frame (pd.DataFrame): Produkty po sloupcích.
+        """
+        if frame.empty:
+            return []
+        
+        def filled(column: str) -> pd.Series:
+            if column not in frame.columns:
+                return pd.Series(False, index=frame.index)
+            return frame[column].notna() & (frame[column] != '')
+        
+        types = frame['Type']
+        has_attributes = filled('Attribute 1 name') | filled('Attribute 2 name') | filled('Attribute 3 name')
+        parent_skus = set(frame.loc[types == 'variable', 'SKU'])
+        
+        errors = []
+        # Zkontrolovat varianty
+        variations = types == 'variation'
+        missing_parent = variations & ~frame['Parent'].isin(parent_skus)
+        missing_attributes = variations & ~has_attributes
+        checked = frame.loc[missing_parent | missing_attributes, ['SKU', 'Parent']]
+        for sku, parent, no_parent, no_attributes in zip(checked['SKU'], checked['Parent'],
+                                                         missing_parent[checked.index],
+                                                         missing_attributes[checked.index]):
+            if no_parent:
+                errors.append(f"Varianta {sku} nemá parent produkt {parent}")
+            if no_attributes:
+                errors.append(f"Varianta {sku} nemá žádné atributy")
+        
+        # Kontrola parent produktů
+        variables = types == 'variable'
+        parent_without_attributes = variables & ~has_attributes
+        parent_with_stock = variables & filled('Stock')
+        checked = frame.loc[parent_without_attributes | parent_with_stock, ['SKU', 'Stock']]
+        for sku, stock, no_attributes, has_stock in zip(checked['SKU'], checked['Stock'],
+                                                        parent_without_attributes[checked.index],
+                                                        parent_with_stock[checked.index]):
+            if no_attributes:
+                errors.append(f"Parent produkt {sku} nemá žádné atributy")
+            if has_stock:
+                errors.append(f"Variable produkt {sku} má vyplněný stock: {stock}")
+        
+        return errors
+    
     def run_transformation(self) -> Tuple[List[Dict], List[Dict]]:
         """
         Spustí kompletní transformaci dat a vrátí produkty a kategorie.
@@ -738,7 +1147,8 @@ class DataTransformer:
         self._transform_categories()
         
         # Validace
-        validation_errors = self.validate_products()
+        with span('validation', rows=len(self.woo_products)):
+            validation_errors = self.validate_products()
         if validation_errors:
             logger.warning(f"Nalezeno {len(validation_errors)} validačních chyb:")
             for error in validation_errors[:10]:  # Zobrazit max 10 chyb
@@ -753,17 +1163,164 @@ class DataTransformer:
         logger.info("=== TRANSFORMACE DAT DOKONČENA ===")
         return self.woo_products, self.woo_categories
     
-    def _print_transformation_stats(self) -> None:
-        """Vypíše statistiky transformace."""
-        simple_count = len([p for p in self.woo_products if p['Type'] == 'simple'])
-        variable_count = len([p for p in self.woo_products if p['Type'] == 'variable'])
-        variation_count = len([p for p in self.woo_products if p['Type'] == 'variation'])
+    def run_frame_transformation(self) -> Tuple[pd.DataFrame, List[Dict]]:
+        """
+        Spustí transformaci, která produkty sestaví po sloupcích (viz build_product_frame).
+        
+        Returns:
+            Tuple[pd.DataFrame, List[Dict]]: Produkty jako DataFrame a seznam kategorií.
+        """
+        logger.info("=== SPUŠTĚNÍ SLOUPCOVÉ TRANSFORMACE DAT ===")
+        self._create_category_mapping()
+        products = self.build_product_frame()
+        self._transform_categories()
+        
+        # Validace
+        with span('validation', rows=len(products)):
+            validation_errors = self.validate_product_frame(products)
+        if validation_errors:
+            logger.warning(f"Nalezeno {len(validation_errors)} validačních chyb:")
+            for error in validation_errors[:10]:  # Zobrazit max 10 chyb
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(Counter(products['Type'].tolist()))
+        
+        # Vytisknout report mapování kategorií
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('export_mapping_report', True):
+            self.category_mapper.print_mapping_report()
+        
+        logger.info("=== SLOUPCOVÁ TRANSFORMACE DAT DOKONČENA ===")
+        return products, self.woo_categories
+    
+    def run_streaming_transformation(self, product_sink: Callable[[List[Dict]], None],
+                                     chunk_size: int) -> Tuple[Counter, List[Dict]]:
+        """
+        Spustí transformaci, která produkty předává po dávkách do product_sink.
+        
+        Produkty se neukládají do self.woo_products; v paměti je vždy jen
+        aktuální dávka. Validace proběhne pro každou dávku zvlášť.
+        
+        Args:
+            product_sink (Callable): Funkce volaná s každou dávkou produktů (např. CsvStreamWriter.write).
+            chunk_size (int): Požadovaný počet produktů v dávce.
+        
+        Returns:
+            Tuple[Counter, List[Dict]]: Počty produktů podle typu a seznam kategorií.
+        """
+        logger.info(f"=== SPUŠTĚNÍ STREAMOVANÉ TRANSFORMACE DAT (dávka {chunk_size}) ===")
+        self._create_category_mapping()
+        
+        type_counts = Counter()
+        self.validation_errors = []
+        for chunk in self.iter_product_chunks(chunk_size):
+            with span('validation', rows=len(chunk)):
+                self.validation_errors.extend(self.validate_products(chunk))
+            type_counts.update(product['Type'] for product in chunk)
+            product_sink(chunk)
+        logger.info(f"Vytvořeno celkem {sum(type_counts.values())} WooCommerce produktů")
+        
+        self._transform_categories()
+        
+        if self.validation_errors:
+            logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
+            for error in self.validation_errors[:10]:
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(type_counts)
+        
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('export_mapping_report', True):
+            self.category_mapper.print_mapping_report()
+        
+        logger.info("=== STREAMOVANÁ TRANSFORMACE DAT DOKONČENA ===")
+        return type_counts, self.woo_categories
+    
+    def run_batched_transformation(self, product_batches: Iterable[pd.DataFrame],
+                                   product_sink: Callable[[List[Dict]], None],
+                                   memory_optimization: Optional[bool] = None) -> Tuple[Counter, List[Dict]]:
+        """
+        Spustí transformaci po dávkách vstupních řádků (viz DataLoader.iter_product_chunks).
+        
+        Na rozdíl od run_streaming_transformation není v paměti celý katalog:
+        každá dávka se transformuje, předá do product_sink a její struktury
+        (záznamy, parametry, přiřazení kategorií) se uvolní před načtením další.
+        Rodina variant musí být celá v jedné dávce. Pořadí produktů ve výstupu
+        je po dávkách (v každé dávce jednoduché produkty, pak rodiny variant).
+        
+        Args:
+            product_batches (Iterable[pd.DataFrame]): Dávky řádků listu Zbozi.
+            product_sink (Callable): Funkce volaná s produkty každé dávky (např. CsvStreamWriter.write).
+            memory_optimization (bool, optional): Internovat texty a zmenšit celá čísla
+                v dávce (optimize_frame) a po dávce uvolnit paměť
+                (výchozí ADVANCED_SETTINGS['memory_optimization']).
+        
+        Returns:
+            Tuple[Counter, List[Dict]]: Počty produktů podle typu a seznam kategorií.
+        """
+        if memory_optimization is None:
+            memory_optimization = ADVANCED_SETTINGS.get('memory_optimization', True)
+        logger.info(f"=== SPUŠTĚNÍ DÁVKOVÉ TRANSFORMACE DAT (optimalizace paměti: "
+                    f"{'ano' if memory_optimization else 'ne'}) ===")
+        self._create_category_mapping()
+        
+        type_counts = Counter()
+        self.validation_errors = []
+        monitor = BatchMemoryMonitor(logger)
+        source_rows = 0
+        for batch in product_batches:
+            if memory_optimization:
+                batch = optimize_frame(batch)
+            self._bind_products(batch)
+            with span('product_build') as measured:
+                products = [product for unit in self._iter_product_units() for product in unit]
+                measured.rows = len(products)
+            with span('validation', rows=len(products)):
+                self.validation_errors.extend(self.validate_products(products))
+            type_counts.update(product['Type'] for product in products)
+            product_sink(products)
+            
+            # Uvolnění struktur dávky před načtením další
+            rows, product_count = len(batch), len(products)
+            source_rows += rows
+            self._bind_products(batch.iloc[0:0])
+            del batch, products
+            if memory_optimization:
+                release_memory()
+            monitor.record(rows, product_count)
+        self.batch_stats = monitor.stats
+        logger.info(f"Vytvořeno celkem {sum(type_counts.values())} WooCommerce produktů "
+                    f"v {len(monitor.stats)} dávkách, nejvyšší špička RSS {format_mb(monitor.peak())}")
+        
+        self._transform_categories()
+        
+        if self.validation_errors:
+            logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
+            for error in self.validation_errors[:10]:
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(type_counts, source_rows)
+        
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('export_mapping_report', True):
+            self.category_mapper.print_mapping_report()
+        
+        logger.info("=== DÁVKOVÁ TRANSFORMACE DAT DOKONČENA ===")
+        return type_counts, self.woo_categories
+    
+    def _print_transformation_stats(self, type_counts: Optional[Counter] = None,
+                                    source_rows: Optional[int] = None) -> None:
+        """Vypíše statistiky transformace (při streamování a po dávkách z předaných počtů)."""
+        if type_counts is None:
+            type_counts = Counter(p['Type'] for p in self.woo_products)
+        if source_rows is None:
+            source_rows = len(self.products_data)
+        simple_count = type_counts['simple']
+        variable_count = type_counts['variable']
+        variation_count = type_counts['variation']
         
         print("\n" + "="*50)
         print("STATISTIKY TRANSFORMACE")
         print("="*50)
-        print(f"Celkem FastCentrik produktů: {len(self.products_data)}")
-        print(f"Celkem WooCommerce produktů: {len(self.woo_products)}")
+        print(f"Celkem FastCentrik produktů: {source_rows}")
+        print(f"Celkem WooCommerce produktů: {sum(type_counts.values())}")
         print(f"  - Jednoduché produkty: {simple_count}")
         print(f"  - Variabilní produkty: {variable_count}")
         print(f"  - Varianty: {variation_count}")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seskupování variant podle SKU vzoru
+===================================
+
+Detekuje skupiny variant podle SKU vzoru (např. 033201, 033201_2, 033201_3)
+jedním vektorizovaným průchodem přes sloupec KodZbozi. Base SKU a číselný
+suffix se extrahují jednou pro všechny SKU a skupiny se sestaví hashováním
+podle base SKU, takže cena roste lineárně s počtem produktů.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import pandas as pd
+from typing import Dict, List, Optional, Set
+
+# Varianta = libovolný base SKU (včetně teček, pomlček atd.) + podtržítko a číslo
+SKU_VARIANT_PATTERN = r'^(.+?)_\d+$'
+
+
+def group_skus_by_pattern(skus: pd.Series) -> Dict:
+    """
+    Seskupí SKU podle vzoru {base}_{číslo}.
+
+    Args:
+        skus (pd.Series): Sloupec KodZbozi.
+
+    Returns:
+        Dict obsahující:
+            - parent_groups: Dict[str, List[str]] - mapování base SKU na seznam variant SKU
+              (v pořadí prvního výskytu)
+            - all_variant_skus: Set[str] - všechny SKU které jsou součástí nějaké skupiny variant
+              (varianty i existující base SKU)
+    """
+    # str() na každou hodnotu, stejně jako při zpracování po řádcích (NaN -> 'nan')
+    unique_skus = pd.Series(pd.unique(skus.map(str)), dtype=object)
+    base_skus = unique_skus.str.extract(SKU_VARIANT_PATTERN, expand=False)
+    is_variant = base_skus.notna()
+
+    parent_groups: Dict[str, List[str]] = {}
+    for sku, base_sku in zip(unique_skus[is_variant].tolist(), base_skus[is_variant].tolist()):
+        parent_groups.setdefault(base_sku, []).append(sku)
+
+    all_skus: Set[str] = set(unique_skus.tolist())
+    all_variant_skus: Set[str] = set(unique_skus[is_variant].tolist())
+    # Base SKU existující v datech bude zpracováno jako součást skupiny variant
+    all_variant_skus.update(base_sku for base_sku in parent_groups if base_sku in all_skus)
+
+    return {
+        'parent_groups': parent_groups,
+        'all_variant_skus': all_variant_skus
+    }
+
+
+def group_family_positions(skus: pd.Series) -> Dict:
+    """
+    Sestaví rodiny variant podle SKU vzoru přímo jako pozice řádků.
+
+    Jedním groupby podle base SKU vrátí pro každou rodinu pozice všech jejích
+    řádků (varianty {base}_{číslo} a řádky s base SKU) a pozici parent řádku;
+    jednoduché produkty se určí anti-joinem (řádky mimo všechny rodiny).
+    Skupiny odpovídají group_skus_by_pattern - SKU se porovnávají jako str().
+
+    Args:
+        skus (pd.Series): Sloupec KodZbozi.
+
+    Returns:
+        Dict obsahující:
+            - families: List[Tuple[str, List[int], Optional[int]]] - (base SKU, pozice řádků
+              rodiny v pořadí DataFrame, pozice prvního řádku s base SKU nebo None);
+              rodiny v pořadí prvního výskytu varianty
+            - simple_positions: List[int] - pozice řádků, které nepatří do žádné rodiny
+    """
+    sku_values = pd.Series(skus.map(str).tolist(), dtype=object)
+    base_skus = sku_values.str.extract(SKU_VARIANT_PATTERN, expand=False)
+    is_variant = base_skus.notna()
+    positions = pd.Series(range(len(sku_values)))
+
+    # Rodiny v pořadí prvního výskytu varianty (jako parent_groups)
+    family_order = pd.unique(base_skus[is_variant])
+    is_base_row = sku_values.isin(family_order)
+
+    # Řádek s base SKU, který je zároveň variantou (A_1 u A_1_2), patří do obou rodin
+    members = pd.concat([
+        pd.DataFrame({'family': base_skus[is_variant], 'position': positions[is_variant]}),
+        pd.DataFrame({'family': sku_values[is_base_row], 'position': positions[is_base_row]}),
+    ]).sort_values('position', kind='stable')
+    family_rows = members.groupby('family', sort=False)['position'].agg(list).to_dict()
+    parent_rows = positions[is_base_row].groupby(sku_values[is_base_row], sort=False).first().to_dict()
+
+    return {
+        'families': [(base_sku, family_rows[base_sku], parent_rows.get(base_sku)) for base_sku in family_order],
+        'simple_positions': positions[~(is_variant | is_base_row)].tolist(),
+    }
+
+
+def sku_key(value) -> str:
+    """
+    Normalizuje hodnotu SKU na klíč indexu.
+
+    Celočíselné floaty (např. 33201.0 z numerického sloupce s NaN) se převádí
+    na tvar bez desetinné části, aby odpovídaly stejnému kódu uloženému jako int.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def build_sku_index(skus: pd.Series) -> Dict[str, List[int]]:
+    """
+    Vytvoří hash index SKU -> pozice řádků (iloc) v pořadí v DataFrame.
+
+    Args:
+        skus (pd.Series): Sloupec KodZbozi.
+
+    Returns:
+        Dict[str, List[int]]: Mapování normalizovaného SKU na seznam pozic řádků.
+    """
+    index: Dict[str, List[int]] = {}
+    for position, sku in enumerate(skus.tolist()):
+        if pd.isna(sku):
+            continue
+        index.setdefault(sku_key(sku), []).append(position)
+    return index
+
+
+def assign_family_ids(skus: pd.Series, master_codes: Optional[pd.Series] = None) -> List[int]:
+    """
+    Přiřadí každému řádku číslo rodiny variant.
+
+    Řádky patří do stejné rodiny, pokud mají stejné base SKU (vzor
+    {base}_{číslo}; SKU bez suffixu je samo sobě base) nebo stejný neprázdný
+    KodMasterVyrobku. Řádek, jehož SKU je base jiných řádků, patří do
+    rodiny s nimi (A, A_1 a A_1_2 jsou jedna rodina - DataTransformer
+    z nich sestaví vnořené skupiny A a A_1). Rodina tak pokrývá seskupení
+    podle SKU vzoru (DataTransformer) i podle master kódu
+    (WebToffeeTransformer) a lze podle ní dělit produkty na dávky bez
+    rozdělení skupiny variant.
+
+    Args:
+        skus (pd.Series): Sloupec KodZbozi.
+        master_codes (pd.Series, optional): Sloupec KodMasterVyrobku.
+
+    Returns:
+        List[int]: Číslo rodiny pro každý řádek (číslováno v pořadí prvního výskytu).
+    """
+    sku_values = skus.map(str)
+    base_skus = sku_values.str.extract(SKU_VARIANT_PATTERN, expand=False).fillna(sku_values).tolist()
+    masters = master_codes.tolist() if master_codes is not None else [None] * len(base_skus)
+
+    parent: Dict[tuple, tuple] = {}
+
+    def find(key: tuple) -> tuple:
+        root = parent.setdefault(key, key)
+        while root != parent[root]:
+            root = parent[root]
+        while key != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    def union(key: tuple, root: tuple) -> tuple:
+        other_root = find(key)
+        if other_root != root:
+            parent[other_root] = root
+        return root
+
+    row_keys = []
+    for sku, base_sku, master in zip(sku_values.tolist(), base_skus, masters):
+        key = ('sku', base_sku)
+        # Vlastní SKU spojí řádek s řádky, pro které je base (vnořené suffixy)
+        root = union(('sku', sku), find(key))
+        if pd.notna(master) and master:
+            union(('master', master), root)
+        row_keys.append(key)
+
+    family_numbers: Dict[tuple, int] = {}
+    return [family_numbers.setdefault(find(key), len(family_numbers)) for key in row_keys]
+
+
+def has_master_code_groups(master_codes: Optional[pd.Series]) -> bool:
+    """
+    Zjistí, zda některý neprázdný KodMasterVyrobku sdílí více řádků.
+
+    Odpovídá rozhodnutí WebToffeeTransformer, zda seskupovat varianty podle
+    master kódu, nebo podle SKU vzoru - při dávkovém zpracování se musí
+    rozhodnout jednou pro celý katalog (např. z load_family_index).
+    """
+    if master_codes is None:
+        return False
+    codes = master_codes.astype(object)
+    codes = codes[codes.notna() & (codes != '')]
+    return bool((codes.value_counts() > 1).any())
@@ -11,10 +11,12 @@ Autor: FastCentrik Migration Tool
 Verze: 1.0
 """
 
+import numpy as np
 import pandas as pd
 import re
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Set, Optional
 import sys
 import html
 import logging
@@ -26,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from src.fastcentrik_woocommerce.utils.utils import create_slug, parse_parameters
 from src.fastcentrik_woocommerce.utils.logging_config import setup_logging
 from config.config import (
+    ADVANCED_SETTINGS,
     SEO_SETTINGS,
     TAG_SETTINGS,
     VARIANT_SETTINGS,
@@ -35,6 +38,17 @@ from config.config import (
     CATEGORY_MAPPING_SETTINGS
 )
 from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper
+from src.fastcentrik_woocommerce.loaders.parameter_table import DEFAULT_SIZE_PATTERNS, ParameterTable, infer_size
+from src.fastcentrik_woocommerce.loaders.product_record import ProductRecord, build_product_records, column_values
+from src.fastcentrik_woocommerce.core.category_paths import resolve_category_paths
+from src.fastcentrik_woocommerce.core.family_aggregates import FamilyAggregate, aggregate_families
+from src.fastcentrik_woocommerce.core.product_frame import (
+    image_urls, last_segment, object_column, optional_text_column, output_parameters, price_column, spread_columns,
+    tag_column, text_column
+)
+from src.fastcentrik_woocommerce.core.variant_grouping import build_sku_index, sku_key
+from src.fastcentrik_woocommerce.utils.memory import BatchMemoryMonitor, format_mb, optimize_frame, release_memory
+from src.fastcentrik_woocommerce.utils.instrumentation import instrument_iter, span, spanned
 
 # Nastavení logování s novou konfigurací
 logger = setup_logging(__name__, log_level=logging.DEBUG)
@@ -97,42 +111,111 @@ class WebToffeeTransformer:
     - Obrázky jsou oddělené pipe symbolem |
     """
     
-    def __init__(self, products_df: pd.DataFrame, categories_df: pd.DataFrame):
+    # Pole se stejnou hodnotou u všech produktů (šablona pro slovníky i sloupcové sestavení)
+    CONSTANT_FIELDS = {
+        'manage_stock': 'yes',
+        'visibility': 'visible',
+        'backorders': 'no',
+        'downloadable': 'no',
+        'virtual': 'no',
+        'low_stock_amount': ''
+    }
+    
+    # Neatributové klíče, které má každý produkt z _create_woo_product
+    PRODUCT_COLUMNS = [
+        'ID', 'post_parent', 'parent_sku', 'sku', 'post_title', 'post_excerpt', 'post_content',
+        'post_status', 'regular_price', 'sale_price', 'stock_status', 'stock', 'weight', 'images',
+        'tax:product_type', 'tax:product_cat', 'tax:product_tag', 'menu_order', *CONSTANT_FIELDS
+    ]
+    
+    def __init__(self, products_df: pd.DataFrame, categories_df: pd.DataFrame,
+                 params_table: Optional[ParameterTable] = None):
         """
         Inicializace transformátoru.
 
         Args:
             products_df (pd.DataFrame): DataFrame s produkty.
             categories_df (pd.DataFrame): DataFrame s kategoriemi.
+            params_table (ParameterTable, optional): Předem naparsované parametry produktů.
+                Pokud není zadána, vytvoří se z products_df jedním průchodem.
         """
-        self.products_data = products_df
         self.categories_data = categories_df
+        self._bind_products(products_df, params_table)
         self.category_mapping = {}
         self.woo_products = []
         self.validation_errors = []
         self.product_id_counter = 1000  # Počáteční ID pro produkty
-        self.parent_id_mapping = {}  # Mapování parent SKU na ID
+        # Seskupení variant: None = podle načtených produktů, True = KodMasterVyrobku, False = SKU vzor
+        self.group_by_master_code: Optional[bool] = None
+        self.batch_stats = []  # Paměť po dávkách z run_batched_transformation
         
         # Inicializace category mapperu
         if CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
-            self.category_mapper = CategoryMapper()
+            self.category_mapper = CategoryMapper(
+                cache_size=CATEGORY_MAPPING_SETTINGS.get('mapping_cache_size', 4096)
+            )
             logger.info("Inteligentní mapování kategorií aktivováno")
         else:
             self.category_mapper = None
     
+    @spanned('product_records', rows=lambda self, products_df, params_table=None: len(products_df))
+    def _bind_products(self, products_df: pd.DataFrame,
+                       params_table: Optional[ParameterTable] = None) -> None:
+        """Nastaví produkty, se kterými transformátor pracuje (celý katalog nebo jednu dávku)."""
+        self.products_data = products_df
+        self.params_table = params_table if params_table is not None else ParameterTable.from_products(
+            products_df, size_patterns=VARIANT_SETTINGS.get('size_name_patterns', DEFAULT_SIZE_PATTERNS))
+        self.product_records = build_product_records(products_df)
+        self.parent_id_mapping = {}  # Mapování parent SKU na ID
+        self.sku_index = {}  # Index SKU -> pozice řádků v products_data
+        self.category_assignments = {}  # Label řádku -> (název, kategorie, mapping_type) z dávkového mapování
+    
+    def _get_params(self, row: ProductRecord) -> Dict[str, str]:
+        """Vrátí parametry řádku z tabulky parametrů (bez opakovaného parsování řetězce)."""
+        if row.position < len(self.params_table):
+            return self.params_table.params_at(row.position)
+        return parse_parameters(row.HodnotyParametru)
+    
+    def _get_variant_params(self, row: ProductRecord) -> Dict[str, str]:
+        """Parametry varianty; bez parametrů velikost odvozená z názvu (inferred_velikost)."""
+        params = self._get_params(row)
+        if not params:
+            if row.position < len(self.params_table):
+                size = self.params_table.inferred_size_at(row.position)
+            else:
+                size = infer_size(row.JmenoZbozi,
+                                  VARIANT_SETTINGS.get('size_name_patterns', DEFAULT_SIZE_PATTERNS))
+            if size is not None:
+                params['velikost'] = size
+        return params
+    
+    @spanned('category_mapping')
     def _create_category_mapping(self) -> None:
         """Vytvoří mapování kategorií s hierarchickou strukturou."""
         logger.info("Vytvářím mapování kategorií")
         
-        for _, cat in self.categories_data.iterrows():
-            if pd.notna(cat['InterniKod']) and pd.notna(cat['JmenoKategorie']):
-                self.category_mapping[cat['InterniKod']] = {
-                    'name': cat['JmenoKategorie'],
-                    'parent': cat.get('KodNadrizeneKategorie', ''),
-                    'description': cat.get('PopisKategorie', ''),
-                    'slug': create_slug(cat['JmenoKategorie'])
+        categories = zip(
+            column_values(self.categories_data, 'InterniKod', None),
+            column_values(self.categories_data, 'JmenoKategorie', None),
+            column_values(self.categories_data, 'KodNadrizeneKategorie', ''),
+            column_values(self.categories_data, 'PopisKategorie', '')
+        )
+        for category_id, category_name, parent_id, description in categories:
+            if pd.notna(category_id) and pd.notna(category_name):
+                self.category_mapping[category_id] = {
+                    'name': category_name,
+                    'parent': parent_id,
+                    'description': description,
+                    'slug': create_slug(category_name)
                 }
         
+        # Cesty, hloubky a koncové názvy všech kategorií jedním průchodem
+        hierarchy_issues = resolve_category_paths(self.category_mapping)
+        if hierarchy_issues['orphans']:
+            logger.warning(f"Kategorie s neexistující nadřazenou kategorií: {hierarchy_issues['orphans']}")
+        for cycle in hierarchy_issues['cycles']:
+            logger.warning(f"Cyklus v hierarchii kategorií: {' -> '.join(map(str, cycle))}")
+        
         logger.info(f"Vytvořeno mapování pro {len(self.category_mapping)} kategorií")
     
     def _get_category_path(self, category_id: str) -> str:
@@ -140,29 +223,20 @@ class WebToffeeTransformer:
         if not category_id or category_id not in self.category_mapping:
             return ""
         
-        category = self.category_mapping[category_id]
-        path = [category['name']]
-        
-        # Projdeme hierarchii nahoru
-        parent_id = category['parent']
-        while parent_id and parent_id != 'ROOT_1' and parent_id in self.category_mapping:
-            parent = self.category_mapping[parent_id]
-            path.insert(0, parent['name'])
-            parent_id = parent['parent']
-        
-        return ' > '.join(path)
+        # Cesta je předpočítaná v _create_category_mapping
+        return self.category_mapping[category_id]['path']
     
-    def _get_product_images(self, row: pd.Series) -> str:
+    def _get_product_images(self, row: ProductRecord) -> str:
         """
-        Sestaví seznam obrázků produktu z řádku DataFrame s použitím base URL.
+        Sestaví seznam obrázků produktu ze záznamu produktu s použitím base URL.
         WebToffee používá pipe | jako oddělovač.
         """
         # DEBUG: Log all column names to identify potential image columns
-        logger.debug(f"DEBUG: Dostupné sloupce v DataFrame: {list(row.index)}")
+        logger.debug(f"DEBUG: Dostupné sloupce v DataFrame: {list(self.products_data.columns)}")
         
-        main_image = row.get('HlavniObrazek')
-        additional_images = row.get('DalsiObrazky')
-        sku = row.get('KodZbozi', 'N/A')
+        main_image = row.HlavniObrazek
+        additional_images = row.DalsiObrazky
+        sku = row.KodZbozi
         
         # DEBUG: Log the values of potential image columns
         logger.debug(f"DEBUG: SKU: {sku}, HlavniObrazek: {main_image}, DalsiObrazky: {additional_images}")
@@ -227,17 +301,9 @@ class WebToffeeTransformer:
         
         return text
         
-    def _extract_variant_attributes(self, row: pd.Series) -> Dict[str, str]:
+    def _extract_variant_attributes(self, row: ProductRecord) -> Dict[str, str]:
         """Extrahuje atributy varianty z parametrů nebo názvu."""
-        params = parse_parameters(row.get('HodnotyParametru', ''))
-        
-        # Pokud nejsou parametry, zkusíme extrahovat velikost z názvu
-        if not params and 'JmenoZbozi' in row:
-            name = str(row['JmenoZbozi'])
-            # Hledáme velikost na konci názvu (např. "39 1/3", "40", "41 1/3")
-            size_match = re.search(r'\b(\d{2}(?:\s+\d/\d)?)\b$', name)
-            if size_match:
-                params['velikost'] = size_match.group(1)
+        params = self._get_variant_params(row)
         
         # Filtrujeme pouze variant atributy
         variant_attrs = {}
@@ -247,29 +313,26 @@ class WebToffeeTransformer:
         
         return variant_attrs
     
-    def _create_parent_attributes(self, variants_group: pd.DataFrame) -> Dict[str, str]:
+    @spanned('family_aggregation')
+    def _aggregate_families(self, variant_groups: Dict[str, List[ProductRecord]]) -> Dict[str, FamilyAggregate]:
+        """Spočítá atributy všech skupin variant jedním průchodem (viz aggregate_families)."""
+        return aggregate_families(
+            {key: [variant.position for variant in variants] for key, variants in variant_groups.items()},
+            self.params_table,
+            attributes=VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva'])
+        )
+    
+    def _create_parent_attributes(self, aggregate: FamilyAggregate) -> Dict[str, str]:
         """
         Vytvoří atributy pro parent produkt ve WebToffee formátu.
-        Shromáždí všechny unikátní hodnoty atributů ze všech variant.
+        Hodnoty atributů jsou unikátní hodnoty ze všech variant (souhrn rodiny).
         """
-        all_attributes = {}
-        
-        # Shromáždíme všechny unikátní hodnoty atributů
-        for _, variant in variants_group.iterrows():
-            variant_attrs = self._extract_variant_attributes(variant)
-            
-            for attr_name, attr_value in variant_attrs.items():
-                if attr_name not in all_attributes:
-                    all_attributes[attr_name] = set()
-                all_attributes[attr_name].add(attr_value)
-        
-        # Převod na WebToffee formát
         woo_attributes = {}
         position = 0
+        defaults = aggregate.defaults
         
-        for attr_name, values in all_attributes.items():
+        for attr_name, sorted_values in aggregate.attributes.items():
             mapped_name = ATTRIBUTE_MAPPING.get(attr_name, attr_name)
-            sorted_values = sorted(values)
             
             # WebToffee formát pro atributy - používáme pa_ prefix
             attr_key = f'pa_{mapped_name.lower()}'
@@ -278,13 +341,13 @@ class WebToffeeTransformer:
             woo_attributes[f'attribute:{attr_key}'] = '|'.join(sorted_values)
             # position|visible|variation
             woo_attributes[f'attribute_data:{attr_key}'] = f'{position}|1|1'
-            woo_attributes[f'attribute_default:{attr_key}'] = sorted_values[0] if sorted_values else ''
+            woo_attributes[f'attribute_default:{attr_key}'] = defaults.get(attr_name, '')
             
             position += 1
         
         return woo_attributes
     
-    def _create_variant_attributes(self, row: pd.Series) -> Dict[str, str]:
+    def _create_variant_attributes(self, row: ProductRecord) -> Dict[str, str]:
         """Vytvoří atributy pro variantu ve WebToffee formátu."""
         variant_attrs = self._extract_variant_attributes(row)
         woo_attributes = {}
@@ -303,20 +366,71 @@ class WebToffeeTransformer:
         
         return woo_attributes
     
-    def _get_category_path_for_product(self, row: pd.Series) -> str:
+    @spanned('category_mapping', rows=lambda self: len(self.products_data))
+    def _precompute_category_assignments(self) -> None:
+        """Namapuje kategorie celého katalogu jedním dávkovým voláním mapperu."""
+        self.category_assignments = {}
+        if not self.category_mapper or not self.products_data.index.is_unique:
+            return
+        
+        if 'InetrniKodyKategorii' in self.products_data.columns:
+            original_categories = self.products_data['InetrniKodyKategorii'].astype(object).map(
+                self._get_category_path)
+        else:
+            original_categories = None
+        
+        categories, mapping_types = self.category_mapper.map_dataframe(
+            self.products_data, self.params_table,
+            original_categories=original_categories,
+            multi_category=CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False),
+            max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
+            strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary'),
+            update_stats=False
+        )
+        names = self.products_data['JmenoZbozi'].map(str) if 'JmenoZbozi' in self.products_data.columns \
+            else pd.Series('', index=self.products_data.index)
+        self.category_assignments = dict(zip(
+            self.products_data.index, zip(names.tolist(), categories.tolist(), mapping_types.tolist())
+        ))
+    
+    def _map_product_categories(self, row: ProductRecord, name: str, params: Dict[str, str]) -> Tuple[List[str], str]:
+        """
+        Vrátí kategorie produktu z dávkového mapování, případně namapuje řádek samostatně.
+        
+        Samostatně se mapují řádky upravené během transformace (např. parent
+        produkt s novým názvem). Statistiky mapperu se započítají v obou případech.
+        """
+        assignment = self.category_assignments.get(row.label)
+        if assignment is not None and assignment[0] == name:
+            _, categories, mapping_type = assignment
+            self.category_mapper.record_mapping(name, categories, mapping_type)
+            return list(categories), mapping_type
+        
+        original_category = self._get_category_path(row.InetrniKodyKategorii)
+        if CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False):
+            return self.category_mapper.map_product_to_multiple_categories(
+                product_name=name,
+                product_params=params,
+                original_category=original_category,
+                max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
+                strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary')
+            )
+        
+        category_path, mapping_type = self.category_mapper.map_product_to_category(
+            product_name=name,
+            product_params=params,
+            original_category=original_category
+        )
+        return ([category_path] if category_path else []), mapping_type
+    
+    def _get_category_path_for_product(self, row: ProductRecord) -> str:
         """Získá cestu kategorie pro produkt s podporou inteligentního mapování."""
-        name = str(row['JmenoZbozi'])
-        params = parse_parameters(row.get('HodnotyParametru', ''))
+        name = str(row.JmenoZbozi)
+        params = self._get_params(row)
         
         if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
             if CATEGORY_MAPPING_SETTINGS.get('enable_multi_category', False):
-                categories, _ = self.category_mapper.map_product_to_multiple_categories(
-                    product_name=name,
-                    product_params=params,
-                    original_category=self._get_category_path(row.get('InetrniKodyKategorii', '')),
-                    max_categories=CATEGORY_MAPPING_SETTINGS.get('max_categories_per_product', 2),
-                    strategy=CATEGORY_MAPPING_SETTINGS.get('multi_category_strategy', 'complementary')
-                )
+                categories, _ = self._map_product_categories(row, name, params)
                 
                 if categories:
                     separator = '|'  # WebToffee používá pipe pro více kategorií
@@ -326,23 +440,19 @@ class WebToffeeTransformer:
                     else:
                         return separator.join(categories)
             else:
-                category_path, _ = self.category_mapper.map_product_to_category(
-                    product_name=name,
-                    product_params=params,
-                    original_category=self._get_category_path(row.get('InetrniKodyKategorii', ''))
-                )
-                return category_path
+                categories, _ = self._map_product_categories(row, name, params)
+                return categories[0] if categories else ""
         else:
             # Původní mapování
-            if pd.notna(row.get('InetrniKodyKategorii')):
-                category_path = self._get_category_path(row['InetrniKodyKategorii'])
+            if pd.notna(row.InetrniKodyKategorii):
+                category_path = self._get_category_path(row.InetrniKodyKategorii)
                 if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True) and category_path:
                     return category_path.split(' > ')[-1].strip()
                 return category_path
         
         return ""
     
-    def _create_woo_product(self, row: pd.Series, product_type: str = 'simple',
+    def _create_woo_product(self, row: ProductRecord, product_type: str = 'simple',
                            parent_id: str = '', parent_attributes: Dict = None,
                            is_variation: bool = False, parent_sku: str = '',
                            menu_order: int = 0) -> Dict:
@@ -363,7 +473,7 @@ class WebToffeeTransformer:
         self.product_id_counter += 1
         
         # Základní informace
-        sku = str(row['KodZbozi'])
+        sku = str(row.KodZbozi)
         
         # Pro varianty používáme minimální data
         if is_variation:
@@ -378,44 +488,39 @@ class WebToffeeTransformer:
                 'post_parent': parent_id,
                 'parent_sku': parent_sku,
                 'sku': '',  # bude doplněno jako {parentSKU}_{index}
-                'post_title': str(row['JmenoZbozi']),
+                'post_title': str(row.JmenoZbozi),
                 'post_excerpt': short_description,
-                'post_content': self._clean_html(str(row.get('Popis', '')) if pd.notna(row.get('Popis')) else ''),
-                'post_status': 'publish' if row.get('Vypnuto', 0) == 0 else 'draft',
-                'regular_price': self._format_price(row.get('CenaBezna', '')),
-                'sale_price': self._format_price(row.get('ZakladniCena', '')) if pd.notna(row.get('ZakladniCena')) else '',
-                'stock_status': 'instock' if row.get('NaSklade', 0) > 0 else 'outofstock',
-                'stock': str(row.get('NaSklade', 0)),
-                'manage_stock': 'yes',
-                'weight': self._format_price(row.get('Hmotnost', '')),
+                'post_content': self._clean_html(str(row.Popis) if pd.notna(row.Popis) else ''),
+                'post_status': 'publish' if row.Vypnuto == 0 else 'draft',
+                'regular_price': self._format_price(row.CenaBezna),
+                'sale_price': self._format_price(row.ZakladniCena) if pd.notna(row.ZakladniCena) else '',
+                'stock_status': 'instock' if row.NaSklade > 0 else 'outofstock',
+                'stock': str(row.NaSklade),
+                'weight': self._format_price(row.Hmotnost),
                 'images': '',  # Varianty nemají vlastní obrázky
                 'tax:product_type': '',  # Prázdný typ pro varianty
                 'tax:product_cat': '',
                 'tax:product_tag': '',
-                'visibility': 'visible',
-                'backorders': 'no',
-                'downloadable': 'no',
-                'virtual': 'no',
                 'menu_order': str(menu_order),
-                'low_stock_amount': ''
+                **self.CONSTANT_FIELDS
             }
         else:
             # Plné informace pro simple a variable produkty
-            name = str(row['JmenoZbozi'])
+            name = str(row.JmenoZbozi)
             category_path = self._get_category_path_for_product(row)
-            regular_price = self._format_price(row.get('CenaBezna', ''))
-            sale_price = self._format_price(row.get('ZakladniCena', ''))
-            description = str(row.get('Popis', '')) if pd.notna(row.get('Popis')) else ''
-            short_description = str(row.get('KratkyPopis', '')) if pd.notna(row.get('KratkyPopis')) else ''
+            regular_price = self._format_price(row.CenaBezna)
+            sale_price = self._format_price(row.ZakladniCena)
+            description = str(row.Popis) if pd.notna(row.Popis) else ''
+            short_description = str(row.KratkyPopis) if pd.notna(row.KratkyPopis) else ''
             images = self._get_product_images(row)
-            stock_quantity = row.get('NaSklade', 0)
+            stock_quantity = row.NaSklade
             stock_status = 'instock' if stock_quantity > 0 else 'outofstock'
-            post_status = 'publish' if row.get('Vypnuto', 0) == 0 else 'draft'
+            post_status = 'publish' if row.Vypnuto == 0 else 'draft'
             
             # Tagy
             tags = []
             if TAG_SETTINGS.get('auto_generate_tags', False):
-                params = parse_parameters(row.get('HodnotyParametru', ''))
+                params = self._get_params(row)
                 tag_attributes = TAG_SETTINGS.get('tag_attributes', [])
                 for tag_attr in tag_attributes:
                     if tag_attr in params:
@@ -438,18 +543,13 @@ class WebToffeeTransformer:
                 'sale_price': sale_price if sale_price != regular_price else '',
                 'stock_status': stock_status,
                 'stock': str(stock_quantity),
-                'manage_stock': 'yes',
-                'weight': self._format_price(row.get('Hmotnost', '')),
+                'weight': self._format_price(row.Hmotnost),
                 'images': images,
                 'tax:product_type': webtoffee_type,
                 'tax:product_cat': category_path,
                 'tax:product_tag': '|'.join(tags) if tags else '',
-                'visibility': 'visible',
-                'backorders': 'no',
-                'downloadable': 'no',
-                'virtual': 'no',
                 'menu_order': '0',
-                'low_stock_amount': ''
+                **self.CONSTANT_FIELDS
             }
         # Přidání atributů podle typu produktu
         if product_type == 'variable' and not is_variation:
@@ -462,7 +562,7 @@ class WebToffeeTransformer:
             woo_product.update(variant_attrs)
         elif product_type == 'simple':
             # Jednoduchý produkt - všechny parametry jako atributy
-            params = parse_parameters(row.get('HodnotyParametru', ''))
+            params = self._get_params(row)
             position = 0
             for attr_name, attr_value in params.items():
                 mapped_name = ATTRIBUTE_MAPPING.get(attr_name, attr_name)
@@ -474,7 +574,8 @@ class WebToffeeTransformer:
         
         return woo_product
     
-    def _group_products_by_master_code(self) -> Dict[str, List[pd.Series]]:
+    @spanned('variant_grouping', rows=lambda self: len(self.products_data))
+    def _group_products_by_master_code(self) -> Dict[str, List[ProductRecord]]:
         """
         Seskupí produkty podle KodMasterVyrobku pro detekci variant.
         
@@ -483,8 +584,8 @@ class WebToffeeTransformer:
         """
         groups = {}
         
-        for _, product in self.products_data.iterrows():
-            master_code = product.get('KodMasterVyrobku', '')
+        for product in self.product_records:
+            master_code = product.KodMasterVyrobku
             
             # Pokud má master kód, přidáme do skupiny
             if pd.notna(master_code) and master_code:
@@ -499,7 +600,8 @@ class WebToffeeTransformer:
         
         return variant_groups
     
-    def _group_products_by_sku_pattern(self) -> Dict[str, List[pd.Series]]:
+    @spanned('variant_grouping', rows=lambda self: len(self.products_data))
+    def _group_products_by_sku_pattern(self) -> Dict[str, List[ProductRecord]]:
         """
         Alternativní metoda - seskupí produkty podle SKU vzoru.
         Např. 033201, 033201_2, 033201_3
@@ -508,27 +610,25 @@ class WebToffeeTransformer:
             Dict mapující base SKU na seznam produktů
         """
         groups = {}
-        all_products = {}
-        
-        # Nejprve uložíme všechny produkty podle SKU
-        for _, product in self.products_data.iterrows():
-            sku = str(product['KodZbozi'])
-            all_products[sku] = product
         
-        # Najdeme base SKU které mají varianty
-        for sku, product in all_products.items():
+        # Najdeme base SKU které mají varianty (pozice řádků bereme ze sdíleného indexu)
+        for sku, positions in self.sku_index.items():
             # Pokud SKU končí _číslo, je to varianta
             match = re.match(r'^(.+?)_\d+$', sku)
             if match:
                 base_sku = match.group(1)
-                if base_sku not in groups:
-                    groups[base_sku] = []
-                groups[base_sku].append(product)
+                group = groups.setdefault(base_sku, [])
+                group.append(positions[-1])
                 
                 # Přidáme také base SKU pokud existuje
-                if base_sku in all_products:
-                    if all_products[base_sku] not in groups[base_sku]:
-                        groups[base_sku].append(all_products[base_sku])
+                base_positions = self.sku_index.get(base_sku)
+                if base_positions and base_positions[-1] not in group:
+                    group.append(base_positions[-1])
+        
+        groups = {
+            base_sku: [self.product_records[position] for position in positions]
+            for base_sku, positions in groups.items()
+        }
         
         # Filtrujeme skupiny s více než jedním produktem
         variant_groups = {k: v for k, v in groups.items() if len(v) > 1}
@@ -537,10 +637,26 @@ class WebToffeeTransformer:
         
         return variant_groups
     
-    def _create_parent_name(self, variants_group: List[pd.Series]) -> str:
+    def _find_product_with_images(self, positions: List[int]) -> Optional[ProductRecord]:
+        """
+        Vrátí první produkt z daných pozic, který má vyplněný hlavní nebo další obrázky.
+        
+        Args:
+            positions: Pozice řádků z indexu SKU
+            
+        Returns:
+            Záznam produktu nebo None
+        """
+        for position in positions:
+            product = self.product_records[position]
+            if pd.notna(product.HlavniObrazek) or pd.notna(product.DalsiObrazky):
+                return product
+        return None
+    
+    def _create_parent_name(self, variants_group: List[ProductRecord]) -> str:
         """Vytvoří název pro parent produkt."""
         first_product = variants_group[0]
-        name = str(first_product['JmenoZbozi'])
+        name = str(first_product.JmenoZbozi)
         
         # Odstranění variant-specific částí z názvu
         variant_attrs = self._extract_variant_attributes(first_product)
@@ -555,15 +671,64 @@ class WebToffeeTransformer:
         
         return name
     
-    def _transform_products(self) -> None:
-        """Hlavní metoda pro transformaci produktů."""
-        logger.info("Zahajuji transformaci produktů do WebToffee formátu")
+    def _detect_variant_groups(self) -> Dict[str, List[ProductRecord]]:
+        """Seskupí varianty podle KodMasterVyrobku, případně podle SKU vzoru (viz group_by_master_code)."""
+        if self.group_by_master_code is None:
+            variant_groups = self._group_products_by_master_code()
+            if not variant_groups:
+                logger.info("KodMasterVyrobku nenalezen, zkouším detekci podle SKU vzoru")
+                variant_groups = self._group_products_by_sku_pattern()
+        elif self.group_by_master_code:
+            # Způsob seskupení je určen pro celý katalog (dávkové zpracování)
+            variant_groups = self._group_products_by_master_code()
+        else:
+            variant_groups = self._group_products_by_sku_pattern()
+        return variant_groups
+    
+    def _sort_variants(self, variants: List[ProductRecord]) -> List[ProductRecord]:
+        """Seřadí varianty přirozeně podle hodnoty prvního variantního atributu."""
+        def natural_sort_key(s):
+            if isinstance(s, str):
+                return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', s)]
+            return [s]
 
+        primary_attr_name = VARIANT_SETTINGS.get('variant_attributes', ['velikost'])[0]
+        
+        sort_keys = [
+            self._extract_variant_attributes(v).get(primary_attr_name, '')
+            for v in variants
+        ]
+        return [
+            v for _, v in sorted(zip(sort_keys, variants), key=lambda item: natural_sort_key(item[0]))
+        ]
+    
+    def _unique_variant_sku(self, parent_sku: str, variant_index: int, emitted_skus: Set[str]) -> str:
+        """Vrátí SKU varianty {parentSKU}_{index}, při kolizi s už vydaným SKU s příponou _v{n}."""
+        unique_variant_sku = f"{parent_sku}_{variant_index}"
+        
+        bump = 1
+        while unique_variant_sku in emitted_skus:
+            bump += 1
+            unique_variant_sku = f"{parent_sku}_{variant_index}_v{bump}"
+        return unique_variant_sku
+    
+    def _iter_product_units(self) -> Iterator[List[Dict]]:
+        """
+        Postupně vytváří WebToffee produkty.
+        
+        Vrací celé jednotky exportu: rodinu variant jako [parent, varianty...]
+        a jednoduchý produkt jako jednoprvkový seznam, takže se rodina nikdy
+        nerozdělí mezi dávky. Drží jen množinu už vydaných SKU.
+        """
+        # Index SKU -> pozice řádků, sdílený pro parent lookup, fallback obrázků a varianty
+        with span('variant_grouping'):
+            self.sku_index = build_sku_index(self.products_data.get('KodZbozi', pd.Series(dtype=object)))
+        
+        # Kategorie celého katalogu se namapují najednou
+        self._precompute_category_assignments()
+        
         # Detekce variant - prioritně podle KodMasterVyrobku
-        variant_groups = self._group_products_by_master_code()
-        if not variant_groups:
-            logger.info("KodMasterVyrobku nenalezen, zkouším detekci podle SKU vzoru")
-            variant_groups = self._group_products_by_sku_pattern()
+        variant_groups = self._detect_variant_groups()
 
         # --> ENHANCED DIAGNOSTIC BLOCK
         if variant_groups:
@@ -582,11 +747,11 @@ class WebToffeeTransformer:
                 
                 # Detailní výpis dat každé varianty
                 for i, product_row in enumerate(first_group):
-                    sku = product_row.get('KodZbozi', 'N/A')
-                    name = product_row.get('JmenoZbozi', 'N/A')
-                    main_img = product_row.get('HlavniObrazek', 'N/A')
-                    add_imgs = product_row.get('DalsiObrazky', 'N/A')
-                    params = product_row.get('HodnotyParametru', 'N/A')
+                    sku = product_row.KodZbozi
+                    name = product_row.JmenoZbozi
+                    main_img = product_row.HlavniObrazek
+                    add_imgs = product_row.DalsiObrazky
+                    params = product_row.HodnotyParametru
                     
                     logger.info(f"\nVarianta {i}:")
                     logger.info(f"  SKU: '{sku}'")
@@ -607,7 +772,11 @@ class WebToffeeTransformer:
                 logger.info("="*80 + "\n")
         # <-- END ENHANCED DIAGNOSTIC BLOCK
 
+        # Atributy všech skupin variant najednou
+        aggregates = self._aggregate_families(variant_groups)
+        
         processed_skus = set()
+        emitted_skus = set()  # SKU všech dosud vytvořených produktů
         variable_count = 0
         variation_count = 0
         
@@ -616,7 +785,7 @@ class WebToffeeTransformer:
         for master_code, variants in variant_groups.items():
             # Přidání SKU všech variant do `processed_skus`, aby se nevytvořily jako Simple
             for v in variants:
-                processed_skus.add(str(v['KodZbozi']))
+                processed_skus.add(str(v.KodZbozi))
             
             if not variants:
                 logger.warning(f"Skupina variant pro master_code '{master_code}' je prázdná, přeskakuji.")
@@ -626,32 +795,27 @@ class WebToffeeTransformer:
             # Tento produkt by měl být použit jako parent, protože obsahuje obrázky
             logger.info(f"Hledám produkt s KodZbozi={master_code} pro použití jako parent...")
             
-            # Vytvoříme kopii celého DataFrame pro vyhledávání
-            all_products_df = self.products_data.copy()
-            
-            # Hledáme produkt s KodZbozi = master_code
-            parent_product_rows = all_products_df[all_products_df['KodZbozi'] == master_code]
+            # Hledáme produkt s KodZbozi = master_code v indexu (bez kopie a skenu DataFrame)
+            parent_positions = self.sku_index.get(sku_key(master_code), [])
             
-            if len(parent_product_rows) > 0:
+            if parent_positions:
                 # Použijeme existující produkt jako parent
                 logger.info(f"Nalezen existující produkt s KodZbozi={master_code}, použiji ho jako parent")
-                parent_data = parent_product_rows.iloc[0].copy()
+                parent_data = self.product_records[parent_positions[0]]
                 parent_sku = master_code
                 
                 # Vypíšeme informace o obrázcích pro diagnostiku
                 logger.info(f"Parent produkt má tyto obrázky:")
-                logger.info(f"  HlavniObrazek: {parent_data.get('HlavniObrazek', 'N/A')}")
-                logger.info(f"  DalsiObrazky: {parent_data.get('DalsiObrazky', 'N/A')}")
+                logger.info(f"  HlavniObrazek: {parent_data.HlavniObrazek}")
+                logger.info(f"  DalsiObrazky: {parent_data.DalsiObrazky}")
             else:
                 # Fallback na původní logiku - použijeme první variantu
                 logger.info(f"Nenalezen existující produkt s KodZbozi={master_code}, použiji první variantu jako parent")
                 first_variant = variants[0]
                 parent_sku = master_code
-                parent_data = first_variant.copy()
-                parent_data['JmenoZbozi'] = self._create_parent_name(variants)
+                parent_data = first_variant._replace(JmenoZbozi=self._create_parent_name(variants))
             
-            variants_df = pd.DataFrame(variants)
-            parent_attributes = self._create_parent_attributes(variants_df)
+            parent_attributes = self._create_parent_attributes(aggregates[master_code])
 
             parent_product = self._create_woo_product(
                 parent_data,
@@ -667,21 +831,22 @@ class WebToffeeTransformer:
             logger.info(f"\n>>> Získávám obrázky pro parent SKU: {parent_sku}")
             
             # DEBUG: Log parent_data columns and values
-            logger.debug(f"DEBUG: parent_data sloupce: {list(parent_data.index)}")
-            logger.debug(f"DEBUG: parent_data KodZbozi: {parent_data.get('KodZbozi', 'N/A')}")
+            logger.debug(f"DEBUG: parent_data sloupce: {list(self.products_data.columns)}")
+            logger.debug(f"DEBUG: parent_data KodZbozi: {parent_data.KodZbozi}")
             
             # Check if the product has the expected image columns
-            if 'HlavniObrazek' not in parent_data or 'DalsiObrazky' not in parent_data:
+            if 'HlavniObrazek' not in self.products_data.columns or 'DalsiObrazky' not in self.products_data.columns:
                 logger.warning(f"DEBUG: Produkt nemá očekávané sloupce s obrázky!")
-                # Try to identify image columns by looking at all columns
-                for col in parent_data.index:
-                    val = parent_data.get(col)
+                # Try to identify image columns by looking at all columns of the source row
+                source_row = self.products_data.iloc[parent_data.position]
+                for col in source_row.index:
+                    val = source_row.get(col)
                     if pd.notna(val) and isinstance(val, str) and ('/images/' in val or '.jpg' in val or '.png' in val):
                         logger.info(f"DEBUG: Potenciální sloupec s obrázkem: {col} = {val[:100]}...")
             
             # Explicitně zkontrolujeme hodnoty obrázků
-            hlavni_obrazek = parent_data.get('HlavniObrazek')
-            dalsi_obrazky = parent_data.get('DalsiObrazky')
+            hlavni_obrazek = parent_data.HlavniObrazek
+            dalsi_obrazky = parent_data.DalsiObrazky
             
             logger.info(f"Hodnoty obrázků v parent_data:")
             logger.info(f"  HlavniObrazek: {hlavni_obrazek}")
@@ -691,21 +856,19 @@ class WebToffeeTransformer:
             if pd.isna(hlavni_obrazek) and pd.isna(dalsi_obrazky):
                 logger.warning(f"Obě hodnoty obrázků jsou NaN, zkusím najít produkt s obrázky v celém DataFrame")
                 
-                # Hledáme produkt s KodZbozi = master_code v celém DataFrame
-                all_products_with_images = self.products_data[
-                    (self.products_data['KodZbozi'] == master_code) &
-                    (self.products_data['HlavniObrazek'].notna() | self.products_data['DalsiObrazky'].notna())
-                ]
+                # Hledáme produkt s KodZbozi = master_code a s obrázky přes index
+                image_product = self._find_product_with_images(parent_positions)
                 
-                if len(all_products_with_images) > 0:
+                if image_product is not None:
                     logger.info(f"Nalezen produkt s obrázky v celém DataFrame, použiji ho pro obrázky")
-                    image_product = all_products_with_images.iloc[0]
-                    parent_data['HlavniObrazek'] = image_product['HlavniObrazek']
-                    parent_data['DalsiObrazky'] = image_product['DalsiObrazky']
+                    parent_data = parent_data._replace(
+                        HlavniObrazek=image_product.HlavniObrazek,
+                        DalsiObrazky=image_product.DalsiObrazky
+                    )
                     
                     logger.info(f"Nové hodnoty obrázků:")
-                    logger.info(f"  HlavniObrazek: {parent_data['HlavniObrazek']}")
-                    logger.info(f"  DalsiObrazky: {parent_data['DalsiObrazky']}")
+                    logger.info(f"  HlavniObrazek: {parent_data.HlavniObrazek}")
+                    logger.info(f"  DalsiObrazky: {parent_data.DalsiObrazky}")
             
             parent_images = self._get_product_images(parent_data)
             parent_product['images'] = parent_images
@@ -719,15 +882,15 @@ class WebToffeeTransformer:
                 # If first variant has no images, try other variants
                 logger.warning(f"První varianta nemá obrázky, zkouším další varianty...")
                 for i, variant in enumerate(variants[1:]):
-                    logger.debug(f"DEBUG: Zkouším variantu {i+2}, SKU: {variant.get('KodZbozi', 'N/A')}")
+                    logger.debug(f"DEBUG: Zkouším variantu {i+2}, SKU: {variant.KodZbozi}")
                     # Log variant columns
-                    logger.debug(f"DEBUG: Sloupce varianty: {list(variant.index)}")
+                    logger.debug(f"DEBUG: Sloupce varianty: {list(ProductRecord._fields)}")
                     
                     variant_images = self._get_product_images(variant)
                     if variant_images:
                         parent_product['images'] = variant_images
                         image_count = len(variant_images.split('|'))
-                        logger.info(f"<<< Nalezeny obrázky ve variantě {variant.get('KodZbozi')}: {image_count} obrázků")
+                        logger.info(f"<<< Nalezeny obrázky ve variantě {variant.KodZbozi}: {image_count} obrázků")
                         break
                 
                 if not parent_product['images']:
@@ -739,36 +902,18 @@ class WebToffeeTransformer:
             parent_id = parent_product['ID']
             self.parent_id_mapping[parent_sku] = parent_id
             
-            self.woo_products.append(parent_product)
+            family = [parent_product]
+            emitted_skus.add(parent_product['sku'])
             variable_count += 1
             processed_skus.add(parent_sku)
 
             # Seřazení variant
-            def natural_sort_key(s):
-                if isinstance(s, str):
-                    return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', s)]
-                return [s]
-
-            primary_attr_name = VARIANT_SETTINGS.get('variant_attributes', ['velikost'])[0]
-            
-            for v in variants:
-                attrs = self._extract_variant_attributes(v)
-                v['sort_key'] = attrs.get(primary_attr_name, '')
-            
-            variants_sorted = sorted(variants, key=lambda v: natural_sort_key(v['sort_key']))
+            variants_sorted = self._sort_variants(variants)
 
             # Zpracování jednotlivých variant
-            all_current_skus = {p['sku'] for p in self.woo_products}
-            
             for i, variant in enumerate(variants_sorted):
                 variant_index = i + 1
-                base_variant_sku = f"{parent_sku}_{variant_index}"
-                unique_variant_sku = base_variant_sku
-                
-                bump = 1
-                while unique_variant_sku in all_current_skus:
-                    bump += 1
-                    unique_variant_sku = f"{parent_sku}_{variant_index}_v{bump}"
+                unique_variant_sku = self._unique_variant_sku(parent_sku, variant_index, emitted_skus)
                 
                 variant_product = self._create_woo_product(
                     variant,
@@ -779,15 +924,17 @@ class WebToffeeTransformer:
                     menu_order=variant_index
                 )
                 variant_product['sku'] = unique_variant_sku
-                all_current_skus.add(unique_variant_sku)
+                emitted_skus.add(unique_variant_sku)
                 
                 # Přidáme obrázky z parent produktu i do variant
                 if parent_images_for_variants:
                     variant_product['images'] = parent_images_for_variants
                     logger.debug(f"Kopíruji obrázky z parent produktu do varianty {unique_variant_sku}")
 
-                self.woo_products.append(variant_product)
+                family.append(variant_product)
                 variation_count += 1
+            
+            yield family
         
         logger.info(f"Vytvořeno {variable_count} variable produktů a {variation_count} variant.")
         logger.info(f"{len(processed_skus)} SKU označeno jako zpracované (varianty a jejich rodiče).")
@@ -795,27 +942,328 @@ class WebToffeeTransformer:
         # 2. Zpracování jednoduchých produktů
         simple_count = 0
         logger.info("Zpracovávám jednoduché produkty...")
-        for _, product in self.products_data.iterrows():
-            sku = str(product['KodZbozi'])
+        for product in self.product_records:
+            sku = str(product.KodZbozi)
             if sku not in processed_skus:
                 woo_product = self._create_woo_product(product, 'simple')
                 if woo_product['sku'] not in processed_skus:
-                    self.woo_products.append(woo_product)
                     simple_count += 1
                     processed_skus.add(woo_product['sku'])
+                    emitted_skus.add(woo_product['sku'])
+                    yield [woo_product]
 
         logger.info(f"Zpracováno {simple_count} jednoduchých produktů.")
+    
+    def _transform_products(self) -> None:
+        """Hlavní metoda pro transformaci produktů."""
+        logger.info("Zahajuji transformaci produktů do WebToffee formátu")
+        
+        with span('product_build') as measured:
+            for unit in self._iter_product_units():
+                self.woo_products.extend(unit)
+            measured.rows = len(self.woo_products)
+        
         logger.info(f"Celkem vytvořeno {len(self.woo_products)} produktů (včetně variant).")
     
-    def validate_products(self) -> List[str]:
-        """Validuje vytvořené produkty."""
+    def iter_product_chunks(self, chunk_size: int) -> Iterator[List[Dict]]:
+        """
+        Vrací produkty po dávkách bez ukládání do self.woo_products.
+        
+        Dávka se uzavře po dosažení chunk_size produktů, ale vždy až za
+        celou rodinou variant, takže může být o jednu rodinu delší.
+        Sestavení každé dávky se měří jako span product_build.
+        
+        Args:
+            chunk_size: Požadovaný počet produktů v dávce
+        """
+        return instrument_iter('product_build', self._product_chunks(chunk_size))
+
+    def _product_chunks(self, chunk_size: int) -> Iterator[List[Dict]]:
+        """Skládá jednotky produktů do dávek (viz iter_product_chunks)."""
+        chunk = []
+        for unit in self._iter_product_units():
+            chunk.extend(unit)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def _plan_product_rows(self) -> Dict:
+        """
+        Rozvrhne výstupní řádky ve stejném pořadí a se stejnými ID jako _iter_product_units.
+        
+        Returns:
+            Dict obsahující:
+                - positions: np.ndarray - pozice zdrojového řádku každého produktu
+                - kinds: List[str] - druh řádku (simple, variable, variation)
+                - ids, skus, parent_ids, parent_skus, menu_orders: List - hodnoty sloupců
+                  ID, sku, post_parent, parent_sku a menu_order
+                - titles: Dict[int, str] - upravené názvy parent produktů podle výstupního řádku
+                - images: Dict[int, str] - obrázky parent produktů a variant podle výstupního řádku
+                - aggregates: List[Tuple[int, FamilyAggregate]] - souhrn rodiny každého parent produktu
+        """
+        with span('variant_grouping'):
+            self.sku_index = build_sku_index(self.products_data.get('KodZbozi', pd.Series(dtype=object)))
+        self._precompute_category_assignments()
+        variant_groups = self._detect_variant_groups()
+        aggregates = self._aggregate_families(variant_groups)
+        
+        # Obrázky každého zdrojového řádku (parent produkty je přebírají z řádku s obrázky)
+        source_images = image_urls(object_column(self.products_data, 'HlavniObrazek', None),
+                                   object_column(self.products_data, 'DalsiObrazky', None),
+                                   IMAGE_BASE_URL).tolist()
+        
+        plan = {key: [] for key in ('positions', 'kinds', 'ids', 'skus', 'parent_ids', 'parent_skus',
+                                    'menu_orders', 'aggregates')}
+        plan.update(titles={}, images={})
+        
+        def add_row(position, kind, sku, parent_id='', parent_sku='', menu_order='0') -> int:
+            out_row = len(plan['positions'])
+            plan['positions'].append(position)
+            plan['kinds'].append(kind)
+            plan['ids'].append(str(self.product_id_counter))
+            self.product_id_counter += 1
+            plan['skus'].append(sku)
+            plan['parent_ids'].append(parent_id)
+            plan['parent_skus'].append(parent_sku)
+            plan['menu_orders'].append(menu_order)
+            return out_row
+        
+        processed_skus = set()
+        emitted_skus = set()
+        
+        # 1. Variabilní produkty a jejich varianty
+        logger.info(f"Zpracovávám {len(variant_groups)} skupin variant...")
+        for master_code, variants in variant_groups.items():
+            processed_skus.update(str(v.KodZbozi) for v in variants)
+            
+            # Parent je produkt s KodZbozi = master_code, jinak první varianta s upraveným názvem
+            parent_positions = self.sku_index.get(sku_key(master_code), [])
+            parent_position = parent_positions[0] if parent_positions else variants[0].position
+            out_row = add_row(parent_position, 'variable', master_code)
+            if not parent_positions:
+                plan['titles'][out_row] = self._create_parent_name(variants)
+            plan['aggregates'].append((out_row, aggregates[master_code]))
+            
+            # Obrázky: parent, produkt s KodZbozi = master_code s obrázky, nebo první další varianta
+            image_position = parent_position
+            parent_record = self.product_records[parent_position]
+            if pd.isna(parent_record.HlavniObrazek) and pd.isna(parent_record.DalsiObrazky):
+                image_product = self._find_product_with_images(parent_positions)
+                if image_product is not None:
+                    image_position = image_product.position
+            parent_images = source_images[image_position] or next(
+                (source_images[v.position] for v in variants[1:] if source_images[v.position]), '')
+            plan['images'][out_row] = parent_images
+            
+            parent_id = plan['ids'][out_row]
+            self.parent_id_mapping[master_code] = parent_id
+            emitted_skus.add(master_code)
+            processed_skus.add(master_code)
+            
+            for variant_index, variant in enumerate(self._sort_variants(variants), start=1):
+                unique_variant_sku = self._unique_variant_sku(master_code, variant_index, emitted_skus)
+                emitted_skus.add(unique_variant_sku)
+                out_row = add_row(variant.position, 'variation', unique_variant_sku,
+                                  parent_id, master_code, str(variant_index))
+                plan['images'][out_row] = parent_images
+        
+        # 2. Jednoduché produkty (první výskyt každého dosud nezpracovaného SKU)
+        for product in self.product_records:
+            sku = str(product.KodZbozi)
+            if sku not in processed_skus:
+                processed_skus.add(sku)
+                emitted_skus.add(sku)
+                add_row(product.position, 'simple', sku)
+        
+        plan['positions'] = np.asarray(plan['positions'], dtype=np.int64)
+        return plan
+    
+    def _frame_categories(self, plan: Dict, titles: np.ndarray) -> np.ndarray:
+        """Sloupec tax:product_cat (viz _get_category_path_for_product); varianty ho nemají."""
+        positions = plan['positions']
+        categories = np.full(len(positions), '', dtype=object)
+        rows = [out_row for out_row, kind in enumerate(plan['kinds']) if kind != 'variation']
+        
+        if self.category_mapper and CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False):
+            # Mapper a jeho statistiky po řádcích; hotová přiřazení z _precompute_category_assignments
+            for out_row in rows:
+                row = self.product_records[positions[out_row]]
+                if out_row in plan['titles']:
+                    row = row._replace(JmenoZbozi=titles[out_row])
+                categories[out_row] = self._get_category_path_for_product(row)
+            return categories
+        
+        # Původní mapování: cesta podle kódu kategorie, jednou pro každý zdrojový řádek
+        paths = {category_id: data['path'] for category_id, data in self.category_mapping.items() if category_id}
+        source = object_column(self.products_data, 'InetrniKodyKategorii', '').map(paths).fillna('')
+        if CATEGORY_MAPPING_SETTINGS.get('use_leaf_category_only', True):
+            source = last_segment(source).str.strip()
+        categories[rows] = source.to_numpy(dtype=object)[positions[rows]]
+        return categories
+    
+    def _frame_attributes(self, params: pd.DataFrame, plan: Dict, length: int) -> pd.DataFrame:
+        """Atributové sloupce (attribute:, attribute_data:, attribute_default:, meta:attribute_) všech řádků."""
+        kinds = np.asarray(plan['kinds'], dtype=object)
+        kind_of = kinds[params['out_row'].to_numpy(dtype=np.int64)]
+        mapped_names = {key: ATTRIBUTE_MAPPING.get(key, key) for key in params['key'].unique()}
+        
+        # Jednoduché produkty: každý parametr jako atribut (pořadí = pozice v attribute_data)
+        simple = params[kind_of == 'simple']
+        mapped = simple['key'].map(mapped_names).astype(object)
+        capitalized = mapped.str.capitalize()
+        order = simple['seq'] * 3
+        simple_cells = [
+            pd.DataFrame({'out_row': simple['out_row'], 'order': order,
+                          'column': 'attribute:' + capitalized, 'value': simple['value']}),
+            pd.DataFrame({'out_row': simple['out_row'], 'order': order + 1,
+                          'column': 'attribute_data:' + capitalized,
+                          'value': simple['seq'].astype(str) + '|1|0'}),
+            pd.DataFrame({'out_row': simple['out_row'], 'order': order + 2,
+                          'column': 'meta:attribute_' + mapped.str.lower(), 'value': ''}),
+        ]
+        
+        # Varianty: meta atributy v pořadí VARIANT_SETTINGS
+        variation = self._frame_variant_params(params, kind_of)
+        variation_cells = pd.DataFrame({
+            'out_row': variation['out_row'], 'order': variation['rank'],
+            'column': 'meta:attribute_pa_' + variation['key'].map(mapped_names).astype(object).str.lower(),
+            'value': variation['value'],
+        })
+        
+        # Parent produkty: souhrnné atributy rodiny
+        parent_cells = pd.DataFrame([
+            (out_row, order, column, value)
+            for out_row, aggregate in plan['aggregates']
+            for order, (column, value) in enumerate(self._create_parent_attributes(aggregate).items())
+        ], columns=['out_row', 'order', 'column', 'value'])
+        
+        cells = pd.concat(simple_cells + [variation_cells, parent_cells], ignore_index=True)
+        cells['out_row'] = cells['out_row'].astype(np.int64)
+        cells = cells.sort_values(['out_row', 'order'], kind='stable')
+        return spread_columns(cells[['out_row', 'column', 'value']], length)
+    
+    def _frame_variant_params(self, params: pd.DataFrame, kind_of: np.ndarray) -> pd.DataFrame:
+        """Variantní atributy variant (viz _extract_variant_attributes) seřazené podle VARIANT_SETTINGS."""
+        variant_rank = {attr: rank for rank, attr in
+                        enumerate(VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva']))}
+        variation = params[(kind_of == 'variation') & params['key'].isin(variant_rank).to_numpy()]
+        variation = variation.assign(rank=variation['key'].map(variant_rank))
+        return variation.sort_values(['out_row', 'rank'], kind='stable')
+    
+    @spanned('product_frame', rows=lambda self: len(self.products_data))
+    def build_product_frame(self) -> pd.DataFrame:
+        """
+        Sestaví všechny produkty jako DataFrame po celých sloupcích.
+        
+        Alternativa k _iter_product_units se slovníkem na produkt: ceny,
+        sklad, post_status, hmotnost, taxonomie a atributy se počítají pro
+        celý katalog najednou, pole z CONSTANT_FIELDS jsou jediná hodnota.
+        Řádky, ID a SKU jsou stejné jako u slovníků z _iter_product_units,
+        takže WebToffeeCSVExporter.export_product_frame zapíše stejné soubory
+        jako export_products.
+        
+        Returns:
+            pd.DataFrame: Produkty (řádek = produkt, index 0..n-1); chybějící atributy jsou NaN.
+        """
+        products = self.products_data
+        plan = self._plan_product_rows()
+        positions = plan['positions']
+        length = len(positions)
+        kinds = np.asarray(plan['kinds'], dtype=object)
+        variation = kinds == 'variation'
+        
+        def take(values) -> np.ndarray:
+            return np.asarray(values, dtype=object)[positions]
+        
+        titles = take(text_column(products, 'JmenoZbozi', ''))
+        for out_row, title in plan['titles'].items():
+            titles[out_row] = title
+        
+        # Ceny: varianty mají akční cenu vždy, ostatní jen pokud se liší od běžné
+        regular_price = take(price_column(products, 'CenaBezna'))
+        sale_price = take(price_column(products, 'ZakladniCena'))
+        sale_price = np.where(variation | (sale_price != regular_price), sale_price, '')
+        
+        # HTML popisu se čistí jednou pro každý různý text
+        descriptions = optional_text_column(products, 'Popis')
+        unique_descriptions = pd.unique(descriptions.to_numpy(dtype=object))
+        with span('html_cleaning', rows=len(unique_descriptions)):
+            cleaned = {text: self._clean_html(text) for text in unique_descriptions}
+        
+        params = output_parameters(self.params_table, positions, variation)
+        kind_of = kinds[params['out_row'].to_numpy(dtype=np.int64)]
+        
+        # Krátký popis variant z prvního variantního atributu ("Velikost: L")
+        excerpts = take(optional_text_column(products, 'KratkyPopis'))
+        excerpts[variation] = ': '
+        first_attributes = self._frame_variant_params(params, kind_of).drop_duplicates('out_row')
+        excerpts[first_attributes['out_row'].to_numpy(dtype=np.int64)] = [
+            f"{key.capitalize()}: {value}"
+            for key, value in zip(first_attributes['key'].tolist(), first_attributes['value'].tolist())
+        ]
+        
+        images = take(image_urls(object_column(products, 'HlavniObrazek', None),
+                                 object_column(products, 'DalsiObrazky', None), IMAGE_BASE_URL))
+        for out_row, row_images in plan['images'].items():
+            images[out_row] = row_images
+        
+        # Tagy jen u jednoduchých a variabilních produktů
+        tags = [''] * length
+        if TAG_SETTINGS.get('auto_generate_tags', False):
+            tags = tag_column(params[kind_of != 'variation'], TAG_SETTINGS.get('tag_attributes', []),
+                              TAG_SETTINGS.get('max_tags_per_product', 5), '|', length)
+        
+        columns = {
+            'ID': plan['ids'],
+            'post_parent': plan['parent_ids'],
+            'parent_sku': plan['parent_skus'],
+            'sku': plan['skus'],
+            'post_title': titles,
+            'post_excerpt': excerpts,
+            'post_content': take(descriptions.map(cleaned)),
+            'post_status': take(np.where(object_column(products, 'Vypnuto', 0) == 0, 'publish', 'draft')),
+            'regular_price': regular_price,
+            'sale_price': sale_price,
+            'stock_status': take(np.where(object_column(products, 'NaSklade', 0) > 0, 'instock', 'outofstock')),
+            'stock': take(text_column(products, 'NaSklade', 0)),
+            'weight': take(price_column(products, 'Hmotnost')),
+            'images': images,
+            'tax:product_type': np.select([kinds == 'simple', kinds == 'variable'], ['Simple', 'Variable'],
+                                          '').astype(object),
+            'tax:product_cat': self._frame_categories(plan, titles),
+            'tax:product_tag': tags,
+            'menu_order': plan['menu_orders'],
+            **self.CONSTANT_FIELDS
+        }
+        
+        # Konstantní sloupce (skalární hodnoty) pandas rozšíří na všechny řádky
+        frame = pd.DataFrame(columns, index=pd.RangeIndex(length))
+        frame = pd.concat([frame, self._frame_attributes(params, plan, length)], axis=1)
+        logger.info(f"Celkem vytvořeno {length} produktů (včetně variant).")
+        return frame
+    
+    def validate_products(self, products: Optional[List[Dict]] = None,
+                          seen_skus: Optional[Set[str]] = None) -> List[str]:
+        """
+        Validuje vytvořené produkty.
+        
+        Args:
+            products: Dávka produktů; výchozí jsou všechny self.woo_products.
+                Rodiny variant jsou v dávce vždy celé.
+            seen_skus: Množina SKU z předchozích dávek pro kontrolu duplicit napříč dávkami.
+        """
+        if products is None:
+            products = self.woo_products
+        if seen_skus is None:
+            seen_skus = set()
         errors = []
         
         # Najít všechny parent produkty a jejich SKUs
         parent_ids = set()
         parent_skus_from_parents = set()
-        seen_skus = set()
-        for product in self.woo_products:
+        for product in products:
             sku_val = product.get('sku', '')
             if sku_val:
                 if sku_val in seen_skus:
@@ -827,7 +1275,7 @@ class WebToffeeTransformer:
                 parent_skus_from_parents.add(product['sku'])
         
         # Kontrola variant
-        for product in self.woo_products:
+        for product in products:
             if product.get('parent_sku'):  # Je to varianta
                 # Kontrola post_parent
                 if product['post_parent'] not in parent_ids:
@@ -854,7 +1302,7 @@ class WebToffeeTransformer:
                     errors.append(f"Varianta '{product['post_title']}' (parent_sku: {product['parent_sku']}) nemá žádné meta atributy")
         
         # Kontrola variable produktů
-        for product in self.woo_products:
+        for product in products:
             if product['tax:product_type'] == 'Variable':
                 # Musí mít agregované atributy
                 has_attributes = any(
@@ -866,6 +1314,61 @@ class WebToffeeTransformer:
         
         return errors
     
+    def validate_product_frame(self, frame: pd.DataFrame) -> List[str]:
+        """
+        Validuje produkty z build_product_frame stejnými pravidly jako validate_products.
+        
+        Args:
+            frame: Produkty po sloupcích
+        """
+        if frame.empty:
+            return []
+        
+        def filled(columns: List[str]) -> pd.Series:
+            result = pd.Series(False, index=frame.index)
+            for column in columns:
+                result |= frame[column].notna() & (frame[column] != '')
+            return result
+        
+        errors = []
+        
+        # Duplicity SKU
+        skus = frame.loc[filled(['sku']), 'sku']
+        for sku_val in skus[skus.duplicated()]:
+            errors.append(f"Duplicita SKU: '{sku_val}' se vyskytuje vícekrát.")
+        
+        variables = frame['tax:product_type'] == 'Variable'
+        parent_ids = set(frame.loc[variables, 'ID'])
+        parent_skus_from_parents = set(frame.loc[variables, 'sku'])
+        
+        # Kontrola variant
+        has_meta_attributes = filled([column for column in frame.columns
+                                      if column.startswith('meta:attribute_pa_')])
+        variations = frame[filled(['parent_sku'])]
+        for title, parent_id, parent_sku, sku, has_meta in zip(
+                variations['post_title'], variations['post_parent'], variations['parent_sku'],
+                variations['sku'], has_meta_attributes[variations.index]):
+            if parent_id not in parent_ids:
+                errors.append(f"Varianta '{title}' (parent_sku: {parent_sku}) odkazuje на neexistující parent ID {parent_id}")
+            
+            if parent_sku not in parent_skus_from_parents:
+                errors.append(f"Varianta '{title}' odkazuje na neexistující parent SKU {parent_sku}.")
+            
+            if pd.isna(sku) or not sku:
+                errors.append(f"Varianta '{title}' (parent_sku: {parent_sku}) nemá přiřazené SKU.")
+            elif not re.match(rf"^{re.escape(parent_sku)}_\d+$", sku):
+                errors.append(f"Varianta '{title}' má SKU '{sku}', které neodpovídá formátu {parent_sku}_<číslo>.")
+            
+            if not has_meta:
+                errors.append(f"Varianta '{title}' (parent_sku: {parent_sku}) nemá žádné meta atributy")
+        
+        # Kontrola variable produktů
+        has_attributes = filled([column for column in frame.columns if column.startswith('attribute:')])
+        for sku_val in frame.loc[variables & ~has_attributes, 'sku']:
+            errors.append(f"Variable produkt {sku_val} nemá žádné atributy")
+        
+        return errors
+    
     def run_transformation(self) -> Tuple[List[Dict], List[str]]:
         """
         Spustí kompletní transformaci dat.
@@ -882,7 +1385,8 @@ class WebToffeeTransformer:
         self._transform_products()
         
         # Validace
-        self.validation_errors = self.validate_products()
+        with span('validation', rows=len(self.woo_products)):
+            self.validation_errors = self.validate_products()
         if self.validation_errors:
             logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
             for error in self.validation_errors[:10]:
@@ -895,17 +1399,236 @@ class WebToffeeTransformer:
         
         return self.woo_products, self.validation_errors
     
-    def _print_transformation_stats(self) -> None:
-        """Vypíše statistiky transformace."""
-        simple_count = len([p for p in self.woo_products if p['tax:product_type'] == 'Simple'])
-        variable_count = len([p for p in self.woo_products if p['tax:product_type'] == 'Variable'])
-        variation_count = len([p for p in self.woo_products if p['tax:product_type'] == ''])  # Varianty mají prázdný typ
+    def run_frame_transformation(self) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Spustí transformaci, která produkty sestaví po sloupcích (viz build_product_frame).
+        
+        Returns:
+            Tuple[pd.DataFrame, List[str]]: Produkty jako DataFrame a seznam validačních chyb
+        """
+        logger.info("=== SPUŠTĚNÍ SLOUPCOVÉ WEBTOFFEE TRANSFORMACE ===")
+        
+        self._create_category_mapping()
+        products = self.build_product_frame()
+        
+        # Validace
+        with span('validation', rows=len(products)):
+            self.validation_errors = self.validate_product_frame(products)
+        if self.validation_errors:
+            logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
+            for error in self.validation_errors[:10]:
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(Counter(products['tax:product_type'].tolist()))
+        
+        logger.info("=== SLOUPCOVÁ WEBTOFFEE TRANSFORMACE DOKONČENA ===")
+        
+        return products, self.validation_errors
+    
+    def run_streaming_transformation(self, product_sink: Callable[[List[Dict]], None],
+                                     chunk_size: int) -> Tuple[Counter, List[str]]:
+        """
+        Spustí transformaci, která produkty předává po dávkách do product_sink.
+        
+        Produkty se neukládají do self.woo_products; v paměti je vždy jen
+        aktuální dávka. Validace proběhne pro každou dávku zvlášť, duplicity
+        SKU se kontrolují napříč dávkami.
+        
+        Args:
+            product_sink: Funkce volaná s každou dávkou produktů (např. CsvStreamWriter.write)
+            chunk_size: Požadovaný počet produktů v dávce
+        
+        Returns:
+            Tuple[Counter, List[str]]: Počty produktů podle tax:product_type a seznam validačních chyb
+        """
+        logger.info(f"=== SPUŠTĚNÍ STREAMOVANÉ WEBTOFFEE TRANSFORMACE (dávka {chunk_size}) ===")
+        
+        self._create_category_mapping()
+        
+        type_counts = Counter()
+        seen_skus = set()
+        self.validation_errors = []
+        for chunk in self.iter_product_chunks(chunk_size):
+            with span('validation', rows=len(chunk)):
+                self.validation_errors.extend(self.validate_products(chunk, seen_skus))
+            type_counts.update(product['tax:product_type'] for product in chunk)
+            product_sink(chunk)
+        
+        if self.validation_errors:
+            logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
+            for error in self.validation_errors[:10]:
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(type_counts)
+        
+        logger.info("=== STREAMOVANÁ WEBTOFFEE TRANSFORMACE DOKONČENA ===")
+        
+        return type_counts, self.validation_errors
+    
+    def run_batched_transformation(self, product_batches: Iterable[pd.DataFrame],
+                                   product_sink: Callable[[List[Dict]], None],
+                                   group_by_master_code: Optional[bool] = None,
+                                   memory_optimization: Optional[bool] = None) -> Tuple[Counter, List[str]]:
+        """
+        Spustí transformaci po dávkách vstupních řádků (viz DataLoader.iter_product_chunks).
+        
+        Na rozdíl od run_streaming_transformation není v paměti celý katalog:
+        každá dávka se transformuje, předá do product_sink a její struktury se
+        uvolní před načtením další. Rodina variant musí být celá v jedné dávce.
+        Čítač ID pokračuje přes dávky a duplicity SKU se kontrolují napříč
+        dávkami. Pořadí produktů (a tedy přidělená ID) je po dávkách, takže se
+        liší od jednorázové transformace.
+        
+        Args:
+            product_batches: Dávky řádků listu Zbozi
+            product_sink: Funkce volaná s produkty každé dávky (např. CsvStreamWriter.write)
+            group_by_master_code: Seskupovat varianty podle KodMasterVyrobku (True) nebo SKU
+                vzoru (False) pro celý katalog (viz has_master_code_groups); None = v každé
+                dávce zvlášť, což se může mezi dávkami lišit
+            memory_optimization: Internovat texty a zmenšit celá čísla v dávce a po dávce
+                uvolnit paměť (výchozí ADVANCED_SETTINGS['memory_optimization'])
+        
+        Returns:
+            Tuple[Counter, List[str]]: Počty produktů podle tax:product_type a seznam validačních chyb
+        """
+        if memory_optimization is None:
+            memory_optimization = ADVANCED_SETTINGS.get('memory_optimization', True)
+        logger.info(f"=== SPUŠTĚNÍ DÁVKOVÉ WEBTOFFEE TRANSFORMACE (optimalizace paměti: "
+                    f"{'ano' if memory_optimization else 'ne'}) ===")
+        if group_by_master_code is None:
+            logger.warning("Způsob seskupení variant není určen pro celý katalog, rozhoduje se v každé dávce")
+        self.group_by_master_code = group_by_master_code
+        
+        self._create_category_mapping()
+        
+        type_counts = Counter()
+        seen_skus = set()
+        self.validation_errors = []
+        monitor = BatchMemoryMonitor(logger)
+        source_rows = 0
+        for batch in product_batches:
+            if memory_optimization:
+                batch = optimize_frame(batch)
+            self._bind_products(batch)
+            with span('product_build') as measured:
+                products = [product for unit in self._iter_product_units() for product in unit]
+                measured.rows = len(products)
+            with span('validation', rows=len(products)):
+                self.validation_errors.extend(self.validate_products(products, seen_skus))
+            type_counts.update(product['tax:product_type'] for product in products)
+            product_sink(products)
+            
+            # Uvolnění struktur dávky před načtením další
+            rows, product_count = len(batch), len(products)
+            source_rows += rows
+            self._bind_products(batch.iloc[0:0])
+            del batch, products
+            if memory_optimization:
+                release_memory()
+            monitor.record(rows, product_count)
+        self.batch_stats = monitor.stats
+        logger.info(f"Zpracováno {len(monitor.stats)} dávek, nejvyšší špička RSS {format_mb(monitor.peak())}")
+        
+        if self.validation_errors:
+            logger.warning(f"Nalezeno {len(self.validation_errors)} validačních chyb:")
+            for error in self.validation_errors[:10]:
+                logger.warning(f"  - {error}")
+        
+        self._print_transformation_stats(type_counts, source_rows)
+        
+        logger.info("=== DÁVKOVÁ WEBTOFFEE TRANSFORMACE DOKONČENA ===")
+        
+        return type_counts, self.validation_errors
+    
+    def product_columns(self, parameter_keys: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Vrátí sloupce, které produkty vyplní, pro hlavičku streamovaného exportu.
+        
+        Args:
+            parameter_keys: Klíče parametrů celého katalogu (viz attribute_columns)
+        """
+        return self.PRODUCT_COLUMNS + self.attribute_columns(parameter_keys)
+    
+    def attribute_columns(self, parameter_keys: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Vrátí seřazené atributové sloupce, které produkty vyplní.
+        
+        Počítá se ještě před transformací, aby mohl streamovaný export zapsat
+        hlavičku předem. Bez parameter_keys se sloupce odvodí z načteného
+        katalogu stejně jako při transformaci (skupiny variant, parametry
+        jednoduchých produktů, atributy variant a rodin), takže odpovídají
+        sloupcům jednorázového exportu.
+        
+        Při dávkovém zpracování katalog v paměti není a hlavička vychází jen
+        z klíčů parametrů: obsahuje sloupce jednoduchých produktů pro každý
+        klíč a sloupce všech variantních atributů, i když je žádný produkt
+        nevyplní. Takové sloupce zůstanou prázdné.
+        
+        Args:
+            parameter_keys: Klíče parametrů celého katalogu (viz DataLoader.load_parameter_keys),
+                pokud transformátor nemá načtené všechny produkty
+        """
+        variant_attributes = VARIANT_SETTINGS.get('variant_attributes', ['velikost', 'barva'])
+        if parameter_keys is not None:
+            return self._attribute_columns(parameter_keys, variant_attributes, variant_attributes)
+        
+        with span('variant_grouping'):
+            self.sku_index = build_sku_index(self.products_data.get('KodZbozi', pd.Series(dtype=object)))
+        variant_groups = {key: variants for key, variants in self._detect_variant_groups().items() if variants}
+        aggregates = self._aggregate_families(variant_groups)
+        
+        # Jednoduché produkty: první řádek každého SKU mimo rodiny variant (jako _iter_product_units)
+        processed_skus = set(variant_groups)
+        processed_skus.update(str(v.KodZbozi) for variants in variant_groups.values() for v in variants)
+        simple_positions = []
+        for product in self.product_records:
+            sku = str(product.KodZbozi)
+            if sku not in processed_skus:
+                processed_skus.add(sku)
+                simple_positions.append(product.position)
+        long_table = self.params_table.long_table
+        simple_keys = long_table.loc[long_table['row'].isin(simple_positions), 'key'].unique()
+        
+        parent_keys = {key for aggregate in aggregates.values() for key in aggregate.attributes}
+        variation_keys = {
+            key for variants in variant_groups.values() for variant in variants
+            for key in self._extract_variant_attributes(variant)
+        }
+        return self._attribute_columns(simple_keys, parent_keys, variation_keys)
+    
+    @staticmethod
+    def _attribute_columns(simple_keys: Iterable[str], parent_keys: Iterable[str],
+                           variation_keys: Iterable[str]) -> List[str]:
+        """Seřazené atributové sloupce jednoduchých produktů, parent produktů a variant pro dané klíče."""
+        columns = set()
+        for key in simple_keys:
+            mapped_name = ATTRIBUTE_MAPPING.get(key, key)
+            columns.add(f'attribute:{mapped_name.capitalize()}')
+            columns.add(f'attribute_data:{mapped_name.capitalize()}')
+            columns.add(f'meta:attribute_{mapped_name.lower()}')
+        for key in parent_keys:
+            attr_key = f"pa_{ATTRIBUTE_MAPPING.get(key, key).lower()}"
+            columns.update([f'attribute:{attr_key}', f'attribute_data:{attr_key}', f'attribute_default:{attr_key}'])
+        for key in variation_keys:
+            columns.add(f"meta:attribute_pa_{ATTRIBUTE_MAPPING.get(key, key).lower()}")
+        return sorted(columns)
+    
+    def _print_transformation_stats(self, type_counts: Optional[Counter] = None,
+                                    source_rows: Optional[int] = None) -> None:
+        """Vypíše statistiky transformace (při streamování a po dávkách z předaných počtů)."""
+        if type_counts is None:
+            type_counts = Counter(p['tax:product_type'] for p in self.woo_products)
+        if source_rows is None:
+            source_rows = len(self.products_data)
+        simple_count = type_counts['Simple']
+        variable_count = type_counts['Variable']
+        variation_count = type_counts['']  # Varianty mají prázdný typ
         
         logger.info("\n" + "="*50)
         logger.info("STATISTIKY WEBTOFFEE TRANSFORMACE")
         logger.info("="*50)
-        logger.info(f"Celkem FastCentrik produktů: {len(self.products_data)}")
-        logger.info(f"Celkem WebToffee produktů: {len(self.woo_products)}")
+        logger.info(f"Celkem FastCentrik produktů: {source_rows}")
+        logger.info(f"Celkem WebToffee produktů: {sum(type_counts.values())}")
         logger.info(f"  - Jednoduché produkty: {simple_count}")
         logger.info(f"  - Variable produkty: {variable_count}")
         logger.info(f"  - Varianty: {variation_count}")
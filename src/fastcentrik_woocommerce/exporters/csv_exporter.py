@@ -13,6 +13,7 @@ import sys
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from config.config import EXPORT_SETTINGS
+from src.fastcentrik_woocommerce.exporters.stream_writer import CsvStreamWriter
 
 logger = logging.getLogger(__name__)
 
@@ -49,17 +50,27 @@ class CsvExporter:
             logger.warning("Nebyly nalezeny žádné produkty k exportu.")
             return
 
+        self.export_product_frame(pd.DataFrame(products), output_dir)
+
+    def export_product_frame(self, df: pd.DataFrame, output_dir: str):
+        """
+        Exportuje produkty sestavené po sloupcích (DataTransformer.build_product_frame).
+
+        Zapíše stejný soubor jako export_products se seznamem slovníků.
+
+        Args:
+            df (pd.DataFrame): Produkty, řádek = produkt.
+            output_dir (str): Cílová složka pro export.
+        """
+        if df.empty:
+            logger.warning("Nebyly nalezeny žádné produkty k exportu.")
+            return
+
         output_file = Path(output_dir) / 'woocommerce_products.csv'
-        logger.info(f"Exportuji {len(products)} produktů do {output_file}...")
+        logger.info(f"Exportuji {len(df)} produktů do {output_file}...")
 
-        df = pd.DataFrame(products)
-        
         # Zajistí, že všechny sloupce existují
-        for col in self.WOO_COLUMNS:
-            if col not in df.columns:
-                df[col] = ''
-        
-        df = df.reindex(columns=self.WOO_COLUMNS)
+        df = df.reindex(columns=self.WOO_COLUMNS, fill_value='')
         
         df.to_csv(
             output_file, 
@@ -69,6 +80,25 @@ class CsvExporter:
         )
         logger.info("Export produktů dokončen.")
 
+    def open_product_stream(self, output_dir: str) -> CsvStreamWriter:
+        """
+        Otevře postupný zápis produktů do stejného CSV jako export_products.
+
+        Args:
+            output_dir (str): Cílová složka pro export.
+
+        Returns:
+            CsvStreamWriter: Zapisovač, kterému se předávají dávky produktů.
+        """
+        output_file = Path(output_dir) / 'woocommerce_products.csv'
+        logger.info(f"Streamuji produkty do {output_file}...")
+        return CsvStreamWriter(
+            output_file,
+            self.WOO_COLUMNS,
+            encoding=EXPORT_SETTINGS.get('encoding', 'utf-8-sig'),
+            sep=EXPORT_SETTINGS.get('separator', ',')
+        )
+
     def export_categories(self, categories: List[Dict], output_dir: str):
         """
         Exportuje seznam kategorií do CSV souboru.
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Postupný zápis produktů do CSV
+==============================
+
+CsvStreamWriter zapisuje dávky produktů (seznamy slovníků) do jednoho CSV
+souboru s pevně daným pořadím sloupců. Hlavička se zapíše s první dávkou,
+každá další dávka se jen připojí, takže v paměti je vždy jen aktuální dávka.
+
+Formátování hodnot odpovídá jednorázovému exportu přes DataFrame.to_csv:
+chybějící klíče i None se zapíší jako prázdné hodnoty, klíče mimo seznam
+sloupců se ignorují.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CsvStreamWriter:
+    """
+    Zapisuje dávky produktů do CSV souboru s pevným pořadím sloupců.
+
+    Použití:
+        with CsvStreamWriter(path, columns) as writer:
+            for chunk in transformer.iter_product_chunks(1000):
+                writer.write(chunk)
+    """
+
+    def __init__(self, output_file: str, columns: List[str], defaults: Optional[Dict[str, Any]] = None,
+                 row_transform: Optional[Callable[[Dict], Dict]] = None,
+                 encoding: str = 'utf-8-sig', **csv_options):
+        """
+        Args:
+            output_file (str): Cesta k výstupnímu CSV souboru (přepíše se).
+            columns (List[str]): Sloupce ve výstupním pořadí.
+            defaults (Dict, optional): Výchozí hodnoty sloupců, které v dávce chybí úplně.
+            row_transform (Callable, optional): Úprava každého produktu před zápisem.
+            encoding (str): Kódování souboru; BOM u utf-8-sig se zapíše jen jednou.
+            **csv_options: Další parametry pro DataFrame.to_csv (sep, quotechar, escapechar...).
+        """
+        self.output_file = Path(output_file)
+        self.columns = list(columns)
+        self.defaults = defaults or {}
+        self.row_transform = row_transform
+        self.encoding = encoding
+        self.csv_options = csv_options
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._handle = None
+        self._closed = False
+
+    def __enter__(self) -> 'CsvStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, rows: List[Dict]) -> None:
+        """Připojí dávku produktů do souboru."""
+        if self._handle is None:
+            self._handle = open(self.output_file, 'w', encoding=self.encoding, newline='')
+        if not rows:
+            return
+
+        if self.row_transform is not None:
+            rows = [self.row_transform(row) for row in rows]
+        df = pd.DataFrame(rows)
+        for column, value in self.defaults.items():
+            if column not in df.columns:
+                df[column] = value
+        df = df.reindex(columns=self.columns)
+
+        df.to_csv(self._handle, index=False, header=self.chunks_written == 0, **self.csv_options)
+        self.rows_written += len(df)
+        self.chunks_written += 1
+
+    def close(self) -> None:
+        """Uzavře soubor; pokud nebyla zapsána žádná dávka, zapíše alespoň hlavičku."""
+        if self._closed:
+            return
+        if self._handle is None:
+            self._handle = open(self.output_file, 'w', encoding=self.encoding, newline='')
+        if self.chunks_written == 0:
+            pd.DataFrame(columns=self.columns).to_csv(self._handle, index=False, **self.csv_options)
+        self._handle.close()
+        self._handle = None
+        self._closed = True
+        logger.info(f"Zapsáno {self.rows_written} řádků v {self.chunks_written} dávkách do {self.output_file}")
@@ -12,8 +12,13 @@ Verze: 1.0
 
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List, Union
 import logging
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from src.fastcentrik_woocommerce.exporters.stream_writer import CsvStreamWriter
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +83,26 @@ class WebToffeeCSVExporter:
         'shipping_class'
     ]
     
+    # Výchozí hodnoty sloupců, které produkty samy nevyplňují
+    DEFAULT_VALUES = {
+        'length': '',
+        'width': '',
+        'height': '',
+        'featured': 'no',
+        'tax_status': 'taxable',
+        'tax_class': '',
+        'shipping_class': ''
+    }
+    
+    # Prefixy atributových sloupců
+    ATTRIBUTE_PREFIXES = ('attribute:', 'attribute_data:', 'attribute_default:', 'meta:attribute_')
+    
+    CSV_OPTIONS = {
+        'sep': ',',
+        'quotechar': '"',
+        'escapechar': '\\'
+    }
+    
     def __init__(self, output_dir: str = 'output'):
         """
         Inicializace exportéru.
@@ -98,39 +123,42 @@ class WebToffeeCSVExporter:
         Returns:
             DataFrame připravený k exportu
         """
-        # Vytvoříme kopii produktů pro zpracování
-        processed_products = []
-        
         # Zpracujeme každý produkt a rozdělíme obrázky do samostatných sloupců
-        for product in products:
-            processed_product = product.copy()
-            
-            # Zpracování obrázků
-            if 'images' in processed_product and processed_product['images']:
-                # Rozdělíme obrázky podle oddělovače |
-                image_urls = processed_product['images'].split('|')
-                
-                # Zachováme původní sloupec images
-                # Přidáme jednotlivé obrázky do samostatných sloupců
-                for i, url in enumerate(image_urls):
-                    if i <= 15:  # Maximálně 16 obrázků (0-15)
-                        processed_product[f'fifu_image_url_{i}'] = url
-            
-            processed_products.append(processed_product)
+        processed_products = [self._expand_images(product) for product in products]
         
         # Vytvoříme DataFrame
-        df = pd.DataFrame(processed_products)
+        return self._order_columns(pd.DataFrame(processed_products))
+    
+    def _prepare_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Připraví produkty sestavené po sloupcích (WebToffeeTransformer.build_product_frame).
+        
+        Výsledek je stejný jako z _prepare_dataframe se slovníky stejných
+        produktů: atributové sloupce bez hodnoty se vynechají a obrázky se
+        rozdělí do sloupců fifu_image_url_0 až 15 po celých sloupcích.
+        
+        Args:
+            frame: Produkty, řádek = produkt
+            
+        Returns:
+            DataFrame připravený k exportu
+        """
+        attribute_columns = [col for col in frame.columns if col.startswith(self.ATTRIBUTE_PREFIXES)]
+        empty_columns = [col for col in attribute_columns if frame[col].isna().all()]
+        df = frame.drop(columns=empty_columns).reset_index(drop=True)
         
+        if 'images' in df.columns:
+            image_urls = df['images'].str.split('|')
+            has_images = df['images'].notna() & (df['images'] != '')
+            for i in range(16):  # Maximálně 16 obrázků (0-15)
+                df[f'fifu_image_url_{i}'] = image_urls.str[i].where(has_images)
+        
+        return self._order_columns(df)
+    
+    def _order_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Doplní výchozí sloupce, seřadí sloupce pro WebToffee a nahradí NaN prázdným textem."""
         # Přidáme chybějící sloupce s výchozími hodnotami
-        default_values = {
-            'length': '',
-            'width': '',
-            'height': '',
-            'featured': 'no',
-            'tax_status': 'taxable',
-            'tax_class': '',
-            'shipping_class': ''
-        }
+        default_values = dict(self.DEFAULT_VALUES)
         
         # Přidáme chybějící sloupce pro obrázky
         for i in range(16):
@@ -142,38 +170,42 @@ class WebToffeeCSVExporter:
             if col not in df.columns:
                 df[col] = default_val
         
-        # Získáme všechny atributové sloupce
-        attribute_columns = []
-        for col in df.columns:
-            if col.startswith(('attribute:', 'attribute_data:', 'attribute_default:', 'meta:attribute_')):
-                attribute_columns.append(col)
+        # Seřadíme DataFrame podle finálních sloupců
+        df = df[self._column_order(df.columns)]
         
-        # Seřadíme atributové sloupce
-        attribute_columns.sort()
+        # Vyčistíme NaN hodnoty
+        df = df.fillna('')
         
-        # Vytvoříme finální seznam sloupců
-        final_columns = []
+        return df
+    
+    def _column_order(self, columns: Iterable[str]) -> List[str]:
+        """Seřadí sloupce pro WebToffee: WEBTOFFEE_COLUMNS, seřazené atributy, ostatní v daném pořadí."""
+        columns = list(dict.fromkeys(columns))
+        present = set(columns)
         
         # Nejprve základní sloupce
-        for col in self.WEBTOFFEE_COLUMNS:
-            if col in df.columns:
-                final_columns.append(col)
+        final_columns = [col for col in self.WEBTOFFEE_COLUMNS if col in present]
         
-        # Pak atributové sloupce
-        final_columns.extend(attribute_columns)
+        # Pak seřazené atributové sloupce
+        final_columns.extend(sorted(col for col in columns if col.startswith(self.ATTRIBUTE_PREFIXES)))
         
         # Nakonec jakékoliv další sloupce které nejsou v našem seznamu
-        for col in df.columns:
-            if col not in final_columns:
-                final_columns.append(col)
-        
-        # Seřadíme DataFrame podle finálních sloupců
-        df = df[final_columns]
-        
-        # Vyčistíme NaN hodnoty
-        df = df.fillna('')
-        
-        return df
+        listed = set(final_columns)
+        final_columns.extend(col for col in columns if col not in listed)
+        return final_columns
+    
+    def _expand_images(self, product: Dict) -> Dict:
+        """Vrátí kopii produktu s obrázky rozdělenými do sloupců fifu_image_url_0 až 15."""
+        processed_product = product.copy()
+        
+        if 'images' in processed_product and processed_product['images']:
+            # Rozdělíme obrázky podle oddělovače |, původní sloupec images zachováme
+            image_urls = processed_product['images'].split('|')
+            for i, url in enumerate(image_urls):
+                if i <= 15:  # Maximálně 16 obrázků (0-15)
+                    processed_product[f'fifu_image_url_{i}'] = url
+        
+        return processed_product
     
     def _split_by_product_type(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         """
@@ -221,8 +253,25 @@ class WebToffeeCSVExporter:
         logger.info(f"Exportuji {len(products)} produktů do WebToffee CSV formátu")
         
         # Připravíme DataFrame
-        df = self._prepare_dataframe(products)
+        return self._export_dataframe(self._prepare_dataframe(products), filename_prefix)
+    
+    def export_product_frame(self, frame: pd.DataFrame,
+                             filename_prefix: str = 'webtoffee_products') -> List[str]:
+        """
+        Exportuje produkty sestavené po sloupcích do stejných CSV souborů jako export_products.
         
+        Args:
+            frame: Produkty z WebToffeeTransformer.build_product_frame
+            filename_prefix: Prefix pro názvy souborů
+            
+        Returns:
+            Seznam cest k vytvořeným souborům
+        """
+        logger.info(f"Exportuji {len(frame)} produktů do WebToffee CSV formátu")
+        return self._export_dataframe(self._prepare_frame(frame), filename_prefix)
+    
+    def _export_dataframe(self, df: pd.DataFrame, filename_prefix: str) -> List[str]:
+        """Zapíše připravené produkty do souborů podle typu a do souboru se všemi produkty."""
         # Rozdělíme podle typu produktu
         splits = self._split_by_product_type(df)
         
@@ -260,12 +309,45 @@ class WebToffeeCSVExporter:
         
         return exported_files
     
-    def export_sample(self, products: List[Dict], sample_size: int = 10) -> str:
+    def open_product_stream(self, product_columns: Iterable[str],
+                            filename_prefix: str = 'webtoffee_products') -> CsvStreamWriter:
+        """
+        Otevře postupný zápis všech produktů do souboru {prefix}_all.csv.
+        
+        Hlavička se sestaví předem stejně jako v _order_columns: sloupce
+        produktů, výchozí sloupce a sloupce obrázků. Sloupce, které žádný
+        produkt nevyplní (např. sold_individually), se vynechají. Soubory
+        rozdělené podle typu se při streamování nevytváří, protože vyžadují
+        přeřazení celého katalogu.
+        
+        Args:
+            product_columns: Sloupce, které produkty vyplní (viz WebToffeeTransformer.product_columns)
+            filename_prefix: Prefix pro název souboru
+            
+        Returns:
+            Zapisovač, kterému se předávají dávky produktů
+        """
+        output_file = self.output_dir / f"{filename_prefix}_all.csv"
+        logger.info(f"Streamuji produkty do WebToffee CSV: {output_file}")
+        
+        defaults = dict(self.DEFAULT_VALUES)
+        defaults.update({f'fifu_image_url_{i}': '' for i in range(16)})
+        
+        return CsvStreamWriter(
+            output_file,
+            self._column_order(list(product_columns) + list(defaults)),
+            defaults=defaults,
+            row_transform=self._expand_images,
+            encoding='utf-8-sig',
+            **self.CSV_OPTIONS
+        )
+    
+    def export_sample(self, products: Union[List[Dict], pd.DataFrame], sample_size: int = 10) -> str:
         """
         Exportuje ukázkový soubor s omezeným počtem produktů.
         
         Args:
-            products: Seznam produktů
+            products: Seznam produktů, nebo DataFrame z WebToffeeTransformer.build_product_frame
             sample_size: Počet produktů v ukázce
             
         Returns:
@@ -274,10 +356,10 @@ class WebToffeeCSVExporter:
         logger.info(f"Vytvářím ukázkový soubor s {sample_size} produkty")
         
         # Vezmeme ukázku produktů
-        sample_products = products[:sample_size]
-        
-        # Připravíme DataFrame
-        df = self._prepare_dataframe(sample_products)
+        if isinstance(products, pd.DataFrame):
+            df = self._prepare_frame(products.head(sample_size))
+        else:
+            df = self._prepare_dataframe(products[:sample_size])
         
         # Export
         sample_file = self.output_dir / "webtoffee_sample.csv"
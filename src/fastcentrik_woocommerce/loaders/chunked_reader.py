@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Čtení vstupních listů po dávkách
+================================
+
+Pro velké exporty, které se celé nevejdou do paměti vedle výstupů, čte
+list po dávkách řádků. V paměti je vždy jen aktuální dávka.
+
+    - .xlsx/.xlsm: openpyxl v read-only režimu, řádky se čtou postupně;
+      dávka se převede stejným parserem jako v pd.read_excel (TextParser),
+      takže hodnoty odpovídají jednorázovému načtení listu
+    - textové exporty (.csv/.tsv/.jsonl, i .gz/.zst): pd.read_csv / pd.read_json
+      s chunksize (viz text_formats)
+    - .xls: xlrd neumí číst postupně - list se načte celý a rozdělí na dávky
+
+Index dávek pokračuje přes celý list (0..n-1), stejně jako při načtení
+celého listu. Typy sloupců se odvozují pro každou dávku zvlášť.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from src.fastcentrik_woocommerce.loaders.text_formats import detect_format, iter_text_chunks
+
+logger = logging.getLogger(__name__)
+
+STREAMING_EXCEL_SUFFIXES = ('.xlsx', '.xlsm')
+
+UseCols = Optional[Callable[[str], bool]]
+
+
+def _convert_cell(cell):
+    """Převod buňky openpyxl shodný s pandas (OpenpyxlReader._convert_cell)."""
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    value = cell.value
+    if value is None:
+        return ''
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        integer = int(value)
+        if integer == value:
+            return integer
+        return float(value)
+    return value
+
+
+def _parse_rows(header: List, rows: List[List], start: int, usecols: UseCols,
+                dtype: Optional[Dict[str, type]] = None) -> pd.DataFrame:
+    width = len(header)
+    rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+    df = TextParser([header] + rows, header=0, usecols=usecols, dtype=dtype).read()
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def iter_xlsx_chunks(file_path: Path, sheet_name: str, chunk_size: int, usecols: UseCols = None,
+                     dtype: Optional[Dict[str, type]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Čte list .xlsx po dávkách přes openpyxl v read-only režimu.
+
+    Prázdné řádky na konci listu se vynechají (stejně jako v pd.read_excel);
+    hodnoty za šířkou hlavičky se ignorují.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        rows = workbook[sheet_name].iter_rows()
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [_convert_cell(cell) for cell in header]
+        while header and header[-1] == '':
+            header.pop()
+
+        start = 0
+        batch: List[List] = []
+        empty_rows: List[List] = []
+        for cells in rows:
+            row = [_convert_cell(cell) for cell in cells]
+            while row and row[-1] == '':
+                row.pop()
+            if not row:
+                # Prázdný řádek se použije, jen pokud za ním ještě jsou data
+                empty_rows.append(row)
+                continue
+            batch.extend(empty_rows)
+            empty_rows = []
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield _parse_rows(header, batch, start, usecols, dtype)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield _parse_rows(header, batch, start, usecols, dtype)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_chunks(file_path: Path, sheet_name: str, chunk_size: int, usecols: UseCols = None,
+                      engine: Optional[str] = None,
+                      dtype: Optional[Dict[str, type]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Čte list vstupního souboru po dávkách podle jeho formátu.
+
+    Args:
+        file_path (Path): Vstupní soubor (.xlsx, .xlsm, .xls, .csv, .tsv, .jsonl).
+        sheet_name (str): Logický list (Zbozi, Kategorie, Parametry).
+        chunk_size (int): Počet řádků v dávce.
+        usecols (Callable, optional): Filtr načítaných sloupců.
+        engine (str, optional): Engine pro .xls (načtení celého listu).
+        dtype (Dict, optional): Typy sloupců (textové sloupce jako str).
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Velikost dávky musí být kladná, zadáno {chunk_size}")
+    input_format = detect_format(file_path)
+
+    if input_format.kind != 'excel':
+        yield from iter_text_chunks(file_path, sheet_name, chunk_size, usecols, dtype)
+    elif input_format.suffix in STREAMING_EXCEL_SUFFIXES and engine in (None, 'openpyxl'):
+        yield from iter_xlsx_chunks(file_path, sheet_name, chunk_size, usecols, dtype)
+    else:
+        logger.warning(f"Soubor {Path(file_path).name} nejde číst postupně, list '{sheet_name}' "
+                       f"se načte celý a rozdělí na dávky")
+        df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=usecols, engine=engine, dtype=dtype)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
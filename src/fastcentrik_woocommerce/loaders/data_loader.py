@@ -6,31 +6,221 @@ Modul pro načítání dat z FastCentrik exportu.
 
 import pandas as pd
 import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Mapping, Optional, Set
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from config.config import ADVANCED_SETTINGS, LOADER_ENGINE_SETTINGS, SHEET_CACHE_SETTINGS
+from src.fastcentrik_woocommerce.core.variant_grouping import assign_family_ids
+from src.fastcentrik_woocommerce.loaders.chunked_reader import iter_sheet_chunks
+from src.fastcentrik_woocommerce.loaders.excel_engines import resolve_engine
+from src.fastcentrik_woocommerce.loaders.input_schema import (
+    apply_schema, memory_usage, schema_signature, text_dtypes, usecols_for
+)
+from src.fastcentrik_woocommerce.loaders.lazy_sheets import LazySheets
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+from src.fastcentrik_woocommerce.loaders.text_formats import detect_format, read_text_sheet
+from src.fastcentrik_woocommerce.loaders.sheet_cache import SheetCache
 
 logger = logging.getLogger(__name__)
 
+# Klíč ve výsledku -> název listu v exportu
+SHEETS_TO_LOAD = {
+    'products': 'Zbozi',
+    'categories': 'Kategorie',
+    'parameters': 'Parametry'
+}
+
 class DataLoader:
     """
     Zodpovídá za načítání a základní validaci dat z vstupního Excel souboru.
+
+    Kromě Excelu čte i textové exporty CSV/TSV/JSONL (i komprimované .gz/.zst),
+    které mapuje na stejné logické listy (viz text_formats).
+
+    Sešit se otevře a dekóduje jen jednou; jednotlivé listy se pak parsují
+    souběžně ve vláknech. Rozparsované listy se ukládají do diskové cache
+    (SheetCache), takže opakované načtení stejného souboru parsování přeskočí.
+    Engine pro čtení sešitu se volí přes resolve_engine (excel_engines).
+    Listy se schématem (input_schema) se načtou jen v deklarovaných sloupcích
+    a s deklarovanými typy; velikost v paměti se ukládá do self.memory_report.
+    Doby načtení se ukládají do self.sheet_timings.
+
+    V líném režimu (výchozí) vrací load_data kontejner LazySheets a každý list
+    se načte až při prvním přístupu - list, který nikdo nepotřebuje, se
+    nečte vůbec. Sešit zůstává otevřený, dokud nejsou načteny všechny listy
+    nebo dokud se nezavolá close().
+
+    Pro exporty, které se nevejdou do paměti, vrací iter_product_chunks list
+    Zbozi po dávkách; rodina variant se nikdy nerozdělí mezi dávky.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_workers: Optional[int] = None,
+                 use_cache: Optional[bool] = None, cache_dir: Optional[str] = None,
+                 engine: Optional[str] = None, lazy: Optional[bool] = None):
         """
         Inicializace DataLoaderu.
 
         Args:
-            file_path (str): Cesta k vstupnímu Excel souboru.
+            file_path (str): Cesta k vstupnímu souboru (Excel, CSV/TSV, JSONL).
+            max_workers (int, optional): Počet vláken pro parsování listů
+                (výchozí z ADVANCED_SETTINGS['sheet_loader_workers']; 1 = postupně).
+            use_cache (bool, optional): Použít cache rozparsovaných listů
+                (výchozí z SHEET_CACHE_SETTINGS['enabled']).
+            cache_dir (str, optional): Adresář cache (výchozí z SHEET_CACHE_SETTINGS['cache_dir']).
+            engine (str, optional): Engine pro čtení Excelu nebo 'auto'
+                (výchozí z LOADER_ENGINE_SETTINGS['engine']).
+            lazy (bool, optional): Načítat listy až při prvním přístupu
+                (výchozí z ADVANCED_SETTINGS['lazy_sheet_loading']).
         """
         self.file_path = Path(file_path)
+        self.max_workers = max_workers if max_workers is not None else \
+            ADVANCED_SETTINGS.get('sheet_loader_workers', len(SHEETS_TO_LOAD))
+        self.use_cache = use_cache if use_cache is not None else SHEET_CACHE_SETTINGS.get('enabled', True)
+        self.cache = SheetCache(
+            cache_dir or SHEET_CACHE_SETTINGS.get('cache_dir', '.sheet_cache'),
+            max_size_mb=SHEET_CACHE_SETTINGS.get('max_size_mb', 1024),
+            cache_format=SHEET_CACHE_SETTINGS.get('format', 'auto')
+        )
+        self.requested_engine = engine or LOADER_ENGINE_SETTINGS.get('engine', 'auto')
+        self.engine: Optional[str] = None
+        self.input_format = None
+        self.lazy = lazy if lazy is not None else ADVANCED_SETTINGS.get('lazy_sheet_loading', True)
+        self._workbook: Optional[pd.ExcelFile] = None
+        self._workbook_lock = threading.Lock()
+        self._pending_sheets = set()
+        self._cache_key: Optional[str] = None
         self.data = {}
+        self.sheet_timings: Dict[str, float] = {}
+        self.memory_report: Dict[str, Dict[str, int]] = {}
+
+    def _cache_signature(self) -> str:
+        """Nastavení parsování, které ovlivňuje obsah cache."""
+        return f"sheets={','.join(SHEETS_TO_LOAD.values())}|engine={self.engine}|" \
+               f"schema={schema_signature()}|pandas={pd.__version__}"
+
+    def invalidate_cache(self) -> int:
+        """Smaže z cache všechny záznamy vstupního souboru; vrátí jejich počet."""
+        return self.cache.invalidate(self.file_path)
+
+    def _parse_sheet(self, workbook: Optional[pd.ExcelFile], sheet_name: str) -> pd.DataFrame:
+        """
+        Rozparsuje jeden list, převede typy podle schématu a změří dobu.
+
+        List se čte z již otevřeného sešitu, pro workbook None z textového exportu.
+        """
+        start = time.perf_counter()
+        if workbook is None:
+            df = read_text_sheet(self.file_path, sheet_name, usecols_for(sheet_name), text_dtypes(sheet_name))
+        else:
+            df = workbook.parse(sheet_name=sheet_name, usecols=usecols_for(sheet_name),
+                                dtype=text_dtypes(sheet_name))
+        parsed_size = memory_usage(df)
+        df = apply_schema(df, sheet_name)
+        self.sheet_timings[sheet_name] = time.perf_counter() - start
+        self.memory_report[sheet_name] = {
+            'columns': len(df.columns),
+            'parsed': parsed_size,
+            'optimized': memory_usage(df)
+        }
+        logger.info(f"Načteno {len(df)} záznamů z listu '{sheet_name}' za {self.sheet_timings[sheet_name]:.2f} s.")
+        return df
+
+    def _log_sheet_memory(self, sheet_name: str) -> None:
+        report = self.memory_report[sheet_name]
+        logger.info(f"List '{sheet_name}' ({report['columns']} sloupců): "
+                    f"{report['parsed'] / 1024 / 1024:.1f} MB po načtení, "
+                    f"{report['optimized'] / 1024 / 1024:.1f} MB po převodu typů")
+
+    def log_memory_report(self) -> None:
+        """Zaloguje velikost načtených listů v paměti před a po převodu typů."""
+        for sheet_name in self.memory_report:
+            self._log_sheet_memory(sheet_name)
+
+    def _load_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Načte jeden list pro LazySheets - z cache, jinak z jednou otevřeného sešitu (nebo textového exportu)."""
+        if self._cache_key is not None:
+            start = time.perf_counter()
+            cached = self.cache.load(self._cache_key, [sheet_name])
+            if cached is not None:
+                elapsed = time.perf_counter() - start
+                self.sheet_timings['_cache'] = self.sheet_timings.get('_cache', 0.0) + elapsed
+                logger.info(f"List '{sheet_name}' načten z cache za {elapsed:.2f} s")
+                self._mark_loaded(sheet_name)
+                return cached[sheet_name]
 
-    def load_data(self) -> Dict[str, pd.DataFrame]:
+        try:
+            with self._workbook_lock:
+                if self.input_format.kind == 'excel' and self._workbook is None:
+                    start = time.perf_counter()
+                    self._workbook = pd.ExcelFile(self.file_path, engine=self.engine)
+                    self.sheet_timings['_open'] = time.perf_counter() - start
+                    logger.info(f"Sešit otevřen enginem {self._workbook.engine} "
+                                f"za {self.sheet_timings['_open']:.2f} s")
+                # Textový export nemá sešit - _parse_sheet čte list přímo ze souboru
+                df = self._parse_sheet(self._workbook, sheet_name)
+        except Exception as e:
+            logger.error(f"Došlo k chybě při načítání listu '{sheet_name}': {e}")
+            raise
+        self._log_sheet_memory(sheet_name)
+
+        if self._cache_key is not None:
+            try:
+                self.cache.add_sheets(self._cache_key, {sheet_name: df}, self.file_path)
+            except OSError as e:
+                logger.warning(f"List '{sheet_name}' se nepodařilo uložit do cache: {e}")
+
+        self._mark_loaded(sheet_name)
+        return df
+
+    def _mark_loaded(self, sheet_name: str) -> None:
+        """Po načtení posledního listu sešit zavře."""
+        self._pending_sheets.discard(sheet_name)
+        if not self._pending_sheets:
+            self.close()
+
+    def close(self) -> None:
+        """Zavře sešit otevřený pro líné načítání (další přístup ho otevře znovu)."""
+        with self._workbook_lock:
+            if self._workbook is not None:
+                self._workbook.close()
+                self._workbook = None
+
+    def _parse_workbook(self, start: float) -> Dict[str, pd.DataFrame]:
+        """Otevře sešit jednou a rozparsuje všechny listy (souběžně ve vláknech)."""
+        with pd.ExcelFile(self.file_path, engine=self.engine) as workbook:
+            self.sheet_timings['_open'] = time.perf_counter() - start
+            logger.info(f"Sešit otevřen enginem {workbook.engine} za {self.sheet_timings['_open']:.2f} s")
+
+            workers = max(1, min(self.max_workers, len(SHEETS_TO_LOAD)))
+            if workers == 1:
+                loaded_data = {
+                    key: self._parse_sheet(workbook, sheet_name)
+                    for key, sheet_name in SHEETS_TO_LOAD.items()
+                }
+            else:
+                logger.info(f"Parsuji {len(SHEETS_TO_LOAD)} listy ve {workers} vláknech...")
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = {
+                        key: pool.submit(self._parse_sheet, workbook, sheet_name)
+                        for key, sheet_name in SHEETS_TO_LOAD.items()
+                    }
+                    loaded_data = {key: future.result() for key, future in futures.items()}
+        return loaded_data
+
+    def load_data(self) -> Mapping[str, pd.DataFrame]:
         """
         Načte data ze všech požadovaných listů v Excel souboru.
 
         Returns:
-            Dict[str, pd.DataFrame]: Slovník s DataFrame pro každý list.
+            Mapping[str, pd.DataFrame]: DataFrame pro každý list; v líném režimu
+                LazySheets, který list načte až při prvním přístupu.
         
         Raises:
             FileNotFoundError: Pokud soubor neexistuje.
@@ -43,21 +233,168 @@ class DataLoader:
 
         logger.info(f"Načítám data z {self.file_path}")
         try:
-            sheets_to_load = {
-                'products': 'Zbozi',
-                'categories': 'Kategorie',
-                'parameters': 'Parametry'
-            }
-            
-            loaded_data = {}
-            for key, sheet_name in sheets_to_load.items():
-                logger.info(f"Načítám list '{sheet_name}'...")
-                loaded_data[key] = pd.read_excel(self.file_path, sheet_name=sheet_name)
-                logger.info(f"Načteno {len(loaded_data[key])} záznamů z listu '{sheet_name}'.")
+            self.sheet_timings = {}
+            self.memory_report = {}
+            self.input_format = detect_format(self.file_path)
+            self.engine = None
+            if self.input_format.kind == 'excel':
+                self.engine = resolve_engine(self.file_path, self.requested_engine,
+                                             LOADER_ENGINE_SETTINGS.get('choices_file'))
+            start = time.perf_counter()
+
+            cache_key = None
+            if self.use_cache:
+                cache_key = self.cache.key_for(self.file_path, self._cache_signature())
+
+            if self.lazy:
+                self.close()
+                self._cache_key = cache_key
+                self._pending_sheets = set(SHEETS_TO_LOAD.values())
+                self.data = LazySheets({
+                    key: (lambda sheet_name=sheet_name: self._load_sheet(sheet_name))
+                    for key, sheet_name in SHEETS_TO_LOAD.items()
+                })
+                return self.data
+
+            if cache_key is not None:
+                cached = self.cache.load(cache_key, SHEETS_TO_LOAD.values())
+                if cached is not None:
+                    self.sheet_timings['_cache'] = time.perf_counter() - start
+                    logger.info(f"Listy načteny z cache za {self.sheet_timings['_cache']:.2f} s")
+                    self.data = {key: cached[sheet_name] for key, sheet_name in SHEETS_TO_LOAD.items()}
+                    return self.data
+
+            if self.input_format.kind != 'excel':
+                loaded_data = {key: self._parse_sheet(None, sheet_name) for key, sheet_name in SHEETS_TO_LOAD.items()}
+            else:
+                loaded_data = self._parse_workbook(start)
+
+            self.sheet_timings['_total'] = time.perf_counter() - start
+            logger.info(f"Všechny listy načteny za {self.sheet_timings['_total']:.2f} s")
+            self.log_memory_report()
+
+            if cache_key is not None:
+                try:
+                    self.cache.store(cache_key, {
+                        sheet_name: loaded_data[key] for key, sheet_name in SHEETS_TO_LOAD.items()
+                    }, self.file_path)
+                except OSError as e:
+                    logger.warning(f"Listy se nepodařilo uložit do cache: {e}")
             
             self.data = loaded_data
             return self.data
 
         except Exception as e:
             logger.error(f"Došlo k chybě při načítání Excel souboru: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def iter_sheet_chunks(self, key: str = 'products', chunk_size: Optional[int] = None,
+                          columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Čte list po dávkách řádků (bez cache, v paměti je jen aktuální dávka).
+
+        Args:
+            key (str): Klíč listu ze SHEETS_TO_LOAD.
+            chunk_size (int, optional): Počet řádků v dávce (výchozí ADVANCED_SETTINGS['batch_size']).
+            columns (List[str], optional): Načíst jen tyto sloupce; jinak podle schématu
+                a s převodem typů (input_schema).
+
+        Yields:
+            pd.DataFrame: Dávky s indexem pokračujícím přes celý list.
+        """
+        if not self.file_path.exists():
+            msg = f"Vstupní soubor nebyl nalezen: {self.file_path}"
+            logger.error(msg)
+            raise FileNotFoundError(msg)
+
+        sheet_name = SHEETS_TO_LOAD[key]
+        chunk_size = chunk_size or ADVANCED_SETTINGS.get('batch_size', 1000)
+        if columns is not None:
+            names = frozenset(columns)
+            usecols = lambda column: column in names
+        else:
+            usecols = usecols_for(sheet_name)
+        engine = None
+        if detect_format(self.file_path).kind == 'excel':
+            engine = resolve_engine(self.file_path, self.requested_engine,
+                                    LOADER_ENGINE_SETTINGS.get('choices_file'))
+
+        for chunk in iter_sheet_chunks(self.file_path, sheet_name, chunk_size, usecols, engine,
+                                       dtype=text_dtypes(sheet_name)):
+            yield chunk if columns is not None else apply_schema(chunk, sheet_name)
+
+    def load_family_index(self) -> pd.DataFrame:
+        """
+        Předběžný průchod listem Zbozi - načte jen KodZbozi a KodMasterVyrobku.
+
+        Returns:
+            pd.DataFrame: Sloupce KodZbozi, KodMasterVyrobku a family (číslo rodiny
+                variant z assign_family_ids) pro každý řádek listu.
+        """
+        start = time.perf_counter()
+        chunks = list(self.iter_sheet_chunks('products', columns=['KodZbozi', 'KodMasterVyrobku']))
+        index = pd.concat(chunks) if chunks else pd.DataFrame(columns=['KodZbozi'])
+        if 'KodZbozi' not in index.columns:
+            raise ValueError("List Zbozi neobsahuje sloupec KodZbozi")
+        index['family'] = assign_family_ids(index['KodZbozi'], index.get('KodMasterVyrobku'))
+        self.sheet_timings['_family_index'] = time.perf_counter() - start
+        logger.info(f"Předběžný průchod: {len(index)} řádků v {index['family'].nunique()} rodinách "
+                    f"za {self.sheet_timings['_family_index']:.2f} s")
+        return index
+
+    def load_parameter_keys(self) -> Set[str]:
+        """
+        Předběžný průchod listem Zbozi - načte jen HodnotyParametru.
+
+        Returns:
+            Set[str]: Klíče parametrů všech produktů (např. pro hlavičku
+                dávkového WebToffee exportu, která se zapisuje předem).
+        """
+        keys: Set[str] = set()
+        for chunk in self.iter_sheet_chunks('products', columns=['HodnotyParametru']):
+            keys.update(ParameterTable.from_products(chunk, size_patterns=()).long_table['key'].unique())
+        return keys
+
+    def iter_product_chunks(self, chunk_size: Optional[int] = None,
+                            family_index: Optional[pd.DataFrame] = None) -> Iterator[pd.DataFrame]:
+        """
+        Vrací list Zbozi po dávkách tak, aby každá rodina variant byla celá v jedné dávce.
+
+        Nejprve proběhne předběžný průchod (load_family_index), který určí
+        rodinu a počet řádků každé rodiny. Řádky rodiny, která ještě není
+        načtená celá, se podrží do další dávky - dávka proto může být kratší
+        nebo delší než chunk_size a rodiny roztroušené daleko od sebe
+        zvyšují počet podržených řádků.
+
+        Args:
+            chunk_size (int, optional): Počet řádků čtených najednou (výchozí ADVANCED_SETTINGS['batch_size']).
+            family_index (pd.DataFrame, optional): Výsledek load_family_index, pokud už
+                předběžný průchod proběhl (jinak se provede zde).
+
+        Yields:
+            pd.DataFrame: Dávky produktů s indexem odpovídajícím řádkům listu.
+        """
+        if family_index is None:
+            family_index = self.load_family_index()
+        family_ids = family_index['family'].to_numpy()
+        remaining = np.bincount(family_ids) if len(family_ids) else np.zeros(0, dtype=int)
+
+        held: Optional[pd.DataFrame] = None
+        held_ids = np.zeros(0, dtype=family_ids.dtype)
+        position = 0
+        for chunk in self.iter_sheet_chunks('products', chunk_size):
+            chunk_ids = family_ids[position:position + len(chunk)]
+            position += len(chunk)
+            np.subtract.at(remaining, chunk_ids, 1)
+
+            if held is not None and len(held):
+                chunk = pd.concat([held, chunk])
+                chunk_ids = np.concatenate([held_ids, chunk_ids])
+            complete = remaining[chunk_ids] == 0
+            held, held_ids = chunk[~complete], chunk_ids[~complete]
+            if complete.any():
+                yield chunk[complete]
+
+        if held is not None and len(held):
+            logger.warning(f"{len(held)} řádků nemá v předběžném průchodu úplnou rodinu, vracím je v poslední dávce")
+            yield held
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Čtecí enginy pro Excel exporty
+==============================
+
+Přehled enginů, kterými umí pandas číst sešit, s kontrolou dostupnosti:
+
+    - xlrd: výchozí pro .xls
+    - openpyxl: výchozí pro .xlsx; pandas ho otevírá v read-only režimu
+      (read_only=True, data_only=True), listy se čtou po řádcích
+    - calamine: volitelný rychlý engine v Rustu (balíček python-calamine,
+      pandas >= 2.2), umí .xls i .xlsx
+
+DataLoader engine vybírá přes resolve_engine: explicitně zadaný engine,
+jinak vítěz uloženého měření pro danou příponu, jinak výchozí engine
+pandas. Příponou se rozumí skutečný formát podle začátku souboru
+(detect_excel_suffix), ne název - export Export_Excel_Lite.xls bývá
+i sešit .xlsx a pandas ho bez zadaného enginu načte. Měření
+(benchmark_engines) změří všechny dostupné enginy na konkrétním souboru,
+ověří, že vrací stejná data jako výchozí engine, a nejrychlejšího uloží
+jako volbu pro příponu souboru.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import importlib.util
+import json
+import logging
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ExcelEngine(NamedTuple):
+    """Popis enginu pro pd.ExcelFile."""
+    name: str
+    module: str
+    suffixes: Tuple[str, ...]
+    description: str
+    min_pandas: Tuple[int, int] = (1, 0)
+
+
+EXCEL_ENGINES = {
+    'xlrd': ExcelEngine('xlrd', 'xlrd', ('.xls',), 'xlrd (výchozí pro .xls)'),
+    'openpyxl': ExcelEngine('openpyxl', 'openpyxl', ('.xlsx', '.xlsm'),
+                            'openpyxl v read-only režimu (výchozí pro .xlsx)'),
+    'calamine': ExcelEngine('calamine', 'python_calamine', ('.xls', '.xlsx', '.xlsm'),
+                            'calamine (python-calamine)', min_pandas=(2, 2)),
+}
+
+# Engine, který pandas použije bez explicitní volby
+DEFAULT_ENGINES = {
+    '.xls': 'xlrd',
+    '.xlsx': 'openpyxl',
+    '.xlsm': 'openpyxl',
+}
+
+# Začátek souboru starého binárního formátu .xls (OLE2)
+XLS_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+
+def detect_excel_suffix(file_path: Path) -> Optional[str]:
+    """
+    Určí formát sešitu podle obsahu souboru, stejně jako pandas bez zadaného enginu.
+
+    Args:
+        file_path (Path): Vstupní sešit.
+
+    Returns:
+        Optional[str]: '.xls' nebo '.xlsx' ('.xlsm' podle názvu); přípona názvu,
+            pokud soubor neexistuje; None pro obsah, který neznáme (rozhodne pandas).
+    """
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    try:
+        with open(path, 'rb') as handle:
+            header = handle.read(len(XLS_SIGNATURE))
+    except OSError:
+        return suffix
+    if header == XLS_SIGNATURE:
+        return '.xls'
+    if header.startswith(ZIP_SIGNATURE):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                if 'xl/workbook.xml' in archive.namelist():
+                    return suffix if suffix == '.xlsm' else '.xlsx'
+        except zipfile.BadZipFile:
+            pass
+    return None
+
+
+def _pandas_version() -> Tuple[int, int]:
+    major, minor = pd.__version__.split('.')[:2]
+    return int(major), int(''.join(ch for ch in minor if ch.isdigit()) or 0)
+
+
+def is_engine_available(name: str) -> bool:
+    """Vrátí True, pokud je engine nainstalovaný a podporovaný verzí pandas."""
+    engine = EXCEL_ENGINES.get(name)
+    if engine is None:
+        return False
+    if _pandas_version() < engine.min_pandas:
+        return False
+    return importlib.util.find_spec(engine.module) is not None
+
+
+def available_engines(suffix: str) -> List[str]:
+    """Vrátí dostupné enginy, které umí číst soubory s danou příponou."""
+    suffix = suffix.lower()
+    return [name for name, engine in EXCEL_ENGINES.items()
+            if suffix in engine.suffixes and is_engine_available(name)]
+
+
+def load_engine_choices(choices_file: Path) -> Dict[str, str]:
+    """Načte uložené vítěze měření (přípona -> engine)."""
+    path = Path(choices_file)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding='utf-8')).get('engines', {})
+    except ValueError:
+        logger.warning(f"Soubor s volbou enginů {path} je poškozený, ignoruji ho")
+        return {}
+
+
+def save_engine_choice(choices_file: Path, suffix: str, engine: str) -> None:
+    """Uloží engine jako volbu pro danou příponu."""
+    path = Path(choices_file)
+    choices = load_engine_choices(path)
+    choices[suffix.lower()] = engine
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'engines': choices}, indent=2), encoding='utf-8')
+
+
+def resolve_engine(file_path: Path, requested: Optional[str] = 'auto',
+                   choices_file: Optional[Path] = None) -> Optional[str]:
+    """
+    Určí engine pro čtení souboru.
+
+    Args:
+        file_path (Path): Vstupní sešit.
+        requested (str, optional): Název enginu, nebo 'auto' / None pro automatickou volbu.
+        choices_file (Path, optional): Soubor s uloženými vítězi měření.
+
+    Returns:
+        Optional[str]: Název enginu; None pro formát, který neznáme (rozhodne pandas).
+
+    Raises:
+        ValueError: Pokud zadaný engine neexistuje, není nainstalovaný nebo nepodporuje formát.
+    """
+    suffix = detect_excel_suffix(file_path)
+
+    if requested not in (None, 'auto'):
+        engine = EXCEL_ENGINES.get(requested)
+        if engine is None:
+            raise ValueError(f"Neznámý engine '{requested}', dostupné: {', '.join(EXCEL_ENGINES)}")
+        if suffix is not None and suffix not in engine.suffixes:
+            raise ValueError(f"Engine '{requested}' neumí číst soubory {suffix}")
+        if not is_engine_available(requested):
+            raise ValueError(f"Engine '{requested}' není nainstalovaný (balíček {engine.module})")
+        return requested
+
+    if suffix is None:
+        return None
+    if choices_file is not None:
+        choice = load_engine_choices(choices_file).get(suffix)
+        if choice and choice in available_engines(suffix):
+            return choice
+
+    return DEFAULT_ENGINES.get(suffix)
+
+
+def _parse_all(file_path: Path, sheet_names: Iterable[str], engine: Optional[str]) -> Dict[str, pd.DataFrame]:
+    with pd.ExcelFile(file_path, engine=engine) as workbook:
+        return {sheet_name: workbook.parse(sheet_name=sheet_name) for sheet_name in sheet_names}
+
+
+def benchmark_engines(file_path: Path, sheet_names: Iterable[str], repeat: int = 1,
+                      choices_file: Optional[Path] = None) -> List[Dict]:
+    """
+    Změří dostupné enginy na souboru a nejrychlejšího uloží jako volbu pro jeho příponu.
+
+    Vítězem může být jen engine, jehož data jsou shodná s výchozím enginem pandas.
+
+    Args:
+        file_path (Path): Vstupní sešit.
+        sheet_names (Iterable[str]): Listy, které se mají načíst.
+        repeat (int): Počet opakování; bere se nejlepší čas.
+        choices_file (Path, optional): Kam uložit vítěze; None = neukládat.
+
+    Returns:
+        List[Dict]: Pro každý engine name, seconds (None při chybě), identical, error, winner.
+    """
+    file_path = Path(file_path)
+    sheet_names = list(sheet_names)
+    suffix = detect_excel_suffix(file_path)
+    reference = _parse_all(file_path, sheet_names, DEFAULT_ENGINES.get(suffix))
+
+    results = []
+    for name in available_engines(suffix or ''):
+        result = {'name': name, 'seconds': None, 'identical': False, 'error': '', 'winner': False}
+        try:
+            best = float('inf')
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                data = _parse_all(file_path, sheet_names, name)
+                best = min(best, time.perf_counter() - start)
+            result['seconds'] = best
+            result['identical'] = all(data[sheet].equals(reference[sheet]) for sheet in sheet_names)
+        except Exception as e:
+            result['error'] = str(e)
+        results.append(result)
+        logger.info(f"Engine {name}: {result['seconds']} s, shodná data: {result['identical']}")
+
+    candidates = [result for result in results if result['identical']]
+    if candidates:
+        winner = min(candidates, key=lambda result: result['seconds'])
+        winner['winner'] = True
+        if choices_file is not None:
+            save_engine_choice(choices_file, suffix, winner['name'])
+            logger.info(f"Engine {winner['name']} uložen jako volba pro {suffix} do {choices_file}")
+
+    return results
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deklarované schéma vstupních listů
+==================================
+
+Transformátory z listů Zbozi a Kategorie čtou jen několik sloupců. Schéma
+je vyjmenuje i s typem hodnot a DataLoader podle něj:
+
+    - načte jen deklarované sloupce (usecols), ostatní se vůbec neparsují
+    - kódové sloupce načte jako text, takže kódy kategorií v Zbozi a Kategorie
+      mají stejný typ i při čistě číselných kódech (12 i '12' -> '12');
+      sloupce s malým počtem různých hodnot převede na category
+    - ceny načte jako text a ponechá beze změny - export je zapisuje tak,
+      jak jsou ve zdroji (jen desetinná čárka -> tečka), float by změnil
+      zápis (6232 -> 6232.0, 6 660,90 -> 6660.9)
+    - skladové množství a příznak vypnutí převede na nullable Int64
+
+Převod, který by ztratil data (hodnota, která není číslo, desetinné
+množství), se neprovede a sloupec zůstane beze změny. Listy bez schématu
+se načítají celé.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import logging
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TEXT = 'text'
+CODE = 'code'
+PRICE = 'price'
+INT = 'int'
+
+# Druhy sloupců, které se čtou jako str (viz text_dtypes)
+STR_KINDS = (TEXT, CODE, PRICE)
+
+
+class ColumnSpec(NamedTuple):
+    """Deklarace jednoho sloupce vstupního listu."""
+    name: str
+    kind: str = TEXT
+
+
+ZBOZI_COLUMNS = (
+    ColumnSpec('KodZbozi'),
+    ColumnSpec('JmenoZbozi'),
+    ColumnSpec('KodMasterVyrobku', CODE),
+    ColumnSpec('HodnotyParametru'),
+    ColumnSpec('InetrniKodyKategorii', CODE),
+    ColumnSpec('CenaBezna', PRICE),
+    ColumnSpec('ZakladniCena', PRICE),
+    ColumnSpec('Popis'),
+    ColumnSpec('KratkyPopis'),
+    ColumnSpec('HlavniObrazek'),
+    ColumnSpec('DalsiObrazky'),
+    ColumnSpec('NaSklade', INT),
+    ColumnSpec('Hmotnost'),
+    ColumnSpec('Vypnuto', INT),
+)
+
+KATEGORIE_COLUMNS = (
+    ColumnSpec('InterniKod', CODE),
+    ColumnSpec('JmenoKategorie'),
+    ColumnSpec('KodNadrizeneKategorie', CODE),
+    ColumnSpec('PopisKategorie'),
+)
+
+# Název listu -> deklarované sloupce
+SHEET_SCHEMAS: Dict[str, Tuple[ColumnSpec, ...]] = {
+    'Zbozi': ZBOZI_COLUMNS,
+    'Kategorie': KATEGORIE_COLUMNS,
+}
+
+# Kódový sloupec se převede na category, jen pokud má nejvýše tento podíl různých hodnot
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def schema_signature() -> str:
+    """Popis schématu pro podpis cache - změna schématu vede na nový záznam."""
+    return ';'.join(
+        f"{sheet_name}:" + ','.join(f"{spec.name}/{spec.kind}" for spec in columns)
+        for sheet_name, columns in SHEET_SCHEMAS.items()
+    ) + ';str=' + ','.join(STR_KINDS)  # Sloupce čtené jako str (text_dtypes)
+
+
+def usecols_for(sheet_name: str) -> Optional[Callable[[str], bool]]:
+    """
+    Vrátí filtr sloupců pro parametr usecols, nebo None pro list bez schématu.
+
+    Filtr je funkce, takže sloupec, který v exportu chybí, nezpůsobí chybu.
+    """
+    columns = SHEET_SCHEMAS.get(sheet_name)
+    if columns is None:
+        return None
+    names = frozenset(spec.name for spec in columns)
+    return lambda column: column in names
+
+
+def _to_number(series: pd.Series) -> Optional[pd.Series]:
+    """Převede sloupec na čísla; None, pokud některá neprázdná hodnota není číslo."""
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    text = series.astype(object).where(series.notna(), None).map(
+        lambda value: str(value).replace('\xa0', '').replace(' ', '').replace(',', '.')
+        if value is not None else None
+    )
+    numbers = pd.to_numeric(text, errors='coerce')
+    if (numbers.isna() & text.notna() & (text != '')).any():
+        return None
+    return numbers
+
+
+def _convert_column(series: pd.Series, spec: ColumnSpec, sheet_name: str) -> pd.Series:
+    if spec.kind == CODE:
+        non_null = series.count()
+        if non_null and series.nunique() <= non_null * CATEGORY_MAX_UNIQUE_RATIO:
+            return series.astype('category')
+        return series
+
+    if spec.kind == INT:
+        numbers = _to_number(series)
+        if numbers is None:
+            logger.warning(f"Sloupec '{spec.name}' listu '{sheet_name}' obsahuje nečíselné hodnoty, "
+                           f"ponechávám ho beze změny")
+            return series
+        non_null = numbers.dropna()
+        if not (non_null == non_null.round()).all():
+            logger.warning(f"Sloupec '{spec.name}' listu '{sheet_name}' obsahuje desetinná čísla, "
+                           f"ponechávám ho jako float")
+            return numbers
+        return numbers.astype('Int64')
+
+    return series
+
+
+def apply_schema(df: pd.DataFrame, sheet_name: str) -> pd.DataFrame:
+    """
+    Převede sloupce listu na deklarované typy.
+
+    Args:
+        df (pd.DataFrame): Rozparsovaný list.
+        sheet_name (str): Název listu (určuje schéma).
+
+    Returns:
+        pd.DataFrame: List s převedenými sloupci (pro list bez schématu beze změny).
+    """
+    columns = SHEET_SCHEMAS.get(sheet_name)
+    if columns is None:
+        return df
+    converted = {
+        spec.name: _convert_column(df[spec.name], spec, sheet_name)
+        for spec in columns if spec.name in df.columns
+    }
+    return df.assign(**converted)
+
+
+def memory_usage(df: pd.DataFrame) -> int:
+    """Vrátí skutečnou velikost DataFrame v bajtech včetně obsahu řetězců."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def text_dtypes(sheet_name: str) -> Dict[str, type]:
+    """
+    Vrátí typy pro čtení listů: textové, kódové a cenové sloupce jako str.
+
+    Bez nich pandas převede číselně vypadající text na číslo - v CSV by
+    033201 ztratil úvodní nulu a v Excelu by se sloupec kódů nebo cen
+    s prázdnými buňkami načetl jako float (100002.0, 6232.0). Kódy
+    kategorií se musí číst stejně v Zbozi i Kategorie, jinak se '12'
+    z produktu nenajde v mapování s klíčem 12.
+    """
+    return {spec.name: str for spec in SHEET_SCHEMAS.get(sheet_name, ()) if spec.kind in STR_KINDS}
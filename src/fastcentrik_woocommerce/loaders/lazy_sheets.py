@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Líně načítané listy sešitu
+==========================
+
+LazySheets se chová jako slovník DataFrame (klíč -> list), ale list
+rozparsuje až při prvním přístupu a výsledek si zapamatuje. List, který
+žádný konzument nepotřebuje (např. Parametry při WebToffee transformaci),
+se tak vůbec nečte.
+
+Pozor: iterace přes hodnoty (values(), items()) načte všechny listy.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List
+
+import pandas as pd
+
+
+class LazySheets(Mapping):
+    """
+    Slovník listů načítaných při prvním přístupu.
+
+    Použití:
+        sheets = LazySheets({'products': lambda: parse('Zbozi')})
+        products_df = sheets['products']   # parsuje se teprve zde
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], pd.DataFrame]]):
+        """
+        Args:
+            loaders (Dict[str, Callable]): Klíč -> funkce bez parametrů, která list načte.
+        """
+        self._loaders = dict(loaders)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if key not in self._loaders:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._frames:
+                self._frames[key] = self._loaders[key]()
+            return self._frames[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    def is_loaded(self, key: str) -> bool:
+        """Vrátí True, pokud už byl list načten."""
+        return key in self._frames
+
+    def loaded_keys(self) -> List[str]:
+        """Vrátí klíče již načtených listů."""
+        return [key for key in self._loaders if key in self._frames]
+
+    def __repr__(self) -> str:
+        return f"LazySheets(načteno={self.loaded_keys()}, celkem={list(self._loaders)})"
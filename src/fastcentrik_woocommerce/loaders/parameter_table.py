@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sloupcová tabulka parametrů produktů
+====================================
+
+Rozparsuje celý sloupec HodnotyParametru jednou při načtení katalogu do
+long-format tabulky (row, key, value) a k ní drží lookup parametrů podle řádku.
+Transformátory pak parametry čtou z tabulky místo opakovaného dělení řetězců.
+
+Řádkům bez parametrů se zároveň jedním Series.str.extract odvodí velikost
+z konce názvu (sloupec inferred_velikost) pro varianty bez parametrů.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import re
+
+import pandas as pd
+from typing import Dict, Hashable, Optional, Sequence
+
+# Výchozí vzory velikosti na konci názvu (skupina 1 = velikost), např. "40", "41 1/3"
+DEFAULT_SIZE_PATTERNS = [r'\b(\d{2}(?:\s+\d/\d)?)\b$']
+
+
+def extract_sizes(names: pd.Series, patterns: Sequence[str] = DEFAULT_SIZE_PATTERNS) -> pd.Series:
+    """
+    Odvodí velikost z názvů produktů.
+
+    Vzory se zkouší v daném pořadí, pro každý název vyhrává první shoda;
+    velikostí je první skupina vzoru. Hledá se kdekoli v názvu (re.search),
+    vzor si sám určí ukotvení (např. $ pro konec názvu).
+
+    Args:
+        names (pd.Series): Názvy produktů (převedou se přes str()).
+        patterns (Sequence[str]): Regulární výrazy s alespoň jednou skupinou.
+
+    Returns:
+        pd.Series: Velikost, nebo NaN, pokud žádný vzor nenajde shodu (stejný index jako names).
+    """
+    texts = pd.Series([str(name) for name in names], index=names.index, dtype=object)
+    sizes = pd.Series(float('nan'), index=names.index, dtype=object)
+    for pattern in patterns:
+        missing = sizes.isna()
+        if not missing.any():
+            break
+        found = texts[missing].str.extract(pattern, expand=True)[0].dropna()
+        sizes[found.index] = found
+    return sizes
+
+
+def infer_size(name, patterns: Sequence[str] = DEFAULT_SIZE_PATTERNS) -> Optional[str]:
+    """Velikost z jednoho názvu podle stejných pravidel jako extract_sizes, nebo None."""
+    for pattern in patterns:
+        match = re.search(pattern, str(name))
+        if match:
+            return match.group(1)
+    return None
+
+
+class ParameterTable:
+    """
+    Parametry všech produktů katalogu ve dvou podobách:
+
+    - long_table: DataFrame se sloupci row (pozice řádku), key, value
+    - lookup podle pozice nebo indexového labelu řádku -> Dict[str, str]
+    - inferred_velikost: velikost z názvu pro řádky bez parametrů (podle pozice, jinak NaN)
+
+    Sémantika odpovídá parse_parameters: páry se dělí podle '##' a '||',
+    klíč i hodnota se ořezávají, prázdné se přeskakují a při opakovaném klíči
+    vyhrává poslední hodnota na pozici prvního výskytu.
+    """
+
+    def __init__(self, long_table: pd.DataFrame, labels: pd.Index,
+                 inferred_velikost: Optional[pd.Series] = None):
+        """
+        Inicializace tabulky.
+
+        Args:
+            long_table (pd.DataFrame): Tabulka se sloupci row, key, value.
+            labels (pd.Index): Index původního DataFrame s produkty.
+            inferred_velikost (pd.Series, optional): Velikost z názvu podle pozice řádku.
+        """
+        self.long_table = long_table
+        self.labels = labels
+        if inferred_velikost is None:
+            inferred_velikost = pd.Series(float('nan'), index=pd.RangeIndex(len(labels)), dtype=object)
+        self.inferred_velikost = inferred_velikost.rename('inferred_velikost')
+        self._inferred_sizes: Dict[int, str] = inferred_velikost.dropna().to_dict()
+        self._row_params: Dict[int, Dict[str, str]] = {}
+        for row, key, value in zip(long_table['row'].tolist(),
+                                   long_table['key'].tolist(),
+                                   long_table['value'].tolist()):
+            self._row_params.setdefault(row, {})[key] = value
+
+        # Lookup podle labelu má smysl jen pro unikátní index
+        self._label_positions: Optional[Dict[Hashable, int]] = None
+        if labels.is_unique:
+            self._label_positions = {label: position for position, label in enumerate(labels)}
+
+    @classmethod
+    def from_series(cls, param_series: pd.Series, names: Optional[pd.Series] = None,
+                    size_patterns: Sequence[str] = DEFAULT_SIZE_PATTERNS) -> 'ParameterTable':
+        """
+        Vytvoří tabulku z celého sloupce HodnotyParametru jedním vektorizovaným průchodem.
+
+        Args:
+            param_series (pd.Series): Sloupec HodnotyParametru.
+            names (pd.Series, optional): Sloupec JmenoZbozi pro inferred_velikost
+                řádků bez parametrů; bez něj se velikost neodvozuje.
+            size_patterns (Sequence[str]): Vzory velikosti v názvu (viz extract_sizes).
+
+        Returns:
+            ParameterTable: Naparsované parametry katalogu.
+        """
+        values = pd.Series(param_series.to_numpy(dtype=object), dtype=object)
+        is_text = values.map(lambda value: isinstance(value, str) and value != '')
+        values = values[is_text]
+
+        pairs = values.str.split('##').explode()
+        pairs = pairs[pairs.str.contains('||', regex=False, na=False)]
+        parts = pairs.str.split('||', n=1, regex=False)
+
+        long_table = pd.DataFrame({
+            'row': pairs.index.to_numpy(),
+            'key': parts.str[0].str.strip().to_numpy(dtype=object),
+            'value': parts.str[1].str.strip().to_numpy(dtype=object),
+        })
+        long_table = long_table[(long_table['key'] != '') & (long_table['value'] != '')]
+
+        # Opakovaný klíč v řádku: poslední hodnota, ale pořadí podle prvního výskytu
+        long_table = long_table.reset_index(drop=True)
+        long_table['order'] = long_table.index
+        first_order = long_table.groupby(['row', 'key'], sort=False)['order'].transform('min')
+        long_table['order'] = first_order
+        long_table = long_table.drop_duplicates(['row', 'key'], keep='last')
+        long_table = long_table.sort_values('order', kind='stable').drop(columns='order')
+        long_table = long_table.reset_index(drop=True)
+
+        inferred_velikost = None
+        if names is not None and size_patterns:
+            # Jen řádky bez jakýchkoli parametrů - ostatní velikost z názvu nepoužívají
+            positions = pd.RangeIndex(len(param_series))
+            bare = ~positions.isin(long_table['row'].unique())
+            inferred_velikost = pd.Series(float('nan'), index=positions, dtype=object)
+            bare_names = pd.Series(names.to_numpy(dtype=object)[bare], index=positions[bare], dtype=object)
+            inferred_velikost[bare_names.index] = extract_sizes(bare_names, size_patterns)
+
+        return cls(long_table, param_series.index, inferred_velikost)
+
+    @classmethod
+    def from_products(cls, products_df: pd.DataFrame,
+                      size_patterns: Sequence[str] = DEFAULT_SIZE_PATTERNS) -> 'ParameterTable':
+        """
+        Vytvoří tabulku z DataFrame produktů (i bez sloupce HodnotyParametru).
+
+        Args:
+            products_df (pd.DataFrame): List Zbozi.
+            size_patterns (Sequence[str]): Vzory velikosti v názvu; prázdné = neodvozovat.
+        """
+        names = products_df['JmenoZbozi'] if 'JmenoZbozi' in products_df.columns \
+            else pd.Series([''] * len(products_df), index=products_df.index, dtype=object)
+        if 'HodnotyParametru' in products_df.columns:
+            return cls.from_series(products_df['HodnotyParametru'], names, size_patterns)
+        return cls.from_series(pd.Series([None] * len(products_df), index=products_df.index, dtype=object),
+                               names, size_patterns)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def params_at(self, position: int) -> Dict[str, str]:
+        """Vrátí kopii parametrů řádku na dané pozici."""
+        return dict(self._row_params.get(position, {}))
+
+    def inferred_size_at(self, position: int) -> Optional[str]:
+        """Vrátí velikost odvozenou z názvu řádku bez parametrů, nebo None."""
+        return self._inferred_sizes.get(position)
+
+    def params_for_label(self, label: Hashable) -> Optional[Dict[str, str]]:
+        """
+        Vrátí kopii parametrů řádku podle labelu indexu.
+
+        Returns:
+            Slovník parametrů nebo None, pokud label v tabulce není (nebo index není unikátní).
+        """
+        if self._label_positions is None:
+            return None
+        position = self._label_positions.get(label)
+        if position is None:
+            return None
+        return self.params_at(position)
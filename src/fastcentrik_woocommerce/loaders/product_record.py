@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typované záznamy produktů
+=========================
+
+Převede DataFrame produktů jednou na seznam neměnných záznamů ProductRecord
+(NamedTuple). Transformátory pak v horkých smyčkách čtou hodnoty přes
+atributy místo vytváření pd.Series pro každý řádek (iterrows).
+
+Chybějící sloupec dostane výchozí hodnotu odpovídající původnímu
+row.get(sloupec, výchozí) v transformátorech. Chybějící hodnoty
+nullable sloupců (Int64) se předají jako NaN, stejně jako u float sloupců.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+from typing import Any, Hashable, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class ProductRecord(NamedTuple):
+    """Jeden řádek listu Zbozi; label a position odkazují na řádek v DataFrame."""
+    label: Hashable
+    position: int
+    KodZbozi: Any = ''
+    JmenoZbozi: Any = ''
+    KodMasterVyrobku: Any = ''
+    HodnotyParametru: Any = ''
+    InetrniKodyKategorii: Any = ''
+    CenaBezna: Any = ''
+    ZakladniCena: Any = ''
+    Popis: Any = ''
+    KratkyPopis: Any = ''
+    HlavniObrazek: Any = None
+    DalsiObrazky: Any = None
+    NaSklade: Any = 0
+    Vypnuto: Any = 0
+    Hmotnost: Any = ''
+
+
+# Sloupce DataFrame převzaté do záznamu (bez label a position)
+PRODUCT_FIELDS = ProductRecord._fields[2:]
+
+
+def column_values(df: pd.DataFrame, column: str, default: Any = '') -> List[Any]:
+    """Vrátí hodnoty sloupce jako seznam Python hodnot, nebo výchozí hodnoty, pokud sloupec chybí."""
+    if column not in df.columns:
+        return [default] * len(df)
+    series = df[column]
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.hasnans \
+            and not isinstance(series.dtype, pd.CategoricalDtype):
+        # pd.NA nejde porovnat (NA > 0 v podmínce vyhodí TypeError)
+        return series.to_numpy(dtype=object, na_value=np.nan).tolist()
+    return series.tolist()
+
+
+def build_product_records(products_df: pd.DataFrame) -> List[ProductRecord]:
+    """
+    Vytvoří záznamy pro všechny řádky DataFrame produktů.
+
+    Args:
+        products_df (pd.DataFrame): List Zbozi.
+
+    Returns:
+        List[ProductRecord]: Záznamy v pořadí řádků DataFrame.
+    """
+    columns = [
+        column_values(products_df, field, ProductRecord._field_defaults[field])
+        for field in PRODUCT_FIELDS
+    ]
+    return [
+        ProductRecord(label, position, *values)
+        for position, (label, *values) in enumerate(zip(products_df.index, *columns))
+    ]
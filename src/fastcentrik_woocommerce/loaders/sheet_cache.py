@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Disková cache rozparsovaných listů
+==================================
+
+Parsování Excel exportu je pomalé a deterministické, proto se rozparsované
+listy ukládají do adresáře cache - jeden soubor na list. Klíč záznamu tvoří
+SHA-256 obsahu vstupního souboru, jeho velikost, mtime a podpis parsování
+(verze formátu, načítané listy), takže změna vstupu i nastavení načítání
+vede na nový záznam.
+
+Formát:
+    - arrow: Arrow IPC (pokud je nainstalovaný pyarrow); čte se přes
+      memory map, takže načtení z cache je téměř okamžité
+    - pickle: záložní formát bez dalších závislostí
+
+Listy načítané líně lze do existujícího záznamu doplňovat postupně
+(add_sheets). Cache lze explicitně zneplatnit (pro jeden vstupní soubor nebo celou)
+a při překročení limitu velikosti se mažou nejdéle nepoužité záznamy.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - volitelná závislost
+    pa = None
+    pa_ipc = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(file_path: Path) -> Dict:
+    """Vrátí SHA-256 obsahu, velikost a mtime souboru."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    stat = file_path.stat()
+    return {
+        'sha256': digest.hexdigest(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+
+
+class SheetCache:
+    """
+    Adresář s rozparsovanými listy vstupních sešitů.
+
+    Každý záznam je podadresář pojmenovaný klíčem, obsahuje soubor na list
+    a manifest.json se zdrojem, otiskem souboru a formátem. Čas posledního
+    použití záznamu je mtime manifestu.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 1024, cache_format: str = 'auto'):
+        """
+        Args:
+            cache_dir (str): Adresář cache (vytvoří se při prvním zápisu).
+            max_size_mb (float): Limit velikosti cache; starší záznamy se mažou.
+            cache_format (str): 'arrow', 'pickle' nebo 'auto' (arrow, je-li dostupný pyarrow).
+        """
+        if cache_format not in ('auto', 'arrow', 'pickle'):
+            raise ValueError(f"Neznámý formát cache: {cache_format}")
+        if cache_format == 'arrow' and pa is None:
+            raise ValueError("Formát cache 'arrow' vyžaduje balíček pyarrow")
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.cache_format = cache_format
+        if cache_format == 'auto':
+            self.cache_format = 'arrow' if pa is not None else 'pickle'
+
+    def key_for(self, file_path: Path, signature: str = '') -> str:
+        """
+        Vrátí klíč záznamu pro vstupní soubor.
+
+        Args:
+            file_path (Path): Vstupní sešit.
+            signature (str): Popis nastavení parsování (listy, sloupce...), které ovlivňuje výsledek.
+        """
+        fingerprint = file_fingerprint(Path(file_path))
+        raw_key = f"{CACHE_VERSION}|{fingerprint['sha256']}|{fingerprint['size']}|" \
+                  f"{fingerprint['mtime_ns']}|{signature}"
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()[:32]
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def _sheet_path(self, entry_dir: Path, sheet_name: str, cache_format: str) -> Path:
+        suffix = '.arrow' if cache_format == 'arrow' else '.pkl'
+        return entry_dir / f"{sheet_name}{suffix}"
+
+    def load(self, key: str, sheet_names: Iterable[str]) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Načte listy ze záznamu cache.
+
+        Returns:
+            Dict[str, pd.DataFrame] podle názvu listu, nebo None pokud záznam chybí či je neúplný.
+        """
+        entry_dir = self._entry_dir(key)
+        manifest_path = entry_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            sheets = {}
+            for sheet_name in sheet_names:
+                sheet_format = manifest['sheets'].get(sheet_name)
+                if sheet_format is None:
+                    return None
+                sheets[sheet_name] = self._read_sheet(self._sheet_path(entry_dir, sheet_name, sheet_format),
+                                                      sheet_format)
+        except Exception as e:
+            logger.warning(f"Poškozený záznam cache {key} bude odstraněn: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        # Čas posledního použití pro LRU mazání
+        manifest_path.touch()
+        return sheets
+
+    def store(self, key: str, sheets: Dict[str, pd.DataFrame], source: Path) -> None:
+        """
+        Uloží listy do nového záznamu cache a případně uvolní místo.
+
+        Listy, které Arrow neumí převést (např. smíšené typy v objektovém
+        sloupci), se uloží jako pickle.
+        """
+        entry_dir = self._entry_dir(key)
+        tmp_dir = self.cache_dir / f".{key}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        sheet_formats = {
+            sheet_name: self._write_sheet(df, tmp_dir, sheet_name)
+            for sheet_name, df in sheets.items()
+        }
+
+        manifest = {
+            'version': CACHE_VERSION,
+            'source': str(Path(source).resolve()),
+            'created': time.time(),
+            'sheets': sheet_formats
+        }
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        tmp_dir.rename(entry_dir)
+        logger.info(f"Listy uloženy do cache {entry_dir} ({self._entry_size(entry_dir) / 1024 / 1024:.1f} MB)")
+
+        self.evict(keep=key)
+
+    def add_sheets(self, key: str, sheets: Dict[str, pd.DataFrame], source: Path) -> None:
+        """
+        Doplní listy do existujícího záznamu cache; pokud záznam neexistuje, založí ho.
+
+        Soubory listů se zapíší před manifestem a manifest se nahradí atomicky,
+        takže záznam nikdy neodkazuje na nedopsaný list.
+        """
+        entry_dir = self._entry_dir(key)
+        manifest_path = entry_dir / MANIFEST_NAME
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.store(key, sheets, source)
+            return
+
+        for sheet_name, df in sheets.items():
+            manifest['sheets'][sheet_name] = self._write_sheet(df, entry_dir, sheet_name)
+        tmp_manifest = entry_dir / f".{MANIFEST_NAME}.tmp"
+        tmp_manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp_manifest.replace(manifest_path)
+        logger.info(f"Do cache {entry_dir} doplněny listy: {', '.join(sheets)}")
+
+        self.evict(keep=key)
+
+    def _write_sheet(self, df: pd.DataFrame, entry_dir: Path, sheet_name: str) -> str:
+        """Zapíše list do adresáře záznamu a vrátí použitý formát."""
+        sheet_format = self.cache_format
+        if sheet_format == 'arrow':
+            try:
+                self._write_arrow(df, self._sheet_path(entry_dir, sheet_name, 'arrow'))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                logger.debug(f"List '{sheet_name}' nejde uložit do Arrow ({e}), použije se pickle")
+                sheet_format = 'pickle'
+        if sheet_format == 'pickle':
+            df.to_pickle(self._sheet_path(entry_dir, sheet_name, 'pickle'))
+        return sheet_format
+
+    def _write_arrow(self, df: pd.DataFrame, path: Path) -> None:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def _read_sheet(self, path: Path, sheet_format: str) -> pd.DataFrame:
+        if sheet_format == 'pickle':
+            return pd.read_pickle(path)
+        if pa is None:
+            raise ValueError("Záznam ve formátu arrow vyžaduje balíček pyarrow")
+        with pa.memory_map(str(path), 'r') as source:
+            return pa_ipc.open_file(source).read_all().to_pandas()
+
+    def entries(self) -> List[Dict]:
+        """Vrátí záznamy cache s klíčem, zdrojem, velikostí a časem posledního použití."""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            manifest_path = entry_dir / MANIFEST_NAME
+            if not entry_dir.is_dir() or not manifest_path.exists():
+                continue
+            try:
+                source = json.loads(manifest_path.read_text(encoding='utf-8')).get('source', '')
+            except ValueError:
+                source = ''
+            entries.append({
+                'key': entry_dir.name,
+                'source': source,
+                'size': self._entry_size(entry_dir),
+                'last_used': manifest_path.stat().st_mtime
+            })
+        return entries
+
+    def _entry_size(self, entry_dir: Path) -> int:
+        return sum(path.stat().st_size for path in entry_dir.iterdir() if path.is_file())
+
+    def invalidate(self, source: Optional[Path] = None) -> int:
+        """
+        Smaže záznamy cache.
+
+        Args:
+            source (Path, optional): Smazat jen záznamy tohoto vstupního souboru; jinak celou cache.
+
+        Returns:
+            int: Počet smazaných záznamů.
+        """
+        source_path = str(Path(source).resolve()) if source is not None else None
+        removed = 0
+        for entry in self.entries():
+            if source_path is None or entry['source'] == source_path:
+                shutil.rmtree(self._entry_dir(entry['key']), ignore_errors=True)
+                removed += 1
+        logger.info(f"Z cache odstraněno {removed} záznamů")
+        return removed
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Maže nejdéle nepoužité záznamy, dokud celková velikost nepřesahuje limit.
+
+        Args:
+            keep (str, optional): Klíč záznamu, který se nesmaže (právě uložený).
+
+        Returns:
+            int: Počet smazaných záznamů.
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry['last_used'])
+        total_size = sum(entry['size'] for entry in entries)
+        candidates = [entry for entry in entries if entry['key'] != keep]
+        removed = 0
+        while candidates and total_size > self.max_size_bytes:
+            entry = candidates.pop(0)
+            shutil.rmtree(self._entry_dir(entry['key']), ignore_errors=True)
+            total_size -= entry['size']
+            removed += 1
+        if removed:
+            logger.info(f"Cache překročila limit, odstraněno {removed} nejstarších záznamů")
+        return removed
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Textové vstupní formáty (CSV, TSV, JSONL)
+=========================================
+
+Kromě Excel exportu umí DataLoader číst i textové exporty, bez převodu
+do Excelu:
+
+    - CSV/TSV (.csv, .tsv, .txt): kódování a oddělovač se zjistí ze začátku
+      souboru (utf-8 s BOM / utf-8 / cp1250; čárka, středník, tabulátor, |)
+    - JSONL (.jsonl, .ndjson): jeden JSON objekt na řádek
+
+Komprese .gz a .zst (zstd, vyžaduje balíček zstandard) se rozbalí
+transparentně; rozpozná se podle přípony i podle úvodních bajtů.
+
+Mapování na logické listy:
+    - hlavní soubor obsahuje list Zbozi
+    - ostatní listy se hledají v sousedních souborech pojmenovaných
+      <název>.<List>.<přípony>, např. catalog.csv.gz -> catalog.Kategorie.csv.gz
+    - v JSONL může každý záznam určit list polem "_sheet" (Zbozi, Kategorie,
+      Parametry); záznamy bez něj patří do Zbozi
+    - list, který nikde není, je prázdný DataFrame
+
+Textové sloupce schématu (input_schema) se čtou jako řetězce, takže SKU
+jako 033201 neztratí úvodní nulu.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import codecs
+import csv
+import gzip
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXCEL_SUFFIXES = ('.xls', '.xlsx', '.xlsm')
+TEXT_SUFFIXES = {'.csv': 'csv', '.tsv': 'csv', '.txt': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+MAGIC_BYTES = {b'\x1f\x8b': 'gzip', b'\x28\xb5\x2f\xfd': 'zstd'}
+SUPPORTED_SUFFIXES = EXCEL_SUFFIXES + tuple(TEXT_SUFFIXES)
+
+SHEET_FIELD = '_sheet'
+PRODUCTS_SHEET = 'Zbozi'
+CANDIDATE_ENCODINGS = ('utf-8', 'cp1250')
+CANDIDATE_SEPARATORS = ',;\t|'
+SNIFF_BYTES = 64 * 1024
+
+UseCols = Optional[Callable[[str], bool]]
+
+
+class InputFormat(NamedTuple):
+    """Rozpoznaný formát vstupního souboru."""
+    kind: str                    # excel, csv, jsonl
+    suffix: str                  # přípona bez komprese (.csv, .xlsx...)
+    compression: Optional[str]   # None, gzip, zstd
+
+
+def detect_format(file_path: Path) -> InputFormat:
+    """
+    Rozpozná formát a kompresi souboru podle přípon a úvodních bajtů.
+
+    Raises:
+        ValueError: Nepodporovaný formát nebo komprimovaný Excel.
+    """
+    path = Path(file_path)
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        compression = COMPRESSION_SUFFIXES[suffixes.pop()]
+    suffix = suffixes[-1] if suffixes else ''
+
+    if compression is None and path.exists():
+        with open(path, 'rb') as handle:
+            head = handle.read(4)
+        compression = next((name for magic, name in MAGIC_BYTES.items() if head.startswith(magic)), None)
+
+    if suffix in EXCEL_SUFFIXES:
+        if compression is not None:
+            raise ValueError(f"Komprimovaný Excel ({path.name}) není podporován, rozbalte ho")
+        return InputFormat('excel', suffix, None)
+    if suffix in TEXT_SUFFIXES:
+        return InputFormat(TEXT_SUFFIXES[suffix], suffix, compression)
+    raise ValueError(f"Nepodporovaný formát vstupu: {path.name} "
+                     f"(podporováno: {', '.join(SUPPORTED_SUFFIXES)}, volitelně .gz/.zst)")
+
+
+def _open_binary(file_path: Path, compression: Optional[str]):
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(f"Soubor {Path(file_path).name} je komprimovaný zstd - nainstalujte balíček zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    return open(file_path, 'rb')
+
+
+def sniff_csv(file_path: Path) -> Tuple[str, str]:
+    """
+    Zjistí kódování a oddělovač CSV ze začátku souboru (.tsv má vždy tabulátor).
+
+    Returns:
+        Tuple[str, str]: (kódování pro read_csv, oddělovač)
+    """
+    input_format = detect_format(file_path)
+    with _open_binary(file_path, input_format.compression) as handle:
+        sample = handle.read(SNIFF_BYTES)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        encoding, text = 'utf-8-sig', sample[len(codecs.BOM_UTF8):].decode('utf-8', errors='ignore')
+    else:
+        for encoding in CANDIDATE_ENCODINGS:
+            try:
+                # Vzorek může končit uprostřed vícebajtového znaku
+                text = codecs.getincrementaldecoder(encoding)().decode(sample)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            encoding, text = 'latin-1', sample.decode('latin-1')
+
+    if input_format.suffix == '.tsv':
+        separator = '\t'
+    else:
+        header = text.splitlines()[0] if text else ''
+        try:
+            separator = csv.Sniffer().sniff(text[:SNIFF_BYTES // 4], delimiters=CANDIDATE_SEPARATORS).delimiter
+        except csv.Error:
+            separator = ','
+        # Sniffer se u krátkých vzorků plete - oddělovač musí být aspoň v hlavičce
+        if separator not in header:
+            separator = max(CANDIDATE_SEPARATORS, key=header.count) if header else ','
+    logger.debug(f"{Path(file_path).name}: kódování {encoding}, oddělovač {separator!r}")
+    return encoding, separator
+
+
+def sheet_path(file_path: Path, sheet_name: str) -> Path:
+    """Vrátí cestu k souboru listu: hlavní soubor pro Zbozi, jinak soused <název>.<List>.<přípony>."""
+    path = Path(file_path)
+    if sheet_name == PRODUCTS_SHEET:
+        return path
+    # Jen přípona formátu a komprese (catalog.v2.csv.gz -> catalog.v2 + .csv.gz)
+    tail = path.suffixes[-2:] if path.suffix.lower() in COMPRESSION_SUFFIXES else path.suffixes[-1:]
+    tail = ''.join(tail)
+    stem = path.name[:len(path.name) - len(tail)]
+    return path.with_name(f"{stem}.{sheet_name}{tail}")
+
+
+def _select_sheet(df: pd.DataFrame, sheet_name: str, usecols: UseCols) -> pd.DataFrame:
+    """Z JSONL záznamů vybere jeden list a požadované sloupce."""
+    if SHEET_FIELD in df.columns:
+        df = df[df[SHEET_FIELD].fillna(PRODUCTS_SHEET) == sheet_name].drop(columns=[SHEET_FIELD])
+        df = df.dropna(axis=1, how='all') if sheet_name != PRODUCTS_SHEET else df
+    elif sheet_name != PRODUCTS_SHEET:
+        return df.iloc[0:0]
+    if usecols is not None:
+        df = df[[column for column in df.columns if usecols(column)]]
+    return df
+
+
+def _csv_options(path: Path, dtype: Optional[Dict[str, type]]) -> Dict:
+    encoding, separator = sniff_csv(path)
+    return {
+        'sep': separator,
+        'encoding': encoding,
+        'compression': detect_format(path).compression,
+        'dtype': dtype,
+    }
+
+
+def _json_options(path: Path) -> Dict:
+    # dtype=False: hodnoty zůstanou v typech z JSON (řetězce se nepřevádí na čísla ani data)
+    return {'lines': True, 'dtype': False, 'convert_dates': False, 'compression': detect_format(path).compression}
+
+
+def _sources(file_path: Path, sheet_name: str, input_format: InputFormat) -> Iterator[Path]:
+    """Soubory, ve kterých se list hledá - soused, případně hlavní JSONL se záznamy _sheet."""
+    path = sheet_path(file_path, sheet_name)
+    if path.exists():
+        yield path
+    elif input_format.kind == 'jsonl' and sheet_name != PRODUCTS_SHEET:
+        yield Path(file_path)
+    else:
+        logger.warning(f"List '{sheet_name}' nebyl nalezen ({path.name} neexistuje), použije se prázdný")
+
+
+def read_text_sheet(file_path: Path, sheet_name: str, usecols: UseCols = None,
+                    dtype: Optional[Dict[str, type]] = None) -> pd.DataFrame:
+    """
+    Načte logický list z textového exportu.
+
+    Args:
+        file_path (Path): Hlavní vstupní soubor.
+        sheet_name (str): Zbozi, Kategorie nebo Parametry.
+        usecols (Callable, optional): Filtr načítaných sloupců.
+        dtype (Dict, optional): Typy sloupců pro CSV (např. str pro textové sloupce).
+    """
+    input_format = detect_format(file_path)
+    for path in _sources(file_path, sheet_name, input_format):
+        if input_format.kind == 'csv':
+            return pd.read_csv(path, usecols=usecols, **_csv_options(path, dtype))
+        df = pd.read_json(path, **_json_options(path))
+        return _select_sheet(df, sheet_name, usecols).reset_index(drop=True)
+    return pd.DataFrame()
+
+
+def iter_text_chunks(file_path: Path, sheet_name: str, chunk_size: int, usecols: UseCols = None,
+                     dtype: Optional[Dict[str, type]] = None) -> Iterator[pd.DataFrame]:
+    """Čte logický list z textového exportu po dávkách; index pokračuje přes celý list."""
+    input_format = detect_format(file_path)
+    for path in _sources(file_path, sheet_name, input_format):
+        if input_format.kind == 'csv':
+            with pd.read_csv(path, usecols=usecols, chunksize=chunk_size,
+                             **_csv_options(path, dtype)) as reader:
+                yield from reader
+            return
+        start = 0
+        with pd.read_json(path, chunksize=chunk_size, **_json_options(path)) as reader:
+            for chunk in reader:
+                chunk = _select_sheet(chunk, sheet_name, usecols)
+                if len(chunk):
+                    chunk.index = pd.RangeIndex(start, start + len(chunk))
+                    start += len(chunk)
+                    yield chunk
@@ -13,20 +13,232 @@ Verze: 1.0
 
 import re
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+import itertools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any, Callable, FrozenSet, Iterator, NamedTuple, Pattern
+import numpy as np
 import pandas as pd
 
+from .keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
+class CompiledCategory(NamedTuple):
+    """
+    Uzel předkompilovaného stromu kategorií.
+
+    Podmínky kategorie jsou v pravidlech spojené operátorem "nebo", takže se
+    při kompilaci sloučí podle typu: klíčová slova názvu do bitové masky
+    KeywordMatcher, hodnoty parametrů a značek převedené na malá písmena. Slova name_contains
+    zůstávají beze změny - porovnávají se s názvem převedeným na malá písmena
+    stejně jako v původních pravidlech. Cesta a hloubka jsou předpočítané,
+    node_id je pořadí uzlu v průchodu stromem do hloubky (preorder).
+    """
+    node_id: int
+    name: str
+    path: str
+    depth: int
+    priority: int
+    name_mask: int
+    name_regexes: Tuple[Pattern, ...]
+    param_rules: Tuple[Tuple[Tuple[str, Tuple[str, ...]], ...], ...]
+    params_any: Tuple[Tuple[str, FrozenSet[str]], ...]
+    brand_keywords: Tuple[str, ...]
+    children: Tuple['CompiledCategory', ...]
+
+
+class ProductContext(NamedTuple):
+    """Normalizovaná data produktu, nad kterými se vyhodnocují pravidla."""
+    name: str
+    keyword_bits: int
+    params: Dict[str, str]
+    brand: str
+
+
+def _as_lowered_tuple(values: Any) -> Tuple[str, ...]:
+    """Převede seznam nebo jeden řetězec na tuple řetězců malými písmeny."""
+    if isinstance(values, list):
+        return tuple(value.lower() for value in values)
+    return (values.lower(),)
+
+
+def collect_name_keywords(category_tree: Dict) -> List[str]:
+    """Posbírá klíčová slova name_contains celého stromu v pořadí průchodu."""
+    keywords = []
+    for category_data in category_tree.values():
+        for condition in category_data.get('conditions', []):
+            keywords.extend(condition.get('name_contains', []))
+        keywords.extend(collect_name_keywords(category_data.get('subcategories', {})))
+    return keywords
+
+
+def compile_category_plan(category_tree: Dict, keyword_matcher: KeywordMatcher,
+                          parent_path: str = "",
+                          node_ids: Optional[Iterator[int]] = None) -> Tuple[CompiledCategory, ...]:
+    """
+    Zkompiluje vnořený slovník kategorií do neměnného plánu pravidel.
+
+    Args:
+        category_tree: Úroveň stromu ve formátu _define_category_structure
+        keyword_matcher: Automat obsahující všechna klíčová slova name_contains stromu
+        parent_path: Cesta k nadřazené kategorii
+        node_ids: Sdílený čítač id uzlů (při rekurzi)
+
+    Returns:
+        Tuple uzlů CompiledCategory ve stejném pořadí jako ve slovníku
+    """
+    if node_ids is None:
+        node_ids = itertools.count()
+    nodes = []
+    for category_name, category_data in category_tree.items():
+        current_path = f"{parent_path} > {category_name}" if parent_path else category_name
+
+        name_keywords: List[str] = []
+        name_regexes = []
+        param_rules = []
+        params_any = []
+        brand_keywords: List[str] = []
+        for condition in category_data.get('conditions', []):
+            name_keywords.extend(condition.get('name_contains', []))
+            if 'name_regex' in condition:
+                name_regexes.append(re.compile(condition['name_regex']))
+            if 'params' in condition:
+                # Prázdná podmínka params odpovídá každému produktu
+                param_rules.append(tuple(
+                    (param_name.lower(), _as_lowered_tuple(param_values))
+                    for param_name, param_values in condition['params'].items()
+                ))
+            params_any.extend(
+                (param_name.lower(), frozenset(_as_lowered_tuple(param_values)))
+                for param_name, param_values in condition.get('params_any', {}).items()
+            )
+            brand_keywords.extend(word.lower() for word in condition.get('brand_contains', []))
+
+        node_id = next(node_ids)
+        nodes.append(CompiledCategory(
+            node_id=node_id,
+            name=category_name,
+            path=current_path,
+            depth=current_path.count(' > ') + 1,
+            priority=category_data.get('priority', 0),
+            name_mask=keyword_matcher.mask_for(name_keywords),
+            name_regexes=tuple(name_regexes),
+            param_rules=tuple(param_rules),
+            params_any=tuple(params_any),
+            brand_keywords=tuple(brand_keywords),
+            children=compile_category_plan(
+                category_data.get('subcategories', {}), keyword_matcher, current_path, node_ids
+            )
+        ))
+    return tuple(nodes)
+
+
+def collect_rule_params(category_plan: Tuple[CompiledCategory, ...]) -> Tuple[str, ...]:
+    """Vrátí seřazené názvy parametrů, které pravidla plánu čtou (params a params_any)."""
+    param_names = set()
+    for node in category_plan:
+        for rule in node.param_rules:
+            param_names.update(param_name for param_name, _ in rule)
+        param_names.update(param_name for param_name, _ in node.params_any)
+        param_names.update(collect_rule_params(node.children))
+    return tuple(sorted(param_names))
+
+
+def flatten_category_plan(category_plan: Tuple[CompiledCategory, ...]) -> List[CompiledCategory]:
+    """Vrátí všechny uzly plánu v pořadí node_id (průchod do hloubky)."""
+    nodes = []
+    for node in category_plan:
+        nodes.append(node)
+        nodes.extend(flatten_category_plan(node.children))
+    return nodes
+
+
+class MappingCache:
+    """
+    Omezená LRU cache výsledků průchodu stromem kategorií.
+
+    Ukládá pouze výsledek vyhodnocení pravidel; statistiky mapování, fallback
+    a logování řeší CategoryMapper při každém volání.
+
+    Slouží jen volání po řádcích (map_product_to_category,
+    map_product_to_multiple_categories). map_dataframe ji nepoužívá - strom
+    řeší jednou pro každou kombinaci shod - takže v transformátorech cache
+    zachytí jen řádky mapované samostatně (parent produkty s novým názvem).
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_size: int):
+        """
+        Args:
+            max_size: Maximální počet položek (0 = cache vypnutá)
+        """
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Any:
+        """Vrátí uloženou hodnotu nebo MappingCache.MISSING."""
+        value = self._entries.get(key, self.MISSING)
+        if value is self.MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple, value: Any):
+        """Uloží hodnotu a při překročení velikosti vyřadí nejdéle nepoužitou položku."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vyprázdní cache (čítače zůstávají)."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Vrací čítače cache."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
 class CategoryMapper:
     """
     Mapuje produkty do WooCommerce kategorií na základě definovaných pravidel.
     """
     
-    def __init__(self):
-        """Inicializace mapperu s definicí kategoriální struktury."""
+    def __init__(self, cache_size: int = 4096):
+        """
+        Inicializace mapperu s definicí kategoriální struktury.
+        
+        Args:
+            cache_size: Počet výsledků mapování po řádcích držených v LRU cache (0 = bez cache)
+        """
         self.category_structure = self._define_category_structure()
+        # Neměnný plán pravidel - struktura se kompiluje jednou při vytvoření mapperu
+        self.keyword_matcher = KeywordMatcher(collect_name_keywords(self.category_structure))
+        self.category_plan = compile_category_plan(self.category_structure, self.keyword_matcher)
+        # Klíč cache obsahuje jen parametry, které pravidla skutečně čtou
+        self.rule_params = collect_rule_params(self.category_plan)
+        self.mapping_cache = MappingCache(cache_size)
         self.mapping_stats = {
             'mapped': 0,
             'fallback': 0,
@@ -790,38 +1002,22 @@ class CategoryMapper:
                 - category_path: Hierarchická cesta kategorie (např. "Muži > Pánské oblečení > Pánské mikiny")
                 - mapping_type: Typ mapování ("exact", "fallback", "unmapped")
         """
-        # Normalizace názvu produktu pro porovnávání
-        product_name_lower = product_name.lower() if product_name else ""
+        # Normalizace názvu a parametrů pro porovnávání
+        name, params, brand = self._normalize_product(product_name, product_params)
         
-        # Normalizace parametrů
-        normalized_params = {}
-        for key, value in product_params.items():
-            if value:
-                normalized_params[key.lower()] = str(value).lower()
+        # Pokus o nalezení nejlepší shody (varianty se stejným otiskem sdílí výsledek)
+        cache_key = self._mapping_cache_key(('best',), name, params, brand)
+        best_match = self.mapping_cache.get(cache_key)
+        if best_match is MappingCache.MISSING:
+            context = ProductContext(name, self.keyword_matcher.match(name), params, brand)
+            best_match = self._find_best_category_match(context, self.category_plan)
+            self.mapping_cache.put(cache_key, best_match)
         
-        # Pokus o nalezení nejlepší shody
-        best_match = self._find_best_category_match(
-            product_name_lower,
-            normalized_params,
-            self.category_structure
+        categories, mapping_type = self._finalize_categories(
+            [best_match] if best_match else [], original_category
         )
-        
-        if best_match:
-            self.mapping_stats['mapped'] += 1
-            self.mapping_stats['category_counts'][best_match] = \
-                self.mapping_stats['category_counts'].get(best_match, 0) + 1
-            return best_match, "exact"
-        
-        # Fallback na původní kategorii
-        if original_category:
-            self.mapping_stats['fallback'] += 1
-            logger.warning(f"Použit fallback pro produkt '{product_name}' -> '{original_category}'")
-            return original_category, "fallback"
-        
-        # Produkt nemohl být namapován
-        self.mapping_stats['unmapped'] += 1
-        logger.error(f"Produkt '{product_name}' nemohl být namapován do žádné kategorie")
-        return "", "unmapped"
+        self.record_mapping(product_name, categories, mapping_type)
+        return (categories[0] if categories else ""), mapping_type
     
     def map_product_to_multiple_categories(self, product_name: str, product_params: Dict[str, Any],
                                          original_category: Optional[str] = None,
@@ -844,56 +1040,347 @@ class CategoryMapper:
                 - seznam kategorií: Seznam hierarchických cest kategorií
                 - mapping_type: Typ mapování ("exact", "fallback", "unmapped")
         """
-        # Normalizace názvu produktu pro porovnávání
-        product_name_lower = product_name.lower() if product_name else ""
+        # Normalizace názvu a parametrů pro porovnávání
+        name, params, brand = self._normalize_product(product_name, product_params)
         
-        # Normalizace parametrů
-        normalized_params = {}
-        for key, value in product_params.items():
-            if value:
-                normalized_params[key.lower()] = str(value).lower()
+        cache_key = self._mapping_cache_key(('multiple', max_categories, strategy), name, params, brand)
+        cached_categories = self.mapping_cache.get(cache_key)
+        if cached_categories is MappingCache.MISSING:
+            # Najít všechny odpovídající kategorie
+            context = ProductContext(name, self.keyword_matcher.match(name), params, brand)
+            all_matches = self._find_all_category_matches(context, self.category_plan)
+            
+            # Aplikovat strategii výběru
+            if strategy == "complementary":
+                selected_categories = self._select_complementary_categories(all_matches, max_categories)
+            else:  # all_matches
+                selected_categories = self._select_best_matches(all_matches, max_categories)
+            self.mapping_cache.put(cache_key, tuple(selected_categories))
+        else:
+            # Volající dostane vlastní seznam, cache drží neměnný tuple
+            selected_categories = list(cached_categories)
         
-        # Najít všechny odpovídající kategorie
-        all_matches = self._find_all_category_matches(
-            product_name_lower,
-            normalized_params,
-            self.category_structure
-        )
+        categories, mapping_type = self._finalize_categories(selected_categories, original_category)
+        self.record_mapping(product_name, categories, mapping_type)
+        return categories, mapping_type
+    
+    def map_dataframe(self, products_df: pd.DataFrame, params_table,
+                      original_categories: Optional[pd.Series] = None,
+                      multi_category: bool = True,
+                      max_categories: int = 2,
+                      strategy: str = "complementary",
+                      update_stats: bool = True) -> Tuple[pd.Series, pd.Series]:
+        """
+        Namapuje celý katalog najednou.
         
-        # Aplikovat strategii výběru
-        if strategy == "complementary":
-            selected_categories = self._select_complementary_categories(all_matches, max_categories)
-        else:  # all_matches
-            selected_categories = self._select_best_matches(all_matches, max_categories)
+        Každá kategorie se vyhodnotí jako vektorizovaná boolean maska nad celým
+        katalogem (pandas string operace nad názvy a sloupci parametrů). Strom se
+        pak řeší z masek jen jednou pro každou unikátní kombinaci shod, takže
+        výsledky odpovídají volání map_product_to_multiple_categories
+        (resp. map_product_to_category) pro každý řádek. LRU cache mapování
+        se nepoužívá ani neplní.
         
-        if selected_categories:
+        Args:
+            products_df: DataFrame produktů se sloupcem JmenoZbozi
+            params_table: ParameterTable vytvořená ze stejného products_df
+            original_categories: Původní cesty kategorií pro fallback (stejné pořadí řádků)
+            multi_category: True = více kategorií, False = jedna nejlepší kategorie
+            max_categories: Maximální počet kategorií (jen pro multi_category)
+            strategy: Strategie výběru ("complementary" nebo "all_matches")
+            update_stats: Započítat výsledky do mapping_stats (a logovat fallback/unmapped)
+            
+        Returns:
+            Tuple[pd.Series, pd.Series]: (seznamy kategorií, mapping_type) s indexem products_df
+        """
+        if len(params_table) != len(products_df):
+            raise ValueError("Tabulka parametrů neodpovídá DataFrame produktů")
+        
+        row_count = len(products_df)
+        raw_names = products_df['JmenoZbozi'].map(str).tolist() if 'JmenoZbozi' in products_df.columns \
+            else [''] * row_count
+        # Stejná normalizace jako _normalize_product; textové operace běží nad unikátními hodnotami
+        names = self._factorize_column(pd.Series([name.lower() for name in raw_names], dtype=object))
+        param_columns = {
+            param_name: self._factorize_column(column)
+            for param_name, column in self._normalized_param_columns(params_table, row_count).items()
+        }
+        brand = self._brand_column(param_columns, row_count)
+        
+        # Matice shod: řádky × uzly plánu
+        nodes = flatten_category_plan(self.category_plan)
+        match_matrix = self._name_keyword_matrix(names, nodes)
+        for node in nodes:
+            match_matrix[:, node.node_id] |= self._node_mask(node, names, param_columns, brand)
+        
+        # Strom se řeší jednou pro každou unikátní kombinaci shod
+        packed_rows = np.packbits(match_matrix, axis=1)
+        pattern_codes, pattern_keys = pd.factorize(pd.Series([row.tobytes() for row in packed_rows], dtype=object))
+        first_rows = pd.Series(np.arange(row_count)).groupby(pattern_codes).first().to_numpy()
+        patterns = match_matrix[first_rows] if row_count else match_matrix
+        
+        resolved = []
+        for pattern in patterns:
+            is_match = lambda node, pattern=pattern: pattern[node.node_id]
+            if multi_category:
+                all_matches = self._resolve_all_matches(self.category_plan, is_match)
+                if strategy == "complementary":
+                    resolved.append(self._select_complementary_categories(all_matches, max_categories))
+                else:  # all_matches
+                    resolved.append(self._select_best_matches(all_matches, max_categories))
+            else:
+                best_match = self._resolve_best_match(self.category_plan, is_match)
+                resolved.append([best_match] if best_match else [])
+        
+        if original_categories is None:
+            fallbacks = [None] * row_count
+        else:
+            fallbacks = [value if pd.notna(value) else None for value in original_categories.tolist()]
+        
+        categories_list = []
+        mapping_types = []
+        for code, original_category, product_name in zip(pattern_codes.tolist(), fallbacks, raw_names):
+            categories, mapping_type = self._finalize_categories(resolved[code], original_category)
+            if update_stats:
+                self.record_mapping(product_name, categories, mapping_type)
+            categories_list.append(categories)
+            mapping_types.append(mapping_type)
+        
+        return (pd.Series(categories_list, index=products_df.index, dtype=object),
+                pd.Series(mapping_types, index=products_df.index, dtype=object))
+    
+    def record_mapping(self, product_name: str, categories: List[str], mapping_type: str):
+        """
+        Započítá výsledek mapování do statistik a zaloguje fallback / nenamapované produkty.
+        
+        Args:
+            product_name: Název produktu
+            categories: Přiřazené kategorie (při fallbacku původní kategorie)
+            mapping_type: Typ mapování ("exact", "fallback", "unmapped")
+        """
+        if mapping_type == "exact":
             self.mapping_stats['mapped'] += 1
-            for category in selected_categories:
+            for category in categories:
                 self.mapping_stats['category_counts'][category] = \
                     self.mapping_stats['category_counts'].get(category, 0) + 1
-            return selected_categories, "exact"
+        elif mapping_type == "fallback":
+            self.mapping_stats['fallback'] += 1
+            logger.warning(f"Použit fallback pro produkt '{product_name}' -> '{categories[0]}'")
+        else:
+            self.mapping_stats['unmapped'] += 1
+            logger.error(f"Produkt '{product_name}' nemohl být namapován do žádné kategorie")
+    
+    def _finalize_categories(self, selected_categories: List[str],
+                             original_category: Optional[str]) -> Tuple[List[str], str]:
+        """Doplní fallback na původní kategorii a určí typ mapování."""
+        if selected_categories:
+            return list(selected_categories), "exact"
         
         # Fallback na původní kategorii
         if original_category:
-            self.mapping_stats['fallback'] += 1
-            logger.warning(f"Použit fallback pro produkt '{product_name}' -> '{original_category}'")
             return [original_category], "fallback"
         
         # Produkt nemohl být namapován
-        self.mapping_stats['unmapped'] += 1
-        logger.error(f"Produkt '{product_name}' nemohl být namapován do žádné kategorie")
         return [], "unmapped"
     
-    def _find_best_category_match(self, product_name: str, params: Dict[str, str],
-                                  category_tree: Dict, parent_path: str = "") -> Optional[str]:
+    def _normalized_param_columns(self, params_table, row_count: int) -> Dict[str, pd.Series]:
+        """
+        Vytvoří sloupce parametrů čtených pravidly (a značky) z tabulky parametrů.
+        
+        Klíče i hodnoty jsou malými písmeny jako v _normalize_product; chybějící
+        parametr je None. Při kolizi klíčů lišících se velikostí písmen vyhrává
+        poslední, stejně jako při sestavení slovníku.
+        """
+        long_table = params_table.long_table
+        keys = long_table['key'].astype(object).str.lower()
+        wanted = set(self.rule_params) | {'znacka', 'vyrobce'}
+        selected = long_table[keys.isin(wanted)].assign(key=keys[keys.isin(wanted)])
+        selected = selected.drop_duplicates(['row', 'key'], keep='last')
+        
+        columns = {}
+        for param_name, group in selected.groupby('key', sort=False):
+            column = np.full(row_count, None, dtype=object)
+            column[group['row'].to_numpy()] = group['value'].astype(object).str.lower().to_numpy(dtype=object)
+            columns[param_name] = pd.Series(column, dtype=object)
+        return columns
+    
+    @staticmethod
+    def _factorize_column(column: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+        """Rozloží sloupec na kódy a unikátní hodnoty (chybějící hodnota má kód -1)."""
+        codes, uniques = pd.factorize(column)
+        return codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    
+    @staticmethod
+    def _expand_mask(unique_mask: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Rozbalí masku nad unikátními hodnotami na všechny řádky (kód -1 = False)."""
+        return np.append(unique_mask.astype(bool), False)[codes]
+    
+    def _brand_column(self, param_columns: Dict[str, Tuple[np.ndarray, pd.Series]],
+                      row_count: int) -> Tuple[np.ndarray, pd.Series]:
+        """Sestaví sloupec značky (znacka, jinak vyrobce) jako kódy a unikátní hodnoty."""
+        brand = np.full(row_count, '', dtype=object)
+        for param_name in ('vyrobce', 'znacka'):
+            if param_name in param_columns:
+                codes, uniques = param_columns[param_name]
+                values = np.append(uniques.to_numpy(dtype=object), '')[codes]
+                brand = np.where(values != '', values, brand)
+        return self._factorize_column(pd.Series(brand, dtype=object))
+    
+    def _name_keyword_matrix(self, names: Tuple[np.ndarray, pd.Series],
+                             nodes: List[CompiledCategory]) -> np.ndarray:
+        """
+        Vyhodnotí klíčová slova name_contains všech uzlů pro celý katalog.
+        
+        Každý unikátní název projde automat jednou; maska slov se pak násobením
+        matic převede na shody uzlů.
+        
+        Returns:
+            Boolean matice řádky × uzly
+        """
+        codes, unique_names = names
+        keyword_count = len(self.keyword_matcher)
+        byte_count = max(1, (keyword_count + 7) // 8)
+        
+        # Unikátní názvy × klíčová slova
+        packed = np.frombuffer(b''.join(
+            self.keyword_matcher.match(name).to_bytes(byte_count, 'little') for name in unique_names
+        ), dtype=np.uint8).reshape(len(unique_names), byte_count)
+        keyword_hits = np.unpackbits(packed, axis=1, bitorder='little')[:, :keyword_count]
+        
+        # Klíčová slova × uzly
+        node_keywords = np.zeros((keyword_count, len(nodes)), dtype=np.float32)
+        for node in nodes:
+            for keyword_id in range(keyword_count):
+                if node.name_mask >> keyword_id & 1:
+                    node_keywords[keyword_id, node.node_id] = 1
+        
+        unique_matrix = (keyword_hits.astype(np.float32) @ node_keywords) > 0
+        return np.vstack([unique_matrix, np.zeros((1, len(nodes)), dtype=bool)])[codes]
+    
+    def _node_mask(self, node: CompiledCategory, names: Tuple[np.ndarray, pd.Series],
+                   param_columns: Dict[str, Tuple[np.ndarray, pd.Series]],
+                   brand: Tuple[np.ndarray, pd.Series]) -> np.ndarray:
+        """Vektorizovaná obdoba _check_category_conditions (bez name_contains) pro celý katalog."""
+        name_codes, unique_names = names
+        mask = np.zeros(len(name_codes), dtype=bool)
+        
+        # Kontrola regulárních výrazů
+        for name_regex in node.name_regexes:
+            mask |= self._expand_mask(unique_names.str.contains(name_regex, regex=True).to_numpy(), name_codes)
+        
+        # Kontrola parametrů - všechny parametry pravidla musí obsahovat některou z hodnot
+        for rule in node.param_rules:
+            rule_mask = np.ones(len(name_codes), dtype=bool)
+            for param_name, param_values in rule:
+                if param_name not in param_columns:
+                    rule_mask[:] = False
+                    break
+                codes, uniques = param_columns[param_name]
+                value_mask = np.zeros(len(uniques), dtype=bool)
+                for value in param_values:
+                    value_mask |= uniques.str.contains(value, regex=False).to_numpy(dtype=bool)
+                rule_mask &= self._expand_mask(value_mask, codes)
+            mask |= rule_mask
+        
+        # Kontrola parametrů s podmínkou "alespoň jeden"
+        for param_name, param_values in node.params_any:
+            if param_name in param_columns:
+                codes, uniques = param_columns[param_name]
+                mask |= self._expand_mask(uniques.isin(param_values).to_numpy(), codes)
+        
+        # Kontrola značky
+        if node.brand_keywords:
+            codes, uniques = brand
+            brand_mask = np.zeros(len(uniques), dtype=bool)
+            for word in node.brand_keywords:
+                brand_mask |= uniques.str.contains(word, regex=False).to_numpy(dtype=bool)
+            mask |= self._expand_mask(brand_mask, codes)
+        
+        return mask
+    
+    def _normalize_product(self, product_name: str,
+                           product_params: Dict[str, Any]) -> Tuple[str, Dict[str, str], str]:
         """
-        Rekurzivně prochází strom kategorií a hledá nejlepší shodu.
+        Normalizuje název a parametry produktu pro vyhodnocení pravidel.
         
         Args:
-            product_name: Normalizovaný název produktu
-            params: Normalizované parametry produktu
-            category_tree: Aktuální úroveň stromu kategorií
-            parent_path: Cesta k nadřazené kategorii
+            product_name: Název produktu
+            product_params: Slovník parametrů produktu
+            
+        Returns:
+            Tuple (název malými písmeny, parametry malými písmeny, značka)
+        """
+        product_name_lower = product_name.lower() if product_name else ""
+        
+        normalized_params = {}
+        for key, value in product_params.items():
+            if value:
+                normalized_params[key.lower()] = str(value).lower()
+        
+        brand = normalized_params.get('znacka', '') or normalized_params.get('vyrobce', '')
+        return product_name_lower, normalized_params, brand
+    
+    def _create_product_context(self, product_name: str, product_params: Dict[str, Any]) -> ProductContext:
+        """
+        Vytvoří kontext produktu pro vyhodnocení pravidel.
+        
+        Returns:
+            ProductContext s názvem, maskou nalezených klíčových slov,
+            parametry malými písmeny a značkou
+        """
+        name, params, brand = self._normalize_product(product_name, product_params)
+        # Jeden průchod názvem najde všechna klíčová slova celého stromu
+        return ProductContext(name, self.keyword_matcher.match(name), params, brand)
+    
+    def _mapping_cache_key(self, mode: Tuple, name: str, params: Dict[str, str], brand: str) -> Tuple:
+        """
+        Sestaví otisk produktu pro cache mapování.
+        
+        Obsahuje pouze vstupy, na kterých výsledek závisí: název, parametry čtené
+        pravidly (pohlavi, sport, typ, ...), značku (znacka/vyrobce) a režim volání.
+        Parametry jako velikost se v klíči neobjeví, takže varianty sdílí výsledek.
+        """
+        return (mode, name, brand) + tuple(params.get(param_name) for param_name in self.rule_params)
+    
+    def _find_best_category_match(self, context: ProductContext,
+                                  category_nodes: Tuple[CompiledCategory, ...]) -> Optional[str]:
+        """
+        Rekurzivně prochází plán kategorií a hledá nejlepší shodu.
+        
+        Args:
+            context: Normalizovaná data produktu
+            category_nodes: Aktuální úroveň zkompilovaného stromu kategorií
+            
+        Returns:
+            Nejlepší nalezená kategorie nebo None
+        """
+        return self._resolve_best_match(
+            category_nodes, lambda node: self._check_category_conditions(context, node)
+        )
+    
+    def _find_all_category_matches(self, context: ProductContext,
+                                   category_nodes: Tuple[CompiledCategory, ...]) -> List[Tuple[str, int, int]]:
+        """
+        Rekurzivně prochází plán kategorií a najde všechny odpovídající kategorie.
+        
+        Args:
+            context: Normalizovaná data produktu
+            category_nodes: Aktuální úroveň zkompilovaného stromu kategorií
+            
+        Returns:
+            Seznam tuple (category_path, priority, depth)
+        """
+        return self._resolve_all_matches(
+            category_nodes, lambda node: self._check_category_conditions(context, node)
+        )
+    
+    def _resolve_best_match(self, category_nodes: Tuple[CompiledCategory, ...],
+                            is_match: Callable[[CompiledCategory], bool]) -> Optional[str]:
+        """
+        Najde nejlepší kategorii podle predikátu shody uzlu.
+        
+        Args:
+            category_nodes: Aktuální úroveň zkompilovaného stromu kategorií
+            is_match: Vrací True, pokud produkt splňuje podmínky uzlu
             
         Returns:
             Nejlepší nalezená kategorie nebo None
@@ -901,69 +1388,51 @@ class CategoryMapper:
         best_match = None
         best_priority = -1
         
-        for category_name, category_data in category_tree.items():
-            current_path = f"{parent_path} > {category_name}" if parent_path else category_name
-            
+        for node in category_nodes:
             # Kontrola podmínek pro aktuální kategorii
-            if self._check_category_conditions(product_name, params, category_data.get('conditions', [])):
+            if is_match(node):
                 # Rekurzivní prohledávání podkategorií
-                if 'subcategories' in category_data:
-                    sub_match = self._find_best_category_match(
-                        product_name, params,
-                        category_data['subcategories'],
-                        current_path
-                    )
+                if node.children:
+                    sub_match = self._resolve_best_match(node.children, is_match)
                     if sub_match:
                         # Podkategorie má vždy vyšší prioritu
                         return sub_match
                 
                 # Pokud nemá podkategorie nebo žádná nevyhovuje, použít tuto kategorii
-                priority = category_data.get('priority', 0)
-                if priority > best_priority:
-                    best_match = current_path
-                    best_priority = priority
+                if node.priority > best_priority:
+                    best_match = node.path
+                    best_priority = node.priority
         
         return best_match
     
-    def _find_all_category_matches(self, product_name: str, params: Dict[str, str],
-                                  category_tree: Dict, parent_path: str = "") -> List[Tuple[str, int, int]]:
+    def _resolve_all_matches(self, category_nodes: Tuple[CompiledCategory, ...],
+                             is_match: Callable[[CompiledCategory], bool]) -> List[Tuple[str, int, int]]:
         """
-        Rekurzivně prochází strom kategorií a najde všechny odpovídající kategorie.
+        Najde všechny odpovídající kategorie podle predikátu shody uzlu.
         
         Args:
-            product_name: Normalizovaný název produktu
-            params: Normalizované parametry produktu
-            category_tree: Aktuální úroveň stromu kategorií
-            parent_path: Cesta k nadřazené kategorii
+            category_nodes: Aktuální úroveň zkompilovaného stromu kategorií
+            is_match: Vrací True, pokud produkt splňuje podmínky uzlu
             
         Returns:
             Seznam tuple (category_path, priority, depth)
         """
         matches = []
         
-        for category_name, category_data in category_tree.items():
-            current_path = f"{parent_path} > {category_name}" if parent_path else category_name
-            current_depth = current_path.count(' > ') + 1
-            
+        for node in category_nodes:
             # Kontrola podmínek pro aktuální kategorii
-            if self._check_category_conditions(product_name, params, category_data.get('conditions', [])):
-                priority = category_data.get('priority', 0)
-                
+            if is_match(node):
                 # Rekurzivní prohledávání podkategorií
-                if 'subcategories' in category_data:
-                    sub_matches = self._find_all_category_matches(
-                        product_name, params,
-                        category_data['subcategories'],
-                        current_path
-                    )
+                if node.children:
+                    sub_matches = self._resolve_all_matches(node.children, is_match)
                     matches.extend(sub_matches)
                     
                     # Přidat aktuální kategorii pouze pokud nemá odpovídající podkategorie
                     if not sub_matches:
-                        matches.append((current_path, priority, current_depth))
+                        matches.append((node.path, node.priority, node.depth))
                 else:
                     # Kategorie bez podkategorií
-                    matches.append((current_path, priority, current_depth))
+                    matches.append((node.path, node.priority, node.depth))
         
         return matches
     
@@ -1025,73 +1494,45 @@ class CategoryMapper:
         # Vrátit pouze cesty kategorií, omezené na max_categories
         return [cat[0] for cat in matches[:max_categories]]
     
-    def _check_category_conditions(self, product_name: str, params: Dict[str, str],
-                                  conditions: List[Dict]) -> bool:
+    def _check_category_conditions(self, context: ProductContext, node: CompiledCategory) -> bool:
         """
         Kontroluje, zda produkt splňuje podmínky pro danou kategorii.
         
         Args:
-            product_name: Normalizovaný název produktu
-            params: Normalizované parametry produktu
-            conditions: Seznam podmínek pro kategorii
+            context: Normalizovaná data produktu
+            node: Zkompilovaná kategorie
             
         Returns:
             True pokud produkt splňuje alespoň jednu podmínku
         """
-        if not conditions:
-            return False
-        
-        for condition in conditions:
-            # Kontrola názvu produktu
-            if 'name_contains' in condition:
-                if any(word in product_name for word in condition['name_contains']):
-                    return True
-            
-            # Kontrola regulárního výrazu
-            if 'name_regex' in condition:
-                if re.search(condition['name_regex'], product_name):
-                    return True
-            
-            # Kontrola parametrů
-            if 'params' in condition:
-                params_match = True
-                for param_name, param_values in condition['params'].items():
-                    if param_name.lower() not in params:
-                        params_match = False
-                        break
-                    
-                    param_value = params[param_name.lower()]
-                    # Pokud je param_values seznam, kontrolujeme, zda hodnota je v seznamu
-                    if isinstance(param_values, list):
-                        if not any(v.lower() in param_value for v in param_values):
-                            params_match = False
-                            break
-                    # Pokud je param_values string, kontrolujeme částečnou shodu
-                    else:
-                        if param_values.lower() not in param_value:
-                            params_match = False
-                            break
-                
-                if params_match:
-                    return True
-            
-            # Kontrola parametrů s podmínkou "alespoň jeden"
-            if 'params_any' in condition:
-                for param_name, param_values in condition['params_any'].items():
-                    if param_name.lower() in params:
-                        param_value = params[param_name.lower()]
-                        if isinstance(param_values, list):
-                            if param_value in [v.lower() for v in param_values]:
-                                return True
-                        else:
-                            if param_value == param_values.lower():
-                                return True
-            
-            # Kontrola značky
-            if 'brand_contains' in condition:
-                brand = params.get('znacka', '') or params.get('vyrobce', '')
-                if any(word.lower() in brand.lower() for word in condition['brand_contains']):
-                    return True
+        # Kontrola názvu produktu
+        if context.keyword_bits & node.name_mask:
+            return True
+        
+        # Kontrola regulárních výrazů
+        for name_regex in node.name_regexes:
+            if name_regex.search(context.name):
+                return True
+        
+        # Kontrola parametrů - všechny parametry pravidla musí obsahovat některou z hodnot
+        params = context.params
+        for rule in node.param_rules:
+            for param_name, param_values in rule:
+                param_value = params.get(param_name)
+                if param_value is None or not any(v in param_value for v in param_values):
+                    break
+            else:
+                return True
+        
+        # Kontrola parametrů s podmínkou "alespoň jeden"
+        for param_name, param_values in node.params_any:
+            if params.get(param_name) in param_values:
+                return True
+        
+        # Kontrola značky
+        if node.brand_keywords:
+            if any(word in context.brand for word in node.brand_keywords):
+                return True
         
         return False
     
@@ -1104,6 +1545,15 @@ class CategoryMapper:
         """
         return self.mapping_stats
     
+    def get_cache_stats(self) -> Dict:
+        """
+        Vrací čítače cache mapování.
+        
+        Returns:
+            Slovník s velikostí cache a počty hits, misses a evictions
+        """
+        return self.mapping_cache.get_stats()
+    
     def reset_stats(self):
         """Resetuje statistiky mapování."""
         self.mapping_stats = {
@@ -1139,6 +1589,12 @@ class CategoryMapper:
             for category, count in sorted_categories[:20]:
                 print(f"  {category}: {count} produktů")
         
+        # Cache používá jen mapování po řádcích, po samotném map_dataframe nemá co hlásit
+        cache_stats = self.get_cache_stats()
+        if cache_stats['hits'] + cache_stats['misses']:
+            print(f"\nCache mapování (po řádcích): {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                  f"{cache_stats['evictions']} evictions ({cache_stats['hit_rate']*100:.1f}% hit rate)")
+        
         print("="*60)
 
 
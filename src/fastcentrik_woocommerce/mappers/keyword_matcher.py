@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vyhledávání klíčových slov v názvech produktů
+=============================================
+
+Aho-Corasick automat sestavený jednou ze všech klíčových slov name_contains
+ve stromu kategorií. Jeden průchod názvem produktu vrátí bitovou masku
+nalezených slov (bit i = slovo s id i), takže vyhodnocení pravidel je jen
+test masky a cena nezávisí na počtu kategorií.
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+from typing import Dict, Iterable, List
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern vyhledávání podřetězců (Aho-Corasick).
+
+    Shoda odpovídá výrazu `keyword in text` pro každé slovo zvlášť - slova
+    se nijak nenormalizují, případné převody velikosti písmen řeší volající.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Sestaví automat.
+
+        Args:
+            keywords: Klíčová slova; id slova je jeho pořadí (duplicity sdílí id prvního výskytu).
+        """
+        self.keyword_ids: Dict[str, int] = {}
+        for keyword in keywords:
+            self.keyword_ids.setdefault(keyword, len(self.keyword_ids))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [0]
+
+        for keyword, keyword_id in self.keyword_ids.items():
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                state = next_state
+            self._output[state] |= 1 << keyword_id
+
+        # Fail přechody do šířky; výstup stavu zahrnuje výstupy celého fail řetězce
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fail_state = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = fail_state
+                self._output[next_state] |= self._output[fail_state]
+                queue.append(next_state)
+
+    def __len__(self) -> int:
+        return len(self.keyword_ids)
+
+    def mask_for(self, keywords: Iterable[str]) -> int:
+        """Vrátí bitovou masku pro daná slova (slova musí být v automatu)."""
+        mask = 0
+        for keyword in keywords:
+            mask |= 1 << self.keyword_ids[keyword]
+        return mask
+
+    def match(self, text: str) -> int:
+        """
+        Projde text jednou a vrátí masku všech slov, která jsou jeho podřetězcem.
+
+        Args:
+            text: Prohledávaný text
+
+        Returns:
+            int: Bitová maska nalezených slov
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        # Prázdné slovo je podřetězcem každého textu
+        found = output[0]
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= output[state]
+        return found
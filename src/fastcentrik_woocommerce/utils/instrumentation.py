@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Měření fází transformace (spany) a strojově čitelný report běhu
+===============================================================
+
+    - RunReport: sběr měření jednoho běhu; jako context manager se nastaví
+      jako aktivní (contextvar) a volitelně zapne tracemalloc
+    - span(name, rows): změří blok kódu - čas, CPU čas, řádky a špičku
+      alokací; bez aktivního reportu nic neměří
+    - spanned(name, rows): totéž jako dekorátor metody
+    - instrument_iter(name, iterable): změří získání každé položky
+      (např. načtení dávky z DataLoader.iter_product_chunks)
+
+Opakované spany se stejným názvem se sčítají (počet volání, čas, řádky),
+špička alokací je nejvyšší ze všech volání. Špičky alokací se měří jen se
+zapnutým trace_memory (ve spouštěcích skriptech --trace-memory); jinak jsou
+v reportu null a report to uvede v poli notes. peak_rss_bytes se vyplní vždy. Report se zapíše jako JSON
+vedle výstupů (viz INSTRUMENTATION_SETTINGS).
+
+Použití:
+    with RunReport('run_transformation') as report:
+        with span('load'):
+            data = loader.load_data()
+        ...
+    report.write(output_dir / 'run_report.json')
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import functools
+import json
+import platform
+import time
+import tracemalloc
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.fastcentrik_woocommerce.utils.memory import peak_rss
+
+MEMORY_NOT_TRACED_NOTE = ("Špičky alokací se neměřily (trace_memory vypnuto), peak_memory_bytes jsou null; "
+                          "zapněte --trace-memory. Celková špička procesu je v peak_rss_bytes.")
+
+_active_report: ContextVar[Optional['RunReport']] = ContextVar('active_run_report', default=None)
+
+
+class SpanStats:
+    """Souhrn všech volání spanu jednoho názvu."""
+
+    __slots__ = ('name', 'parent', 'calls', 'seconds', 'cpu_seconds', 'rows', 'peak_memory')
+
+    def __init__(self, name: str, parent: Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.calls = 0
+        self.seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows: Optional[int] = None
+        self.peak_memory: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        rows_per_second = self.rows / self.seconds if self.rows is not None and self.seconds > 0 else None
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'rows': self.rows,
+            'rows_per_second': round(rows_per_second, 1) if rows_per_second is not None else None,
+            'peak_memory_bytes': self.peak_memory,
+        }
+
+
+class Span:
+    """Jedno měření bloku kódu; počet řádků lze doplnit i uvnitř bloku (span.rows = ...)."""
+
+    __slots__ = ('report', 'name', 'rows', '_start', '_cpu_start', '_memory_start', '_memory_max')
+
+    def __init__(self, report: 'RunReport', name: str, rows: Optional[int] = None):
+        self.report = report
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self) -> 'Span':
+        self.report._enter(self)
+        self._cpu_start = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        seconds = time.perf_counter() - self._start
+        cpu_seconds = time.process_time() - self._cpu_start
+        self.report._exit(self, seconds, cpu_seconds)
+
+
+class _NullSpan:
+    """Span bez aktivního reportu - nic neměří."""
+
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = None
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+
+class RunReport:
+    """
+    Měření jednoho běhu transformace.
+
+    Args:
+        run_name (str): Název běhu v reportu (např. název spouštěcího skriptu).
+        trace_memory (bool): Měřit špičky alokací přes tracemalloc (zpomalí běh).
+        metadata (Dict, optional): Doplňující údaje (vstupní soubor, režim...).
+    """
+
+    def __init__(self, run_name: str, trace_memory: bool = True, metadata: Optional[Dict[str, Any]] = None):
+        self.run_name = run_name
+        self.trace_memory = trace_memory
+        self.metadata = dict(metadata or {})
+        self.spans: Dict[str, SpanStats] = {}
+        self._open: List[Span] = []
+        self._token = None
+        self._started_tracing = False
+        self._started_at: Optional[datetime] = None
+        self._finished_at: Optional[datetime] = None
+        self._start = self._cpu_start = 0.0
+        self.seconds = self.cpu_seconds = 0.0
+        self.peak_memory: Optional[int] = None
+        self._memory_max = 0  # Nejvyšší špička alokací před vynulováními ve spanech
+
+    def __enter__(self) -> 'RunReport':
+        self._token = _active_report.set(self)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._started_at = datetime.now()
+        self._cpu_start = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.seconds = time.perf_counter() - self._start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+        self._finished_at = datetime.now()
+        if self.trace_memory and tracemalloc.is_tracing():
+            # Celková špička: před vynulováními ve spanech nebo od posledního vynulování
+            self.peak_memory = max(self._memory_max, tracemalloc.get_traced_memory()[1])
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        _active_report.reset(self._token)
+
+    def _tracing(self) -> bool:
+        return self.trace_memory and tracemalloc.is_tracing()
+
+    def _enter(self, span: Span) -> None:
+        if span.name not in self.spans:
+            # Pořadí spanů v reportu podle prvního vstupu - nadřazené před vnořenými
+            parent = self._open[-1].name if self._open else None
+            self.spans[span.name] = SpanStats(span.name, parent)
+        if self._tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Špička před vynulováním patří všem otevřeným (nadřazeným) spanům
+            for open_span in self._open:
+                open_span._memory_max = max(open_span._memory_max, peak)
+            self._memory_max = max(self._memory_max, peak)
+            if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+                tracemalloc.reset_peak()
+            span._memory_start = span._memory_max = current
+        self._open.append(span)
+
+    def _exit(self, span: Span, seconds: float, cpu_seconds: float) -> None:
+        self._open.pop()
+        peak_memory = None
+        if self._tracing() and hasattr(span, '_memory_start'):
+            span._memory_max = max(span._memory_max, tracemalloc.get_traced_memory()[1])
+            for open_span in self._open:
+                open_span._memory_max = max(open_span._memory_max, span._memory_max)
+            peak_memory = span._memory_max - span._memory_start
+
+        stats = self.spans[span.name]
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.cpu_seconds += cpu_seconds
+        if span.rows is not None:
+            stats.rows = (stats.rows or 0) + span.rows
+        if peak_memory is not None:
+            stats.peak_memory = max(stats.peak_memory or 0, peak_memory)
+
+    def span(self, name: str, rows: Optional[int] = None) -> Span:
+        """Vrátí span měřený do tohoto reportu."""
+        return Span(self, name, rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Vrátí report jako slovník pro JSON."""
+        return {
+            'run': self.run_name,
+            'started_at': self._started_at.isoformat(timespec='seconds') if self._started_at else None,
+            'finished_at': self._finished_at.isoformat(timespec='seconds') if self._finished_at else None,
+            'seconds': round(self.seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'peak_memory_bytes': self.peak_memory,
+            'peak_rss_bytes': peak_rss(),
+            'trace_memory': self.trace_memory,
+            'notes': self.notes(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'metadata': self.metadata,
+            'spans': [stats.to_dict() for stats in self.spans.values()],
+        }
+
+    def notes(self) -> List[str]:
+        """Upozornění k interpretaci reportu."""
+        return [] if self.trace_memory else [MEMORY_NOT_TRACED_NOTE]
+
+    def write(self, path) -> Path:
+        """Zapíše report do JSON souboru a vrátí jeho cestu."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.to_dict(), handle, ensure_ascii=False, indent=2)
+        return path
+
+    def summary_lines(self) -> List[str]:
+        """Tabulka spanů pro výpis do konzole nebo logu."""
+        lines = [f"{'fáze':<22} {'volání':>8} {'čas [s]':>9} {'CPU [s]':>9} {'řádků/s':>10} {'špička [MB]':>12}"]
+        for stats in self.spans.values():
+            entry = stats.to_dict()
+            depth, parent = 0, stats.parent
+            while parent in self.spans and depth < len(self.spans):
+                depth, parent = depth + 1, self.spans[parent].parent
+            label = '  ' * depth + stats.name
+            rate = f"{entry['rows_per_second']:.0f}" if entry['rows_per_second'] is not None else ''
+            memory = f"{stats.peak_memory / 1024 / 1024:.1f}" if stats.peak_memory is not None else ''
+            lines.append(f"{label:<22} {stats.calls:>8} {stats.seconds:>9.2f} {stats.cpu_seconds:>9.2f} "
+                         f"{rate:>10} {memory:>12}")
+        lines.extend(self.notes())
+        return lines
+
+
+def active_report() -> Optional[RunReport]:
+    """Vrátí aktivní report běhu, nebo None."""
+    return _active_report.get()
+
+
+def span(name: str, rows: Optional[int] = None):
+    """
+    Změří blok kódu do aktivního reportu; bez reportu nic neměří.
+
+    Args:
+        name (str): Název fáze (stejné názvy se sčítají).
+        rows (int, optional): Počet zpracovaných řádků pro rychlost řádků/s.
+    """
+    report = _active_report.get()
+    if report is None:
+        return _NullSpan()
+    return Span(report, name, rows)
+
+
+def spanned(name: str, rows: Union[int, Callable[..., int], None] = None):
+    """
+    Dekorátor: každé volání funkce je span.
+
+    Args:
+        name (str): Název fáze.
+        rows (int | Callable, optional): Počet řádků na volání, nebo funkce
+            argumentů volání, která ho vrátí.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            report = _active_report.get()
+            if report is None:
+                return func(*args, **kwargs)
+            with Span(report, name, rows(*args, **kwargs) if callable(rows) else rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_iter(name: str, iterable: Iterable, rows: Callable[[Any], int] = len) -> Iterator:
+    """Projde iterable a změří získání každé položky jako span (řádky podle rows(položka))."""
+    iterator = iter(iterable)
+    while True:
+        with span(name) as measured:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            measured.rows = rows(item)
+        yield item
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Měření a úspora paměti při dávkovém zpracování
+==============================================
+
+    - current_rss / peak_rss: aktuální a špičková rezidentní paměť procesu
+      (Linux /proc, jinak modul resource, případně volitelný psutil)
+    - reset_peak_rss: vynuluje špičku (Linux), takže lze měřit špičku
+      jednotlivých dávek; jinde je špička za celý běh procesu
+    - optimize_frame: stejné řetězce v textových sloupcích sdílí jeden objekt
+      (interning) a celočíselné sloupce se zmenší na nejmenší typ
+    - BatchMemoryMonitor: paměť po jednotlivých dávkách (špička a RSS po uvolnění)
+
+Autor: FastCentrik Migration Tool
+Verze: 1.0
+"""
+
+import gc
+import logging
+import sys
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROC_STATUS = '/proc/self/status'
+PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+
+def _proc_status_bytes(field: str) -> Optional[int]:
+    """Přečte hodnotu v kB z /proc/self/status (VmRSS, VmHWM) a vrátí ji v bajtech."""
+    try:
+        with open(PROC_STATUS, encoding='ascii') as handle:
+            for line in handle:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _psutil_memory_info():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info()
+
+
+def current_rss() -> Optional[int]:
+    """Vrátí aktuální rezidentní paměť procesu v bajtech, nebo None, pokud ji nelze zjistit."""
+    rss = _proc_status_bytes('VmRSS')
+    if rss is not None:
+        return rss
+    info = _psutil_memory_info()
+    return info.rss if info is not None else None
+
+
+def peak_rss() -> Optional[int]:
+    """Vrátí špičkovou rezidentní paměť v bajtech (od startu nebo od posledního reset_peak_rss)."""
+    peak = _proc_status_bytes('VmHWM')
+    if peak is not None:
+        return peak
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS vrací bajty, ostatní systémy kB
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+    info = _psutil_memory_info()
+    return getattr(info, 'peak_wset', info.rss) if info is not None else None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Vynuluje špičku rezidentní paměti na aktuální hodnotu (Linux 4.0+).
+
+    Returns:
+        bool: True, pokud se špička vynulovala; jinak peak_rss měří špičku za celý běh.
+    """
+    try:
+        with open(PROC_CLEAR_REFS, 'w', encoding='ascii') as handle:
+            handle.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def memory_snapshot() -> Dict[str, Optional[int]]:
+    """Vrátí {'rss': ..., 'peak_rss': ...} v bajtech."""
+    return {'rss': current_rss(), 'peak_rss': peak_rss()}
+
+
+def format_mb(value: Optional[int]) -> str:
+    """Naformátuje velikost v bajtech jako MB (None -> n/a)."""
+    return f"{value / (1024 * 1024):.1f} MB" if value is not None else "n/a"
+
+
+def release_memory() -> None:
+    """Uvolní nedosažitelné objekty (cykly), aby se paměť dávky mohla použít znovu."""
+    gc.collect()
+
+
+def intern_strings(series: pd.Series) -> pd.Series:
+    """Vrátí sloupec, ve kterém stejné řetězce sdílí jeden objekt; hodnoty i typ se nemění."""
+    pool: Dict[str, str] = {}
+    values = series.to_numpy(dtype=object, copy=True)
+    for position, value in enumerate(values):
+        if isinstance(value, str):
+            values[position] = pool.setdefault(value, value)
+    return pd.Series(values, index=series.index, name=series.name, dtype=series.dtype)
+
+
+def optimize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Zmenší DataFrame v paměti bez změny hodnot.
+
+    Textové sloupce (object, str) se internují - opakované popisy a obrázky
+    variant pak zabírají paměť jen jednou. Celočíselné sloupce (i nullable
+    Int64) se zmenší na nejmenší typ, do kterého se hodnoty vejdou.
+    Kategorie a desetinná čísla se nemění.
+    """
+    optimized = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            optimized[column] = pd.to_numeric(series, downcast='integer')
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            optimized[column] = intern_strings(series)
+    return df.assign(**optimized) if optimized else df
+
+
+class BatchMemoryMonitor:
+    """
+    Měří paměť dávkového zpracování.
+
+    Pro každou dávku zaznamená špičku RSS během dávky (včetně načtení) a RSS
+    po uvolnění jejích struktur. Kde nelze špičku vynulovat, je hodnota
+    špičkou za celý dosavadní běh.
+
+    Použití:
+        monitor = BatchMemoryMonitor()
+        for batch in batches:
+            ...                       # načtení, transformace, zápis, uvolnění
+            monitor.record(len(batch), products_count)
+    """
+
+    def __init__(self, batch_logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            batch_logger (logging.Logger, optional): Logger pro řádky dávek (výchozí logger modulu).
+        """
+        self.logger = batch_logger or logger
+        self.stats: List[Dict[str, Optional[int]]] = []
+        self.per_batch_peak = reset_peak_rss()
+
+    def record(self, rows: int, products: int) -> Dict[str, Optional[int]]:
+        """Zaznamená a zaloguje paměť právě dokončené dávky a začne měřit další."""
+        entry = {'batch': len(self.stats) + 1, 'rows': rows, 'products': products}
+        entry.update(memory_snapshot())
+        self.stats.append(entry)
+        peak_label = 'špička RSS dávky' if self.per_batch_peak else 'špička RSS běhu'
+        self.logger.info(f"Dávka {entry['batch']}: {rows} řádků -> {products} produktů, "
+                    f"{peak_label} {format_mb(entry['peak_rss'])}, RSS po uvolnění {format_mb(entry['rss'])}")
+        self.per_batch_peak = reset_peak_rss()
+        return entry
+
+    def peak(self) -> Optional[int]:
+        """Vrátí nejvyšší zaznamenanou špičku RSS ze všech dávek."""
+        peaks = [entry['peak_rss'] for entry in self.stats if entry['peak_rss'] is not None]
+        return max(peaks) if peaks else None
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test dávkové transformace a optimalizace paměti
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.variant_grouping import has_master_code_groups
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.utils.memory import optimize_frame
+
+PRODUCTS = pd.DataFrame({
+    'KodZbozi': ['S1', 'F1', 'F1_2', 'F1_3', 'S2', 'F2_2', 'F2_3'],
+    'JmenoZbozi': ['Batoh', 'Tričko', 'Tričko L', 'Tričko XL', 'Míč', 'Mikina M', 'Mikina L'],
+    'KodMasterVyrobku': ['', '', 'F1', 'F1', '', 'F2', 'F2'],
+    'HodnotyParametru': ['', '', 'velikost||L', 'velikost||XL', '', 'velikost||M', 'velikost||L'],
+    'Popis': ['Batoh', 'Bavlna', 'Bavlna', 'Bavlna', 'Míč', 'Fleece', 'Fleece'],
+    'NaSklade': pd.array([1, 0, 2, 0, 5, None, 1], dtype='Int64'),
+})
+CATEGORIES = pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Oblečení']})
+# Dávky s celými rodinami variant (jako DataLoader.iter_product_chunks)
+BATCHES = [[0, 1, 2, 3], [4, 5, 6]]
+
+
+def _batches():
+    return (PRODUCTS.iloc[positions] for positions in BATCHES)
+
+
+def test_optimize_frame_keeps_values():
+    products = PRODUCTS.copy()
+    products['Popis'] = products['Popis'].map(lambda text: ''.join(list(text)))  # Různé objekty
+    optimized = optimize_frame(products)
+
+    pd.testing.assert_frame_equal(optimized, products, check_dtype=False)
+    assert optimized['Popis'].dtype == products['Popis'].dtype
+    assert str(optimized['NaSklade'].dtype) == 'Int8'
+    descriptions = optimized['Popis'].tolist()
+    assert descriptions[1] is descriptions[2] is descriptions[3]
+
+
+def test_has_master_code_groups():
+    assert has_master_code_groups(PRODUCTS['KodMasterVyrobku'])
+    assert not has_master_code_groups(pd.Series(['', None, 'A', 'B']))
+    assert not has_master_code_groups(None)
+
+
+def test_batched_transformation_matches_single_run():
+    reference, _ = DataTransformer(PRODUCTS, CATEGORIES).run_transformation()
+
+    transformer = DataTransformer(pd.DataFrame(), CATEGORIES)
+    written = []
+    type_counts, _ = transformer.run_batched_transformation(_batches(), written.append)
+
+    assert len(written) == 2
+    key = lambda product: product['SKU']
+    assert sorted(sum(written, []), key=key) == sorted(reference, key=key)
+    assert type_counts == {'simple': 2, 'variable': 2, 'variation': 4}
+    assert [entry['rows'] for entry in transformer.batch_stats] == [4, 3]
+    assert len(transformer.product_records) == 0  # Struktury poslední dávky jsou uvolněné
+
+
+def test_webtoffee_batches_continue_ids_and_grouping():
+    transformer = WebToffeeTransformer(pd.DataFrame(), CATEGORIES)
+    written = []
+    _, errors = transformer.run_batched_transformation(
+        _batches(), written.extend, group_by_master_code=True, memory_optimization=False
+    )
+
+    assert errors == []
+    ids = [product['ID'] for product in written]
+    assert len(set(ids)) == len(ids)
+    assert [product['sku'] for product in written if product['tax:product_type'] == 'Variable'] == ['F1', 'F2']
+    parents = {product['sku']: product['ID'] for product in written}
+    for product in written:
+        if product.get('parent_sku'):
+            assert product['post_parent'] == parents[product['parent_sku']]
+
+
+if __name__ == "__main__":
+    test_optimize_frame_keeps_values()
+    test_has_master_code_groups()
+    test_batched_transformation_matches_single_run()
+    test_webtoffee_batches_continue_ids_and_grouping()
+    print("✓ Dávková transformace odpovídá jednorázové")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test předpočítaných cest kategorií
+"""
+
+import sys
+from pathlib import Path
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.category_paths import resolve_category_paths
+
+
+def create_mapping(parents: dict) -> dict:
+    return {category_id: {'name': f"Kat {category_id}", 'parent': parent}
+            for category_id, parent in parents.items()}
+
+
+def test_resolve_category_paths():
+    mapping = create_mapping({
+        'C3': 'C2',       # potomek zpracovaný před předky
+        'C1': 'ROOT_1',
+        'C2': 'C1',
+        'C4': '',
+        'C5': 'CHYBI',    # sirotek
+        'C6': 'C5',
+    })
+
+    issues = resolve_category_paths(mapping)
+
+    assert mapping['C3']['path'] == 'Kat C1 > Kat C2 > Kat C3'
+    assert mapping['C3']['depth'] == 3
+    assert mapping['C3']['leaf'] == 'Kat C3'
+    assert mapping['C1']['path'] == 'Kat C1'
+    assert mapping['C4']['depth'] == 1
+    assert mapping['C6']['path'] == 'Kat C5 > Kat C6'
+    assert issues == {'orphans': ['C5'], 'cycles': []}
+
+
+def test_resolve_category_paths_cycle():
+    mapping = create_mapping({'A': 'B', 'B': 'C', 'C': 'A', 'D': 'C'})
+
+    issues = resolve_category_paths(mapping)
+
+    assert issues['cycles'] == [['A', 'B', 'C']]
+    # Cyklus se přeruší u hrany C -> A
+    assert mapping['A']['path'] == 'Kat C > Kat B > Kat A'
+    assert mapping['D']['path'] == 'Kat C > Kat D'
+    assert all('path' in entry for entry in mapping.values())
+
+
+if __name__ == "__main__":
+    test_resolve_category_paths()
+    test_resolve_category_paths_cycle()
+    print("✓ Cesty kategorií jsou správně předpočítané")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test čtení listu Zbozi po dávkách a předběžného průchodu rodinami variant
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.variant_grouping import assign_family_ids
+from src.fastcentrik_woocommerce.loaders.chunked_reader import iter_sheet_chunks
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+
+
+def _products() -> pd.DataFrame:
+    return pd.DataFrame({
+        'KodZbozi': ['A', 'A_2', 'B', 'C', 'A_3', 'D', 'E', 'E_2'],
+        'KodMasterVyrobku': [None, None, None, 'M1', None, 'M1', None, None],
+        'JmenoZbozi': ['Tričko', 'Tričko L', 'Mikina', 'Bunda', 'Tričko XL', 'Bunda 2', 'Čepice', 'Čepice 2'],
+        'NaSklade': [1, 2, 0, 5, 1, 0, 3, 4],
+        'EAN': ['1', '2', '3', '4', '5', '6', '7', '8'],
+    })
+
+
+def test_assign_family_ids_joins_sku_pattern_and_master_code():
+    products = _products()
+    families = assign_family_ids(products['KodZbozi'], products['KodMasterVyrobku'])
+    assert families == [0, 0, 1, 2, 0, 2, 3, 3]
+
+
+def test_sheet_chunks_match_full_read():
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in ('.xlsx', '.csv'):
+            path = Path(tmp) / f"export{suffix}"
+            if suffix == '.csv':
+                _products().to_csv(path, index=False, encoding='utf-8-sig')
+                expected = pd.read_csv(path, encoding='utf-8-sig')
+            else:
+                with pd.ExcelWriter(path) as writer:
+                    _products().to_excel(writer, sheet_name='Zbozi', index=False)
+                expected = pd.read_excel(path, sheet_name='Zbozi')
+
+            chunks = list(iter_sheet_chunks(path, 'Zbozi', 3))
+            assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+            assert pd.concat(chunks).astype(object).equals(expected.astype(object))
+
+
+def test_product_chunks_keep_families_together():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        with pd.ExcelWriter(path) as writer:
+            _products().to_excel(writer, sheet_name='Zbozi', index=False)
+
+        loader = DataLoader(str(path), use_cache=False)
+        family_index = loader.load_family_index()
+        assert list(family_index.columns) == ['KodZbozi', 'KodMasterVyrobku', 'family']
+
+        chunks = list(loader.iter_product_chunks(chunk_size=2))
+        # Rodiny A (řádky 0, 1, 4) a M1 (3, 5) se podrží, dokud nepřijde jejich poslední řádek
+        assert [chunk.index.tolist() for chunk in chunks] == [[2], [0, 1, 3, 4, 5], [6, 7]]
+        assert 'EAN' not in chunks[0].columns
+        assert str(chunks[0]['NaSklade'].dtype) == 'Int64'
+
+
+if __name__ == "__main__":
+    test_assign_family_ids_joins_sku_pattern_and_master_code()
+    test_sheet_chunks_match_full_read()
+    test_product_chunks_keep_families_together()
+    print("✓ Čtení po dávkách drží rodiny variant pohromadě")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test načítání sešitu - jedno otevření, souběžné parsování listů
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+from src.fastcentrik_woocommerce.loaders.input_schema import apply_schema, text_dtypes
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+from src.fastcentrik_woocommerce.exporters.webtoffee_csv_exporter import WebToffeeCSVExporter
+
+
+def _write_workbook(path: Path, sheets: dict) -> None:
+    with pd.ExcelWriter(path) as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def test_load_data_matches_read_excel():
+    sheets = {
+        'Zbozi': pd.DataFrame({'KodZbozi': ['A', 'A_2'], 'JmenoZbozi': ['Tričko', 'Tričko L'], 'NaSklade': [1, 0],
+                               'EAN': ['859', '860'], 'CenaBezna': ['199,90', '249']}),
+        'Kategorie': pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Oblečení']}),
+        'Parametry': pd.DataFrame({'Nazev': ['velikost'], 'Hodnota': ['L']}),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        _write_workbook(path, sheets)
+
+        for workers in (1, 3):
+            loader = DataLoader(str(path), max_workers=workers, use_cache=False, lazy=False)
+            data = loader.load_data()
+
+            expected = apply_schema(pd.read_excel(path, sheet_name='Zbozi', dtype=text_dtypes('Zbozi'))
+                                    .drop(columns=['EAN']), 'Zbozi')
+            assert data['products'].equals(expected)
+            assert data['products']['CenaBezna'].tolist() == ['199,90', '249']
+            assert data['categories'].equals(apply_schema(
+                pd.read_excel(path, sheet_name='Kategorie', dtype=text_dtypes('Kategorie')), 'Kategorie'))
+            assert data['parameters'].equals(pd.read_excel(path, sheet_name='Parametry'))
+            assert set(loader.sheet_timings) == {'_open', 'Zbozi', 'Kategorie', 'Parametry', '_total'}
+            assert loader.memory_report['Zbozi']['columns'] == 4
+
+
+def test_load_data_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            DataLoader(str(Path(tmp) / 'neexistuje.xlsx'), use_cache=False).load_data()
+            assert False, "Očekávána FileNotFoundError"
+        except FileNotFoundError:
+            pass
+
+        path = Path(tmp) / 'bez_parametru.xlsx'
+        _write_workbook(path, {'Zbozi': pd.DataFrame({'KodZbozi': ['A']}),
+                               'Kategorie': pd.DataFrame({'InterniKod': ['C1']})})
+        try:
+            DataLoader(str(path), use_cache=False, lazy=False).load_data()
+            assert False, "Očekávána chyba chybějícího listu"
+        except ValueError:
+            pass
+
+        # V líném režimu se chybějící list projeví až při přístupu
+        data = DataLoader(str(path), use_cache=False, lazy=True).load_data()
+        assert data['products']['KodZbozi'].tolist() == ['A']
+        try:
+            data['parameters']
+            assert False, "Očekávána chyba chybějícího listu"
+        except ValueError:
+            pass
+
+
+def test_lazy_loading_parses_only_accessed_sheets():
+    sheets = {
+        'Zbozi': pd.DataFrame({'KodZbozi': ['A'], 'NaSklade': [1]}),
+        'Kategorie': pd.DataFrame({'InterniKod': ['C1']}),
+        'Parametry': pd.DataFrame({'Nazev': ['velikost']}),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        _write_workbook(path, sheets)
+        cache_dir = str(Path(tmp) / 'cache')
+
+        loader = DataLoader(str(path), use_cache=True, cache_dir=cache_dir, lazy=True)
+        data = loader.load_data()
+        assert data.loaded_keys() == [] and set(data) == {'products', 'categories', 'parameters'}
+
+        products = data['products']
+        assert data['products'] is products
+        assert data.loaded_keys() == ['products']
+        assert set(loader.sheet_timings) == {'_open', 'Zbozi'}
+        loader.close()
+
+        # Druhý běh čte z cache jen list, který první běh načetl
+        second = DataLoader(str(path), use_cache=True, cache_dir=cache_dir, lazy=True)
+        data = second.load_data()
+        assert data['products'].equals(products)
+        assert data['categories']['InterniKod'].tolist() == ['C1']
+        assert set(second.sheet_timings) == {'_cache', '_open', 'Kategorie'}
+        assert second._workbook is not None
+        data['parameters']
+        assert second._workbook is None
+
+
+def test_prices_exported_as_in_source():
+    # Číselné i textové buňky cen, prázdný sklad (sloupec by pandas jinak načetl jako float)
+    sheets = {
+        'Zbozi': pd.DataFrame({'KodZbozi': ['P1', 'P2', 'P3'], 'JmenoZbozi': ['Míč', 'Síť', 'Branka'],
+                               'CenaBezna': [6232, '6 660,90', 1299.9],
+                               'ZakladniCena': [6232, '5 990,00', 999],
+                               'NaSklade': [3, None, 0]}),
+        'Kategorie': pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Sport']}),
+        'Parametry': pd.DataFrame({'Nazev': ['velikost'], 'Hodnota': ['L']}),
+    }
+    regular = ['6232', '6 660.90', '1299.9']
+    sale = ['', '5 990.00', '999']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        _write_workbook(path, sheets)
+        data = DataLoader(str(path), use_cache=False, lazy=False).load_data()
+
+        products, _ = DataTransformer(data['products'], data['categories']).run_transformation()
+        CsvExporter().export_products(products, tmp)
+        woo = pd.read_csv(Path(tmp) / 'woocommerce_products.csv', dtype=str, keep_default_na=False)
+        assert woo['Regular price'].tolist() == regular
+        assert woo['Sale price'].tolist() == sale
+        assert woo['Stock'].tolist()[::2] == ['3', '0']
+
+        products, _ = WebToffeeTransformer(data['products'], data['categories']).run_transformation()
+        all_file = WebToffeeCSVExporter(tmp).export_products(products)[-1]
+        webtoffee = pd.read_csv(all_file, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        assert webtoffee['regular_price'].tolist() == regular
+        assert webtoffee['sale_price'].tolist() == sale
+        assert webtoffee['stock'].tolist()[::2] == ['3', '0']
+
+        # Po dávkách z čtečky openpyxl stejné ceny
+        chunks = list(DataLoader(str(path), use_cache=False).iter_product_chunks(chunk_size=2))
+        written = []
+        DataTransformer(pd.DataFrame(), data['categories']).run_batched_transformation(chunks, written.extend)
+        assert [product['Regular price'] for product in written] == regular
+
+
+def test_numeric_category_codes_match_products():
+    # Čistě číselné kódy v obou listech - Excel je uloží jako čísla
+    sheets = {
+        'Zbozi': pd.DataFrame({'KodZbozi': ['P1', 'P2'], 'JmenoZbozi': ['Kopačky', 'Míč'],
+                               'InetrniKodyKategorii': [14, 13], 'CenaBezna': [999, 250], 'NaSklade': [1, 2]}),
+        'Kategorie': pd.DataFrame({'InterniKod': [12, 13, 14], 'JmenoKategorie': ['Root', 'Míče', 'Boty'],
+                                   'KodNadrizeneKategorie': [None, 12, 12]}),
+        'Parametry': pd.DataFrame({'Nazev': ['velikost'], 'Hodnota': ['L']}),
+    }
+    paths = ['Root > Boty', 'Root > Míče']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        _write_workbook(path, sheets)
+        for lazy in (False, True):
+            data = DataLoader(str(path), use_cache=False, lazy=lazy).load_data()
+            assert data['categories']['InterniKod'].tolist() == ['12', '13', '14']
+
+            products, _ = DataTransformer(data['products'], data['categories']).run_transformation()
+            assert [product['Categories'] for product in products] == paths
+            assert 'v kategorii Boty' in products[0]['Meta: _yoast_wpseo_metadesc']
+
+            frame, _ = DataTransformer(data['products'], data['categories']).run_frame_transformation()
+            assert frame['Categories'].tolist() == paths
+
+            products, _ = WebToffeeTransformer(data['products'], data['categories']).run_transformation()
+            assert [product['tax:product_cat'] for product in products] == paths
+
+        # Po dávkách stejné kategorie
+        chunks = list(DataLoader(str(path), use_cache=False).iter_product_chunks(chunk_size=1))
+        written = []
+        DataTransformer(pd.DataFrame(), data['categories']).run_batched_transformation(chunks, written.extend)
+        assert [product['Categories'] for product in written] == paths
+
+
+if __name__ == "__main__":
+    test_load_data_matches_read_excel()
+    test_load_data_errors()
+    test_lazy_loading_parses_only_accessed_sheets()
+    test_prices_exported_as_in_source()
+    test_numeric_category_codes_match_products()
+    print("✓ DataLoader načítá listy jako pd.read_excel (Zbozi podle schématu)")
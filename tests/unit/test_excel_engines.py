@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test výběru enginu pro čtení Excelu
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.excel_engines import (
+    available_engines, benchmark_engines, detect_excel_suffix, load_engine_choices, resolve_engine,
+    save_engine_choice
+)
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+
+
+def _write_workbook(path: Path) -> None:
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame({'KodZbozi': ['A', 'B'], 'NaSklade': [1, 0]}).to_excel(writer, sheet_name='Zbozi', index=False)
+
+
+def test_resolve_engine_defaults_and_validation():
+    assert resolve_engine(Path('export.xls')) == 'xlrd'
+    assert resolve_engine(Path('export.XLSX'), 'auto') == 'openpyxl'
+    assert resolve_engine(Path('export.xlsx'), 'openpyxl') == 'openpyxl'
+    for requested in ('neznamy', 'xlrd'):
+        try:
+            resolve_engine(Path('export.xlsx'), requested)
+            assert False, "Očekávána ValueError"
+        except ValueError:
+            pass
+
+
+def test_persisted_choice_is_used_when_available():
+    with tempfile.TemporaryDirectory() as tmp:
+        choices_file = Path(tmp) / 'engines.json'
+        save_engine_choice(choices_file, '.XLSX', 'openpyxl')
+        save_engine_choice(choices_file, '.xls', 'neexistujici')
+        assert load_engine_choices(choices_file) == {'.xlsx': 'openpyxl', '.xls': 'neexistujici'}
+        assert resolve_engine(Path('a.xlsx'), 'auto', choices_file) == 'openpyxl'
+        # Nedostupný engine z uložené volby se ignoruje
+        assert resolve_engine(Path('a.xls'), 'auto', choices_file) == 'xlrd'
+
+
+def test_benchmark_persists_winner():
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = Path(tmp) / 'export.xlsx'
+        choices_file = Path(tmp) / 'engines.json'
+        _write_workbook(workbook)
+
+        results = benchmark_engines(workbook, ['Zbozi'], choices_file=choices_file)
+
+        assert [result['name'] for result in results] == available_engines('.xlsx')
+        assert all(result['identical'] for result in results)
+        winners = [result['name'] for result in results if result['winner']]
+        assert len(winners) == 1
+        assert load_engine_choices(choices_file)['.xlsx'] == winners[0]
+
+
+def test_engine_follows_file_content_not_name():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Sešit .xlsx uložený pod výchozím názvem exportu
+        workbook = Path(tmp) / 'Export_Excel_Lite.xls'
+        with pd.ExcelWriter(workbook, engine='openpyxl') as writer:
+            for sheet_name in ('Zbozi', 'Kategorie', 'Parametry'):
+                pd.DataFrame({'KodZbozi': ['A']}).to_excel(writer, sheet_name=sheet_name, index=False)
+        assert detect_excel_suffix(workbook) == '.xlsx'
+        assert resolve_engine(workbook) == 'openpyxl'
+        assert resolve_engine(workbook, 'openpyxl') == 'openpyxl'
+
+        choices_file = Path(tmp) / 'engines.json'
+        save_engine_choice(choices_file, '.xls', 'xlrd')
+        assert resolve_engine(workbook, 'auto', choices_file) == 'openpyxl'
+
+        data = DataLoader(str(workbook), use_cache=False, lazy=False).load_data()
+        assert data['products']['KodZbozi'].tolist() == ['A']
+
+        # Neznámý obsah - engine vybere pandas
+        unknown = Path(tmp) / 'export.xls'
+        unknown.write_text('<html></html>', encoding='utf-8')
+        assert detect_excel_suffix(unknown) is None and resolve_engine(unknown) is None
+
+
+if __name__ == "__main__":
+    test_resolve_engine_defaults_and_validation()
+    test_persisted_choice_is_used_when_available()
+    test_benchmark_persists_winner()
+    test_engine_follows_file_content_not_name()
+    print("✓ Výběr enginu pro čtení Excelu funguje")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test souhrnných atributů a skladu rodin variant
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.family_aggregates import FamilyAggregate, aggregate_families
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+
+PARAMS = pd.Series([
+    'barva||modrá',                       # 0: jen barva
+    'velikost||L##barva||modrá',          # 1
+    'velikost||M##barva||černá',          # 2
+    None,                                 # 3: bez parametrů -> velikost z názvu
+    'material||bavlna',                   # 4: parametry bez variantních atributů
+    'velikost||XL',                       # 5
+])
+NAMES = ['Tričko', 'Tričko L', 'Tričko M', 'Kopačky 41 1/3', 'Kopačky 42', 'Mikina XL']
+STOCK = [0, np.nan, 3, 0, 0, 0]
+ATTRIBUTES = ['velikost', 'barva']
+
+
+def test_aggregate_families():
+    table = ParameterTable.from_series(PARAMS, names=pd.Series(NAMES))
+    aggregates = aggregate_families(
+        {'F1': [0, 1, 2], 'K': [4, 3], 'M': [5], 'X': [3, 3]}, table, ATTRIBUTES, STOCK
+    )
+
+    # Pořadí atributů podle prvního výskytu (barva je už u řádku 0)
+    assert aggregates['F1'] == FamilyAggregate({'barva': ['modrá', 'černá'], 'velikost': ['L', 'M']}, True)
+    assert list(aggregates['F1'].attributes) == ['barva', 'velikost']
+    assert aggregates['F1'].defaults == {'barva': 'modrá', 'velikost': 'L'}
+    # Řádek 4 má parametry (bez velikosti), velikost z názvu jen u řádku 3
+    assert aggregates['K'] == FamilyAggregate({'velikost': ['41 1/3']}, False)
+    assert aggregates['M'] == FamilyAggregate({'velikost': ['XL']}, False)
+    assert aggregates['X'].attributes == {'velikost': ['41 1/3']}
+
+
+def test_aggregate_families_without_stock_or_families():
+    table = ParameterTable.from_series(PARAMS, names=pd.Series(NAMES))
+    aggregates = aggregate_families({'F': [4]}, table, ATTRIBUTES)
+    assert aggregates == {'F': FamilyAggregate({}, None)}
+    assert aggregate_families({}, table, ATTRIBUTES) == {}
+    # Bez velikosti mezi atributy se velikost z názvu neodvozuje
+    assert aggregate_families({'K': [3]}, table, ['barva'])['K'].attributes == {}
+
+
+if __name__ == "__main__":
+    test_aggregate_families()
+    test_aggregate_families_without_stock_or_families()
+    print("✓ Souhrny rodin variant odpovídají výpočtu po rodinách")
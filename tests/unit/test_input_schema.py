@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test deklarovaného schématu vstupních listů
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.input_schema import apply_schema, text_dtypes, usecols_for
+from src.fastcentrik_woocommerce.loaders.product_record import build_product_records
+
+
+def test_usecols_keeps_only_declared_columns():
+    usecols = usecols_for('Zbozi')
+    assert usecols('KodZbozi') and usecols('Vypnuto')
+    assert not usecols('EAN')
+    assert usecols_for('Kategorie')('InterniKod') and not usecols_for('Kategorie')('URL')
+    assert usecols_for('Parametry') is None
+    assert text_dtypes('Kategorie') == {'InterniKod': str, 'JmenoKategorie': str,
+                                        'KodNadrizeneKategorie': str, 'PopisKategorie': str}
+
+
+def test_schema_converts_dtypes():
+    df = pd.DataFrame({
+        'KodZbozi': ['A', 'A_2', 'A_3', 'B'],
+        'KodMasterVyrobku': ['A', 'A', 'A', None],
+        'InetrniKodyKategorii': ['C1', 'C2', 'C3', 'C4'],
+        'CenaBezna': ['1 199,90', '249', None, 10],
+        'ZakladniCena': ['zdarma', '1', '2', '3'],
+        'NaSklade': [1.0, np.nan, 3.0, 0.0],
+        'Vypnuto': ['0', '1', '0', '0'],
+    })
+    result = apply_schema(df, 'Zbozi')
+
+    assert isinstance(result['KodMasterVyrobku'].dtype, pd.CategoricalDtype)
+    # Každá hodnota jiná - převod na category by paměť neušetřil
+    assert not isinstance(result['InetrniKodyKategorii'].dtype, pd.CategoricalDtype)
+    # Ceny zůstanou tak, jak jsou ve zdroji (export nesmí psát 249.0 ani 1199.9)
+    assert result['CenaBezna'].tolist()[:2] == ['1 199,90', '249']
+    assert result['ZakladniCena'].tolist() == df['ZakladniCena'].tolist()
+    assert text_dtypes('Zbozi')['CenaBezna'] is str
+    assert str(result['NaSklade'].dtype) == 'Int64'
+    assert result['Vypnuto'].tolist() == [0, 1, 0, 0]
+    assert df['NaSklade'].dtype == np.float64
+
+
+def test_records_from_nullable_columns():
+    df = apply_schema(pd.DataFrame({'KodZbozi': ['A', 'B'], 'NaSklade': [2, None]}), 'Zbozi')
+    records = build_product_records(df)
+    assert records[0].NaSklade == 2 and str(records[0].NaSklade) == '2'
+    assert pd.isna(records[1].NaSklade) and not records[1].NaSklade > 0
+
+
+if __name__ == "__main__":
+    test_usecols_keeps_only_declared_columns()
+    test_schema_converts_dtypes()
+    test_records_from_nullable_columns()
+    print("✓ Schéma vstupních listů převádí sloupce na deklarované typy")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test měření fází transformace a reportu běhu
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.utils.instrumentation import RunReport, active_report, instrument_iter, span, spanned
+
+PRODUCTS = pd.DataFrame({
+    'KodZbozi': ['S1', 'F1', 'F1_2', 'F1_3'],
+    'JmenoZbozi': ['Batoh', 'Tričko', 'Tričko L', 'Tričko XL'],
+    'KodMasterVyrobku': ['', '', 'F1', 'F1'],
+    'HodnotyParametru': ['', '', 'velikost||L', 'velikost||XL'],
+    'Popis': ['<p>Batoh</p>', '<b>Bavlna</b>', '<b>Bavlna</b>', '<b>Bavlna</b>'],
+    'NaSklade': [1, 0, 2, 0],
+})
+CATEGORIES = pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Oblečení']})
+
+
+def test_spans_aggregate_and_nest():
+    @spanned('item', rows=1)
+    def build(value):
+        return [value] * 1000
+
+    with span('ignored'):  # Bez aktivního reportu se nic neměří
+        pass
+    with RunReport('test', trace_memory=True) as report:
+        assert active_report() is report
+        with span('outer', rows=3):
+            items = [build(value) for value in range(3)]
+        batches = list(instrument_iter('load', iter([[1, 2], [3]])))
+    assert active_report() is None
+    assert len(items) == 3 and batches == [[1, 2], [3]]
+
+    spans = {entry['name']: entry for entry in report.to_dict()['spans']}
+    assert list(spans) == ['outer', 'item', 'load']
+    assert spans['item']['parent'] == 'outer' and spans['item']['calls'] == 3 and spans['item']['rows'] == 3
+    assert spans['outer']['peak_memory_bytes'] >= spans['item']['peak_memory_bytes'] > 0
+    assert spans['load']['rows'] == 3
+    assert report.peak_memory >= spans['outer']['peak_memory_bytes']
+
+
+def test_report_without_memory_tracing_is_written_as_json():
+    with RunReport('test', trace_memory=False, metadata={'mode': 'full'}) as report:
+        with span('export', rows=10):
+            pass
+    with tempfile.TemporaryDirectory() as tmp:
+        path = report.write(Path(tmp) / 'out' / 'run_report.json')
+        data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['run'] == 'test' and data['metadata'] == {'mode': 'full'}
+    assert data['peak_memory_bytes'] is None
+    assert data['notes'] and 'peak_memory_bytes' in data['notes'][0]
+    assert report.summary_lines()[-1] == data['notes'][0]
+    assert data['spans'][0]['name'] == 'export' and data['spans'][0]['peak_memory_bytes'] is None
+
+
+def test_transformers_record_pipeline_stages():
+    with RunReport('test', trace_memory=False) as report:
+        DataTransformer(PRODUCTS, CATEGORIES).run_transformation()
+    assert {'product_records', 'category_mapping', 'variant_grouping', 'product_build',
+            'validation'} <= set(report.spans)
+    # Sestavení se měří za celou smyčku, ne po produktech
+    assert report.spans['product_build'].calls == 1
+    assert report.spans['product_build'].rows == 4  # 1 simple + parent + 2 varianty
+
+    with RunReport('test', trace_memory=False) as report:
+        list(WebToffeeTransformer(PRODUCTS, CATEGORIES).iter_product_chunks(2))
+    assert report.spans['product_build'].rows == 4
+
+    with RunReport('test', trace_memory=False) as report:
+        WebToffeeTransformer(PRODUCTS, CATEGORIES).run_frame_transformation()
+    assert report.spans['html_cleaning'].parent == 'product_frame'
+    assert report.spans['html_cleaning'].calls == 1 and report.spans['html_cleaning'].rows == 2
+    assert report.spans['validation'].rows == report.spans['product_frame'].rows
+
+
+if __name__ == "__main__":
+    test_spans_aggregate_and_nest()
+    test_report_without_memory_tracing_is_written_as_json()
+    test_transformers_record_pipeline_stages()
+    print("✓ Měření fází a report běhu fungují")
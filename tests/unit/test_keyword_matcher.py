@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Aho-Corasick vyhledávání klíčových slov - musí odpovídat `keyword in text`
+"""
+
+import random
+import sys
+from pathlib import Path
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.mappers.keyword_matcher import KeywordMatcher
+from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper, collect_name_keywords
+
+
+def expected_mask(matcher: KeywordMatcher, text: str) -> int:
+    return sum(1 << keyword_id for keyword, keyword_id in matcher.keyword_ids.items() if keyword in text)
+
+
+def test_keyword_matcher_overlapping_keywords():
+    matcher = KeywordMatcher(['he', 'she', 'his', 'hers', 'she', 'kopačky', 'kop'])
+    assert len(matcher) == 6  # duplicita sdílí id
+
+    for text in ['ushers', 'ahishers', 'kopačky nike', 'kopaná', '', 'h']:
+        assert matcher.match(text) == expected_mask(matcher, text)
+
+    assert matcher.match('ushers') == matcher.mask_for(['he', 'she', 'hers'])
+
+
+def test_keyword_matcher_category_keywords():
+    keywords = collect_name_keywords(CategoryMapper().category_structure)
+    matcher = KeywordMatcher(keywords)
+
+    rng = random.Random(1)
+    for _ in range(300):
+        text = ' '.join(rng.sample(keywords, 3)) + ' nike ' + rng.choice(keywords)[:3]
+        text = text.lower()
+        assert matcher.match(text) == expected_mask(matcher, text)
+
+
+def test_keyword_matcher_empty_keyword():
+    matcher = KeywordMatcher(['', 'abc'])
+    assert matcher.match('xyz') == matcher.mask_for([''])
+
+
+if __name__ == "__main__":
+    test_keyword_matcher_overlapping_keywords()
+    test_keyword_matcher_category_keywords()
+    test_keyword_matcher_empty_keyword()
+    print("✓ Vyhledávání klíčových slov funguje správně")
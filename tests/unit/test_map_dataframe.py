@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test dávkového mapování kategorií - musí odpovídat mapování po řádcích
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+
+
+def create_products() -> pd.DataFrame:
+    return pd.DataFrame({
+        'JmenoZbozi': [
+            'Pánská mikina Nike Sportswear',
+            'Fotbalové kopačky Nike Mercurial FG',
+            'Fotbalové kopačky Nike Mercurial FG',
+            'Dětský batoh na výlety',
+            'Neznámý produkt',
+            'Neznámý produkt',
+            None,
+        ],
+        'HodnotyParametru': [
+            'pohlavi||pánské##typ||mikina##znacka||Nike',
+            'sport||fotbal##typ||kopačky##Povrch||FG##velikost||42',
+            'sport||fotbal##typ||kopačky##Povrch||FG##velikost||43',
+            'pohlavi||dětské##typ||batoh',
+            '',
+            'vyrobce||Salomon',
+            None,
+        ],
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+
+
+def test_map_dataframe_matches_row_mapping():
+    products_df = create_products()
+    params_table = ParameterTable.from_products(products_df)
+    original = pd.Series(['', '', '', '', 'Původní > Kategorie', '', ''], index=products_df.index)
+
+    for multi_category in (True, False):
+        for strategy in ('complementary', 'all_matches'):
+            row_mapper = CategoryMapper(cache_size=0)
+            batch_mapper = CategoryMapper()
+
+            expected = []
+            for position, (_, row) in enumerate(products_df.iterrows()):
+                name = str(row['JmenoZbozi'])
+                params = params_table.params_at(position)
+                if multi_category:
+                    expected.append(row_mapper.map_product_to_multiple_categories(
+                        name, params, original.iloc[position], 3, strategy))
+                else:
+                    category, mapping_type = row_mapper.map_product_to_category(
+                        name, params, original.iloc[position])
+                    expected.append(([category] if category else [], mapping_type))
+
+            categories, mapping_types = batch_mapper.map_dataframe(
+                products_df, params_table, original,
+                multi_category=multi_category, max_categories=3, strategy=strategy
+            )
+
+            assert list(categories.index) == list(products_df.index)
+            assert list(zip(categories.tolist(), mapping_types.tolist())) == expected
+            assert batch_mapper.get_mapping_stats() == row_mapper.get_mapping_stats()
+
+
+def test_map_dataframe_without_stats():
+    products_df = create_products()
+    mapper = CategoryMapper()
+    _, mapping_types = mapper.map_dataframe(products_df, ParameterTable.from_products(products_df),
+                                            update_stats=False)
+    assert mapping_types.tolist().count('unmapped') >= 2
+    assert mapper.get_mapping_stats()['mapped'] == 0
+    assert mapper.get_mapping_stats()['unmapped'] == 0
+
+
+if __name__ == "__main__":
+    test_map_dataframe_matches_row_mapping()
+    test_map_dataframe_without_stats()
+    print("✓ Dávkové mapování odpovídá mapování po řádcích")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test LRU cache mapování kategorií
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.mappers.category_mapper import CategoryMapper
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable
+
+
+def test_variants_share_cached_mapping():
+    mapper = CategoryMapper()
+    uncached = CategoryMapper(cache_size=0)
+    name = "Fotbalové kopačky Nike Mercurial FG"
+    base_params = {"sport": "fotbal", "typ": "kopačky", "povrch": "FG", "znacka": "Nike"}
+
+    results = []
+    for size in ['40', '41', '42']:
+        params = dict(base_params, velikost=size)
+        categories, mapping_type = mapper.map_product_to_multiple_categories(name, params, max_categories=3)
+        expected = uncached.map_product_to_multiple_categories(name, params, max_categories=3)
+        assert (categories, mapping_type) == expected
+        results.append(categories)
+
+    assert mapper.get_cache_stats()['hits'] == 2
+    assert mapper.get_cache_stats()['misses'] == 1
+
+    # Statistiky se počítají i při zásahu cache
+    assert mapper.get_mapping_stats() == uncached.get_mapping_stats()
+    assert mapper.get_mapping_stats()['mapped'] == 3
+
+    # Vrácený seznam nesmí sdílet stav s cache
+    results[0].append('Něco jiného')
+    assert mapper.map_product_to_multiple_categories(
+        name, base_params, max_categories=3)[0] == results[1]
+
+
+def test_cache_key_depends_on_rule_params_and_mode():
+    mapper = CategoryMapper()
+    mapper.map_product_to_category("Mikina", {"pohlavi": "pánské"})
+    mapper.map_product_to_category("Mikina", {"pohlavi": "dámské"})
+    mapper.map_product_to_category("Mikina", {"pohlavi": "pánské", "barva": "modrá"})
+    mapper.map_product_to_multiple_categories("Mikina", {"pohlavi": "pánské"})
+
+    stats = mapper.get_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 3)
+
+
+def test_cache_eviction_and_unmapped_fallback():
+    mapper = CategoryMapper(cache_size=2)
+    for name in ['xyz 1', 'xyz 2', 'xyz 3']:
+        assert mapper.map_product_to_category(name, {}, 'Původní') == ('Původní', 'fallback')
+
+    stats = mapper.get_cache_stats()
+    assert stats['evictions'] == 1
+    assert stats['size'] == 2
+    assert mapper.map_product_to_category('xyz 3', {}) == ('', 'unmapped')
+    assert mapper.get_mapping_stats()['fallback'] == 3
+    assert mapper.get_mapping_stats()['unmapped'] == 1
+
+
+def _report(mapper: CategoryMapper) -> str:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        mapper.print_mapping_report()
+    return output.getvalue()
+
+
+def test_report_shows_cache_only_for_row_mapping():
+    products_df = pd.DataFrame({'JmenoZbozi': ['Pánská mikina', 'Pánská mikina'],
+                                'HodnotyParametru': ['pohlavi||pánské', 'pohlavi||pánské']})
+    mapper = CategoryMapper()
+    mapper.map_dataframe(products_df, ParameterTable.from_products(products_df))
+
+    # map_dataframe cache obchází
+    assert mapper.get_cache_stats()['size'] == 0
+    assert 'Cache mapování' not in _report(mapper)
+
+    mapper.map_product_to_category('Pánská mikina', {'pohlavi': 'pánské'})
+    assert 'Cache mapování (po řádcích): 0 hits, 1 misses' in _report(mapper)
+
+
+if __name__ == "__main__":
+    test_variants_share_cached_mapping()
+    test_cache_key_depends_on_rule_params_and_mode()
+    test_cache_eviction_and_unmapped_fallback()
+    test_report_shows_cache_only_for_row_mapping()
+    print("✓ Cache mapování funguje správně")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test sloupcové tabulky parametrů - musí odpovídat parse_parameters
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.parameter_table import ParameterTable, extract_sizes, infer_size
+from src.fastcentrik_woocommerce.utils.utils import parse_parameters
+
+
+def test_parameter_table_matches_parse_parameters():
+    values = [
+        'barva||modrá##velikost||XL',
+        ' velikost || 42 ##barva||černá##',
+        'velikost||41##barva||bílá##velikost||42',  # opakovaný klíč
+        'bez_oddelovace##||jen_hodnota##klic||',
+        'popis||a||b',                               # hodnota s '||'
+        '',
+        None,
+    ]
+    products_df = pd.DataFrame({'HodnotyParametru': values}, index=[10, 11, 12, 13, 14, 15, 16])
+
+    table = ParameterTable.from_products(products_df)
+
+    for position, (label, value) in enumerate(zip(products_df.index, values)):
+        expected = parse_parameters(value)
+        assert list(table.params_at(position).items()) == list(expected.items())
+        assert table.params_for_label(label) == expected
+
+    assert list(table.long_table.columns) == ['row', 'key', 'value']
+    assert table.long_table[table.long_table['row'] == 2]['value'].tolist() == ['42', 'bílá']
+    assert table.params_for_label('neexistuje') is None
+
+
+def test_parameter_table_returns_copies():
+    table = ParameterTable.from_series(pd.Series(['barva||modrá']))
+    params = table.params_at(0)
+    params['velikost'] = '42'
+    assert table.params_at(0) == {'barva': 'modrá'}
+
+
+def test_parameter_table_without_column():
+    table = ParameterTable.from_products(pd.DataFrame({'KodZbozi': ['A', 'B']}))
+    assert len(table) == 2
+    assert table.params_at(1) == {}
+    assert table.params_for_label(0) == {}
+
+
+def test_inferred_size_only_for_rows_without_parameters():
+    products_df = pd.DataFrame({
+        'JmenoZbozi': ['Kopačky 41 1/3', 'Kopačky 42', 'Tričko XL', 'Mikina'],
+        'HodnotyParametru': [None, 'barva||modrá', '', None],
+    }, index=[10, 11, 12, 13])
+    table = ParameterTable.from_products(products_df)
+    assert [table.inferred_size_at(position) for position in range(4)] == ['41 1/3', None, None, None]
+    # Bez vzorů se velikost neodvozuje
+    assert ParameterTable.from_products(products_df, size_patterns=()).inferred_size_at(0) is None
+
+
+def test_size_patterns_first_match_wins():
+    patterns = [r'\b(\d{2})$', r'\b(XXL|XL|L|M|S)$', r'\b((?:UK|EU)\s?\d{1,2}(?:[.,]5)?)$']
+    names = pd.Series(['Tričko XL', 'Bota 42', 'Bota UK 8.5', 'Batoh', 'Bota EU 42'])
+    assert extract_sizes(names, patterns).where(lambda sizes: sizes.notna(), None).tolist() == [
+        'XL', '42', 'UK 8.5', None, '42'
+    ]
+    assert [infer_size(name, patterns) for name in names] == ['XL', '42', 'UK 8.5', None, '42']
+
+
+if __name__ == "__main__":
+    test_parameter_table_matches_parse_parameters()
+    test_parameter_table_returns_copies()
+    test_parameter_table_without_column()
+    test_inferred_size_only_for_rows_without_parameters()
+    test_size_patterns_first_match_wins()
+    print("✓ Tabulka parametrů odpovídá parse_parameters")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test sestavení WooCommerce produktů po sloupcích
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.config import CATEGORY_MAPPING_SETTINGS
+from src.fastcentrik_woocommerce.core.product_frame import (
+    format_template, image_urls, join_groups, last_segment, slot_columns
+)
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.exporters.csv_exporter import CsvExporter
+
+PRODUCTS = pd.DataFrame({
+    'KodZbozi': ['S1', 'F1', 'F1_2', 'F1_3', 'S2', 'F2_2', 'F2_3'],
+    'JmenoZbozi': ['Batoh Trek 30', 'Tričko', 'Tričko L', 'Tričko XL', 'Míč', 'Mikina M', 'Mikina 42'],
+    'KodMasterVyrobku': ['', '', 'F1', 'F1', '', 'F2', 'F2'],
+    'HodnotyParametru': ['material||nylon##barva||modrá##objem||30 l##vaha||1 kg', '',
+                         'velikost||L##barva||modrá', 'barva||černá##velikost||XL', None, 'velikost||M', None],
+    'InetrniKodyKategorii': ['C2', 'C1', 'C1', 'C1', 'X', 'C2', None],
+    'CenaBezna': ['1299,90', '499', '499', '499', 250, '899,5', '899,5'],
+    'ZakladniCena': ['999,90', '499', '449', '499', 250, '899,5', '799'],
+    'Popis': ['Batoh', 'Bavlna', 'Bavlna', 'Bavlna', np.nan, 'Fleece', 'Fleece'],
+    'HlavniObrazek': ['/img/batoh.jpg', None, ' tricko-l.jpg ', '', None, 'mikina.jpg', np.nan],
+    'DalsiObrazky': ['a.jpg; /b.jpg;', None, None, 'x.jpg', 'mic.jpg', None, ';'],
+    'NaSklade': [1, 0, 2, 0, np.nan, 3, -1],
+    'Vypnuto': [0, 0, 1, 0, 0, 1, 0],
+    'Hmotnost': ['1,5', '0,2', '0,2', '0,2', np.nan, '0,6', '0,6'],
+})
+CATEGORIES = pd.DataFrame({
+    'InterniKod': ['C1', 'C2'],
+    'JmenoKategorie': ['Oblečení', 'Batohy'],
+    'KodNadrizeneKategorie': ['', 'C1'],
+})
+
+
+def _csv(frame: pd.DataFrame) -> str:
+    return frame.reindex(columns=CsvExporter.WOO_COLUMNS, fill_value='').to_csv(index=False)
+
+
+def _dict_csv(transformer: DataTransformer) -> str:
+    return _csv(pd.DataFrame([product for unit in transformer._iter_product_units() for product in unit]))
+
+
+def _transformers():
+    transformers = []
+    for _ in range(2):
+        transformer = DataTransformer(PRODUCTS, CATEGORIES)
+        transformer._create_category_mapping()
+        transformers.append(transformer)
+    return transformers
+
+
+def test_format_template_and_last_segment():
+    names = pd.Series(['Batoh', 'Míč'])
+    categories = pd.Series(['Oblečení > Batohy', ''])
+    assert format_template('{product_name} - {category}!', product_name=names,
+                           category=last_segment(categories)).tolist() == ['Batoh - Batohy!', 'Míč - !']
+    # Pole s formátem se vyplní po řádcích
+    assert format_template('{product_name:>6}', product_name=names).tolist() == [' Batoh', '   Míč']
+
+
+def test_image_urls_and_groups():
+    urls = image_urls(pd.Series(['/a.jpg', None, ' ']), pd.Series(['b.jpg;;/c.jpg', 'd.jpg', None]),
+                      'https://shop.cz/')
+    assert urls.tolist() == ['https://shop.cz/a.jpg|https://shop.cz/b.jpg|https://shop.cz/c.jpg',
+                             'https://shop.cz/d.jpg', '']
+    assert join_groups(np.array([0, 0, 2]), ['a', 'b', 'c'], ', ', 4) == ['a, b', '', 'c', '']
+
+    columns = slot_columns(np.array([0, 1, 1]), np.array([1, 1, 2]), {'A {} name': ['x', 'y', 'z']}, 3, 2)
+    assert columns['A 1 name'][:2] == ['x', 'y']
+    assert pd.isna(columns['A 1 name'][2]) and pd.isna(columns['A 2 name'][0])
+    assert columns['A 2 name'][1] == 'z'
+
+
+def test_product_frame_matches_dict_products():
+    dict_transformer, frame_transformer = _transformers()
+    frame = frame_transformer.build_product_frame()
+
+    assert frame['Type'].tolist() == ['simple', 'simple', 'variable', 'variation', 'variation',
+                                      'variable', 'variation', 'variation']
+    assert _csv(frame) == _dict_csv(dict_transformer)
+    assert frame_transformer.validate_product_frame(frame) == []
+
+
+def test_product_frame_matches_without_intelligent_mapping():
+    original = CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False)
+    CATEGORY_MAPPING_SETTINGS['use_intelligent_mapping'] = False
+    try:
+        dict_transformer, frame_transformer = _transformers()
+        frame = frame_transformer.build_product_frame()
+    finally:
+        CATEGORY_MAPPING_SETTINGS['use_intelligent_mapping'] = original
+
+    assert frame['Categories'].tolist()[:2] == ['Oblečení > Batohy', '']
+    assert _csv(frame) == _dict_csv(dict_transformer)
+
+
+if __name__ == "__main__":
+    test_format_template_and_last_segment()
+    test_image_urls_and_groups()
+    test_product_frame_matches_dict_products()
+    test_product_frame_matches_without_intelligent_mapping()
+    print("✓ Produkty sestavené po sloupcích odpovídají slovníkům")
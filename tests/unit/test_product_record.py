@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test typovaných záznamů produktů
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.product_record import ProductRecord, build_product_records, column_values
+
+
+def test_records_keep_label_position_and_values():
+    products_df = pd.DataFrame({
+        'KodZbozi': ['A', 'B'],
+        'JmenoZbozi': ['Tričko', 'Mikina'],
+        'NaSklade': [3, 0],
+        'HlavniObrazek': ['/a.jpg', None],
+    }, index=[10, 20])
+
+    records = build_product_records(products_df)
+
+    assert [(r.label, r.position) for r in records] == [(10, 0), (20, 1)]
+    assert records[0].KodZbozi == 'A'
+    assert records[1].JmenoZbozi == 'Mikina'
+    assert records[0].NaSklade == 3
+    assert records[0].HlavniObrazek == '/a.jpg'
+    assert pd.isna(records[1].HlavniObrazek)
+
+
+def test_missing_columns_use_row_get_defaults():
+    records = build_product_records(pd.DataFrame({'KodZbozi': ['A']}))
+    record = records[0]
+    assert record.CenaBezna == ''
+    assert record.NaSklade == 0
+    assert record.Vypnuto == 0
+    assert record.DalsiObrazky is None
+    assert column_values(pd.DataFrame({'x': [1, 2]}), 'y', None) == [None, None]
+
+
+def test_replace_returns_new_record():
+    record = ProductRecord('r', 0, KodZbozi='A', JmenoZbozi='Kopačky 42')
+    renamed = record._replace(JmenoZbozi='Kopačky')
+    assert renamed.JmenoZbozi == 'Kopačky'
+    assert record.JmenoZbozi == 'Kopačky 42'
+    assert renamed.label == 'r'
+
+
+if __name__ == "__main__":
+    test_records_keep_label_position_and_values()
+    test_missing_columns_use_row_get_defaults()
+    test_replace_returns_new_record()
+    print("✓ Záznamy produktů odpovídají DataFrame")
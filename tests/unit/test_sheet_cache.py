@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test diskové cache rozparsovaných listů
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.sheet_cache import SheetCache
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+
+
+def _sheets():
+    return {
+        'Zbozi': pd.DataFrame({'KodZbozi': ['A', 'B'], 'NaSklade': [1, 0], 'HlavniObrazek': ['/a.jpg', None]}),
+        'Kategorie': pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Oblečení']}),
+    }
+
+
+def test_store_and_load_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'export.xls'
+        source.write_bytes(b'data')
+        for cache_format in ('auto', 'pickle'):
+            cache = SheetCache(Path(tmp) / cache_format, cache_format=cache_format)
+            key = cache.key_for(source, 'sheets=Zbozi,Kategorie')
+
+            assert cache.load(key, ['Zbozi']) is None
+            cache.store(key, _sheets(), source)
+            loaded = cache.load(key, ['Zbozi', 'Kategorie'])
+
+            for sheet_name, df in _sheets().items():
+                assert loaded[sheet_name].equals(df)
+            assert cache.load(key, ['Parametry']) is None
+
+
+def test_key_depends_on_content_and_signature():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'export.xls'
+        source.write_bytes(b'data')
+        cache = SheetCache(Path(tmp) / 'cache')
+        key = cache.key_for(source)
+
+        assert cache.key_for(source) == key
+        assert cache.key_for(source, 'jiné listy') != key
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.key_for(source) != key
+        source.write_bytes(b'dat2')
+        assert cache.key_for(source) != key
+
+
+def test_invalidate_and_evict():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = Path(tmp) / 'a.xls', Path(tmp) / 'b.xls'
+        first.write_bytes(b'a')
+        second.write_bytes(b'b')
+        cache = SheetCache(Path(tmp) / 'cache', cache_format='pickle')
+        cache.store(cache.key_for(first), _sheets(), first)
+        cache.store(cache.key_for(second), _sheets(), second)
+
+        assert cache.invalidate(first) == 1
+        assert [entry['source'] for entry in cache.entries()] == [str(second.resolve())]
+
+        # Limit menší než jeden záznam: zůstane jen právě uložený
+        small_cache = SheetCache(Path(tmp) / 'cache', max_size_mb=0, cache_format='pickle')
+        small_cache.store(small_cache.key_for(first), _sheets(), first)
+        assert [entry['source'] for entry in small_cache.entries()] == [str(first.resolve())]
+
+        assert cache.invalidate() == 1
+        assert cache.entries() == []
+
+
+def test_add_sheets_extends_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'export.xls'
+        source.write_bytes(b'data')
+        cache = SheetCache(Path(tmp) / 'cache')
+        key = cache.key_for(source)
+        sheets = _sheets()
+
+        cache.add_sheets(key, {'Zbozi': sheets['Zbozi']}, source)
+        assert cache.load(key, ['Kategorie']) is None
+        cache.add_sheets(key, {'Kategorie': sheets['Kategorie']}, source)
+
+        loaded = cache.load(key, ['Zbozi', 'Kategorie'])
+        assert loaded['Zbozi'].equals(sheets['Zbozi'])
+        assert loaded['Kategorie'].equals(sheets['Kategorie'])
+        assert len(cache.entries()) == 1
+
+
+def test_data_loader_uses_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name, df in _sheets().items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+            pd.DataFrame({'Nazev': ['velikost']}).to_excel(writer, sheet_name='Parametry', index=False)
+
+        cache_dir = str(Path(tmp) / 'cache')
+        first = DataLoader(str(path), use_cache=True, cache_dir=cache_dir, lazy=False)
+        expected = first.load_data()
+        assert '_cache' not in first.sheet_timings
+
+        second = DataLoader(str(path), use_cache=True, cache_dir=cache_dir, lazy=False)
+        data = second.load_data()
+        assert '_cache' in second.sheet_timings
+        for key in ('products', 'categories', 'parameters'):
+            assert data[key].equals(expected[key])
+
+        assert second.invalidate_cache() == 1
+        third = DataLoader(str(path), use_cache=True, cache_dir=cache_dir, lazy=False)
+        third.load_data()
+        assert '_cache' not in third.sheet_timings
+
+
+if __name__ == "__main__":
+    test_store_and_load_roundtrip()
+    test_key_depends_on_content_and_signature()
+    test_invalidate_and_evict()
+    test_add_sheets_extends_entry()
+    test_data_loader_uses_cache()
+    print("✓ Cache listů funguje")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test postupného zápisu produktů a dávkování transformace
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.exporters.stream_writer import CsvStreamWriter
+from src.fastcentrik_woocommerce.core.transformer import DataTransformer
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.exporters.webtoffee_csv_exporter import WebToffeeCSVExporter
+
+WEBTOFFEE_PRODUCTS = pd.DataFrame({
+    'KodZbozi': ['S1', 'M1-L', 'M1-XL', 'S2', 'S1'],
+    'JmenoZbozi': ['Batoh', 'Tričko L', 'Tričko XL', 'Míč', 'Batoh 2'],
+    'KodMasterVyrobku': ['', 'M1', 'M1', '', ''],
+    # Materiál mají jen varianty, objem jen duplicitní SKU - do exportu se nedostanou
+    'HodnotyParametru': ['barva||modrá', 'velikost||L##material||bavlna', 'velikost||XL', '', 'objem||30 l'],
+    'CenaBezna': ['100', '200', '200', '50', '100'],
+    'NaSklade': [1, 2, 0, 5, 1],
+})
+
+
+def test_stream_writer_matches_single_export():
+    rows = [
+        {'SKU': 'A', 'Name': 'Tričko, modré', 'Stock': '3'},
+        {'SKU': 'B', 'Name': 'Mikina', 'Extra': 'ignorováno'},
+        {'SKU': 'C', 'Stock': None},
+    ]
+    columns = ['SKU', 'Name', 'Stock', 'Tags']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected_file = Path(tmp) / 'expected.csv'
+        pd.DataFrame(rows).reindex(columns=columns).to_csv(expected_file, index=False, encoding='utf-8-sig')
+
+        streamed_file = Path(tmp) / 'streamed.csv'
+        with CsvStreamWriter(streamed_file, columns) as writer:
+            writer.write(rows[:1])
+            writer.write([])
+            writer.write(rows[1:])
+
+        assert streamed_file.read_bytes() == expected_file.read_bytes()
+        assert writer.rows_written == 3
+        assert writer.chunks_written == 2
+
+
+def test_stream_writer_defaults_and_empty_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / 'out.csv'
+        with CsvStreamWriter(output_file, ['sku', 'featured'], defaults={'featured': 'no'}) as writer:
+            writer.write([{'sku': 'A'}])
+        assert output_file.read_text(encoding='utf-8-sig').splitlines() == ['sku,featured', 'A,no']
+
+        empty_file = Path(tmp) / 'empty.csv'
+        CsvStreamWriter(empty_file, ['sku', 'featured']).close()
+        assert empty_file.read_text(encoding='utf-8-sig').splitlines() == ['sku,featured']
+
+
+def test_product_chunks_keep_variant_families_together():
+    products_df = pd.DataFrame({
+        'KodZbozi': ['S1', 'F1', 'F1_2', 'F1_3', 'S2', 'F2_2', 'F2_3'],
+        'JmenoZbozi': ['Batoh', 'Tričko', 'Tričko L', 'Tričko XL', 'Míč', 'Mikina M', 'Mikina L'],
+        'HodnotyParametru': ['', '', 'velikost||L', 'velikost||XL', '', 'velikost||M', 'velikost||L'],
+        'NaSklade': [1, 0, 2, 0, 5, 1, 1],
+    })
+    categories_df = pd.DataFrame({'InterniKod': ['C1'], 'JmenoKategorie': ['Oblečení']})
+
+    batch = DataTransformer(products_df, categories_df)
+    batch._create_category_mapping()
+    batch._transform_products()
+
+    streamed = DataTransformer(products_df, categories_df)
+    streamed._create_category_mapping()
+    chunks = list(streamed.iter_product_chunks(2))
+
+    assert [product for chunk in chunks for product in chunk] == batch.woo_products
+    assert streamed.woo_products == []
+    for chunk in chunks:
+        parents = {p['SKU'] for p in chunk if p['Type'] == 'variable'}
+        assert all(p['Parent'] in parents for p in chunk if p['Type'] == 'variation')
+        assert streamed.validate_products(chunk) == []
+
+
+def _webtoffee_stream(directory: Path, product_columns) -> Path:
+    transformer = WebToffeeTransformer(WEBTOFFEE_PRODUCTS, pd.DataFrame({'InterniKod': [], 'JmenoKategorie': []}))
+    with WebToffeeCSVExporter(str(directory)).open_product_stream(
+            product_columns(transformer), 'stream') as writer:
+        transformer.run_streaming_transformation(writer.write, 2)
+    return writer.output_file
+
+
+def test_webtoffee_stream_matches_full_export():
+    categories = pd.DataFrame({'InterniKod': [], 'JmenoKategorie': []})
+    products, _ = WebToffeeTransformer(WEBTOFFEE_PRODUCTS, categories).run_transformation()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exported = WebToffeeCSVExporter(tmp).export_products(products, 'full')
+        expected = Path(exported[-1]).read_bytes()
+        streamed = _webtoffee_stream(Path(tmp), lambda transformer: transformer.product_columns())
+        assert streamed.read_bytes() == expected
+
+        # Dávkový režim zná jen klíče parametrů: navíc jen prázdné atributové sloupce
+        keys = ['barva', 'velikost', 'material', 'objem']
+        batched = pd.read_csv(_webtoffee_stream(Path(tmp), lambda transformer: transformer.product_columns(keys)),
+                              dtype=str, keep_default_na=False)
+        full = pd.read_csv(exported[-1], dtype=str, keep_default_na=False)
+
+    assert 'sold_individually' not in full.columns
+    extra = [column for column in batched.columns if column not in full.columns]
+    assert 'attribute:Objem' in extra
+    assert all(column.startswith(WebToffeeCSVExporter.ATTRIBUTE_PREFIXES) for column in extra)
+    assert (batched[extra] == '').all().all()
+    pd.testing.assert_frame_equal(batched.drop(columns=extra), full)
+
+
+if __name__ == "__main__":
+    test_stream_writer_matches_single_export()
+    test_stream_writer_defaults_and_empty_output()
+    test_product_chunks_keep_variant_families_together()
+    test_webtoffee_stream_matches_full_export()
+    print("✓ Postupný zápis odpovídá jednorázovému exportu")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test textových vstupních formátů (CSV, TSV, JSONL, komprese)
+"""
+
+import gzip
+import json
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.loaders.data_loader import DataLoader
+from src.fastcentrik_woocommerce.loaders.text_formats import detect_format, sheet_path, sniff_csv
+
+
+def test_detect_format_and_sheet_path():
+    assert detect_format(Path('catalog.csv.gz')) == ('csv', '.csv', 'gzip')
+    assert detect_format(Path('catalog.TSV')) == ('csv', '.tsv', None)
+    assert detect_format(Path('feed.jsonl.zst')) == ('jsonl', '.jsonl', 'zstd')
+    assert detect_format(Path('export.xls')) == ('excel', '.xls', None)
+    for name in ('export.xlsx.gz', 'export.pdf'):
+        try:
+            detect_format(Path(name))
+            assert False, "Očekávána ValueError"
+        except ValueError:
+            pass
+    assert sheet_path(Path('/d/catalog.v2.csv.gz'), 'Kategorie') == Path('/d/catalog.v2.Kategorie.csv.gz')
+    assert sheet_path(Path('/d/catalog.csv'), 'Zbozi') == Path('/d/catalog.csv')
+
+
+def test_sniff_encoding_separator_and_magic_bytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'export.csv'
+        path.write_bytes('KodZbozi;JmenoZbozi\n033201;Čepice\n'.encode('cp1250'))
+        assert sniff_csv(path) == ('cp1250', ';')
+
+        # gzip bez přípony .gz se pozná podle úvodních bajtů
+        path.write_bytes(gzip.compress('﻿KodZbozi\tJmenoZbozi\n1\tA\n'.encode('utf-8')))
+        assert detect_format(path).compression == 'gzip'
+        assert sniff_csv(path) == ('utf-8-sig', '\t')
+
+
+def test_loader_reads_compressed_csv_with_sibling_sheets():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'catalog.csv.gz'
+        with gzip.open(path, 'wt', encoding='utf-8') as handle:
+            handle.write('KodZbozi;JmenoZbozi;NaSklade;CenaBezna;EAN\n033201;Čepice;2;199,90;859\n033201_2;Čepice L;;249;860\n')
+        with gzip.open(Path(tmp) / 'catalog.Kategorie.csv.gz', 'wt', encoding='utf-8') as handle:
+            handle.write('InterniKod;JmenoKategorie\nC1;Oblečení\n')
+
+        for lazy in (False, True):
+            data = DataLoader(str(path), use_cache=False, lazy=lazy).load_data()
+            products = data['products']
+            assert products['KodZbozi'].tolist() == ['033201', '033201_2']
+            assert 'EAN' not in products.columns
+            assert products['CenaBezna'].tolist() == ['199,90', '249']
+            assert str(products['NaSklade'].dtype) == 'Int64'
+            assert data['categories']['JmenoKategorie'].tolist() == ['Oblečení']
+            assert data['parameters'].empty
+
+        loader = DataLoader(str(path), use_cache=False)
+        chunks = list(loader.iter_product_chunks(chunk_size=1))
+        assert [chunk.index.tolist() for chunk in chunks] == [[0, 1]]
+
+
+def test_loader_reads_jsonl_with_sheet_field():
+    records = [
+        {'KodZbozi': '001', 'JmenoZbozi': 'Míč', 'NaSklade': 1},
+        {'_sheet': 'Kategorie', 'InterniKod': 'C1', 'JmenoKategorie': 'Sport'},
+        {'_sheet': 'Zbozi', 'KodZbozi': '002', 'JmenoZbozi': 'Síť', 'NaSklade': 0},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'feed.jsonl'
+        path.write_text('\n'.join(json.dumps(record, ensure_ascii=False) for record in records), encoding='utf-8')
+
+        data = DataLoader(str(path), use_cache=False).load_data()
+        assert data['products']['KodZbozi'].tolist() == ['001', '002']
+        assert data['products'].index.tolist() == [0, 1]
+        assert list(data['categories'].columns) == ['InterniKod', 'JmenoKategorie']
+        assert data['parameters'].empty
+
+        chunks = list(DataLoader(str(path), use_cache=False).iter_sheet_chunks('products', chunk_size=2))
+        assert [chunk.index.tolist() for chunk in chunks] == [[0], [1]]
+        assert pd.concat(chunks)['JmenoZbozi'].tolist() == ['Míč', 'Síť']
+
+
+if __name__ == "__main__":
+    test_detect_format_and_sheet_path()
+    test_sniff_encoding_separator_and_magic_bytes()
+    test_loader_reads_compressed_csv_with_sibling_sheets()
+    test_loader_reads_jsonl_with_sheet_field()
+    print("✓ Textové vstupní formáty se načítají jako listy Excelu")
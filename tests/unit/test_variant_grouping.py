@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test seskupování variant podle SKU vzoru
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.fastcentrik_woocommerce.core.variant_grouping import (
+    assign_family_ids, group_family_positions, group_skus_by_pattern
+)
+
+
+def test_group_skus_by_pattern():
+    skus = pd.Series([
+        '033201', '033201_2', '033201_3', '019228',
+        'TOPS.2121.IN_2', 'TOPS.2121.IN_3',  # base SKU v datech chybí
+        'A_1', 'A_1_2',                        # vnořený suffix
+        'NO_SUFFIX_x', 33500, '033201_2'       # číselné SKU a duplicita
+    ], dtype=object)
+
+    groups = group_skus_by_pattern(skus)
+
+    assert groups['parent_groups'] == {
+        '033201': ['033201_2', '033201_3'],
+        'TOPS.2121.IN': ['TOPS.2121.IN_2', 'TOPS.2121.IN_3'],
+        'A': ['A_1'],
+        'A_1': ['A_1_2'],
+    }
+    assert groups['all_variant_skus'] == {
+        '033201', '033201_2', '033201_3',
+        'TOPS.2121.IN_2', 'TOPS.2121.IN_3',
+        'A_1', 'A_1_2',
+    }
+
+
+def test_group_skus_by_pattern_empty():
+    groups = group_skus_by_pattern(pd.Series([], dtype=object))
+    assert groups == {'parent_groups': {}, 'all_variant_skus': set()}
+
+
+def test_group_family_positions():
+    skus = pd.Series([
+        '033201', '033201_2', '033201_3', '019228',
+        'TOPS.2121.IN_2', 'TOPS.2121.IN_3',
+        'A_1', 'A_1_2', 'NO_SUFFIX_x', 33500, '033201_2', 'A'
+    ], dtype=object)
+
+    groups = group_family_positions(skus)
+
+    # Stejné rodiny jako group_skus_by_pattern, jen jako pozice řádků
+    assert groups['families'] == [
+        ('033201', [0, 1, 2, 10], 0),
+        ('TOPS.2121.IN', [4, 5], None),
+        ('A', [6, 11], 11),
+        ('A_1', [6, 7], 6),
+    ]
+    assert groups['simple_positions'] == [3, 8, 9]
+    assert group_family_positions(pd.Series([], dtype=object)) == {'families': [], 'simple_positions': []}
+
+
+def test_assign_family_ids_joins_nested_suffixes():
+    # A_1 je variantou A i base pro A_1_2 - dávka je nesmí rozdělit
+    skus = pd.Series(['A_1_2', 'B', 'A', 'A_1', 'C_1_2', 'B_2', 'C_1'], dtype=object)
+    assert assign_family_ids(skus) == [0, 1, 0, 0, 2, 1, 2]
+    # Rodiny pokrývají všechny skupiny z group_family_positions
+    families = assign_family_ids(skus)
+    for _, positions, _ in group_family_positions(skus)['families']:
+        assert len({families[position] for position in positions}) == 1
+
+
+if __name__ == "__main__":
+    test_group_skus_by_pattern()
+    test_group_skus_by_pattern_empty()
+    test_group_family_positions()
+    test_assign_family_ids_joins_nested_suffixes()
+    print("✓ Seskupování variant funguje správně")
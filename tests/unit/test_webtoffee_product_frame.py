@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test sestavení WebToffee produktů po sloupcích
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.config import CATEGORY_MAPPING_SETTINGS
+from src.fastcentrik_woocommerce.core.product_frame import price_column, spread_columns
+from src.fastcentrik_woocommerce.core.webtoffee_transformer import WebToffeeTransformer
+from src.fastcentrik_woocommerce.exporters.webtoffee_csv_exporter import WebToffeeCSVExporter
+
+PRODUCTS = pd.DataFrame({
+    'KodZbozi': ['S1', 'M1', 'M1-L', 'M1-XL', 'S2', 'M2-42', 'M2-41', 'S1', 'M3-S'],
+    'JmenoZbozi': ['Batoh', 'Tričko', 'Tričko L', 'Tričko XL', 'Míč', 'Kopačky 42', 'Kopačky 41', 'Batoh 2',
+                   'Mikina S'],
+    'KodMasterVyrobku': ['', '', 'M1', 'M1', None, 'M2', 'M2', '', 'M3'],
+    'HodnotyParametru': ['material||nylon##barva||modrá', '', 'velikost||L##barva||bílá', 'velikost||XL',
+                         'barva||žlutá', None, None, '', 'velikost||S'],
+    'InetrniKodyKategorii': ['C2', 'C1', 'C1', 'C1', 'X', 'C2', 'C2', 'C2', None],
+    'CenaBezna': ['1299,90', '499', '499', '499', 250, '899,5', '899,5', np.nan, ''],
+    'ZakladniCena': ['999,90', '499', '449', np.nan, 250, '899,5', '799', '10', ''],
+    'Popis': ['<p>Batoh <b>30 l</b></p>', 'Bavlna', 'Bavlna', np.nan, '', '<ul><li>Kůže</li></ul>',
+              '<ul><li>Kůže</li></ul>', 'Batoh', 'Fleece'],
+    'KratkyPopis': ['Batoh', np.nan, '', '', 'Míč', '', '', '', ''],
+    'HlavniObrazek': ['/img/batoh.jpg', np.nan, 'tricko-l.jpg', None, None, np.nan, '/kopacky.jpg', None, None],
+    'DalsiObrazky': ['a.jpg; /b.jpg;', np.nan, None, 'x.jpg', 'mic.jpg', None, 'k2.jpg', None, None],
+    'NaSklade': [1, 0, 2, 0, np.nan, 3, -1, 0, 4],
+    'Vypnuto': [0, 0, 1, 0, 0, 1, 0, 0, 0],
+    'Hmotnost': ['1,5', '0,2', '0,2', '0,2', np.nan, '0,6', '0,6', '', '0,4'],
+})
+CATEGORIES = pd.DataFrame({
+    'InterniKod': ['C1', 'C2'],
+    'JmenoKategorie': ['Oblečení', 'Batohy'],
+    'KodNadrizeneKategorie': ['', 'C1'],
+})
+
+
+def _transformer() -> WebToffeeTransformer:
+    transformer = WebToffeeTransformer(PRODUCTS, CATEGORIES)
+    transformer._create_category_mapping()
+    return transformer
+
+
+def _export(products, directory: str) -> dict:
+    exporter = WebToffeeCSVExporter(directory)
+    if isinstance(products, pd.DataFrame):
+        files = exporter.export_product_frame(products)
+    else:
+        files = exporter.export_products(products)
+    files.append(exporter.export_sample(products, sample_size=3))
+    return {Path(file).name: Path(file).read_bytes() for file in files}
+
+
+def _assert_same_files():
+    dict_products = [product for unit in _transformer()._iter_product_units() for product in unit]
+    frame = _transformer().build_product_frame()
+
+    assert frame['sku'].tolist() == [product['sku'] for product in dict_products]
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = _export(dict_products, str(Path(tmp) / 'dicts'))
+        exported = _export(frame, str(Path(tmp) / 'frame'))
+    assert sorted(exported) == sorted(expected)
+    for name, content in expected.items():
+        assert exported[name] == content, name
+    return frame
+
+
+def test_price_column_and_spread_columns():
+    prices = pd.DataFrame({'CenaBezna': ['1,5', '', np.nan, 20]})
+    assert price_column(prices, 'CenaBezna').tolist() == ['1.5', '', '', '20']
+    assert price_column(prices, 'Chybi').tolist() == [''] * 4
+
+    cells = pd.DataFrame({'out_row': [0, 0, 2], 'column': ['a', 'a', 'b'], 'value': ['1', '2', '3']})
+    wide = spread_columns(cells, 3)
+    assert wide['a'].tolist()[0] == '2'  # Poslední hodnota jako u slovníku
+    assert pd.isna(wide['a'].tolist()[1]) and wide['b'].tolist()[2] == '3'
+    assert spread_columns(cells.iloc[0:0], 2).shape == (2, 0)
+
+
+def test_webtoffee_frame_matches_dict_export():
+    frame = _assert_same_files()
+
+    assert frame['tax:product_type'].tolist().count('Variable') == 2
+    assert frame['ID'].is_unique
+    assert _transformer().validate_product_frame(frame) == []
+
+
+def test_webtoffee_frame_matches_without_intelligent_mapping():
+    original = CATEGORY_MAPPING_SETTINGS.get('use_intelligent_mapping', False)
+    CATEGORY_MAPPING_SETTINGS['use_intelligent_mapping'] = False
+    try:
+        frame = _assert_same_files()
+    finally:
+        CATEGORY_MAPPING_SETTINGS['use_intelligent_mapping'] = original
+
+    assert frame.loc[frame['sku'] == 'S1', 'tax:product_cat'].tolist() == ['Oblečení > Batohy']
+
+
+def test_validate_product_frame_reports_dict_errors():
+    transformer = _transformer()
+    frame = transformer.build_product_frame()
+    broken = frame.copy()
+    variations = broken.index[broken['parent_sku'] != '']
+    broken.loc[variations[0], 'sku'] = 'jine'
+    broken.loc[variations[1], 'post_parent'] = '1'
+    broken.loc[broken['sku'] == 'S2', 'sku'] = 'S1'
+
+    products = [{key: value for key, value in row.items() if not pd.isna(value)}
+                for row in broken.to_dict('records')]
+    assert transformer.validate_product_frame(broken) == transformer.validate_products(products)
+
+
+if __name__ == "__main__":
+    test_price_column_and_spread_columns()
+    test_webtoffee_frame_matches_dict_export()
+    test_webtoffee_frame_matches_without_intelligent_mapping()
+    test_validate_product_frame_reports_dict_errors()
+    print("✓ WebToffee produkty sestavené po sloupcích odpovídají slovníkům")